@@ -9,7 +9,7 @@ from PyInstaller.utils.hooks import collect_submodules
 block_cipher = None
 
 hiddenimports = []
-for mod in ("pyvista", "vtk", "pyvistaqt", "trimesh"):
+for mod in ("pyvista", "vtk", "pyvistaqt", "trimesh", "scipy"):
     try:
         hiddenimports += collect_submodules(mod)
     except Exception:
@@ -23,6 +23,12 @@ def main():
         log_file,
     )
 
+    if len(sys.argv) > 1 and sys.argv[1] == "thumbnails":
+        # Пакетная отрисовка миниатюр без окна приложения
+        from solidflow.gui.viewport.offscreen import main as thumbnails
+
+        return thumbnails(sys.argv[2:])
+
     # Важно: импортируем Qt/приложение ПОСЛЕ настройки логирования
     from solidflow.core.application import Application
 
@@ -0,0 +1,293 @@
+"""
+Анализ и ремонт mesh по компонентам связности
+
+Файлы с рабочего стола принтера часто содержат сотни несвязанных деталей.
+Каждая компонента валидируется и ремонтируется отдельно в пуле процессов:
+работа масштабируется по ядрам, а сбой на одной детали не затрагивает остальные.
+"""
+
+import logging
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from solidflow.geometry.mesh.arrays import arrays_to_polydata, mesh_arrays, weld_vertices
+from solidflow.geometry.mesh.shared import (
+    adopt_result,
+    call_shared,
+    create_process_pool,
+    discard_result,
+    publish_result,
+    share_mesh,
+)
+from solidflow.geometry.mesh.topology import component_faces, face_components, submesh_arrays
+
+_log = logging.getLogger("SolidFlow.ComponentAnalyzer")
+
+
+def _part_report(index: int, tmesh) -> Dict[str, any]:
+    """Отчет по одной детали"""
+    from solidflow.analysis.validator import MeshValidator
+
+    validation = MeshValidator(tmesh).validate()
+    watertight = validation["watertight"]
+    bounds = tmesh.bounds
+    return {
+        "index": index,
+        "triangles": int(len(tmesh.faces)),
+        "vertices": int(len(tmesh.vertices)),
+        "volume": float(tmesh.volume) if watertight else 0.0,
+        "surface_area": float(tmesh.area),
+        "bounding_box": {"min": bounds[0].tolist(), "max": bounds[1].tolist()},
+        "watertight": watertight,
+        "valid": validation["valid"],
+        "issues": validation["issues"],
+        "error": None,
+    }
+
+
+def _failed_report(index: int, n_faces: int, error: Exception) -> Dict[str, any]:
+    return {
+        "index": index,
+        "triangles": n_faces,
+        "vertices": 0,
+        "volume": 0.0,
+        "surface_area": 0.0,
+        "bounding_box": None,
+        "watertight": False,
+        "valid": False,
+        "issues": [f"Ошибка обработки: {error}"],
+        "error": str(error),
+    }
+
+
+def _analyze_parts(mesh, parts: List[Tuple[int, np.ndarray]]) -> List[Dict[str, any]]:
+    """Рабочий процесс: валидация группы деталей"""
+    import trimesh
+
+    vertices = np.asarray(mesh.vertices)
+    faces = np.asarray(mesh.faces)
+    reports = []
+    for index, face_ids in parts:
+        try:
+            v, f = submesh_arrays(vertices, faces, face_ids)
+            reports.append(_part_report(index, trimesh.Trimesh(vertices=v, faces=f)))
+        except Exception as e:
+            reports.append(_failed_report(index, len(face_ids), e))
+    return reports
+
+
+def _repair_parts(mesh, parts: List[Tuple[int, np.ndarray]]):
+    """
+    Рабочий процесс: ремонт группы деталей
+
+    Отремонтированные детали объединяются в один mesh и публикуются в разделяемой
+    памяти; при ошибке ремонта деталь остается в исходном виде.
+
+    Returns:
+        tuple: (результат publish_result, отчеты)
+    """
+    import trimesh
+
+    from solidflow.geometry.mesh.processor import MeshProcessor
+
+    vertices = np.asarray(mesh.vertices)
+    faces = np.asarray(mesh.faces)
+    out_vertices, out_faces, reports = [], [], []
+    offset = 0
+    for index, face_ids in parts:
+        v, f = submesh_arrays(vertices, faces, face_ids)
+        try:
+            repaired = MeshProcessor(trimesh.Trimesh(vertices=v, faces=f)).repair()
+            v, f = mesh_arrays(repaired)
+            reports.append(_part_report(index, trimesh.Trimesh(vertices=v, faces=f)))
+        except Exception as e:
+            reports.append(_failed_report(index, len(face_ids), e))
+        out_vertices.append(v)
+        out_faces.append(f + offset)
+        offset += len(v)
+
+    merged = arrays_to_polydata(np.vstack(out_vertices), np.vstack(out_faces))
+    return publish_result(merged), reports
+
+
+class ComponentAnalyzer:
+    """Анализ и ремонт mesh по компонентам связности"""
+
+    # Целевое количество граней в одной задаче пула (мелкие детали группируются)
+    CHUNK_FACES = 200_000
+
+    def __init__(self, mesh, max_workers: Optional[int] = None):
+        """
+        Инициализация
+
+        Args:
+            mesh: PyVista или trimesh mesh объект
+            max_workers: Количество процессов (по умолчанию — число ядер)
+        """
+        self.mesh = mesh
+        self.max_workers = max_workers
+        self._parts = None
+
+    def split(self) -> List[np.ndarray]:
+        """
+        Разбить mesh на компоненты связности
+
+        Совпадающие по координатам вершины предварительно объединяются, чтобы
+        "треугольный суп" из STL не распадался на отдельные грани.
+
+        Returns:
+            list: Номера граней каждой компоненты (по убыванию размера)
+        """
+        if self._parts is None:
+            vertices, faces = mesh_arrays(self.mesh)
+            _, welded = weld_vertices(vertices, faces)
+            n_components, labels = face_components(welded)
+            parts = component_faces(labels, n_components)
+            parts.sort(key=len, reverse=True)
+            self._parts = parts
+            _log.info("Split mesh into %d components", n_components)
+        return self._parts
+
+    @property
+    def n_components(self) -> int:
+        """Количество компонент связности"""
+        return len(self.split())
+
+    def analyze(self, executor=None, check: Callable[[], None] = None) -> List[Dict[str, any]]:
+        """
+        Валидировать каждую деталь
+
+        Args:
+            executor: Пул процессов (по умолчанию создается временный)
+            check: Функция проверки отмены (например, TaskContext.check)
+
+        Returns:
+            list: Отчеты по деталям (объем, герметичность, дефекты)
+        """
+        reports = []
+        for result in self._run(_analyze_parts, executor, check, discard=None):
+            reports.extend(result)
+        return sorted(reports, key=lambda r: r["index"])
+
+    def repair(self, executor=None, check: Callable[[], None] = None):
+        """
+        Отремонтировать каждую деталь и собрать результат в один mesh
+
+        Args:
+            executor: Пул процессов (по умолчанию создается временный)
+            check: Функция проверки отмены (например, TaskContext.check)
+
+        Returns:
+            tuple: (pv.PolyData отремонтированный mesh, отчеты по деталям)
+        """
+        meshes, reports = [], []
+        results = self._run(_repair_parts, executor, check, discard=lambda r: discard_result(r[0]))
+        for shared_result, part_reports in results:
+            meshes.append(adopt_result(shared_result))
+            reports.extend(part_reports)
+
+        vertices, faces, offset = [], [], 0
+        for part in meshes:
+            v, f = mesh_arrays(part)
+            vertices.append(v)
+            faces.append(f + offset)
+            offset += len(v)
+        merged = arrays_to_polydata(np.vstack(vertices), np.vstack(faces))
+        return merged, sorted(reports, key=lambda r: r["index"])
+
+    @staticmethod
+    def summarize(reports: List[Dict[str, any]]) -> Dict[str, any]:
+        """
+        Сводка по отчетам деталей
+
+        Returns:
+            dict: Количество деталей, корректных/негерметичных/сбойных, общий объем
+        """
+        return {
+            "parts": len(reports),
+            "valid": sum(1 for r in reports if r["valid"]),
+            "not_watertight": sum(1 for r in reports if not r["watertight"]),
+            "failed": sum(1 for r in reports if r["error"]),
+            "total_volume": float(sum(r["volume"] for r in reports)),
+        }
+
+    def _chunks(self) -> List[List[Tuple[int, np.ndarray]]]:
+        """Сгруппировать детали в задачи примерно по CHUNK_FACES граней"""
+        chunks, current, size = [], [], 0
+        for index, face_ids in enumerate(self.split()):
+            current.append((index, face_ids))
+            size += len(face_ids)
+            if size >= self.CHUNK_FACES:
+                chunks.append(current)
+                current, size = [], 0
+        if current:
+            chunks.append(current)
+
+        # Достаточно задач, чтобы загрузить все процессы
+        workers = self.max_workers or os.cpu_count() or 1
+        if len(chunks) < workers and len(self.split()) > len(chunks):
+            flat = [part for chunk in chunks for part in chunk]
+            chunks = [flat[i::workers] for i in range(workers) if flat[i::workers]]
+        return chunks
+
+    def _run(self, worker, executor, check, discard):
+        """
+        Выполнить worker над группами деталей; mesh публикуется однократно
+
+        Args:
+            discard: Освобождение ресурсов результата при отмене (опционально)
+        """
+        chunks = self._chunks()
+        if len(chunks) <= 1:
+            # Одна группа — пул процессов не окупается
+            import trimesh
+
+            if check is not None:
+                check()
+            vertices, faces = mesh_arrays(self.mesh)
+            tmesh = trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+            results = [worker(tmesh, chunk) for chunk in chunks]
+            if check is not None:
+                try:
+                    check()
+                except BaseException:
+                    # Отмена во время работы worker: результат больше не нужен
+                    if discard is not None:
+                        for result in results:
+                            discard(result)
+                    raise
+            return results
+
+        own_executor = executor is None
+        if own_executor:
+            executor = create_process_pool(self.max_workers)
+
+        shared = share_mesh(self.mesh)
+        results = []
+        try:
+            args = (shared.descriptor,)
+            futures = [executor.submit(call_shared, worker, args + (c,), {}) for c in chunks]
+            try:
+                for future in futures:
+                    if check is not None:
+                        check()
+                    results.append(future.result())
+            except BaseException:
+                for future in futures:
+                    if not future.cancel() and discard is not None:
+                        future.add_done_callback(lambda f: _discard_future(f, discard))
+                raise
+            return results
+        finally:
+            shared.release()
+            if own_executor:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _discard_future(future, discard):
+    try:
+        discard(future.result())
+    except Exception:
+        pass
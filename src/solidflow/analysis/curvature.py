@@ -0,0 +1,294 @@
+"""
+Анализ кривизны поверхности
+
+Дискретные средняя и гауссова кривизна в вершинах (Meyer et al., 2003):
+
+* средняя кривизна — из вектора котангенсного оператора Лапласа–Бельтрами
+  Σ (cot α + cot β)(x_i - x_j), деленного на смешанную площадь Вороного
+  вершины; знак — по нормали вершины (выпуклые участки положительны);
+* гауссова кривизна — угловой дефект 2π - Σθ, деленный на ту же площадь.
+
+Для моделей обычного размера котангенсный лапласиан строится как разреженная
+матрица (``cotangent_laplacian``). Для очень больших моделей вклады граней
+суммируются в вершины пакетами по ``CHUNK_FACES`` граней, без матрицы и без
+промежуточных массивов на всю модель.
+
+Результат кэшируется на mesh по версии геометрии (``mesh_curvature``).
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+
+from solidflow.core.config import Config
+from solidflow.geometry.mesh.arrays import (
+    geometry_version,
+    mesh_arrays,
+    mesh_lock,
+    weld_vertices,
+)
+from solidflow.geometry.mesh.topology import edge_index
+
+_log = logging.getLogger("SolidFlow.CurvatureAnalyzer")
+
+# Атрибут mesh с закэшированным результатом: (версия геометрии, CurvatureResult)
+_ATTR = "_solidflow_curvature"
+
+
+@dataclass
+class CurvatureResult:
+    """
+    Кривизна в вершинах
+
+    Attributes:
+        vertices: Вершины, объединенные по координатам (N, 3)
+        faces: Треугольники по объединенным вершинам (M, 3)
+        inverse: Номер объединенной вершины для каждой вершины mesh
+        mean: Средняя кривизна (N,), 1/мм; NaN на границе
+        gaussian: Гауссова кривизна (N,), 1/мм²; NaN на границе
+        area: Смешанная площадь Вороного вершин (N,)
+    """
+
+    vertices: np.ndarray
+    faces: np.ndarray
+    inverse: np.ndarray
+    mean: np.ndarray
+    gaussian: np.ndarray
+    area: np.ndarray
+
+    def principal(self):
+        """
+        Главные кривизны
+
+        Returns:
+            tuple: (k1 (N,), k2 (N,)), k1 >= k2
+        """
+        root = np.sqrt(np.maximum(self.mean * self.mean - self.gaussian, 0.0))
+        return self.mean + root, self.mean - root
+
+    def max_abs(self) -> np.ndarray:
+        """Наибольшая по модулю главная кривизна (N,)"""
+        k1, k2 = self.principal()
+        return np.maximum(np.abs(k1), np.abs(k2))
+
+    def face_values(self, values: np.ndarray) -> np.ndarray:
+        """
+        Значения в вершинах, усредненные по граням
+
+        Args:
+            values: Значения в объединенных вершинах (N,)
+
+        Returns:
+            np.ndarray: Значения граней (M,) в порядке граней mesh
+        """
+        with np.errstate(invalid="ignore"):
+            return values[self.faces].mean(axis=1)
+
+    def summary(self, min_radius: Optional[float] = None) -> Dict[str, any]:
+        """
+        Сводка по кривизне
+
+        Args:
+            min_radius: Наименьший допустимый радиус скругления, мм
+                (по умолчанию Config.MIN_FILLET_RADIUS)
+
+        Returns:
+            dict: Процентили средней кривизны, вершины и площадь участков с
+            радиусом меньше min_radius
+        """
+        if min_radius is None:
+            min_radius = Config.MIN_FILLET_RADIUS
+        valid = np.isfinite(self.mean)
+        with np.errstate(invalid="ignore"):
+            small = valid & (self.max_abs() > 1.0 / min_radius)
+        mean = self.mean[valid]
+        percentiles = np.percentile(mean, [1, 50, 99]) if len(mean) else np.zeros(3)
+        total = float(self.area[valid].sum())
+        return {
+            "vertices": int(valid.sum()),
+            "mean_p1": float(percentiles[0]),
+            "mean_median": float(percentiles[1]),
+            "mean_p99": float(percentiles[2]),
+            "min_radius": float(min_radius),
+            "small_radius_vertices": int(small.sum()),
+            "small_radius_area": float(self.area[small].sum()),
+            "small_radius_fraction": float(self.area[small].sum() / total) if total else 0.0,
+        }
+
+
+def _face_terms(vertices: np.ndarray, faces: np.ndarray):
+    """
+    Величины граней для котангенсных формул
+
+    Returns:
+        tuple: (углы при вершинах (M, 3), котангенсы углов (M, 3),
+        квадраты длин сторон напротив вершин (M, 3), удвоенные нормали (M, 3),
+        смешанные площади Вороного вершин граней (M, 3))
+    """
+    tri = vertices[faces]
+    # Сторона напротив вершины i — от вершины i + 1 к i + 2
+    u = np.roll(tri, -1, axis=1) - tri
+    v = np.roll(tri, -2, axis=1) - tri
+    cross = np.cross(u[:, 0], v[:, 0])
+    double_area = np.linalg.norm(cross, axis=1)
+    dot = np.einsum("ijk,ijk->ij", u, v)
+    angle = np.arctan2(double_area[:, None], dot)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cot = np.where(double_area[:, None] > 0, dot / double_area[:, None], 0.0)
+    opposite = np.roll(u, -1, axis=1)
+    length_sq = np.einsum("ijk,ijk->ij", opposite, opposite)
+
+    # Смешанная площадь: Вороного для неостроугольных граней, иначе доли площади
+    area = 0.5 * double_area
+    voronoi = (np.roll(length_sq * cot, -1, axis=1) + np.roll(length_sq * cot, -2, axis=1)) / 8.0
+    obtuse = dot < 0
+    mixed = np.where(
+        obtuse.any(axis=1)[:, None],
+        np.where(obtuse, 0.5, 0.25) * area[:, None],
+        voronoi,
+    )
+    return angle, cot, length_sq, cross, mixed
+
+
+class CurvatureAnalyzer:
+    """Средняя и гауссова кривизна в вершинах по котангенсным формулам"""
+
+    # Граней в пакете поэлементного расчета
+    CHUNK_FACES = 1 << 20
+
+    def __init__(self, mesh):
+        """
+        Инициализация: объединение вершин
+
+        Args:
+            mesh: PyVista или trimesh mesh объект
+        """
+        self.mesh = mesh
+        vertices, faces = mesh_arrays(mesh)
+        # STL хранит вершины каждой грани отдельно — кривизна требует общих вершин
+        self._vertices, self._inverse = weld_vertices(vertices, np.arange(len(vertices)))
+        self._faces = self._inverse[faces]
+
+    def cotangent_laplacian(self):
+        """
+        Котангенсный лапласиан L = D - W, w_ij = (cot α_ij + cot β_ij) / 2
+
+        Returns:
+            scipy.sparse.csr_matrix: Матрица (N, N); L @ x = Σ w_ij (x_i - x_j)
+        """
+        from scipy.sparse import coo_matrix, diags
+
+        _, cot, _, _, _ = _face_terms(self._vertices, self._faces)
+        a = np.roll(self._faces, -1, axis=1).ravel()
+        b = np.roll(self._faces, -2, axis=1).ravel()
+        w = 0.5 * cot.ravel()
+        n = len(self._vertices)
+        weights = coo_matrix(
+            (np.concatenate([w, w]), (np.concatenate([a, b]), np.concatenate([b, a]))),
+            shape=(n, n),
+        ).tocsr()
+        return (diags(np.asarray(weights.sum(axis=1)).ravel()) - weights).tocsr()
+
+    def compute(self, chunk_faces: Optional[int] = None) -> CurvatureResult:
+        """
+        Вычислить кривизну
+
+        Args:
+            chunk_faces: Граней в пакете; по умолчанию для моделей больше
+                CHUNK_FACES граней расчет идет пакетами, иначе — через
+                разреженный лапласиан
+
+        Returns:
+            CurvatureResult: Средняя и гауссова кривизна в вершинах
+        """
+        vertices, faces = self._vertices, self._faces
+        n = len(vertices)
+        if chunk_faces is None and len(faces) > self.CHUNK_FACES:
+            chunk_faces = self.CHUNK_FACES
+
+        angle_sum = np.zeros(n)
+        area = np.zeros(n)
+        normal = np.zeros((n, 3))
+        if chunk_faces is None:
+            angle, _, _, cross, mixed = _face_terms(vertices, faces)
+            self._accumulate(faces, angle, cross, mixed, angle_sum, area, normal)
+            laplace = 2.0 * (self.cotangent_laplacian() @ vertices)
+        else:
+            laplace = np.zeros((n, 3))
+            for start in range(0, len(faces), int(chunk_faces)):
+                block = faces[start : start + int(chunk_faces)]
+                angle, cot, _, cross, mixed = _face_terms(vertices, block)
+                self._accumulate(block, angle, cross, mixed, angle_sum, area, normal)
+                # Угол при вершине c — вклад в вектор Лапласа концов противолежащей стороны
+                a = np.roll(block, -1, axis=1).ravel()
+                b = np.roll(block, -2, axis=1).ravel()
+                diff = cot.reshape(-1, 1) * (vertices[a] - vertices[b])
+                for k in range(3):
+                    laplace[:, k] += np.bincount(a, diff[:, k], minlength=n)
+                    laplace[:, k] -= np.bincount(b, diff[:, k], minlength=n)
+
+        normal /= np.maximum(np.linalg.norm(normal, axis=1, keepdims=True), 1e-300)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean = np.einsum("ij,ij->i", laplace, normal) / (4.0 * area)
+            gaussian = (2.0 * np.pi - angle_sum) / area
+
+        # Граничные вершины: у них нет замкнутого кольца граней
+        index = edge_index(faces, n)
+        open_vertices = index.edges[index.counts != 2].ravel()
+        mean[open_vertices] = np.nan
+        gaussian[open_vertices] = np.nan
+        unused = area <= 0
+        mean[unused] = np.nan
+        gaussian[unused] = np.nan
+
+        _log.info(
+            "Curvature: %d vertices, %s",
+            n,
+            "chunked" if chunk_faces is not None else "sparse Laplacian",
+        )
+        return CurvatureResult(
+            vertices=vertices,
+            faces=faces,
+            inverse=self._inverse,
+            mean=mean,
+            gaussian=gaussian,
+            area=area,
+        )
+
+    @staticmethod
+    def _accumulate(faces, angle, cross, mixed, angle_sum, area, normal):
+        """Сложить вклады граней в вершины: углы, площади, нормали"""
+        n = len(angle_sum)
+        flat = faces.ravel()
+        angle_sum += np.bincount(flat, angle.ravel(), minlength=n)
+        area += np.bincount(flat, mixed.ravel(), minlength=n)
+        # Нормаль вершины — сумма нормалей граней, взвешенных по площади
+        corner_normal = np.repeat(cross, 3, axis=0)
+        for k in range(3):
+            normal[:, k] += np.bincount(flat, corner_normal[:, k], minlength=n)
+
+
+def mesh_curvature(mesh, chunk_faces: Optional[int] = None) -> CurvatureResult:
+    """
+    Получить кривизну mesh из кэша или вычислить
+
+    Результат хранится на самом mesh и действителен, пока не изменилась
+    геометрия (``geometry_version``).
+
+    Args:
+        mesh: PyVista или trimesh mesh объект
+        chunk_faces: Граней в пакете (см. CurvatureAnalyzer.compute)
+
+    Returns:
+        CurvatureResult: Кривизна в вершинах
+    """
+    version = geometry_version(mesh)
+    with mesh_lock(mesh, _ATTR):
+        cached = getattr(mesh, _ATTR, None)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        result = CurvatureAnalyzer(mesh).compute(chunk_faces)
+        setattr(mesh, _ATTR, (version, result))
+        return result
@@ -0,0 +1,365 @@
+"""
+Поиск дефектов mesh по граням и ребрам для подсветки во viewport
+
+MeshValidator считает количество проблем; здесь для каждой грани и ребра
+определяется, где именно они находятся:
+
+* перевернутые грани — ориентация грани не согласована с соседями. Классы
+  согласованной ориентации находятся компонентами связности двойного графа
+  смежности (узлы "грань как есть" и "грань развернута"), после чего в
+  замкнутой компоненте неверным считается класс, дающий отрицательный
+  объем, а в открытой — класс меньшей площади. Вывернутая наизнанку
+  замкнутая модель целиком отмечается перевернутой;
+* вырожденные грани — площадь меньше ``DEGENERATE_AREA`` или совпадающие
+  после объединения вершины;
+* самопересечения — пары граней без общих вершин с пересекающимися AABB
+  (запрос к BVH модели) проверяются векторным тестом отрезок-треугольник для
+  сторон обеих граней. Пересечения копланарных граней не отмечаются;
+* граничные и non-manifold ребра; граничные ребра объединяются в петли
+  (отверстия) по общим вершинам.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from solidflow.geometry.mesh.arrays import mesh_arrays, triangle_normals, weld_vertices
+from solidflow.geometry.mesh.topology import edge_index
+from solidflow.geometry.spatial.bvh import BVH
+from solidflow.geometry.spatial.index import spatial_index
+
+_log = logging.getLogger("SolidFlow.DefectAnalyzer")
+
+# Биты дефектов граней в DefectResult.face_codes
+FACE_DEFECTS = {"flipped": 1, "degenerate": 2, "self_intersection": 4}
+
+# Коды дефектов ребер в DefectResult.edge_kinds
+EDGE_DEFECTS = {"boundary": 0, "non_manifold": 1}
+
+
+@dataclass
+class DefectResult:
+    """
+    Дефекты mesh по граням и ребрам
+
+    Attributes:
+        flipped: Маска перевернутых граней (M,)
+        degenerate: Маска вырожденных граней (M,)
+        self_intersecting: Маска граней, пересекающих другие грани (M,)
+        points: Вершины дефектных ребер (P, 3)
+        edges: Дефектные ребра (K, 2) — номера вершин в points
+        edge_kinds: Код дефекта ребра (K,), см. EDGE_DEFECTS
+        boundary_loops: Количество петель граничных ребер (отверстий)
+        non_orientable: Количество неориентируемых компонент
+    """
+
+    flipped: np.ndarray
+    degenerate: np.ndarray
+    self_intersecting: np.ndarray
+    points: np.ndarray
+    edges: np.ndarray
+    edge_kinds: np.ndarray
+    boundary_loops: int = 0
+    non_orientable: int = 0
+
+    @property
+    def face_codes(self) -> np.ndarray:
+        """Дефекты граней битами FACE_DEFECTS (M,), uint8"""
+        codes = np.zeros(len(self.flipped), dtype=np.uint8)
+        codes[self.flipped] |= FACE_DEFECTS["flipped"]
+        codes[self.degenerate] |= FACE_DEFECTS["degenerate"]
+        codes[self.self_intersecting] |= FACE_DEFECTS["self_intersection"]
+        return codes
+
+    def summary(self) -> Dict[str, any]:
+        """
+        Сводка по дефектам
+
+        Returns:
+            dict: Количество дефектных граней и ребер каждого вида, петель
+            граничных ребер и неориентируемых компонент
+        """
+        return {
+            "flipped_faces": int(self.flipped.sum()),
+            "degenerate_faces": int(self.degenerate.sum()),
+            "self_intersecting_faces": int(self.self_intersecting.sum()),
+            "boundary_edges": int((self.edge_kinds == EDGE_DEFECTS["boundary"]).sum()),
+            "boundary_loops": self.boundary_loops,
+            "non_manifold_edges": int((self.edge_kinds == EDGE_DEFECTS["non_manifold"]).sum()),
+            "non_orientable": self.non_orientable,
+        }
+
+
+def _components(n_nodes: int, links: np.ndarray):
+    """Компоненты связности графа с n_nodes узлами по ребрам links (L, 2)"""
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    graph = coo_matrix(
+        (np.ones(len(links), dtype=np.int8), (links[:, 0], links[:, 1])),
+        shape=(n_nodes, n_nodes),
+    )
+    return connected_components(graph, directed=False)
+
+
+def _segments_cross(p: np.ndarray, q: np.ndarray, tri: np.ndarray, eps: float) -> np.ndarray:
+    """
+    Пересекают ли отрезки треугольники (Моллер-Трумбор, векторно)
+
+    Args:
+        p: Начала отрезков (K, 3)
+        q: Концы отрезков (K, 3)
+        tri: Треугольники (K, 3, 3)
+        eps: Допуск барицентрических координат и параметра на отрезке
+
+    Returns:
+        np.ndarray: Маска (K,); отрезки в плоскости треугольника не пересекают
+    """
+    d = q - p
+    e1 = tri[:, 1] - tri[:, 0]
+    e2 = tri[:, 2] - tri[:, 0]
+    h = np.cross(d, e2)
+    det = np.einsum("ij,ij->i", e1, h)
+    scale = np.linalg.norm(d, axis=1) * np.linalg.norm(e1, axis=1) * np.linalg.norm(e2, axis=1)
+    valid = np.abs(det) > 1e-12 * scale
+    inv = np.divide(1.0, det, out=np.zeros_like(det), where=valid)
+
+    s = p - tri[:, 0]
+    u = np.einsum("ij,ij->i", s, h) * inv
+    qv = np.cross(s, e1)
+    v = np.einsum("ij,ij->i", d, qv) * inv
+    t = np.einsum("ij,ij->i", e2, qv) * inv
+    return valid & (u >= -eps) & (v >= -eps) & (u + v <= 1.0 + eps) & (t > eps) & (t < 1.0 - eps)
+
+
+class DefectAnalyzer:
+    """Перевернутые, вырожденные и самопересекающиеся грани, открытые и non-manifold ребра"""
+
+    # Площадь вырожденной грани (как в MeshValidator)
+    DEGENERATE_AREA = 1e-10
+
+    # Листьев BVH в одном запросе при поиске самопересечений
+    CHUNK_LEAVES = 8192
+
+    # Допуск теста пересечения: касание вершиной не считается пересечением
+    INTERSECTION_EPS = 1e-9
+
+    def __init__(self, mesh, bvh: Optional[BVH] = None):
+        """
+        Инициализация: объединение вершин по координатам
+
+        Args:
+            mesh: PyVista или trimesh mesh объект
+            bvh: Готовый BVH этого mesh (по умолчанию — закэшированный индекс mesh)
+        """
+        self.mesh = mesh
+        self._bvh = bvh
+        self._vertices, self._faces = mesh_arrays(mesh)
+        # STL хранит вершины каждой грани отдельно — топология строится по координатам
+        self._welded_vertices, self._welded = weld_vertices(self._vertices, self._faces)
+        _, self._areas = triangle_normals(self._vertices, self._faces)
+
+    @property
+    def bvh(self) -> BVH:
+        """BVH модели (общий индекс mesh, см. spatial_index)"""
+        if self._bvh is None:
+            self._bvh = spatial_index(self.mesh)
+        return self._bvh
+
+    def degenerate_faces(self) -> np.ndarray:
+        """
+        Вырожденные грани
+
+        Returns:
+            np.ndarray: Маска (M,): нулевая площадь или совпадающие вершины
+        """
+        f = self._welded
+        collapsed = (f[:, 0] == f[:, 1]) | (f[:, 1] == f[:, 2]) | (f[:, 0] == f[:, 2])
+        return collapsed | (self._areas < self.DEGENERATE_AREA)
+
+    def _orientation(self, kept: np.ndarray, index):
+        """
+        Перевернутые грани среди невырожденных
+
+        Returns:
+            tuple: (маска перевернутых граней (len(kept),), количество
+            неориентируемых компонент)
+        """
+        faces = self._welded[kept]
+        n = len(faces)
+        if n == 0:
+            return np.zeros(0, dtype=bool), 0
+
+        interior, pair = index.edge_faces()
+        f1, f2 = pair[:, 0], pair[:, 1]
+        side1 = np.argmax(index.face_edges[f1] == interior[:, None], axis=1)
+        side2 = np.argmax(index.face_edges[f2] == interior[:, None], axis=1)
+        # Согласованные соседи обходят общее ребро в противоположных направлениях
+        consistent = faces[f1, side1] != faces[f2, side2]
+
+        # Двойной граф: узел f — грань как есть, узел f + n — развернутая грань
+        links = np.concatenate(
+            [
+                np.column_stack([f1, np.where(consistent, f2, f2 + n)]),
+                np.column_stack([f1 + n, np.where(consistent, f2 + n, f2)]),
+            ]
+        )
+        _, labels = _components(2 * n, links)
+        same, flipped_node = labels[:n], labels[n:]
+        orientable = same != flipped_node
+        # Класс ориентации грани: входит ли "грань как есть" в меньшую из двух меток
+        low = np.minimum(same, flipped_node)
+        positive = same == low
+        _, component = np.unique(low, return_inverse=True)
+        component = component.reshape(-1)
+        n_components = int(component.max()) + 1
+        sign = np.where(positive, 1.0, -1.0)
+
+        # Замкнутая компонента — без граничных и non-manifold ребер
+        open_face = (index.counts[index.face_edges] != 2).any(axis=1)
+        is_open = np.bincount(component, weights=open_face, minlength=n_components) > 0
+
+        # Объем по формуле Гаусса (вершины смещены к центру для точности)
+        tri = self._welded_vertices[faces]
+        tri = tri - tri.reshape(-1, 3).mean(axis=0)
+        volume = np.einsum("ij,ij->i", tri[:, 0], np.cross(tri[:, 1], tri[:, 2])) / 6.0
+        signed_volume = np.bincount(component, weights=sign * volume, minlength=n_components)
+        signed_area = np.bincount(
+            component, weights=sign * self._areas[kept], minlength=n_components
+        )
+        # Верен класс positive, если он дает положительный объем (или большую площадь)
+        positive_ok = np.where(is_open, signed_area >= 0.0, signed_volume >= 0.0)
+
+        flipped = np.where(positive_ok[component], ~positive, positive) & orientable
+        non_orientable = len(np.unique(component[~orientable]))
+        return flipped, non_orientable
+
+    def self_intersections(
+        self,
+        exclude: Optional[np.ndarray] = None,
+        check: Callable[[], None] = None,
+        progress: Callable[[int], None] = None,
+    ) -> np.ndarray:
+        """
+        Грани, пересекающие другие грани модели
+
+        Args:
+            exclude: Маска граней, не участвующих в проверке (например, вырожденных)
+            check: Функция проверки отмены (например, TaskContext.check)
+            progress: Функция прогресса 0..100 (например, TaskContext.progress)
+
+        Returns:
+            np.ndarray: Маска (M,)
+        """
+        tri = self._vertices[self._faces]
+        n = len(tri)
+        result = np.zeros(n, dtype=bool)
+        if n < 2:
+            return result
+        lo, hi = tri.min(axis=1), tri.max(axis=1)
+        skip = exclude if exclude is not None else np.zeros(n, dtype=bool)
+        welded = self._welded
+
+        # Запросы к BVH боксами листьев, а не граней: запросов в LEAF_SIZE раз меньше
+        bvh = self.bvh
+        leaves = np.flatnonzero(bvh.node_left < 0)
+        for start in range(0, len(leaves), self.CHUNK_LEAVES):
+            if check is not None:
+                check()
+            chunk = leaves[start : start + self.CHUNK_LEAVES]
+            box, other = bvh.query_aabb(bvh.node_lo[chunk], bvh.node_hi[chunk])
+            # Пары (грань листа, найденная грань)
+            leaf = chunk[box]
+            counts = bvh.node_count[leaf]
+            rep = np.repeat(np.arange(len(leaf)), counts)
+            offsets = np.arange(len(rep)) - np.repeat(np.cumsum(counts) - counts, counts)
+            first = bvh.order[bvh.node_start[leaf][rep] + offsets]
+            other = other[rep]
+
+            # Каждая пара один раз; грани с общей вершиной касаются по построению
+            keep = (first < other) & ~skip[first] & ~skip[other]
+            first, other = first[keep], other[keep]
+            overlap = np.all(lo[first] <= hi[other], axis=1) & np.all(
+                hi[first] >= lo[other], axis=1
+            )
+            first, other = first[overlap], other[overlap]
+            shared = (welded[first][:, :, None] == welded[other][:, None, :]).any(axis=(1, 2))
+            first, other = first[~shared], other[~shared]
+            if len(first):
+                a, b = tri[first], tri[other]
+                hit = np.zeros(len(first), dtype=bool)
+                for k in range(3):
+                    hit |= _segments_cross(a[:, k], a[:, (k + 1) % 3], b, self.INTERSECTION_EPS)
+                    hit |= _segments_cross(b[:, k], b[:, (k + 1) % 3], a, self.INTERSECTION_EPS)
+                result[first[hit]] = True
+                result[other[hit]] = True
+            if progress is not None:
+                progress(int(100 * (start + len(chunk)) / len(leaves)))
+        return result
+
+    def analyze(
+        self, check: Callable[[], None] = None, progress: Callable[[int], None] = None
+    ) -> DefectResult:
+        """
+        Найти дефекты граней и ребер
+
+        Args:
+            check: Функция проверки отмены (например, TaskContext.check)
+            progress: Функция прогресса 0..100 поиска самопересечений
+
+        Returns:
+            DefectResult: Маски дефектных граней и дефектные ребра
+        """
+        degenerate = self.degenerate_faces()
+        # Стянутые грани не образуют ребер — топология строится без них
+        f = self._welded
+        kept = np.flatnonzero((f[:, 0] != f[:, 1]) & (f[:, 1] != f[:, 2]) & (f[:, 0] != f[:, 2]))
+        index = edge_index(f[kept], len(self._welded_vertices))
+
+        flipped = np.zeros(len(f), dtype=bool)
+        flipped[kept], non_orientable = self._orientation(kept, index)
+        if check is not None:
+            check()
+
+        intersecting = self.self_intersections(exclude=degenerate, check=check, progress=progress)
+
+        # Дефектные ребра: граничные, затем non-manifold; петли — по общим вершинам
+        boundary = index.edges[index.boundary]
+        non_manifold = index.edges[index.non_manifold]
+        loops = 0
+        if len(boundary):
+            nodes, local = np.unique(boundary, return_inverse=True)
+            loops, _ = _components(len(nodes), local.reshape(-1, 2))
+        defect_edges = np.vstack([boundary, non_manifold])
+        used, local = np.unique(defect_edges, return_inverse=True)
+        kinds = np.concatenate(
+            [
+                np.full(len(boundary), EDGE_DEFECTS["boundary"], dtype=np.uint8),
+                np.full(len(non_manifold), EDGE_DEFECTS["non_manifold"], dtype=np.uint8),
+            ]
+        )
+
+        result = DefectResult(
+            flipped=flipped,
+            degenerate=degenerate,
+            self_intersecting=intersecting,
+            points=self._welded_vertices[used],
+            edges=local.reshape(-1, 2).astype(np.int64),
+            edge_kinds=kinds,
+            boundary_loops=int(loops),
+            non_orientable=int(non_orientable),
+        )
+        summary = result.summary()
+        _log.info(
+            "Defects: %d flipped, %d degenerate, %d self-intersecting faces; "
+            "%d boundary edges in %d loops, %d non-manifold edges",
+            summary["flipped_faces"],
+            summary["degenerate_faces"],
+            summary["self_intersecting_faces"],
+            summary["boundary_edges"],
+            summary["boundary_loops"],
+            summary["non_manifold_edges"],
+        )
+        return result
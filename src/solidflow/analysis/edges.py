@@ -0,0 +1,265 @@
+"""
+Анализ острых кромок и углов
+
+Для каждого внутреннего ребра по индексу ребер (``edge_index``) вычисляется
+угол излома — угол между нормалями двух примыкающих граней: 0° — плоскость,
+180° — грани сложены "лезвием". Ребро вогнутое, если противолежащая вершина
+второй грани лежит над плоскостью первой. Расчет векторный по всем ребрам;
+несогласованная ориентация соседних граней учитывается.
+
+По углам излома определяются:
+
+* кромки — ребра с изломом больше ``sharp_angle``;
+* острые вершины — угловой дефект (360° минус сумма углов граней при вершине)
+  не меньше ``SHARP_VERTEX_DEFECT``; соседние острые вершины объединяются в
+  кластеры;
+* тонкие лезвия — выпуклые ребра с изломом не меньше ``BLADE_ANGLE``,
+  объединенные в области по общим вершинам.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from solidflow.core.config import Config
+from solidflow.geometry.mesh.arrays import mesh_arrays, triangle_normals, weld_vertices
+from solidflow.geometry.mesh.topology import edge_index
+
+_log = logging.getLogger("SolidFlow.EdgeAnalyzer")
+
+
+@dataclass
+class EdgeResult:
+    """
+    Результат анализа кромок
+
+    Attributes:
+        vertices: Вершины, объединенные по координатам (N, 3)
+        edges: Ребра (E, 2) — номера объединенных вершин
+        dihedral: Угол излома ребра (E,), градусы; NaN для граничных и
+            non-manifold ребер и ребер вырожденных граней
+        concave: Маска вогнутых ребер (E,); False, если ориентация
+            примыкающих граней несогласована
+        sharp_angle: Порог угла излома кромок, градусы
+        vertex_defect: Угловой дефект вершин (N,), градусы; NaN на границе
+        sharp_clusters: Номера вершин каждого кластера острых вершин
+        blade_edges: Маска ребер тонких лезвий (E,)
+        blade_regions: Количество областей тонких лезвий
+    """
+
+    vertices: np.ndarray
+    edges: np.ndarray
+    dihedral: np.ndarray
+    concave: np.ndarray
+    sharp_angle: float
+    vertex_defect: np.ndarray
+    sharp_clusters: List[np.ndarray] = field(default_factory=list)
+    blade_edges: np.ndarray = None
+    blade_regions: int = 0
+
+    @property
+    def feature_mask(self) -> np.ndarray:
+        """Маска кромок (излом больше порога)"""
+        with np.errstate(invalid="ignore"):
+            return self.dihedral > self.sharp_angle
+
+    @property
+    def edge_length(self) -> np.ndarray:
+        """Длины ребер (E,)"""
+        return np.linalg.norm(
+            self.vertices[self.edges[:, 1]] - self.vertices[self.edges[:, 0]], axis=1
+        )
+
+    @property
+    def sharp_points(self) -> np.ndarray:
+        """Центры кластеров острых вершин (K, 3)"""
+        if not self.sharp_clusters:
+            return np.zeros((0, 3))
+        return np.array([self.vertices[c].mean(axis=0) for c in self.sharp_clusters])
+
+    def summary(self) -> Dict[str, any]:
+        """
+        Сводка по кромкам
+
+        Returns:
+            dict: Количество и длина кромок (выпуклых и вогнутых), наибольший
+            излом, кластеры острых вершин, области и длина тонких лезвий
+        """
+        feature = self.feature_mask
+        length = self.edge_length
+        with np.errstate(invalid="ignore"):
+            max_dihedral = float(np.nanmax(self.dihedral)) if np.any(feature) else 0.0
+        return {
+            "sharp_angle": self.sharp_angle,
+            "feature_edges": int(feature.sum()),
+            "concave_edges": int((feature & self.concave).sum()),
+            "feature_length": float(length[feature].sum()),
+            "max_dihedral": max_dihedral,
+            "sharp_vertices": int(sum(len(c) for c in self.sharp_clusters)),
+            "sharp_clusters": len(self.sharp_clusters),
+            "blade_regions": self.blade_regions,
+            "blade_length": float(length[self.blade_edges].sum()),
+        }
+
+
+def _components(nodes: np.ndarray, links: np.ndarray):
+    """
+    Компоненты связности подмножества вершин
+
+    Args:
+        nodes: Номера вершин (K,), по возрастанию
+        links: Ребра между ними (L, 2)
+
+    Returns:
+        tuple: (количество компонент, метка компоненты каждой вершины из nodes (K,))
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    local = np.searchsorted(nodes, links)
+    graph = coo_matrix(
+        (np.ones(len(local)), (local[:, 0], local[:, 1])), shape=(len(nodes), len(nodes))
+    )
+    return connected_components(graph, directed=False)
+
+
+class EdgeAnalyzer:
+    """Углы излома ребер, острые кромки, вершины и тонкие лезвия"""
+
+    # Излом выпуклого ребра тонкого лезвия, градусы
+    BLADE_ANGLE = 150.0
+
+    # Угловой дефект острой вершины, градусы (у вершины куба — 90°)
+    SHARP_VERTEX_DEFECT = 120.0
+
+    def __init__(self, mesh, sharp_angle: Optional[float] = None):
+        """
+        Инициализация: объединение вершин и индекс ребер
+
+        Args:
+            mesh: PyVista или trimesh mesh объект
+            sharp_angle: Порог угла излома кромки в градусах
+                (по умолчанию Config.SHARP_EDGE_ANGLE)
+        """
+        self.mesh = mesh
+        self.sharp_angle = float(
+            sharp_angle if sharp_angle is not None else Config.SHARP_EDGE_ANGLE
+        )
+        if not 0.0 <= self.sharp_angle <= 180.0:
+            raise ValueError("Порог угла излома должен быть в диапазоне 0..180 градусов")
+
+        vertices, faces = mesh_arrays(mesh)
+        # STL хранит вершины каждой грани отдельно — ребра ищутся по координатам
+        self._vertices, self._faces = weld_vertices(vertices, faces)
+        self._normals, self._areas = triangle_normals(self._vertices, self._faces)
+        self._index = edge_index(self._faces, len(self._vertices))
+
+    def dihedral_angles(self):
+        """
+        Углы излома всех ребер
+
+        Returns:
+            tuple: (углы излома (E,), градусы, NaN вне внутренних ребер;
+            маска вогнутых ребер (E,))
+        """
+        index, faces = self._index, self._faces
+        interior, pair = index.edge_faces()
+        f1, f2 = pair[:, 0], pair[:, 1]
+
+        # Сторона грани, на которой лежит ребро, и направление обхода ребра
+        side1 = np.argmax(index.face_edges[f1] == interior[:, None], axis=1)
+        side2 = np.argmax(index.face_edges[f2] == interior[:, None], axis=1)
+        consistent = faces[f1, side1] != faces[f2, side2]
+        n1 = self._normals[f1]
+        n2 = self._normals[f2] * np.where(consistent, 1.0, -1.0)[:, None]
+
+        cosines = np.clip(np.einsum("ij,ij->i", n1, n2), -1.0, 1.0)
+        angle = np.degrees(np.arccos(cosines))
+        angle[(self._areas[f1] == 0) | (self._areas[f2] == 0)] = np.nan
+
+        # Вогнутое ребро: противолежащая вершина второй грани над плоскостью первой.
+        # При несогласованной ориентации граней сторона "снаружи" не определена
+        start = self._vertices[index.edges[interior, 0]]
+        opposite = self._vertices[faces[f2, (side2 + 2) % 3]]
+        height = np.einsum("ij,ij->i", opposite - start, n1)
+        scale = np.linalg.norm(opposite - start, axis=1)
+        concave_interior = consistent & (height > 1e-9 * np.maximum(scale, 1.0))
+
+        dihedral = np.full(len(index.edges), np.nan)
+        dihedral[interior] = angle
+        concave = np.zeros(len(index.edges), dtype=bool)
+        concave[interior] = concave_interior
+        return dihedral, concave
+
+    def vertex_defects(self) -> np.ndarray:
+        """
+        Угловой дефект вершин
+
+        Returns:
+            np.ndarray: 360° минус сумма углов граней при вершине (N,), градусы;
+            NaN для вершин на границе и у non-manifold ребер
+        """
+        tri = self._vertices[self._faces]
+        # Угол при вершине i между сторонами к вершинам i + 1 и i + 2
+        u = np.roll(tri, -1, axis=1) - tri
+        v = np.roll(tri, -2, axis=1) - tri
+        cross = np.linalg.norm(np.cross(u, v), axis=2)
+        corner = np.arctan2(cross, np.einsum("ijk,ijk->ij", u, v))
+
+        total = np.bincount(
+            self._faces.ravel(), weights=corner.ravel(), minlength=len(self._vertices)
+        )
+        defect = 360.0 - np.degrees(total)
+        open_edges = self._index.edges[self._index.counts != 2]
+        defect[open_edges.ravel()] = np.nan
+        # Вершины, не входящие в грани
+        defect[np.bincount(self._faces.ravel(), minlength=len(self._vertices)) == 0] = np.nan
+        return defect
+
+    def analyze(self) -> EdgeResult:
+        """
+        Найти кромки, острые вершины и тонкие лезвия
+
+        Returns:
+            EdgeResult: Углы излома ребер, кластеры острых вершин, области лезвий
+        """
+        edges = self._index.edges
+        dihedral, concave = self.dihedral_angles()
+        defect = self.vertex_defects()
+
+        # Кластеры острых вершин: компоненты по ребрам между острыми вершинами
+        with np.errstate(invalid="ignore"):
+            sharp = defect >= self.SHARP_VERTEX_DEFECT
+        sharp_ids = np.flatnonzero(sharp)
+        count, labels = _components(sharp_ids, edges[sharp[edges[:, 0]] & sharp[edges[:, 1]]])
+        order = np.argsort(labels, kind="stable")
+        bounds = np.searchsorted(labels[order], np.arange(count + 1))
+        clusters = [sharp_ids[order[bounds[k] : bounds[k + 1]]] for k in range(count)]
+
+        # Тонкие лезвия: почти сложенные выпуклые ребра, области — по общим вершинам
+        with np.errstate(invalid="ignore"):
+            blade = (dihedral >= self.BLADE_ANGLE) & ~concave
+        blade_regions, _ = _components(np.unique(edges[blade]), edges[blade])
+
+        result = EdgeResult(
+            vertices=self._vertices,
+            edges=edges,
+            dihedral=dihedral,
+            concave=concave,
+            sharp_angle=self.sharp_angle,
+            vertex_defect=defect,
+            sharp_clusters=clusters,
+            blade_edges=blade,
+            blade_regions=blade_regions,
+        )
+        summary = result.summary()
+        _log.info(
+            "Edges: %d feature edges (%d concave), %d sharp clusters, %d blade regions",
+            summary["feature_edges"],
+            summary["concave_edges"],
+            summary["sharp_clusters"],
+            summary["blade_regions"],
+        )
+        return result
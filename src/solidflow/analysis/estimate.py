@@ -0,0 +1,308 @@
+"""
+Оценка времени печати и расхода материала
+
+Модель один раз режется на тонкие слои (``Slicer``); оценка для конкретного
+профиля печати использует только площади, периметры и число контуров слоев,
+пересчитанные на толщину слоя профиля интерполяцией. Поэтому пересчет при
+изменении любого параметра, включая толщину слоя, занимает миллисекунды.
+
+FDM: стенки (периметр x число стенок), сплошные слои у верхних и нижних
+поверхностей (по разности площадей соседних слоев), заполнение, время
+перемещений с ограничением ускорения (трапецеидальный профиль скорости).
+Фотополимер: засветка и подъем платформы на каждый слой, объем — площади на
+толщину слоя.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from solidflow.geometry.slicing.slicer import SliceResult, Slicer
+
+_log = logging.getLogger("SolidFlow.PrintEstimator")
+
+
+@dataclass
+class FDMProfile:
+    """
+    Профиль FDM-печати
+
+    Длины — мм, скорости — мм/с, ускорение — мм/с², плотность — г/см³.
+    """
+
+    layer_height: float = 0.2
+    line_width: float = 0.45
+    wall_count: int = 2
+    top_bottom_layers: int = 4
+    infill_density: float = 0.2
+    wall_speed: float = 40.0
+    infill_speed: float = 60.0
+    travel_speed: float = 150.0
+    acceleration: float = 1500.0
+    min_layer_time: float = 5.0
+    filament_diameter: float = 1.75
+    filament_density: float = 1.24
+
+
+@dataclass
+class ResinProfile:
+    """
+    Профиль фотополимерной печати (маскированная засветка всего слоя)
+
+    Время — с, длины — мм, скорости — мм/с, плотность — г/см³.
+    """
+
+    layer_height: float = 0.05
+    exposure_time: float = 2.5
+    bottom_exposure_time: float = 30.0
+    bottom_layers: int = 5
+    lift_distance: float = 5.0
+    lift_speed: float = 1.0
+    retract_speed: float = 3.0
+    resin_density: float = 1.1
+
+
+@dataclass
+class PrintEstimate:
+    """
+    Оценка печати
+
+    Attributes:
+        technology: "fdm" или "resin"
+        layer_time: Время печати каждого слоя, с (L,)
+        volume: Объем материала, мм³
+        mass: Масса материала, г
+        filament_length: Длина нити, мм (для фотополимера 0)
+    """
+
+    technology: str
+    layer_time: np.ndarray
+    volume: float
+    mass: float
+    filament_length: float = 0.0
+
+    @property
+    def layers(self) -> int:
+        """Количество слоев"""
+        return len(self.layer_time)
+
+    @property
+    def time(self) -> float:
+        """Полное время печати, с"""
+        return float(self.layer_time.sum())
+
+    def summary(self) -> Dict[str, any]:
+        """
+        Сводка по оценке
+
+        Returns:
+            dict: Технология, слои, время (с), объем (мм³), масса (г), длина нити (м)
+        """
+        return {
+            "technology": self.technology,
+            "layers": self.layers,
+            "time": self.time,
+            "volume": self.volume,
+            "mass": self.mass,
+            "filament_length_m": self.filament_length / 1000.0,
+        }
+
+
+def move_time(total_length, count, speed: float, acceleration: float):
+    """
+    Время count одинаковых перемещений общей длиной total_length
+
+    Каждое перемещение разгоняется с ускорением acceleration до speed и
+    тормозит до нуля; короткие перемещения не успевают разогнаться.
+
+    Args:
+        total_length: Суммарная длина (скаляр или массив)
+        count: Количество перемещений (скаляр или массив)
+        speed: Максимальная скорость
+        acceleration: Ускорение
+
+    Returns:
+        Время, с (той же формы, что total_length)
+    """
+    total_length = np.asarray(total_length, dtype=np.float64)
+    count = np.maximum(np.asarray(count, dtype=np.float64), 1.0)
+    length = total_length / count
+    if acceleration <= 0:
+        return total_length / speed
+    cruise = length >= speed * speed / acceleration
+    single = np.where(
+        cruise, length / speed + speed / acceleration, 2.0 * np.sqrt(length / acceleration)
+    )
+    return np.where(total_length > 0, count * single, 0.0)
+
+
+def _window_max(values: np.ndarray, before: int, after: int) -> np.ndarray:
+    """Максимум values в окне [i - before, i + after] для каждого i"""
+    if before == 0 and after == 0:
+        return values
+    padded = np.concatenate([np.zeros(before), values, np.zeros(after)])
+    windows = np.lib.stride_tricks.sliding_window_view(padded, before + after + 1)
+    return windows.max(axis=1)
+
+
+class PrintEstimator:
+    """Оценка времени печати и расхода материала по площадям и периметрам слоев"""
+
+    # Предел числа тонких слоев, по которым строится оценка, и их минимальная толщина
+    SAMPLE_LAYERS = 2000
+    MIN_RESOLUTION = 0.01
+
+    def __init__(self, slices: SliceResult, bounds: Optional[Tuple[float, float]] = None):
+        """
+        Инициализация
+
+        Args:
+            slices: Сечения модели вдоль направления построения (тонкие слои)
+            bounds: Нижняя и верхняя высоты модели (по умолчанию — по высотам
+                сечений как серединам равных слоев)
+        """
+        if slices.n_layers == 0:
+            raise ValueError("Нет сечений для оценки печати")
+
+        self.heights = slices.heights
+        self.area = np.maximum(slices.area, 0.0)
+        self.perimeter = slices.perimeter
+        self.loops = np.bincount(slices.loop_layer, minlength=slices.n_layers).astype(np.float64)
+
+        if bounds is None:
+            step = np.diff(self.heights).mean() if slices.n_layers > 1 else 0.0
+            bounds = (self.heights[0] - 0.5 * step, self.heights[-1] + 0.5 * step)
+        self.bounds = (float(bounds[0]), float(bounds[1]))
+
+    @classmethod
+    def from_mesh(
+        cls,
+        mesh,
+        resolution: Optional[float] = None,
+        check: Callable[[], None] = None,
+        progress: Callable[[int], None] = None,
+    ) -> "PrintEstimator":
+        """
+        Построить оценщик для модели в текущей ориентации (печать вдоль +Z)
+
+        Args:
+            mesh: PyVista или trimesh mesh объект
+            resolution: Толщина тонких слоев (по умолчанию — не больше SAMPLE_LAYERS слоев)
+            check: Функция проверки отмены (например, TaskContext.check)
+            progress: Функция прогресса 0..100 (например, TaskContext.progress)
+
+        Returns:
+            PrintEstimator: Оценщик
+        """
+        slicer = Slicer(mesh)
+        low, high = slicer.intervals.bounds
+        if high <= low:
+            raise ValueError("Модель не имеет высоты")
+        if resolution is None:
+            resolution = max((high - low) / cls.SAMPLE_LAYERS, cls.MIN_RESOLUTION)
+        slices = slicer.slice(layer_height=resolution, check=check, progress=progress)
+        return cls(slices, bounds=(low, high))
+
+    def layers(self, layer_height: float):
+        """
+        Площадь, периметр и число контуров слоев заданной толщины
+
+        Args:
+            layer_height: Толщина слоя
+
+        Returns:
+            tuple: (площади (L,), периметры (L,), числа контуров (L,))
+        """
+        if layer_height <= 0:
+            raise ValueError("Толщина слоя должна быть положительной")
+        low, high = self.bounds
+        count = max(1, int(np.ceil((high - low) / layer_height - 1e-9)))
+        mids = np.minimum(low + layer_height * (np.arange(count) + 0.5), high)
+        area = np.interp(mids, self.heights, self.area)
+        perimeter = np.interp(mids, self.heights, self.perimeter)
+        loops = np.rint(np.interp(mids, self.heights, self.loops))
+        return area, perimeter, loops
+
+    def estimate(self, profile: Union[FDMProfile, ResinProfile]) -> PrintEstimate:
+        """
+        Оценить время печати и расход материала
+
+        Args:
+            profile: Профиль печати (FDMProfile или ResinProfile)
+
+        Returns:
+            PrintEstimate: Время по слоям, объем и масса материала
+        """
+        if isinstance(profile, ResinProfile):
+            return self._estimate_resin(profile)
+        if isinstance(profile, FDMProfile):
+            return self._estimate_fdm(profile)
+        raise TypeError(f"Неизвестный профиль печати: {type(profile).__name__}")
+
+    def _estimate_fdm(self, p: FDMProfile) -> PrintEstimate:
+        if p.line_width <= 0 or not 0.0 <= p.infill_density <= 1.0:
+            raise ValueError("Некорректные параметры профиля печати")
+        area, perimeter, loops = self.layers(p.layer_height)
+        w = p.line_width
+
+        # Стенки; у узких областей стенки занимают всю площадь
+        wall_area = np.minimum(area, perimeter * p.wall_count * w)
+        wall_length = wall_area / w
+        interior = area - wall_area
+
+        # Сплошные слои: открытая снизу или сверху часть слоя и top_bottom_layers
+        # слоев над ней (под ней)
+        n = max(int(p.top_bottom_layers), 0)
+        below = np.concatenate([[0.0], area[:-1]])
+        above = np.concatenate([area[1:], [0.0]])
+        solid = np.zeros_like(area)
+        if n:
+            bottom_skin = _window_max(np.maximum(area - below, 0.0), n - 1, 0)
+            top_skin = _window_max(np.maximum(area - above, 0.0), 0, n - 1)
+            solid = np.minimum(interior, bottom_skin + top_skin)
+        sparse = interior - solid
+
+        solid_length = solid / w
+        infill_length = sparse * p.infill_density / w
+        fill_length = solid_length + infill_length
+
+        # Перемещения: контур стенки — одно перемещение, линии заполнения —
+        # длиной порядка поперечника области; холостые — к каждому контуру
+        loops = np.maximum(loops, (area > 0).astype(np.float64))
+        width = np.sqrt(np.maximum(interior / np.maximum(loops, 1.0), w * w))
+        wall_moves = loops * p.wall_count
+        fill_moves = np.ceil(fill_length / width)
+        travel_length = loops * (p.wall_count + 1) * np.sqrt(area / np.maximum(loops, 1.0))
+
+        layer_time = (
+            move_time(wall_length, wall_moves, p.wall_speed, p.acceleration)
+            + move_time(fill_length, fill_moves, p.infill_speed, p.acceleration)
+            + move_time(travel_length, loops * (p.wall_count + 1), p.travel_speed, p.acceleration)
+        )
+        layer_time = np.maximum(layer_time, p.min_layer_time * (area > 0))
+
+        volume = float((wall_length + fill_length).sum() * w * p.layer_height)
+        filament_area = np.pi * (0.5 * p.filament_diameter) ** 2
+        return PrintEstimate(
+            technology="fdm",
+            layer_time=layer_time,
+            volume=volume,
+            mass=volume * 1e-3 * p.filament_density,
+            filament_length=volume / filament_area,
+        )
+
+    def _estimate_resin(self, p: ResinProfile) -> PrintEstimate:
+        area, _, _ = self.layers(p.layer_height)
+        exposure = np.full(len(area), float(p.exposure_time))
+        exposure[: max(int(p.bottom_layers), 0)] = p.bottom_exposure_time
+        lift = p.lift_distance / p.lift_speed + p.lift_distance / p.retract_speed
+
+        volume = float(area.sum() * p.layer_height)
+        return PrintEstimate(
+            technology="resin",
+            layer_time=exposure + lift,
+            volume=volume,
+            mass=volume * 1e-3 * p.resin_density,
+        )
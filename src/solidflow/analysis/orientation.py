@@ -0,0 +1,579 @@
+"""
+Автоматический подбор ориентации для 3D-печати
+
+Кандидаты — направления построения (направление "вверх" в координатах модели),
+равномерно распределенные по сфере (спираль Фибоначчи), плюс направления,
+кладущие крупные плоские участки на стол. Лучшие кандидаты уточняются
+локальным поиском в сужающихся окрестностях.
+
+Оценка выполняется пакетно для тысяч направлений сразу:
+
+* грани группируются по нормалям (октаэдрическая сетка): для группы хранятся
+  площадь, средняя нормаль и момент площади — площадь поддержек и объем под
+  нависаниями считаются произведением (группы x направления), а не (грани x
+  направления);
+* высота построения и площадь проекции (footprint) считаются по выпуклой
+  оболочке; площадь проекции выпуклого тела — формула Коши:
+  S(d) = 1/2 * sum(A_i * |n_i · d|) по граням оболочки;
+* грани, лежащие на столе, определяются по плоским участкам модели.
+
+Пакеты направлений распределяются по потокам (NumPy освобождает GIL).
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, fields
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from solidflow.analysis.overhang import OverhangAnalyzer, normalize_directions
+from solidflow.geometry.mesh.arrays import arrays_to_polydata, mesh_arrays
+
+_log = logging.getLogger("SolidFlow.OrientationOptimizer")
+
+# Метрики кандидата (все минимизируются)
+METRICS = ("support_area", "build_height", "footprint", "overhang_volume")
+
+
+def fibonacci_sphere(n: int) -> np.ndarray:
+    """
+    Равномерные направления на единичной сфере (спираль Фибоначчи)
+
+    Args:
+        n: Количество направлений
+
+    Returns:
+        np.ndarray: Единичные векторы (n, 3)
+    """
+    i = np.arange(n) + 0.5
+    z = 1.0 - 2.0 * i / n
+    r = np.sqrt(np.maximum(0.0, 1.0 - z * z))
+    phi = i * np.pi * (3.0 - np.sqrt(5.0))
+    return np.column_stack([r * np.cos(phi), r * np.sin(phi), z])
+
+
+def rotation_to_z(direction) -> np.ndarray:
+    """
+    Матрица поворота, переводящая направление построения в ось +Z
+
+    Args:
+        direction: Направление (3,)
+
+    Returns:
+        np.ndarray: Матрица 3x3
+    """
+    d = normalize_directions(direction)[0]
+    z = np.array([0.0, 0.0, 1.0])
+    axis = np.cross(d, z)
+    s = np.linalg.norm(axis)
+    c = float(d @ z)
+    if s < 1e-12:
+        # Уже вдоль оси: тождество или поворот на 180° вокруг X
+        return np.eye(3) if c > 0 else np.diag([1.0, -1.0, -1.0])
+    k = axis / s
+    cross = np.array([[0.0, -k[2], k[1]], [k[2], 0.0, -k[0]], [-k[1], k[0], 0.0]])
+    return np.eye(3) + s * cross + (1.0 - c) * (cross @ cross)
+
+
+def orient_mesh(mesh, direction):
+    """
+    Повернуть mesh так, чтобы направление построения стало осью +Z,
+    и поставить на стол (минимум Z = 0)
+
+    Args:
+        mesh: PyVista или trimesh mesh объект
+        direction: Направление построения (3,)
+
+    Returns:
+        pv.PolyData: Повернутый mesh
+    """
+    vertices, faces = mesh_arrays(mesh)
+    rotated = vertices @ rotation_to_z(direction).T
+    if len(rotated):
+        rotated[:, 2] -= rotated[:, 2].min()
+    return arrays_to_polydata(rotated, faces)
+
+
+@dataclass
+class OrientationWeights:
+    """
+    Веса метрик в оценке ориентации
+
+    Метрики приводятся к безразмерному виду: площади — к площади поверхности
+    модели, высота — к диагонали габаритов, объем — к площади на диагональ.
+    """
+
+    support_area: float = 1.0
+    build_height: float = 0.5
+    footprint: float = 0.25
+    overhang_volume: float = 1.0
+
+
+@dataclass
+class OrientationResult:
+    """
+    Результат подбора ориентации
+
+    Attributes:
+        directions: Оцененные направления построения (N, 3)
+        metrics: Метрика -> значения (N,)
+        scores: Взвешенная оценка (N,), меньше — лучше
+        pareto: Номера направлений фронта Парето по метрикам, по возрастанию оценки
+    """
+
+    directions: np.ndarray
+    metrics: Dict[str, np.ndarray]
+    scores: np.ndarray
+    pareto: np.ndarray
+
+    @property
+    def best_index(self) -> int:
+        """Номер направления с лучшей оценкой"""
+        return int(np.argmin(self.scores))
+
+    @property
+    def best_direction(self) -> np.ndarray:
+        """Лучшее направление построения"""
+        return self.directions[self.best_index]
+
+    def candidate(self, index: int) -> Dict[str, any]:
+        """
+        Описание кандидата
+
+        Returns:
+            dict: Направление, оценка и метрики
+        """
+        info = {"direction": self.directions[index].tolist(), "score": float(self.scores[index])}
+        info.update({name: float(values[index]) for name, values in self.metrics.items()})
+        return info
+
+    def front(self) -> List[Dict[str, any]]:
+        """Кандидаты фронта Парето"""
+        return [self.candidate(i) for i in self.pareto]
+
+
+def pareto_front(values: np.ndarray, chunk: int = 256) -> np.ndarray:
+    """
+    Недоминируемые строки (все столбцы минимизируются)
+
+    Строки просматриваются по возрастанию суммы: доминирующая строка всегда
+    имеет меньшую сумму, поэтому каждую строку достаточно сравнить с уже
+    найденным фронтом и со своим пакетом.
+
+    Args:
+        values: Метрики (N, K)
+        chunk: Строк в одном пакете сравнения
+
+    Returns:
+        np.ndarray: Номера недоминируемых строк
+    """
+    order = np.argsort(values.sum(axis=1), kind="stable")
+    front = np.zeros(0, dtype=np.int64)
+    for start in range(0, len(order), chunk):
+        idx = order[start : start + chunk]
+        others = np.concatenate([front, idx])
+        a, b = values[others][:, None, :], values[idx][None, :, :]
+        # Строка j доминирует i: не хуже по всем метрикам и лучше хотя бы по одной
+        dominated = np.any(np.all(a <= b, axis=2) & np.any(a < b, axis=2), axis=0)
+        front = np.concatenate([front, idx[~dominated]])
+    return np.sort(front)
+
+
+class OrientationOptimizer:
+    """Подбор ориентации по площади поддержек, высоте, площади на столе и объему нависаний"""
+
+    # Разрешение октаэдрической сетки группировки нормалей
+    NORMAL_BINS = 64
+
+    # Плоские участки: разрешение сетки нормалей и число крупнейших участков
+    PATCH_BINS = 4096
+    MAX_PATCHES = 256
+
+    # Отклонение нормали плоского участка от -d, при котором он лежит на столе
+    PLATE_ANGLE = 0.5
+
+    # Предел вершин оболочки, по которым считается высота построения
+    MAX_HULL_POINTS = 2048
+
+    # Вершин модели, начиная с которых оболочка строится по прореженным
+    # вершинам, и ячеек сетки прореживания по наибольшему размеру
+    HULL_INPUT_POINTS = 50_000
+    HULL_GRID = 128
+
+    # Направлений в одном пакете оценки
+    BATCH_DIRECTIONS = 256
+
+    def __init__(
+        self,
+        mesh,
+        critical_angle: Optional[float] = None,
+        weights: Optional[OrientationWeights] = None,
+        max_workers: Optional[int] = None,
+    ):
+        """
+        Инициализация
+
+        Args:
+            mesh: PyVista или trimesh mesh объект
+            critical_angle: Критический угол нависания (по умолчанию Config.OVERHANG_ANGLE)
+            weights: Веса метрик
+            max_workers: Количество потоков оценки (по умолчанию — число ядер)
+        """
+        self.mesh = mesh
+        self.weights = weights or OrientationWeights()
+        self.max_workers = max_workers
+
+        overhang = OverhangAnalyzer(mesh, critical_angle)
+        self.critical_angle = overhang.critical_angle
+        self.threshold = overhang.threshold
+        self.plate_tolerance = overhang.PLATE_TOLERANCE
+
+        # Массивы граней уже вычислены анализатором нависаний
+        vertices, faces = overhang._vertices, overhang._faces
+        if len(faces) == 0:
+            raise ValueError("Mesh не содержит граней")
+        normals, areas = overhang._normals, overhang._areas
+        centroids = overhang._centroids
+
+        self.total_area = float(areas.sum())
+        extent = vertices.max(axis=0) - vertices.min(axis=0)
+        self.diagonal = float(max(np.linalg.norm(extent), 1e-12))
+
+        self._group_normals(normals, areas, centroids)
+        self._find_patches(normals, areas, centroids)
+        self._build_hull(vertices)
+
+    # ------------------------------------------------------------------
+    # Подготовка
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _octahedral_cells(normals: np.ndarray, resolution: int) -> np.ndarray:
+        """Номер ячейки октаэдрической сетки для каждой нормали"""
+        p = normals / np.maximum(np.abs(normals).sum(axis=1, keepdims=True), 1e-300)
+        u, v = p[:, 0].copy(), p[:, 1].copy()
+        lower = p[:, 2] < 0
+        u[lower] = (1.0 - np.abs(p[lower, 1])) * np.where(p[lower, 0] >= 0, 1.0, -1.0)
+        v[lower] = (1.0 - np.abs(p[lower, 0])) * np.where(p[lower, 1] >= 0, 1.0, -1.0)
+        iu = np.clip(((u + 1.0) * 0.5 * resolution).astype(np.int64), 0, resolution - 1)
+        iv = np.clip(((v + 1.0) * 0.5 * resolution).astype(np.int64), 0, resolution - 1)
+        return iu * resolution + iv
+
+    @staticmethod
+    def _bin_sums(inverse: np.ndarray, n: int, weights: np.ndarray, values: np.ndarray):
+        """Суммы weights * values (K, 3) по группам"""
+        return np.column_stack(
+            [np.bincount(inverse, weights=weights * values[:, k], minlength=n) for k in range(3)]
+        )
+
+    def _group_normals(self, normals, areas, centroids):
+        """Группы граней с близкими нормалями: площадь, средняя нормаль, момент площади"""
+        _, inverse = np.unique(
+            self._octahedral_cells(normals, self.NORMAL_BINS), return_inverse=True
+        )
+        n = int(inverse.max()) + 1
+        area = np.bincount(inverse, weights=areas, minlength=n)
+        normal = self._bin_sums(inverse, n, areas, normals)
+        moment = self._bin_sums(inverse, n, areas, centroids)
+        length = np.linalg.norm(normal, axis=1, keepdims=True)
+        keep = (area > 0) & (length[:, 0] > 0)
+        self._bin_area = area[keep]
+        self._bin_normal = normal[keep] / length[keep]
+        self._bin_moment = moment[keep]
+
+    def _find_patches(self, normals, areas, centroids):
+        """Крупнейшие плоские участки (одна нормаль и одна плоскость)"""
+        cells = self._octahedral_cells(normals, self.PATCH_BINS)
+        offset = np.round(np.einsum("ij,ij->i", normals, centroids) / self.plate_tolerance)
+        offset = offset.astype(np.int64)
+        keys = cells * np.int64(1 << 36) + (offset - offset.min())
+        _, inverse = np.unique(keys, return_inverse=True)
+        n = int(inverse.max()) + 1
+        area = np.bincount(inverse, weights=areas, minlength=n)
+        top = np.argsort(area)[::-1][: self.MAX_PATCHES]
+        top = top[area[top] > 0]
+
+        normal = self._bin_sums(inverse, n, areas, normals)[top]
+        self._patch_area = area[top]
+        self._patch_normal = normal / np.maximum(
+            np.linalg.norm(normal, axis=1, keepdims=True), 1e-300
+        )
+        self._patch_point = self._bin_sums(inverse, n, areas, centroids)[top] / area[top, None]
+
+    def _build_hull(self, vertices):
+        """
+        Выпуклая оболочка для высоты построения и площади проекции
+
+        Грани оболочки группируются по нормалям так же, как грани модели, число
+        вершин ограничено MAX_HULL_POINTS: стоимость оценки не зависит от размера
+        оболочки.
+
+        У гладких моделей почти все вершины лежат на оболочке, и qhull по всем
+        вершинам занимал секунды (эллипсоид в 500 тыс. граней — 2.3 с). Поэтому
+        у больших моделей оболочка строится по прореженным вершинам
+        (_hull_candidates): высота и площадь проекции отличаются от точных
+        не больше чем на 0.1% (эллипсоид и тор в 500 тыс. граней, 2000
+        направлений), подготовка на одном ядре — ~0.9 с вместо 3-5 с.
+        Опорность плоских участков проверяется по всем вершинам.
+        """
+        from scipy.spatial import ConvexHull
+
+        reduced = len(vertices) > self.HULL_INPUT_POINTS
+        if reduced:
+            points = self._hull_candidates(vertices)
+        else:
+            points = np.unique(vertices, axis=0)
+        try:
+            hull = ConvexHull(points)
+        except Exception as e:
+            # Плоская или вырожденная модель: высота — по всем вершинам,
+            # проекция — по граням модели (для плоской модели точна)
+            _log.warning("Convex hull failed (%s), using mesh faces for footprint", e)
+            self._hull_points = points
+            self._hull_normals = self._bin_normal
+            self._hull_areas = 2.0 * self._bin_area
+            self._patch_supporting = np.ones(len(self._patch_area), dtype=bool)
+            return
+
+        tri = points[hull.simplices]
+        facet_normals = hull.equations[:, :3]
+        facet_areas = 0.5 * np.linalg.norm(
+            np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0]), axis=1
+        )
+        _, inverse = np.unique(
+            self._octahedral_cells(facet_normals, self.NORMAL_BINS), return_inverse=True
+        )
+        n = int(inverse.max()) + 1
+        normal = self._bin_sums(inverse, n, facet_areas, facet_normals)
+        length = np.linalg.norm(normal, axis=1, keepdims=True)
+        group_normals = normal / np.maximum(length, 1e-300)
+        keep = length[:, 0] > 0
+        self._hull_normals = group_normals[keep]
+        self._hull_areas = np.bincount(inverse, weights=facet_areas, minlength=n)[keep]
+
+        # Высота построения — по вершинам оболочки; у гладких моделей их почти
+        # столько же, сколько вершин модели, тогда остаются крайние вершины
+        # по равномерной выборке направлений
+        extreme = points[hull.vertices]
+        self._hull_points = extreme
+        if len(extreme) > self.MAX_HULL_POINTS:
+            probes = fibonacci_sphere(self.MAX_HULL_POINTS)
+            best = np.full(len(probes), -np.inf)
+            index = np.zeros(len(probes), dtype=np.int64)
+            rows = np.arange(len(probes))
+            for start in range(0, len(extreme), 8192):
+                block = probes @ extreme[start : start + 8192].T
+                arg = block.argmax(axis=1)
+                value = block[rows, arg]
+                better = value > best
+                best[better] = value[better]
+                index[better] = arg[better] + start
+            self._hull_points = extreme[np.unique(index)]
+
+        # Плоский участок может лечь на стол, только если его плоскость опорная:
+        # ни одна вершина оболочки не выходит за нее (у прореженной оболочки —
+        # ни одна вершина модели)
+        offsets = (
+            np.einsum("ij,ij->i", self._patch_normal, self._patch_point) + self.plate_tolerance
+        )
+        self._patch_supporting = self._reach(self._patch_normal, extreme) <= offsets
+        if reduced:
+            # Прореженная оболочка лежит внутри точной: неопорный по ней участок
+            # неопорный и по модели, остальные проверяются по всем вершинам
+            check = np.flatnonzero(self._patch_supporting)
+            reach = self._reach(self._patch_normal[check], vertices)
+            self._patch_supporting[check] = reach <= offsets[check]
+
+    @staticmethod
+    def _reach(normals: np.ndarray, points: np.ndarray) -> np.ndarray:
+        """Наибольшая проекция точек на каждую нормаль (пакетами точек)"""
+        reach = np.full(len(normals), -np.inf)
+        for start in range(0, len(points), 16384):
+            block = normals @ points[start : start + 16384].T
+            reach = np.maximum(reach, block.max(axis=1, initial=-np.inf))
+        return reach
+
+    def _hull_candidates(self, vertices: np.ndarray) -> np.ndarray:
+        """
+        Прореженные вершины для выпуклой оболочки
+
+        Из каждой ячейки сетки HULL_GRID берется вершина, самая далекая от
+        центра габаритов: вершина оболочки отстоит от оставленной вершины своей
+        ячейки не дальше размера ячейки. Крайние вершины по осям добавляются
+        точно — высота в осевых ориентациях не искажается.
+        """
+        low = vertices.min(axis=0)
+        high = vertices.max(axis=0)
+        cell = max(float((high - low).max()), 1e-12) / self.HULL_GRID
+        ijk = np.minimum(((vertices - low) / cell).astype(np.int64), self.HULL_GRID)
+        size = np.int64(self.HULL_GRID + 1)
+        keys = (ijk[:, 0] * size + ijk[:, 1]) * size + ijk[:, 2]
+        offset = vertices - 0.5 * (low + high)
+        distance = np.einsum("ij,ij->i", offset, offset)
+        order = np.lexsort((-distance, keys))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = keys[order[1:]] != keys[order[:-1]]
+        axes = np.concatenate([vertices.argmin(axis=0), vertices.argmax(axis=0)])
+        return np.unique(vertices[np.concatenate([order[first], axes])], axis=0)
+
+    # ------------------------------------------------------------------
+    # Оценка
+    # ------------------------------------------------------------------
+
+    def evaluate(self, directions) -> Dict[str, np.ndarray]:
+        """
+        Вычислить метрики для множества направлений построения
+
+        Args:
+            directions: Направления (D, 3)
+
+        Returns:
+            dict: Метрика -> значения (D,): площадь поддержек, высота построения,
+            площадь проекции на стол, объем под нависаниями
+        """
+        directions = normalize_directions(directions)
+        n = len(directions)
+        batch = self.BATCH_DIRECTIONS
+        ranges = [(s, min(s + batch, n)) for s in range(0, n, batch)]
+        workers = self.max_workers or os.cpu_count() or 1
+
+        if len(ranges) <= 1 or workers == 1:
+            parts = [self._evaluate_batch(directions[s:e]) for s, e in ranges]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(self._evaluate_batch, directions[s:e]) for s, e in ranges]
+                parts = [f.result() for f in futures]
+
+        if not parts:
+            return {name: np.zeros(0) for name in METRICS}
+        return {name: np.concatenate([p[name] for p in parts]) for name in METRICS}
+
+    def _evaluate_batch(self, d: np.ndarray) -> Dict[str, np.ndarray]:
+        heights = self._hull_points @ d.T
+        base = heights.min(axis=0)
+        build_height = heights.max(axis=0) - base
+        footprint = 0.5 * (self._hull_areas @ np.abs(self._hull_normals @ d.T))
+
+        # Нависания по группам нормалей
+        cosines = self._bin_normal @ d.T
+        overhang = cosines < self.threshold
+        support = self._bin_area @ overhang
+        lift = self._bin_moment @ d.T - self._bin_area[:, None] * base
+        volume = np.sum(np.where(overhang, -cosines * lift, 0.0), axis=0)
+
+        # Плоские участки на столе поддержек не требуют
+        aligned = (self._patch_normal @ d.T) < -np.cos(np.radians(self.PLATE_ANGLE))
+        aligned &= self._patch_supporting[:, None]
+        support = support - self._patch_area @ aligned
+
+        return {
+            "support_area": np.maximum(support, 0.0),
+            "build_height": build_height,
+            "footprint": footprint,
+            "overhang_volume": np.maximum(volume, 0.0),
+        }
+
+    def score(self, metrics: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Взвешенная оценка направлений (меньше — лучше)
+
+        Args:
+            metrics: Результат evaluate
+
+        Returns:
+            np.ndarray: Оценки (D,)
+        """
+        area = max(self.total_area, 1e-12)
+        scales = {
+            "support_area": area,
+            "build_height": self.diagonal,
+            "footprint": area,
+            "overhang_volume": area * self.diagonal,
+        }
+        total = 0.0
+        for item in fields(self.weights):
+            weight = getattr(self.weights, item.name)
+            if weight:
+                total = total + weight * metrics[item.name] / scales[item.name]
+        return np.broadcast_to(np.asarray(total, dtype=np.float64), metrics[METRICS[0]].shape)
+
+    # ------------------------------------------------------------------
+    # Поиск
+    # ------------------------------------------------------------------
+
+    def optimize(
+        self,
+        n_samples: int = 2000,
+        refine_top: int = 8,
+        refine_rounds: int = 3,
+        refine_samples: int = 32,
+        check: Callable[[], None] = None,
+    ) -> OrientationResult:
+        """
+        Подобрать ориентацию
+
+        Args:
+            n_samples: Количество направлений начальной выборки
+            refine_top: Сколько лучших направлений уточнять
+            refine_rounds: Количество раундов уточнения
+            refine_samples: Направлений вокруг каждого уточняемого в раунде
+            check: Функция проверки отмены (например, TaskContext.check)
+
+        Returns:
+            OrientationResult: Оцененные направления, лучшее и фронт Парето
+        """
+        # Начальная выборка: сфера + "плоский участок на стол"
+        directions = np.vstack([fibonacci_sphere(n_samples), -self._patch_normal])
+        metrics = self.evaluate(directions)
+        scores = self.score(metrics)
+
+        # Уточнение в сужающихся окрестностях лучших направлений
+        radius = np.sqrt(4.0 * np.pi / max(n_samples, 1))
+        for _ in range(refine_rounds):
+            if check is not None:
+                check()
+            seeds = directions[np.argsort(scores)[:refine_top]]
+            local = self._around(seeds, radius, refine_samples)
+            local_metrics = self.evaluate(local)
+            directions = np.vstack([directions, local])
+            metrics = {k: np.concatenate([metrics[k], local_metrics[k]]) for k in METRICS}
+            scores = np.concatenate([scores, self.score(local_metrics)])
+            radius *= 0.5
+
+        if check is not None:
+            check()
+        values = np.column_stack([metrics[k] for k in METRICS])
+        # Фронт строится по уникальным значениям метрик (дубликаты направлений)
+        _, unique_rows = np.unique(np.round(values, 9), axis=0, return_index=True)
+        front = unique_rows[pareto_front(values[unique_rows])]
+        front = front[np.argsort(scores[front])]
+
+        result = OrientationResult(directions, metrics, scores, front)
+        _log.info(
+            "Orientation: %d candidates, Pareto front %d, best score %.4f",
+            len(directions),
+            len(front),
+            float(scores[result.best_index]),
+        )
+        return result
+
+    @staticmethod
+    def _around(seeds: np.ndarray, radius: float, count: int) -> np.ndarray:
+        """Направления в сферических окрестностях радиуса radius (спираль Фибоначчи на диске)"""
+        i = np.arange(count) + 0.5
+        r = radius * np.sqrt(i / count)
+        phi = i * np.pi * (3.0 - np.sqrt(5.0))
+
+        # Базис касательной плоскости каждого направления
+        helper = np.where(np.abs(seeds[:, :1]) < 0.9, [[1.0, 0.0, 0.0]], [[0.0, 1.0, 0.0]])
+        t1 = np.cross(seeds, helper)
+        t1 /= np.linalg.norm(t1, axis=1, keepdims=True)
+        t2 = np.cross(seeds, t1)
+
+        offsets = (r * np.cos(phi))[None, :, None] * t1[:, None, :] + (r * np.sin(phi))[
+            None, :, None
+        ] * t2[:, None, :]
+        local = (seeds[:, None, :] + offsets).reshape(-1, 3)
+        return local / np.linalg.norm(local, axis=1, keepdims=True)
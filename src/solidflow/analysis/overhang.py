@@ -0,0 +1,297 @@
+"""
+Анализ нависаний и площади поддержек
+
+Грань нуждается в поддержке, если она обращена вниз круче критического угла:
+угол между поверхностью и вертикалью больше ``critical_angle``, то есть
+n · d < -sin(critical_angle), где n — нормаль грани, d — направление построения.
+Грани на уровне стола поддержек не требуют.
+
+Для множества направлений построения классификация сводится к одному
+матричному произведению нормалей на направления (пакетами, чтобы ограничить
+память), площадь поддержек — к произведению вектора площадей на маски.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from solidflow.core.config import Config
+from solidflow.geometry.mesh.arrays import mesh_arrays, triangle_normals, weld_vertices
+from solidflow.geometry.mesh.topology import edge_index
+
+_log = logging.getLogger("SolidFlow.OverhangAnalyzer")
+
+
+def normalize_directions(directions) -> np.ndarray:
+    """
+    Привести направления к единичной длине
+
+    Args:
+        directions: Направление (3,) или направления (D, 3)
+
+    Returns:
+        np.ndarray: Единичные направления (D, 3)
+
+    Raises:
+        ValueError: Если есть нулевое направление
+    """
+    directions = np.asarray(directions, dtype=np.float64).reshape(-1, 3)
+    length = np.linalg.norm(directions, axis=1, keepdims=True)
+    if np.any(length == 0):
+        raise ValueError("Направление построения не может быть нулевым")
+    return directions / length
+
+
+@dataclass
+class OverhangResult:
+    """
+    Результат анализа нависаний для одного направления построения
+
+    Attributes:
+        direction: Направление построения (3,)
+        critical_angle: Критический угол от вертикали, градусы
+        overhang_angle: Угол грани от вертикали (M,), градусы; положительный —
+            грань обращена вниз, отрицательный — вверх
+        overhang_mask: Грани, требующие поддержки (M,)
+        support_area: Площадь граней, требующих поддержки
+        unsupported_points: Нижние точки областей, начинающихся "в воздухе" (K, 3)
+        unsupported_vertices: Номера вершин mesh каждой такой области
+    """
+
+    direction: np.ndarray
+    critical_angle: float
+    overhang_angle: np.ndarray
+    overhang_mask: np.ndarray
+    support_area: float
+    unsupported_points: np.ndarray
+    unsupported_vertices: List[np.ndarray] = field(default_factory=list)
+
+    @property
+    def needs_support(self) -> bool:
+        """Требуются ли поддержки"""
+        return bool(self.overhang_mask.any() or len(self.unsupported_points))
+
+    def summary(self) -> Dict[str, any]:
+        """
+        Сводка по нависаниям
+
+        Returns:
+            dict: Направление, количество граней и площадь поддержек, число
+            неподдержанных областей
+        """
+        return {
+            "direction": self.direction.tolist(),
+            "critical_angle": self.critical_angle,
+            "overhang_faces": int(self.overhang_mask.sum()),
+            "support_area": self.support_area,
+            "unsupported_regions": int(len(self.unsupported_points)),
+            "needs_support": self.needs_support,
+        }
+
+
+class OverhangAnalyzer:
+    """Классификация граней по углу к направлению построения"""
+
+    # Допуск высоты граней, лежащих на столе, мм
+    PLATE_TOLERANCE = 0.05
+
+    # Порог -n · d, с которого грань считается обращенной вниз (отсекает вертикальные)
+    DOWN_TOLERANCE = 1e-6
+
+    # Предел элементов матрицы (грани x направления) в одном пакете
+    MAX_ELEMENTS = 1 << 24
+
+    def __init__(self, mesh, critical_angle: Optional[float] = None):
+        """
+        Инициализация
+
+        Args:
+            mesh: PyVista или trimesh mesh объект
+            critical_angle: Критический угол от вертикали в градусах
+                (по умолчанию Config.OVERHANG_ANGLE)
+        """
+        self.mesh = mesh
+        self.critical_angle = float(
+            critical_angle if critical_angle is not None else Config.OVERHANG_ANGLE
+        )
+        if not 0.0 <= self.critical_angle <= 90.0:
+            raise ValueError("Критический угол должен быть в диапазоне 0..90 градусов")
+
+        self._vertices, self._faces = mesh_arrays(mesh)
+        self._normals, self._areas = triangle_normals(self._vertices, self._faces)
+        self._centroids = self._vertices[self._faces].mean(axis=1)
+        self._graph = None
+
+    @property
+    def threshold(self) -> float:
+        """Порог n · d, ниже которого грань требует поддержки"""
+        return -np.sin(np.radians(self.critical_angle))
+
+    def analyze(self, direction=(0.0, 0.0, 1.0)) -> OverhangResult:
+        """
+        Проанализировать нависания для одного направления построения
+
+        Args:
+            direction: Направление построения (вверх от стола)
+
+        Returns:
+            OverhangResult: Маски граней, площадь поддержек, неподдержанные области
+        """
+        d = normalize_directions(direction)[0]
+        cosines = self._normals @ d
+        base = float((self._vertices @ d).min())
+        mask = (cosines < self.threshold) & (self._centroids @ d - base > self.PLATE_TOLERANCE)
+        # Вырожденные грани (нулевая нормаль) не классифицируются
+        mask &= self._areas > 0
+
+        points, vertices = self._lowest_unsupported(d, base)
+        result = OverhangResult(
+            direction=d,
+            critical_angle=self.critical_angle,
+            overhang_angle=np.degrees(np.arcsin(np.clip(-cosines, -1.0, 1.0))),
+            overhang_mask=mask,
+            support_area=float(self._areas[mask].sum()),
+            unsupported_points=points,
+            unsupported_vertices=vertices,
+        )
+        _log.info(
+            "Overhangs: %d faces, support area %.2f, %d unsupported regions",
+            int(mask.sum()),
+            result.support_area,
+            len(points),
+        )
+        return result
+
+    def overhang_masks(self, directions) -> np.ndarray:
+        """
+        Маски граней, требующих поддержки, для множества направлений
+
+        Args:
+            directions: Направления построения (D, 3)
+
+        Returns:
+            np.ndarray: Маски (D, M)
+        """
+        directions = normalize_directions(directions)
+        masks = np.empty((len(directions), len(self._faces)), dtype=bool)
+        for start, end in self._chunks(len(directions)):
+            masks[start:end] = self._masks(directions[start:end]).T
+        return masks
+
+    def support_areas(self, directions) -> np.ndarray:
+        """
+        Площадь поддержек для множества направлений
+
+        Args:
+            directions: Направления построения (D, 3)
+
+        Returns:
+            np.ndarray: Площадь граней, требующих поддержки, для каждого направления (D,)
+        """
+        directions = normalize_directions(directions)
+        areas = np.empty(len(directions))
+        for start, end in self._chunks(len(directions)):
+            areas[start:end] = self._areas @ self._masks(directions[start:end])
+        return areas
+
+    def _masks(self, directions: np.ndarray) -> np.ndarray:
+        """Маски (M, D) для пакета направлений"""
+        cosines = self._normals @ directions.T
+        heights = self._centroids @ directions.T
+        base = (self._vertices @ directions.T).min(axis=0)
+        masks = (cosines < self.threshold) & (heights - base > self.PLATE_TOLERANCE)
+        masks &= (self._areas > 0)[:, None]
+        return masks
+
+    def _chunks(self, n_directions: int):
+        """Диапазоны направлений, в которых матрица грани x направления ограничена"""
+        step = max(1, self.MAX_ELEMENTS // max(len(self._faces), 1))
+        return [(s, min(s + step, n_directions)) for s in range(0, n_directions, step)]
+
+    def _vertex_graph(self):
+        """
+        Граф вершин: объединенные по координатам вершины и ребра между ними
+
+        Returns:
+            tuple: (номер объединенной вершины для каждой вершины mesh,
+            объединенные вершины, ребра (E, 2), маска вершин, входящих в грани)
+        """
+        if self._graph is None:
+            used = np.zeros(len(self._vertices), dtype=bool)
+            used[self._faces.ravel()] = True
+            welded, inverse = weld_vertices(self._vertices, np.arange(len(self._vertices)))
+            edges = edge_index(inverse[self._faces], len(welded)).edges
+            # Вершины, не входящие в грани, в анализе не участвуют
+            referenced = np.zeros(len(welded), dtype=bool)
+            referenced[inverse[used]] = True
+            self._graph = (inverse, welded, edges, referenced)
+        return self._graph
+
+    def _lowest_unsupported(self, direction: np.ndarray, base: float):
+        """
+        Области, с которых печать начинается "в воздухе"
+
+        Это локальные минимумы высоты на графе вершин (все соседи не ниже),
+        не лежащие на столе и касающиеся хотя бы одной грани, обращенной вниз:
+        вмятина на верхней грани — тоже минимум, но печатается поверх модели.
+        Минимумом может быть и горизонтальная площадка снизу — тогда она
+        возвращается одной областью.
+
+        Returns:
+            tuple: (нижние точки областей (K, 3), номера вершин mesh каждой области)
+        """
+        from scipy.sparse import coo_matrix
+        from scipy.sparse.csgraph import connected_components
+
+        inverse, welded, edges, referenced = self._vertex_graph()
+        if len(edges) == 0:
+            return np.zeros((0, 3)), []
+
+        heights = welded @ direction
+        a, b = edges[:, 0], edges[:, 1]
+        lowest_neighbor = np.full(len(welded), np.inf)
+        np.minimum.at(lowest_neighbor, a, heights[b])
+        np.minimum.at(lowest_neighbor, b, heights[a])
+
+        extent = float(heights.max() - heights.min())
+        eps = max(extent, 1.0) * 1e-9
+
+        # Площадки: вершины одной высоты, соединенные ребрами. Площадка — минимум,
+        # если ни у одной ее вершины нет более низкого соседа.
+        flat = np.abs(heights[a] - heights[b]) <= eps
+        graph = coo_matrix(
+            (np.ones(int(flat.sum()), dtype=np.int8), (a[flat], b[flat])),
+            shape=(len(welded), len(welded)),
+        )
+        n_plateaus, labels = connected_components(graph, directed=False)
+        has_lower = np.zeros(n_plateaus, dtype=bool)
+        has_lower[labels[lowest_neighbor < heights - eps]] = True
+
+        # Области, касающиеся граней, обращенных вниз
+        down = inverse[self._faces[self._normals @ direction < -self.DOWN_TOLERANCE]]
+        has_down = np.zeros(n_plateaus, dtype=bool)
+        has_down[labels[down.ravel()]] = True
+
+        minima = referenced & ~has_lower[labels] & has_down[labels]
+        minima &= heights - base > self.PLATE_TOLERANCE
+        ids = np.flatnonzero(minima)
+        if not len(ids):
+            return np.zeros((0, 3)), []
+
+        # Вершины минимумов по областям, внутри области — по возрастанию высоты:
+        # первая вершина области — ее нижняя точка
+        order = ids[np.lexsort((heights[ids], labels[ids]))]
+        _, starts, counts = np.unique(labels[order], return_index=True, return_counts=True)
+        points = welded[order[starts]]
+
+        # Номера вершин mesh по областям — один проход по всем вершинам
+        region = np.full(len(welded), -1, dtype=np.int64)
+        region[order] = np.repeat(np.arange(len(starts)), counts)
+        vertex_region = region[inverse]
+        members = np.flatnonzero(vertex_region >= 0)
+        members = members[np.argsort(vertex_region[members], kind="stable")]
+        sizes = np.bincount(vertex_region[members], minlength=len(starts))
+        regions = np.split(members, np.cumsum(sizes)[:-1])
+        return points, regions
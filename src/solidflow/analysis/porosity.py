@@ -0,0 +1,270 @@
+"""
+Анализ внутренних пустот и толщины по воксельной модели
+
+Работает по ``VoxelGrid`` и поэтому не требует замкнутой поверхности:
+
+* пустоты — связные области пустых вокселей, не соединенные с внешним
+  пространством. Области размечаются по слоям блоков (``scipy.ndimage.label``),
+  метки соседних слоев объединяются по общей границе как ребра графа, и
+  компоненты графа ищутся разом (``connected_components``). Компонент,
+  касающийся края сетки, — внешнее пространство;
+* толщина — по преобразованию расстояний (EDT) заполненных вокселей: на
+  срединной поверхности стенки (локальные максимумы расстояния до пустоты)
+  толщина равна 2·d - 1 вокселей (с точностью до вокселя, в меньшую сторону).
+  Слой считается с запасом ``HALO_SLABS`` слоев с каждой стороны, поэтому
+  стенки толще 2·HALO_SLABS·BLOCK вокселей занижаются, но остаются заведомо
+  толще допустимого минимума.
+
+В памяти одновременно находятся только несколько плотных слоев, а не вся сетка.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from solidflow.core.config import Config
+from solidflow.geometry.voxel.grid import VoxelGrid
+
+_log = logging.getLogger("SolidFlow.PorosityAnalyzer")
+
+
+@dataclass
+class PorosityResult:
+    """
+    Пустоты и толщина стенок по вокселям
+
+    Attributes:
+        pitch: Размер вокселя
+        solid_volume: Объем заполненных вокселей
+        voids: Пустоты по убыванию объема: словари с ключами
+            "volume", "voxels", "center" (3,)
+        ridge_points: Точки срединной поверхности стенок (R, 3)
+        ridge_thickness: Толщина стенки в этих точках (R,)
+    """
+
+    pitch: float
+    solid_volume: float
+    voids: List[Dict[str, any]] = field(default_factory=list)
+    ridge_points: np.ndarray = None
+    ridge_thickness: np.ndarray = None
+
+    @property
+    def void_volume(self) -> float:
+        """Суммарный объем внутренних пустот"""
+        return float(sum(v["volume"] for v in self.voids))
+
+    @property
+    def porosity(self) -> float:
+        """Доля пустот в объеме тела с пустотами"""
+        total = self.solid_volume + self.void_volume
+        return self.void_volume / total if total > 0 else 0.0
+
+    def thin_points(self, min_thickness: Optional[float] = None) -> np.ndarray:
+        """
+        Точки срединной поверхности, где стенка тоньше допустимой
+
+        Args:
+            min_thickness: Минимальная толщина (по умолчанию Config.MIN_WALL_THICKNESS)
+
+        Returns:
+            np.ndarray: Точки (T, 3)
+        """
+        if min_thickness is None:
+            min_thickness = Config.MIN_WALL_THICKNESS
+        return self.ridge_points[self.ridge_thickness < min_thickness]
+
+    def summary(self, min_thickness: Optional[float] = None) -> Dict[str, any]:
+        """
+        Сводка по пустотам и толщине
+
+        Args:
+            min_thickness: Минимальная толщина (по умолчанию Config.MIN_WALL_THICKNESS)
+
+        Returns:
+            dict: Пустоты (количество, объем, наибольшая, пористость) и толщина
+            (минимум, 5-й процентиль, медиана, доля точек тоньше min_thickness)
+        """
+        if min_thickness is None:
+            min_thickness = Config.MIN_WALL_THICKNESS
+        thickness = self.ridge_thickness
+        if len(thickness):
+            p5, median = np.percentile(thickness, [5, 50])
+            thin = float(np.mean(thickness < min_thickness))
+            minimum = float(thickness.min())
+        else:
+            p5 = median = minimum = 0.0
+            thin = 0.0
+        return {
+            "pitch": float(self.pitch),
+            "solid_volume": float(self.solid_volume),
+            "voids": len(self.voids),
+            "void_volume": self.void_volume,
+            "largest_void": float(self.voids[0]["volume"]) if self.voids else 0.0,
+            "porosity": self.porosity,
+            "min_thickness": float(min_thickness),
+            "thickness_min": minimum,
+            "thickness_p5": float(p5),
+            "thickness_median": float(median),
+            "thin_fraction": thin,
+        }
+
+
+class PorosityAnalyzer:
+    """Поиск внутренних пустот и оценка толщины стенок по воксельной сетке"""
+
+    # Слоев блоков запаса с каждой стороны при расчете расстояний
+    HALO_SLABS = 2
+
+    # Пустоты меньше этого числа вокселей — артефакты вокселизации у поверхности
+    MIN_VOID_VOXELS = 8
+
+    def __init__(self, grid: VoxelGrid):
+        """
+        Инициализация
+
+        Args:
+            grid: Воксельная сетка модели (см. voxel_grid)
+        """
+        self.grid = grid
+
+    def analyze(
+        self, check: Callable[[], None] = None, progress: Callable[[int], None] = None
+    ) -> PorosityResult:
+        """
+        Найти пустоты и оценить толщину
+
+        Args:
+            check: Функция проверки отмены (например, TaskContext.check)
+            progress: Функция прогресса 0..100 (например, TaskContext.progress)
+
+        Returns:
+            PorosityResult: Пустоты и толщина стенок
+        """
+        from scipy import ndimage
+        from scipy.sparse import coo_matrix
+        from scipy.sparse.csgraph import connected_components
+
+        grid = self.grid
+        b = VoxelGrid.BLOCK
+        n = grid.n_slabs
+        h = self.HALO_SLABS
+
+        # Метки пустых областей: глобальные номера, счетчики и суммы координат
+        offset = 0
+        counts, sums, border, links = [], [], [], []
+        previous_last = None
+        ridge_points, ridge_thickness = [], []
+        for index in range(n):
+            if check is not None:
+                check()
+            window = grid.slabs(index - h, index + h + 1)
+            solid = window[:, :, h * b : (h + 1) * b]
+
+            labels, found = ndimage.label(~solid)
+            labels[labels > 0] += offset
+            flat = labels.ravel()
+            local = flat[flat > 0] - offset - 1
+            counts.append(np.bincount(local, minlength=found))
+            coords = np.nonzero(labels)
+            sums.append(
+                np.stack([np.bincount(local, weights=c, minlength=found) for c in coords], axis=1)
+                + counts[-1][:, None] * np.array([0, 0, index * b])
+            )
+            edge = np.unique(
+                np.concatenate(
+                    [
+                        labels[0].ravel(),
+                        labels[-1].ravel(),
+                        labels[:, 0].ravel(),
+                        labels[:, -1].ravel(),
+                        labels[:, :, 0].ravel() if index == 0 else [],
+                        labels[:, :, -1].ravel() if index == n - 1 else [],
+                    ]
+                ).astype(np.int64)
+            )
+            border.append(edge[edge > 0])
+            if previous_last is not None:
+                first = labels[:, :, 0]
+                shared = (previous_last > 0) & (first > 0)
+                links.append(np.stack([previous_last[shared], first[shared]], axis=1))
+            previous_last = labels[:, :, -1].copy()
+            offset += found
+
+            ridge = self._ridge(window, h * b)
+            if ridge is not None:
+                ijk, thickness = ridge
+                ijk[:, 2] += index * b
+                ridge_points.append(grid.origin + (ijk + 0.5) * grid.pitch)
+                ridge_thickness.append(thickness * grid.pitch)
+
+            if progress is not None:
+                progress(int(95 * (index + 1) / n))
+
+        voids = []
+        if offset:
+            counts = np.concatenate(counts)
+            sums = np.concatenate(sums)
+            pairs = np.concatenate(links) if links else np.zeros((0, 2), dtype=np.int64)
+            graph = coo_matrix(
+                (np.ones(len(pairs)), (pairs[:, 0] - 1, pairs[:, 1] - 1)), shape=(offset, offset)
+            )
+            _, component = connected_components(graph, directed=False)
+            exterior = np.zeros(component.max() + 1, dtype=bool)
+            exterior[component[np.concatenate(border) - 1]] = True
+            voxels = np.bincount(component, weights=counts)
+            centers = np.stack(
+                [np.bincount(component, weights=sums[:, k]) for k in range(3)], axis=1
+            )
+            for c in np.flatnonzero(~exterior & (voxels >= self.MIN_VOID_VOXELS)):
+                voids.append(
+                    {
+                        "volume": float(voxels[c] * grid.pitch**3),
+                        "voxels": int(voxels[c]),
+                        "center": grid.origin + (centers[c] / voxels[c] + 0.5) * grid.pitch,
+                    }
+                )
+            voids.sort(key=lambda v: -v["volume"])
+
+        result = PorosityResult(
+            pitch=grid.pitch,
+            solid_volume=grid.volume,
+            voids=voids,
+            ridge_points=np.concatenate(ridge_points) if ridge_points else np.zeros((0, 3)),
+            ridge_thickness=(np.concatenate(ridge_thickness) if ridge_thickness else np.zeros(0)),
+        )
+        if progress is not None:
+            progress(100)
+        _log.info(
+            "Porosity: %d voids (%.4g total), %d ridge voxels",
+            len(voids),
+            result.void_volume,
+            len(result.ridge_thickness),
+        )
+        return result
+
+    @staticmethod
+    def _ridge(window: np.ndarray, start: int):
+        """
+        Срединная поверхность стенок в центральном слое окна
+
+        Args:
+            window: Заполненность окна слоев (nx, ny, S)
+            start: Первый слой z центрального слоя блоков в окне
+
+        Returns:
+            tuple: (индексы вокселей (R, 3) относительно слоя, толщина в вокселях (R,))
+            или None, если в слое нет заполненных вокселей
+        """
+        from scipy import ndimage
+
+        stop = start + VoxelGrid.BLOCK
+        if not window[:, :, start:stop].any():
+            return None
+        distance = ndimage.distance_transform_edt(window)
+        peak = ndimage.maximum_filter(distance, size=3)
+        core = distance[:, :, start:stop]
+        ridge = (core > 0) & (core >= peak[:, :, start:stop])
+        ijk = np.argwhere(ridge)
+        return ijk, 2.0 * core[ridge] - 1.0
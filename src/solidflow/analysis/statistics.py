@@ -3,7 +3,9 @@
 """
 
 import numpy as np
-from typing import Dict
+from typing import Callable, Dict
+
+from solidflow.geometry.mesh.arrays import mesh_arrays
 
 
 class MeshStatistics:
@@ -17,20 +19,30 @@ class MeshStatistics:
             mesh: PyVista mesh объект
         """
         self.mesh = mesh
+        self._volume_cache = None
 
-    def compute_all(self) -> Dict[str, any]:
+    def compute_all(
+        self, check: Callable[[], None] = None, progress: Callable[[int], None] = None
+    ) -> Dict[str, any]:
         """
         Вычислить всю статистику
 
+        Args:
+            check: Функция проверки отмены (например, TaskContext.check)
+            progress: Функция прогресса 0..100 (например, TaskContext.progress);
+                вызывается только при оценке объема по вокселям
+
         Returns:
             dict: Словарь со всей статистикой
         """
         bounds = self.mesh.bounds
+        self._volume(check, progress)
 
         return {
             "geometry": self.get_geometry_info(),
             "size": self.get_size_info(),
             "volume": self.get_volume(),
+            "volume_estimated": self.is_volume_estimated(),
             "surface_area": self.get_surface_area(),
             "bounding_box": {
                 "min": [bounds[0], bounds[2], bounds[4]],
@@ -78,24 +90,49 @@ class MeshStatistics:
         """
         Вычислить объем модели
 
+        Для негерметичных моделей (дыры, вывернутые или пересекающиеся
+        оболочки) объем оценивается по воксельной модели.
+
         Returns:
             float: Объем в кубических единицах
         """
+        return self._volume()[0]
+
+    def is_volume_estimated(self) -> bool:
+        """
+        Проверить, оценен ли объем по вокселям (модель не герметична)
+
+        Returns:
+            bool: True, если get_volume возвращает воксельную оценку
+        """
+        return self._volume()[1]
+
+    def _volume(self, check: Callable[[], None] = None, progress: Callable[[int], None] = None):
+        """Объем и признак воксельной оценки, вычисляются один раз"""
+        if self._volume_cache is not None:
+            return self._volume_cache
         # PyVista не имеет прямого метода для объема
         # Используем trimesh для вычисления
         try:
             import trimesh
 
-            vertices = self.mesh.points
-            faces = self.mesh.faces.reshape((-1, 4))[:, 1:]
+            vertices, faces = mesh_arrays(self.mesh)
             tmesh = trimesh.Trimesh(vertices=vertices, faces=faces)
 
             if tmesh.is_watertight:
-                return float(tmesh.volume)
+                self._volume_cache = (float(tmesh.volume), False)
             else:
-                return 0.0  # Не можем вычислить объем для негерметичных моделей
-        except:
-            return 0.0
+                # Объем по граням не определен — оцениваем по вокселям
+                from solidflow.geometry.voxel.voxelizer import voxel_grid
+
+                grid = voxel_grid(self.mesh, check=check, progress=progress)
+                self._volume_cache = (float(grid.volume), True)
+        except Exception:
+            # Отмена задачи не маскируется нулевым объемом
+            if check is not None:
+                check()
+            self._volume_cache = (0.0, False)
+        return self._volume_cache
 
     def get_surface_area(self) -> float:
         """
@@ -107,8 +144,7 @@ class MeshStatistics:
         try:
             import trimesh
 
-            vertices = self.mesh.points
-            faces = self.mesh.faces.reshape((-1, 4))[:, 1:]
+            vertices, faces = mesh_arrays(self.mesh)
             tmesh = trimesh.Trimesh(vertices=vertices, faces=faces)
 
             return float(tmesh.area)
@@ -123,4 +159,3 @@ class MeshStatistics:
             np.ndarray: Координаты центра масс
         """
         return self.mesh.center
-
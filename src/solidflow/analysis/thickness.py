@@ -0,0 +1,345 @@
+"""
+Анализ толщины стенок
+
+Толщина измеряется в точках поверхности (центры граней или случайные точки на
+гранях) одним из методов:
+
+* ``ray`` — луч из точки внутрь модели против нормали; толщина — расстояние до
+  первого пересечения с поверхностью;
+* ``sphere`` — вписанная сфера ("shrinking ball"): сфера, касающаяся поверхности
+  в точке, уменьшается, пока не перестанет пересекать поверхность; толщина —
+  ее диаметр. Метод устойчивее на скруглениях и наклонных стенках.
+
+Запросы выполняются пакетно по BVH, который можно переиспользовать между анализами.
+
+Обход BVH векторизован средствами NumPy (фронт пар луч-узел) и стоит
+25-80 мкс на луч на одно ядро: дольше всего лучи, пересекающие всю модель
+(толстые стенки, сферы). Полный анализ модели в 2 млн треугольников занимает
+минуты; компилируемые локаторы VTK по одному лучу не быстрее (около 20 мкс и
+без параллельности), а упрощение кластеризацией схлопывает как раз тонкие
+стенки. Поэтому для крупных моделей есть быстрая оценка (``max_points``):
+измеряется случайная выборка граней, остальные грани берут толщину ближайшей
+измеренной, а статистика считается только по измеренным. Оценка тора из
+2 млн треугольников по 50 тыс. граней (каждый луч пересекает всю трубу) —
+около 8 с на одном ядре.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+from solidflow.geometry.mesh.arrays import mesh_arrays, triangle_normals
+from solidflow.geometry.spatial.bvh import BVH
+from solidflow.geometry.spatial.index import spatial_index
+
+_log = logging.getLogger("SolidFlow.ThicknessAnalyzer")
+
+
+@dataclass
+class ThicknessResult:
+    """
+    Результат анализа толщины
+
+    Attributes:
+        face_thickness: Толщина для каждой грани (M,), NaN — не измерена
+            (луч не пересек поверхность, например у незамкнутой модели)
+        method: Метод измерения ("ray" или "sphere")
+        sampled_faces: Грани, измеренные при быстрой оценке по выборке; толщина
+            остальных взята у ближайшей измеренной грани (None — измерены все)
+    """
+
+    face_thickness: np.ndarray
+    method: str
+    sampled_faces: Optional[np.ndarray] = None
+
+    def summary(self, percentiles: Sequence[float] = (5, 50, 95)) -> Dict[str, any]:
+        """
+        Сводка по толщине
+
+        Args:
+            percentiles: Процентили для сводки
+
+        Returns:
+            dict: min, max, mean, процентили и количество измеренных граней; при
+            оценке по выборке — только по измеренным граням (sampled = True)
+        """
+        measured = self.face_thickness
+        if self.sampled_faces is not None:
+            measured = measured[self.sampled_faces]
+        measured = measured[np.isfinite(measured)]
+        result = {
+            "method": self.method,
+            "faces": int(len(self.face_thickness)),
+            "measured": int(len(measured)),
+            "sampled": self.sampled_faces is not None,
+        }
+        if len(measured) == 0:
+            result.update({"min": None, "max": None, "mean": None, "percentiles": {}})
+            return result
+
+        values = np.percentile(measured, percentiles)
+        result.update(
+            {
+                "min": float(measured.min()),
+                "max": float(measured.max()),
+                "mean": float(measured.mean()),
+                "percentiles": {float(p): float(v) for p, v in zip(percentiles, values)},
+            }
+        )
+        return result
+
+    def thin_faces(self, threshold: float) -> np.ndarray:
+        """
+        Грани тоньше порога
+
+        Args:
+            threshold: Минимально допустимая толщина
+
+        Returns:
+            np.ndarray: Номера граней
+        """
+        with np.errstate(invalid="ignore"):
+            return np.flatnonzero(self.face_thickness < threshold)
+
+
+class ThicknessAnalyzer:
+    """Анализ толщины стенок по лучам или вписанным сферам"""
+
+    METHODS = ("ray", "sphere")
+
+    # Точек в одном пакете между проверками отмены
+    CHUNK_POINTS = 262_144
+
+    # Максимальное число итераций сжатия сферы
+    SPHERE_ITERATIONS = 30
+
+    # Относительная точность радиуса вписанной сферы
+    SPHERE_TOLERANCE = 1e-3
+
+    # Ближайших измеренных граней, среди которых при оценке по выборке ищется
+    # грань той же стенки
+    FILL_NEIGHBORS = 8
+
+    def __init__(self, mesh, bvh: Optional[BVH] = None, max_workers: Optional[int] = None):
+        """
+        Инициализация
+
+        Args:
+            mesh: PyVista или trimesh mesh объект
+            bvh: Готовый BVH этого mesh (по умолчанию — закэшированный индекс mesh)
+            max_workers: Количество потоков для запросов к BVH
+        """
+        self.mesh = mesh
+        self.max_workers = max_workers
+        self._bvh = bvh
+        self._vertices, self._faces = mesh_arrays(mesh)
+        self._normals = None
+
+    @property
+    def bvh(self) -> BVH:
+        """BVH модели (общий индекс mesh, см. spatial_index)"""
+        if self._bvh is None:
+            self._bvh = spatial_index(self.mesh)
+        return self._bvh
+
+    def analyze(
+        self,
+        method: str = "ray",
+        samples_per_face: int = 1,
+        seed: int = 0,
+        max_points: Optional[int] = None,
+        check: Callable[[], None] = None,
+        progress: Callable[[int], None] = None,
+    ) -> ThicknessResult:
+        """
+        Измерить толщину стенок
+
+        Args:
+            method: "ray" или "sphere"
+            samples_per_face: Точек на грань; 1 — центр грани, больше — случайные точки
+            seed: Зерно генератора случайных точек
+            max_points: Наибольшее количество точек; если их больше, измеряется
+                случайная выборка граней (быстрая оценка), по умолчанию — все
+            check: Функция проверки отмены (например, TaskContext.check)
+            progress: Функция прогресса 0..100 (например, TaskContext.progress)
+
+        Returns:
+            ThicknessResult: Толщина по граням
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Неизвестный метод измерения толщины: {method}")
+        if samples_per_face < 1:
+            raise ValueError("Количество точек на грань должно быть положительным")
+
+        t0 = time.perf_counter()
+        sampled = None
+        if max_points is not None and len(self._faces) * samples_per_face > max_points:
+            count = max(int(max_points) // samples_per_face, 1)
+            rng = np.random.default_rng(seed)
+            sampled = np.sort(rng.choice(len(self._faces), count, replace=False))
+        points, face_ids = self._sample(samples_per_face, seed, sampled)
+        normals = self._face_normals()[face_ids]
+        measure = self._ray_thickness if method == "ray" else self._sphere_thickness
+
+        thickness = np.empty(len(points))
+        n = len(points)
+        for start in range(0, n, self.CHUNK_POINTS):
+            if check is not None:
+                check()
+            end = min(start + self.CHUNK_POINTS, n)
+            thickness[start:end] = measure(
+                points[start:end], normals[start:end], face_ids[start:end]
+            )
+            if progress is not None:
+                progress(int(100 * end / n))
+
+        # Толщина грани — минимум по ее точкам
+        face_thickness = np.full(len(self._faces), np.inf)
+        np.minimum.at(face_thickness, face_ids, np.where(np.isnan(thickness), np.inf, thickness))
+        face_thickness[np.isinf(face_thickness)] = np.nan
+        if sampled is not None:
+            self._fill_unsampled(face_thickness, sampled)
+
+        elapsed = time.perf_counter() - t0
+        _log.info(
+            "Thickness (%s): %d points, %d/%d faces measured in %.2fs (%.0f points/s)",
+            method,
+            n,
+            int(np.isfinite(face_thickness).sum() if sampled is None else len(sampled)),
+            len(face_thickness),
+            elapsed,
+            n / elapsed if elapsed > 0 else 0.0,
+        )
+        return ThicknessResult(face_thickness=face_thickness, method=method, sampled_faces=sampled)
+
+    def _sample(self, samples_per_face: int, seed: int, faces: Optional[np.ndarray] = None):
+        """Точки измерения и номера их граней (всех или только faces)"""
+        face_index = np.arange(len(self._faces)) if faces is None else faces
+        triangles = self._vertices[self._faces[face_index]]
+        if samples_per_face == 1:
+            return triangles.mean(axis=1), face_index
+
+        # Равномерные точки в треугольнике: отражение точек за диагональю квадрата
+        rng = np.random.default_rng(seed)
+        face_ids = np.repeat(np.arange(len(face_index)), samples_per_face)
+        uv = rng.random((len(face_ids), 2))
+        outside = uv.sum(axis=1) > 1.0
+        uv[outside] = 1.0 - uv[outside]
+        tri = triangles[face_ids]
+        points = (
+            tri[:, 0] + uv[:, :1] * (tri[:, 1] - tri[:, 0]) + uv[:, 1:] * (tri[:, 2] - tri[:, 0])
+        )
+        return points, face_index[face_ids]
+
+    def _fill_unsampled(self, face_thickness: np.ndarray, sampled: np.ndarray):
+        """
+        Толщина граней вне выборки — по ближайшей измеренной грани той же стенки
+
+        Из FILL_NEIGHBORS ближайших измеренных граней берется первая с близкой
+        нормалью, чтобы у ребер грань не получила толщину соседней стенки.
+        """
+        from scipy.spatial import cKDTree
+
+        measured = sampled[np.isfinite(face_thickness[sampled])]
+        if not len(measured):
+            return
+        normals = self._face_normals()
+        centroids = self._vertices[self._faces].mean(axis=1)
+        rest = np.ones(len(face_thickness), dtype=bool)
+        rest[sampled] = False
+        rest = np.flatnonzero(rest)
+        tree = cKDTree(centroids[measured])
+        workers = self.max_workers or -1
+        _, nearest = tree.query(centroids[rest], workers=workers)
+        pick = measured[nearest]
+        # Соседи ищутся заново только у граней, ближайшая к которым — с другой стенки
+        other = np.flatnonzero(np.einsum("ij,ij->i", normals[pick], normals[rest]) <= 0.5)
+        k = min(self.FILL_NEIGHBORS, len(measured))
+        if len(other) and k > 1:
+            _, nearest = tree.query(centroids[rest[other]], k=k, workers=workers)
+            nearest = measured[nearest]
+            same = np.einsum("ijk,ik->ij", normals[nearest], normals[rest[other]])
+            # Без грани той же стенки среди соседей — ближайшая (argmax дает 0)
+            pick[other] = nearest[np.arange(len(other)), np.argmax(same > 0.5, axis=1)]
+        face_thickness[rest] = face_thickness[pick]
+
+    def _face_normals(self) -> np.ndarray:
+        """Единичные внешние нормали граней"""
+        if self._normals is None:
+            self._normals, _ = triangle_normals(self._vertices, self._faces)
+        return self._normals
+
+    def _epsilon(self) -> float:
+        """Допуск, отсекающий пересечения с собственной гранью и соседями"""
+        return max(self.bvh.diagonal, 1e-12) * 1e-7
+
+    def _ray_thickness(self, points, normals, face_ids) -> np.ndarray:
+        """Толщина по лучу против нормали, NaN — нет пересечения"""
+        t, face = self.bvh.intersect_rays(
+            points,
+            -normals,
+            t_min=self._epsilon(),
+            ignore_faces=face_ids,
+            max_workers=self.max_workers,
+        )
+        return np.where(face >= 0, t, np.nan)
+
+    def _sphere_thickness(self, points, normals, face_ids) -> np.ndarray:
+        """
+        Толщина по вписанной сфере
+
+        Центр сферы радиуса r лежит на внутренней нормали: c = p - n * r. Если
+        ближайшая к центру точка поверхности q ближе r, сфера пересекает модель
+        и радиус уменьшается до сферы, проходящей через p и q:
+        r = |p - q|² / (2 * (-n) · (q - p)).
+
+        Сфера уменьшается только при касании противоположной стенки (нормаль в
+        точке q направлена навстречу нормали в p); касание смежных граней у
+        выпуклых ребер толщину не уменьшает.
+        """
+        eps = self._epsilon()
+        face_normals = self._face_normals()
+        inward = -normals
+        # Начальный радиус — по лучу (сфера не может быть больше половины хорды)
+        chord = self._ray_thickness(points, normals, face_ids)
+        radius = np.where(np.isfinite(chord), chord / 2.0, self.bvh.diagonal / 2.0)
+
+        active = np.arange(len(points))
+        for _ in range(self.SPHERE_ITERATIONS):
+            if not len(active):
+                break
+            p = points[active]
+            center = p + inward[active] * radius[active, None]
+            # Ищем только точки заметно ближе радиуса: на выпуклых поверхностях
+            # все грани почти равноудалены от центра и отсечение иначе не работает
+            closest, dist, face = self.bvh.closest_point(
+                center,
+                max_distance=radius[active] * (1.0 - self.SPHERE_TOLERANCE),
+                max_workers=self.max_workers,
+            )
+            found = face >= 0
+            active, p, closest, dist, face = (
+                active[found],
+                p[found],
+                closest[found],
+                dist[found],
+                face[found],
+            )
+
+            pq = closest - p
+            along = np.einsum("ij,ij->i", inward[active], pq)
+            opposing = np.einsum("ij,ij->i", face_normals[face], normals[active]) < 0.0
+            with np.errstate(divide="ignore", invalid="ignore"):
+                shrunk = np.einsum("ij,ij->i", pq, pq) / (2.0 * along)
+            # Сфера пересекает противоположную стенку — уменьшаем
+            shrink = (along > eps) & opposing & (shrunk < radius[active])
+            radius[active[shrink]] = shrunk[shrink]
+            active = active[shrink]
+
+        thickness = 2.0 * radius
+        # Без пересечения луча и без уменьшения сферы толщина не определена
+        thickness[~np.isfinite(chord) & (radius >= self.bvh.diagonal / 2.0)] = np.nan
+        return thickness
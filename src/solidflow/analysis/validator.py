@@ -4,7 +4,9 @@
 
 import trimesh
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict
+
+from solidflow.geometry.mesh.arrays import mesh_arrays
 
 
 class MeshValidator:
@@ -20,8 +22,7 @@ class MeshValidator:
         # Конвертируем PyVista mesh в trimesh для анализа
         if hasattr(mesh, "points") and hasattr(mesh, "faces"):
             # PyVista mesh
-            vertices = mesh.points
-            faces = mesh.faces.reshape((-1, 4))[:, 1:]  # Убираем первый элемент (количество)
+            vertices, faces = mesh_arrays(mesh)
             self.mesh = trimesh.Trimesh(vertices=vertices, faces=faces)
         else:
             self.mesh = mesh
@@ -151,3 +152,20 @@ class MeshValidator:
         duplicates = len(self.mesh.vertices) - len(merged.vertices)
         return int(duplicates)
 
+
+
+def validate_mesh(mesh) -> Dict[str, any]:
+    """
+    Выполнить полную валидацию mesh (точка входа для рабочих процессов)
+
+    Trimesh из разделяемой памяти создается без обработки, поэтому здесь он
+    собирается заново — с теми же условиями (слияние вершин), что и PyVista mesh.
+
+    Args:
+        mesh: PyVista или trimesh mesh объект
+
+    Returns:
+        dict: Результаты валидации
+    """
+    vertices, faces = mesh_arrays(mesh)
+    return MeshValidator(trimesh.Trimesh(vertices=vertices, faces=faces)).validate()
@@ -0,0 +1,211 @@
+"""
+Дисковый кэш производных данных mesh
+
+Дорогие для вычисления данные (пространственные индексы, результаты импорта)
+сохраняются в наборы массивов NumPy (.npz) по ключу содержимого: повторное
+открытие той же модели использует готовые данные вместо пересчета.
+
+Управление:
+- SOLIDFLOW_CACHE_DIR: каталог кэша (по умолчанию ~/.solidflow/cache,
+  на macOS ~/Library/Caches/SolidFlow)
+- SOLIDFLOW_CACHE=0: отключить дисковый кэш
+"""
+
+import hashlib
+import logging
+import os
+import platform
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+from solidflow.core.config import Config
+
+_log = logging.getLogger("SolidFlow.MeshCache")
+
+
+def _default_cache_dir() -> Path:
+    env_dir = os.environ.get("SOLIDFLOW_CACHE_DIR")
+    if env_dir:
+        return Path(env_dir)
+    home = Path.home()
+    if platform.system() == "Darwin":
+        return home / "Library" / "Caches" / "SolidFlow"
+    return home / ".solidflow" / "cache"
+
+
+def array_hash(*arrays: np.ndarray) -> str:
+    """
+    Хэш содержимого массивов (форма, тип и данные)
+
+    Args:
+        arrays: Массивы NumPy
+
+    Returns:
+        str: Шестнадцатеричный хэш
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(memoryview(array).cast("B"))
+    return digest.hexdigest()
+
+
+def file_hash(file_path: Union[str, Path], chunk_size: int = 1 << 22) -> str:
+    """
+    Хэш содержимого файла
+
+    Args:
+        file_path: Путь к файлу
+        chunk_size: Размер блока чтения
+
+    Returns:
+        str: Шестнадцатеричный хэш
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, "rb") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class MeshCache:
+    """Дисковый кэш наборов массивов NumPy по типу данных и ключу"""
+
+    def __init__(self, directory: Optional[Path] = None, max_bytes: Optional[int] = None):
+        """
+        Инициализация
+
+        Args:
+            directory: Каталог кэша (по умолчанию — см. описание модуля)
+            max_bytes: Предельный размер кэша; при превышении удаляются
+                давно не использованные записи
+        """
+        self.directory = Path(directory) if directory is not None else _default_cache_dir()
+        self.max_bytes = max_bytes if max_bytes is not None else Config.CACHE_MAX_MB << 20
+        self._lock = threading.Lock()
+
+    def path(self, kind: str, key: str) -> Path:
+        """Путь к записи кэша"""
+        return self.directory / kind / f"{key}.npz"
+
+    def load(self, kind: str, key: str) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Загрузить запись
+
+        Args:
+            kind: Тип данных (например, "bvh")
+            key: Ключ записи
+
+        Returns:
+            dict: Имя массива -> массив, или None если записи нет
+        """
+        path = self.path(kind, key)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files}
+            # Время доступа — для вытеснения давно не использованных записей
+            os.utime(path)
+            return arrays
+        except Exception as e:
+            _log.warning("Dropping unreadable cache entry %s: %s", path, e)
+            path.unlink(missing_ok=True)
+            return None
+
+    def store(self, kind: str, key: str, arrays: Dict[str, np.ndarray]) -> Optional[Path]:
+        """
+        Сохранить запись
+
+        Запись пишется во временный файл и атомарно переименовывается, поэтому
+        параллельные процессы не видят частично записанных данных. Ошибки
+        записи (нет места, нет прав) не прерывают работу.
+
+        Args:
+            kind: Тип данных
+            key: Ключ записи
+            arrays: Имя массива -> массив
+
+        Returns:
+            Path: Путь к записи или None при ошибке
+        """
+        path = self.path(kind, key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    np.savez(f, **arrays)
+                os.replace(tmp_name, path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        except OSError as e:
+            _log.warning("Failed to write cache entry %s: %s", path, e)
+            return None
+
+        self.prune()
+        return path
+
+    def size(self) -> int:
+        """Текущий размер кэша в байтах"""
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def prune(self):
+        """Удалить давно не использованные записи сверх предельного размера"""
+        with self._lock:
+            entries = []
+            for entry in self._entries():
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry))
+
+            total = sum(size for _, size, _ in entries)
+            if total <= self.max_bytes:
+                return
+            for _, size, entry in sorted(entries):
+                entry.unlink(missing_ok=True)
+                total -= size
+                if total <= self.max_bytes:
+                    break
+            _log.info("Pruned mesh cache to %.1f MB", total / (1 << 20))
+
+    def clear(self):
+        """Удалить все записи"""
+        for entry in self._entries():
+            entry.unlink(missing_ok=True)
+
+    def _entries(self):
+        if not self.directory.exists():
+            return []
+        return list(self.directory.glob("*/*.npz"))
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def get_cache() -> Optional[MeshCache]:
+    """
+    Общий дисковый кэш приложения
+
+    Returns:
+        MeshCache: Кэш или None, если отключен (SOLIDFLOW_CACHE=0)
+    """
+    global _default_cache
+    if os.environ.get("SOLIDFLOW_CACHE") == "0":
+        return None
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = MeshCache()
+        return _default_cache
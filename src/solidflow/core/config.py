@@ -23,9 +23,74 @@ class Config:
     WINDOW_WIDTH = 1280
     WINDOW_HEIGHT = 720
 
-    # Поддерживаемые форматы (для MVP только STL)
+    # Минимальная допустимая толщина стенки для 3D-печати, мм
+    MIN_WALL_THICKNESS = 0.8
+
+    # Критический угол нависания от вертикали, градусы (круче — нужны поддержки)
+    OVERHANG_ANGLE = 45.0
+
+    # Угол излома между соседними гранями, начиная с которого ребро — острая кромка, градусы
+    SHARP_EDGE_ANGLE = 30.0
+
+    # Наименьший радиус скругления, различимый при обработке (меньше — шум или микроскругление), мм
+    MIN_FILLET_RADIUS = 0.5
+
+    # Допустимое отклонение модели от исходной после ремонта или упрощения, мм
+    MAX_DEVIATION = 0.1
+
+    # Вокселей по наибольшему размеру модели (объем незамкнутых моделей, пустоты, ремонт)
+    VOXEL_RESOLUTION = 256
+
+    # Припуск на механообработку для заготовки (эквидистанты детали), мм
+    STOCK_ALLOWANCE = 1.0
+
+    # Рабочий стол принтера (X, Y) и зазор между деталями при раскладке, мм
+    BUILD_PLATE = (250.0, 210.0)
+    NESTING_SPACING = 2.0
+
+    # Точек контура сечения, до которых заливка среза строится и при перемещении
+    # плоскости; у больших сечений при перемещении показывается только контур
+    SECTION_DRAG_CAP_POINTS = 2000
+
+    # Наибольшее количество точек облака в окне просмотра (уровень октодерева)
+    POINT_BUDGET = 2_000_000
+
+    # Бюджет времени кадра при движении камеры (упрощенная копия модели), мс,
+    # и размер модели, начиная с которого строятся упрощенные копии, треугольников
+    FRAME_BUDGET_MS = 33.0
+    LOD_MIN_FACES = 500_000
+
+    # Размер модели, треугольников, начиная с которого длительные анализы
+    # предупреждают в строке состояния, что займут больше нескольких секунд
+    LARGE_TASK_FACES = 1_000_000
+
+    # Граней, измеряемых при быстрой оценке толщины стенок крупной модели
+    THICKNESS_SAMPLE_FACES = 50_000
+
+    # Статистика отрисовки viewport: кадров в кольцевом буфере (выгрузка в CSV)
+    # и интервал сводки в журнале, с
+    RENDER_STATS_FRAMES = 2000
+    RENDER_STATS_LOG_S = 60.0
+
+    # Миниатюры без окна: сторона изображения, пикс., наибольшее количество
+    # треугольников упрощенной копии модели и стандартные виды по умолчанию
+    THUMBNAIL_SIZE = 256
+    THUMBNAIL_MAX_FACES = 100_000
+    THUMBNAIL_VIEWS = ("iso",)
+
+    # Точность тесселяции STEP: линейное (мм) и угловое (градусы) отклонение
+    STEP_LINEAR_DEFLECTION = 0.05
+    STEP_ANGULAR_DEFLECTION = 15.0
+
+    # Предельный размер дискового кэша mesh (индексы, результаты импорта), МБ
+    CACHE_MAX_MB = 2048
+
+    # Поддерживаемые форматы
     SUPPORTED_FORMATS = {
         "stl": "STL Files (*.stl)",
+        "step": "STEP Files (*.step *.stp)",
+        "obj": "OBJ Files (*.obj)",
+        "ply": "PLY Meshes and Point Clouds (*.ply)",
     }
 
     @classmethod
@@ -40,3 +105,12 @@ class Config:
         filters.append("All Files (*.*)")
         return ";;".join(filters)
 
+    @classmethod
+    def get_save_filter(cls):
+        """
+        Получить строку фильтра файлов для диалога сохранения (только STL)
+
+        Returns:
+            str: Строка фильтра
+        """
+        return cls.SUPPORTED_FORMATS["stl"]
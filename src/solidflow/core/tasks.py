@@ -0,0 +1,350 @@
+"""
+Планировщик фоновых задач
+
+Тяжелые операции (загрузка, анализ, ремонт) выполняются вне GUI-потока:
+в QThreadPool (для кода, который отпускает GIL — NumPy, VTK) или в пуле процессов
+(для чистого Python, упирающегося в GIL). Результаты возвращаются через Qt-сигналы,
+которые автоматически доставляются в поток получателя (GUI).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+from solidflow.geometry.mesh.shared import (
+    call_shared,
+    create_process_pool,
+    discard_result,
+    release_all,
+    share_args,
+    unwrap_result,
+)
+
+
+class TaskCancelled(Exception):
+    """Задача была отменена пользователем"""
+
+
+class TaskContext:
+    """
+    Контекст выполняемой задачи
+
+    Передается в функцию задачи (аргумент ``ctx``), позволяет сообщать прогресс
+    и проверять запрос отмены.
+    """
+
+    def __init__(self, key: str, report: Callable[[str, int], None], scheduler=None):
+        self.key = key
+        self._report = report
+        self._scheduler = scheduler
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        """True если запрошена отмена"""
+        return self._cancel_event.is_set()
+
+    def cancel(self):
+        """Запросить отмену задачи"""
+        self._cancel_event.set()
+
+    def check(self):
+        """
+        Проверить запрос отмены
+
+        Raises:
+            TaskCancelled: Если задача отменена
+        """
+        if self._cancel_event.is_set():
+            raise TaskCancelled(self.key)
+
+    def progress(self, percent: int):
+        """
+        Сообщить прогресс выполнения
+
+        Args:
+            percent: Процент выполнения (0-100), -1 для неопределенного прогресса
+        """
+        self.check()
+        self._report(self.key, int(percent))
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Подождать запрос отмены не дольше timeout секунд
+
+        Returns:
+            bool: True если отмена запрошена
+        """
+        return self._cancel_event.wait(timeout)
+
+    def run_in_process(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Выполнить функцию в пуле процессов планировщика и дождаться результата
+
+        Mesh-аргументы передаются через разделяемую память (см.
+        ``solidflow.geometry.mesh.shared``), mesh-результат возвращается как PyVista mesh.
+
+        Raises:
+            TaskCancelled: Если задача отменена во время ожидания
+        """
+        return self._scheduler._run_in_process(self, fn, args, kwargs)
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """Пул процессов планировщика (для параллельной обработки внутри задачи)"""
+        return self._scheduler._get_executor()
+
+
+class _TaskRunnable(QRunnable):
+    """Обертка задачи для QThreadPool"""
+
+    def __init__(self, scheduler: "TaskScheduler", ctx: TaskContext, fn, args, kwargs, process):
+        super().__init__()
+        self.setAutoDelete(True)
+        self._scheduler = scheduler
+        self._ctx = ctx
+        self._fn = fn
+        self._args = args
+        self._kwargs = kwargs
+        self._process = process
+
+    def run(self):
+        scheduler = self._scheduler
+        key = self._ctx.key
+        scheduler._emit_started(key)
+        try:
+            if self._process:
+                result = scheduler._run_in_process(self._ctx, self._fn, self._args, self._kwargs)
+            else:
+                result = self._fn(*self._args, ctx=self._ctx, **self._kwargs)
+            self._ctx.check()
+        except TaskCancelled:
+            scheduler._finish(key, cancelled=True)
+        except Exception as e:
+            scheduler._log.exception("Task %s failed", key)
+            scheduler._finish(key, error=e)
+        else:
+            scheduler._finish(key, result=result)
+
+
+class TaskScheduler(QObject):
+    """
+    Планировщик фоновых задач на основе QThreadPool
+
+    Каждая задача идентифицируется ключом. Повторная постановка задачи с ключом,
+    который уже выполняется, игнорируется (дедупликация повторных кликов).
+
+    Сигналы:
+        task_started(key)
+        task_progress(key, percent)
+        task_finished(key, result)
+        task_failed(key, error)
+        task_cancelled(key)
+        busy_changed(busy)
+    """
+
+    task_started = Signal(str)
+    task_progress = Signal(str, int)
+    task_finished = Signal(str, object)
+    task_failed = Signal(str, object)
+    task_cancelled = Signal(str)
+    busy_changed = Signal(bool)
+
+    # Внутренний сигнал из рабочего потока: доставляется в поток планировщика (GUI)
+    _task_done = Signal(str, object, object, bool)
+
+    # Период опроса результата из пула процессов (сек)
+    PROCESS_POLL_INTERVAL = 0.05
+
+    def __init__(self, parent=None, max_threads: Optional[int] = None, max_processes=None):
+        """
+        Инициализация планировщика
+
+        Args:
+            parent: Родительский QObject
+            max_threads: Максимум потоков (по умолчанию — число ядер)
+            max_processes: Максимум процессов для process-бэкенда
+        """
+        super().__init__(parent)
+        self._log = logging.getLogger("SolidFlow.TaskScheduler")
+
+        self._pool = QThreadPool()
+        if max_threads:
+            self._pool.setMaxThreadCount(max_threads)
+
+        self._max_processes = max_processes
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+        self._lock = threading.Lock()
+        self._active: Dict[str, TaskContext] = {}
+
+        self._task_done.connect(self._on_task_done)
+
+    def submit(self, key: str, fn: Callable, *args, process: bool = False, **kwargs) -> bool:
+        """
+        Поставить задачу в очередь
+
+        Для потокового бэкенда функция вызывается как ``fn(*args, ctx=ctx, **kwargs)``
+        и может вызывать ``ctx.progress()`` / ``ctx.check()``. Для процессного бэкенда
+        (``process=True``) функция вызывается как ``fn(*args, **kwargs)`` в дочернем
+        процессе: она и аргументы должны сериализоваться через pickle, а mesh-аргументы
+        передаются через разделяемую память и приходят в процесс как trimesh объекты.
+
+        Args:
+            key: Ключ задачи (для дедупликации и сигналов)
+            fn: Функция задачи
+            process: True для выполнения в пуле процессов
+
+        Returns:
+            bool: True если задача поставлена, False если такая уже выполняется
+        """
+        with self._lock:
+            if key in self._active:
+                self._log.info("Task %s is already running; duplicate request ignored", key)
+                return False
+            ctx = TaskContext(key, self._emit_progress, self)
+            self._active[key] = ctx
+            became_busy = len(self._active) == 1
+
+        if became_busy:
+            self.busy_changed.emit(True)
+
+        self._log.info("Task %s submitted (process=%s)", key, process)
+        self._pool.start(_TaskRunnable(self, ctx, fn, args, kwargs, process))
+        return True
+
+    def cancel(self, key: Optional[str] = None):
+        """
+        Запросить отмену задачи
+
+        Args:
+            key: Ключ задачи; None — отменить все задачи
+        """
+        with self._lock:
+            contexts = list(self._active.values()) if key is None else [self._active.get(key)]
+        for ctx in contexts:
+            if ctx is not None:
+                self._log.info("Task %s cancel requested", ctx.key)
+                ctx.cancel()
+
+    def is_running(self, key: str) -> bool:
+        """Проверить, выполняется ли задача с ключом key"""
+        with self._lock:
+            return key in self._active
+
+    def is_busy(self) -> bool:
+        """True если есть выполняющиеся задачи"""
+        with self._lock:
+            return bool(self._active)
+
+    def wait(self, timeout_ms: int = -1) -> bool:
+        """
+        Дождаться завершения всех задач
+
+        Args:
+            timeout_ms: Таймаут в миллисекундах (-1 — без ограничения)
+
+        Returns:
+            bool: True если все задачи завершились
+        """
+        return self._pool.waitForDone(timeout_ms)
+
+    def shutdown(self, timeout_ms: int = 5000):
+        """Отменить задачи, дождаться потоков и остановить пул процессов"""
+        self.cancel()
+        self._pool.waitForDone(timeout_ms)
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = create_process_pool(self._max_processes)
+            return self._executor
+
+    def _run_in_process(self, ctx: TaskContext, fn, args, kwargs) -> Any:
+        """Выполнить функцию в пуле процессов, опрашивая флаг отмены"""
+        ctx.check()
+        args, kwargs, handles = share_args(args, kwargs)
+        try:
+            future = self._get_executor().submit(call_shared, fn, args, kwargs)
+            self._emit_progress(ctx.key, -1)
+            while True:
+                try:
+                    result = future.result(timeout=self.PROCESS_POLL_INTERVAL)
+                    break
+                except FutureTimeoutError:
+                    if ctx.cancelled:
+                        # Запущенный процесс прервать нельзя — результат просто отбрасывается
+                        if not future.cancel():
+                            future.add_done_callback(_discard_result)
+                        raise TaskCancelled(ctx.key)
+        finally:
+            release_all(handles)
+        return unwrap_result(result)
+
+    def _emit_started(self, key: str):
+        self.task_started.emit(key)
+
+    def _emit_progress(self, key: str, percent: int):
+        self.task_progress.emit(key, percent)
+
+    def _finish(self, key: str, result=None, error=None, cancelled=False):
+        # Ключ снимается с учета только в потоке планировщика, чтобы обработчики
+        # сигналов видели согласованное состояние
+        self._task_done.emit(key, result, error, cancelled)
+
+    def _on_task_done(self, key: str, result, error, cancelled: bool):
+        with self._lock:
+            self._active.pop(key, None)
+            idle = not self._active
+
+        if cancelled:
+            self._log.info("Task %s cancelled", key)
+            self.task_cancelled.emit(key)
+        elif error is not None:
+            self.task_failed.emit(key, error)
+        else:
+            self._log.info("Task %s finished", key)
+            self.task_finished.emit(key, result)
+
+        if idle:
+            self.busy_changed.emit(False)
+
+
+def _discard_result(future):
+    """Освободить разделяемую память результата отмененной задачи"""
+    try:
+        discard_result(future.result())
+    except Exception:
+        pass
+
+
+def wait_for(scheduler: TaskScheduler, key: str, timeout: float = 10.0) -> bool:
+    """
+    Дождаться завершения задачи, прокачивая очередь событий Qt
+
+    Удобно для тестов и скриптов без запущенного event loop.
+
+    Returns:
+        bool: True если задача завершилась до таймаута
+    """
+    from PySide6.QtCore import QCoreApplication
+
+    deadline = time.monotonic() + timeout
+    while scheduler.is_running(key):
+        if time.monotonic() > deadline:
+            return False
+        QCoreApplication.processEvents()
+        time.sleep(0.005)
+    QCoreApplication.processEvents()
+    return True
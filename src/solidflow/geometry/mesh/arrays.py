@@ -0,0 +1,300 @@
+"""
+Преобразование mesh в массивы NumPy и обратно
+"""
+
+import threading
+import weakref
+from typing import Tuple
+
+import numpy as np
+
+# Блокировки кэшей, привязанных к mesh: id(mesh) -> (слабая ссылка, {имя: Lock}).
+# PyVista mesh не хэшируется, поэтому WeakKeyDictionary не подходит; запись
+# удаляется вместе с mesh
+_mesh_locks = {}
+_mesh_locks_guard = threading.Lock()
+
+
+def mesh_arrays(mesh) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Получить массивы вершин и треугольников mesh
+
+    Полигоны PyVista с числом вершин больше трех триангулируются.
+
+    Args:
+        mesh: PyVista или trimesh mesh объект
+
+    Returns:
+        tuple: (вершины float64 (N, 3), грани int64 (M, 3))
+    """
+    if hasattr(mesh, "points") and hasattr(mesh, "faces"):
+        # PyVista mesh
+        if mesh.n_cells and not mesh.is_all_triangles:
+            mesh = mesh.triangulate()
+        vertices = np.asarray(mesh.points, dtype=np.float64)
+        faces = np.asarray(mesh.faces, dtype=np.int64).reshape((-1, 4))[:, 1:]
+    else:
+        vertices = np.asarray(mesh.vertices, dtype=np.float64)
+        faces = np.asarray(mesh.faces, dtype=np.int64)
+
+    return vertices, faces
+
+
+def arrays_to_polydata(vertices: np.ndarray, faces: np.ndarray):
+    """
+    Собрать PyVista mesh из массивов вершин и треугольников
+
+    Args:
+        vertices: Вершины (N, 3)
+        faces: Треугольники (M, 3)
+
+    Returns:
+        pv.PolyData: Mesh
+    """
+    import pyvista as pv
+
+    faces = np.asarray(faces, dtype=np.int64)
+    cells = np.hstack([np.full((len(faces), 1), 3, dtype=np.int64), faces]).flatten()
+    return pv.PolyData(np.array(vertices, dtype=np.float64), cells)
+
+
+def weld_vertices(
+    vertices: np.ndarray, faces: np.ndarray, tolerance: float = 0.0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Объединить вершины с одинаковыми координатами
+
+    Вершины сортируются по 64-битному хэшу координат (одна сортировка целых
+    чисел вместо сравнения строк), совпадения проверяются точным сравнением
+    соседей. Вершины сохраняют порядок первого появления.
+
+    С допуском вершины сначала притягиваются к представителю не дальше
+    tolerance (KD-дерево, жадно по порядку номеров, см. _snap_close). Допуск
+    должен быть меньше наименьшего ребра сетки, иначе объединяются разные
+    вершины.
+
+    Args:
+        vertices: Вершины (N, 3)
+        faces: Треугольники (M, 3) или любой массив номеров вершин; np.arange(N)
+            дает новый номер каждой исходной вершины
+        tolerance: Расстояние, в пределах которого вершины совпадают (0 — точное совпадение)
+
+    Returns:
+        tuple: (вершины без повторов (K, 3), faces с новыми номерами той же формы)
+    """
+    # + 0.0 превращает -0.0 в 0.0, иначе двоичные представления различаются
+    rows = np.ascontiguousarray(vertices, dtype=np.float64) + 0.0
+    if not len(rows):
+        return rows, np.asarray(faces, dtype=np.int64)
+    if tolerance > 0:
+        rows = _snap_close(rows, tolerance)
+    bits = rows.view(np.uint64)
+    key = _mix(_mix(_mix(bits[:, 0]) ^ bits[:, 1]) ^ bits[:, 2])
+    # Порядок внутри группы не важен: первое появление берется как минимум номеров
+    order = np.argsort(key)
+    sorted_key = key[order]
+    ordered = rows[order]
+    differs = np.any(ordered[1:] != ordered[:-1], axis=1)
+    if np.any(differs & (sorted_key[1:] == sorted_key[:-1])):
+        # Коллизия хэша: разные вершины с одним ключом могут чередоваться,
+        # тогда равные вершины не соседние — сортируем по самим координатам
+        order = np.lexsort((bits[:, 2], bits[:, 1], bits[:, 0]))
+        ordered = rows[order]
+        differs = np.any(ordered[1:] != ordered[:-1], axis=1)
+    new = np.ones(len(rows), dtype=bool)
+    new[1:] = differs
+    starts = np.flatnonzero(new)
+    group = np.cumsum(new) - 1
+
+    # Номер группы по порядку первого появления вершины
+    first = np.minimum.reduceat(order, starts)
+    rank = np.empty(len(starts), dtype=np.int64)
+    rank[np.argsort(first)] = np.arange(len(starts))
+    remap = np.empty(len(rows), dtype=np.int64)
+    remap[order] = rank[group]
+    return rows[np.sort(first)], remap[faces]
+
+
+def _mix(x: np.ndarray) -> np.ndarray:
+    """
+    Перемешать биты 64-битных ключей (финализатор MurmurHash3)
+
+    Значимые биты координат — в старших разрядах (знак, порядок, начало
+    мантиссы); у круглых чисел младшие разряды нулевые. Сдвиги переносят
+    старшие биты в младшие, иначе произведения таких ключей часто совпадают.
+    """
+    with np.errstate(over="ignore"):
+        x = x ^ (x >> np.uint64(33))
+        x = x * np.uint64(0xFF51AFD7ED558CCD)
+        x = x ^ (x >> np.uint64(33))
+        x = x * np.uint64(0xC4CEB9FE1A85EC53)
+        return x ^ (x >> np.uint64(33))
+
+
+def _snap_close(rows: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Заменить вершины ближе tolerance к представителю самим представителем
+
+    Жадно по порядку номеров: первая свободная вершина становится представителем
+    и забирает свободных соседей ближе tolerance. Каждая вершина поэтому не
+    дальше tolerance от своего представителя, и цепочка близких вершин не
+    стягивается в одну точку, как при объединении компонент связности пар.
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+    from scipy.spatial import cKDTree
+
+    pairs = cKDTree(rows).query_pairs(tolerance, output_type="ndarray")
+    if not len(pairs):
+        return rows
+    n = len(rows)
+    both = np.concatenate([pairs, pairs[:, ::-1]])
+    graph = coo_matrix(
+        (np.ones(len(both), dtype=np.int8), (both[:, 0], both[:, 1])), shape=(n, n)
+    ).tocsr()
+
+    # Обычно группа — копии одного узла общего ребра, все рядом с первой вершиной:
+    # жадный обход дал бы ту же первую вершину, поэтому он нужен только цепочкам
+    _, labels = connected_components(graph, directed=False)
+    first = np.full(labels.max() + 1, n, dtype=np.int64)
+    np.minimum.at(first, labels, np.arange(n))
+    target = first[labels]
+    spread = np.linalg.norm(rows - rows[target], axis=1) > tolerance
+    chained = np.isin(labels, labels[spread])
+
+    taken = ~chained
+    for vertex in np.flatnonzero(chained):
+        if taken[vertex]:
+            continue
+        near = graph.indices[graph.indptr[vertex] : graph.indptr[vertex + 1]]
+        near = near[~taken[near]]
+        target[vertex] = vertex
+        target[near] = vertex
+        taken[near] = True
+        taken[vertex] = True
+    return rows[target]
+
+
+def fan_triangulate(indices: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Триангуляция многоугольников веером от первой вершины
+
+    Args:
+        indices: Вершины многоугольников подряд (sum(counts),)
+        counts: Число вершин каждого многоугольника (P,); меньше трех — пропускается
+
+    Returns:
+        np.ndarray: Треугольники (sum(counts - 2), 3)
+    """
+    counts = np.asarray(counts, dtype=np.int64)
+    first = np.cumsum(counts) - counts
+    if len(counts) and np.all(counts == 3):
+        return np.asarray(indices, dtype=np.int64).reshape(-1, 3)
+    n_tri = np.maximum(counts - 2, 0)
+    polygon = np.repeat(np.arange(len(counts)), n_tri)
+    corner = np.arange(int(n_tri.sum())) - np.repeat(np.cumsum(n_tri) - n_tri, n_tri)
+    start = first[polygon]
+    return np.stack(
+        [indices[start], indices[start + corner + 1], indices[start + corner + 2]], axis=1
+    ).astype(np.int64)
+
+
+def triangle_normals(vertices: np.ndarray, faces: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Единичные нормали и площади треугольников
+
+    Args:
+        vertices: Вершины (N, 3)
+        faces: Треугольники (M, 3)
+
+    Returns:
+        tuple: (нормали (M, 3), площади (M,)); у вырожденных граней нормаль нулевая
+    """
+    tri = vertices[faces]
+    normals = np.cross(tri[:, 1] - tri[:, 0], tri[:, 2] - tri[:, 0])
+    length = np.linalg.norm(normals, axis=1)
+    normals /= np.where(length > 0, length, 1.0)[:, None]
+    return normals, 0.5 * length
+
+
+def vertex_normals(vertices: np.ndarray, faces: np.ndarray) -> np.ndarray:
+    """
+    Нормали вершин: сумма нормалей прилегающих треугольников с весом площади
+
+    Args:
+        vertices: Вершины (N, 3)
+        faces: Треугольники (M, 3)
+
+    Returns:
+        np.ndarray: Единичные нормали (N, 3); у изолированных вершин нулевые
+    """
+    normals, areas = triangle_normals(vertices, faces)
+    weighted = normals * areas[:, None]
+    corners = np.asarray(faces, dtype=np.int64).ravel()
+    result = np.stack(
+        [np.bincount(corners, np.repeat(weighted[:, k], 3), len(vertices)) for k in range(3)],
+        axis=1,
+    )
+    length = np.linalg.norm(result, axis=1)
+    result /= np.where(length > 0, length, 1.0)[:, None]
+    return result
+
+
+def geometry_version(mesh) -> int:
+    """
+    Получить версию геометрии mesh
+
+    Версия меняется при изменении вершин или граней и используется как ключ
+    для кэшей, привязанных к mesh.
+
+    Args:
+        mesh: PyVista или trimesh mesh объект
+
+    Returns:
+        int: Версия геометрии
+    """
+    if hasattr(mesh, "GetMTime"):
+        # PyVista/VTK: время модификации точек и ячеек
+        points = mesh.GetPoints()
+        polys = mesh.GetPolys()
+        return hash(
+            (
+                points.GetMTime() if points is not None else 0,
+                polys.GetMTime() if polys is not None else 0,
+                mesh.n_points,
+                mesh.n_cells,
+            )
+        )
+    # trimesh: TrackedArray хэшируется по содержимому и кэширует хэш до изменения
+    return hash((hash(mesh.vertices), hash(mesh.faces)))
+
+
+def mesh_lock(mesh, name: str) -> threading.Lock:
+    """
+    Блокировка кэша, привязанного к mesh
+
+    Один поток строит кэш (индекс, кривизну, воксели), остальные потоки с тем
+    же mesh дожидаются готового. Общая блокировка держится только на время
+    поиска, поэтому построение для одного mesh не задерживает задачи с другими.
+
+    Args:
+        mesh: PyVista или trimesh mesh объект
+        name: Имя кэша (атрибут mesh, в котором он хранится)
+
+    Returns:
+        threading.Lock: Блокировка кэша name этого mesh
+    """
+    key = id(mesh)
+    with _mesh_locks_guard:
+        entry = _mesh_locks.get(key)
+        if entry is None or entry[0]() is not mesh:
+            entry = (weakref.ref(mesh, lambda ref: _drop_mesh_locks(key, ref)), {})
+            _mesh_locks[key] = entry
+        return entry[1].setdefault(name, threading.Lock())
+
+
+def _drop_mesh_locks(key: int, ref):
+    """Удалить блокировки освобожденного mesh (без общей блокировки: вызов из сборщика)"""
+    entry = _mesh_locks.get(key)
+    if entry is not None and entry[0] is ref:
+        _mesh_locks.pop(key, None)
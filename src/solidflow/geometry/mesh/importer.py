@@ -1,11 +1,31 @@
 """
-Импорт STL файлов
+Импорт mesh файлов (STL, OBJ, PLY, STEP)
+
+OBJ и PLY разбираются собственными векторизованными парсерами
+(``solidflow.geometry.mesh.obj``, ``solidflow.geometry.mesh.ply``), вершины
+объединяются по координатам, результат сохраняется в дисковом кэше по хэшу
+файла: повторное открытие той же модели не разбирает файл заново. STEP
+тесселируется ``solidflow.geometry.mesh.step`` с точностью по умолчанию.
 """
 
+import logging
+import time
 import pyvista as pv
 import trimesh
 from pathlib import Path
-from typing import Union
+from typing import Iterable, List, Optional, Union
+
+from solidflow.core.cache import MeshCache, file_hash, get_cache
+from solidflow.geometry.mesh.arrays import arrays_to_polydata, weld_vertices
+from solidflow.geometry.mesh.obj import parse_obj
+from solidflow.geometry.mesh.ply import parse_ply
+from solidflow.geometry.mesh.shared import adopt_result, create_process_pool, publish_result
+from solidflow.geometry.mesh.step import STEP_SUFFIXES, STEPImporter
+
+_log = logging.getLogger("SolidFlow.MeshImporter")
+
+# Версия формата записей кэша импорта (увеличивается при изменении разбора)
+_FORMAT = 1
 
 
 class STLImporter:
@@ -46,6 +66,34 @@ class STLImporter:
         except Exception as e:
             raise ValueError(f"Ошибка при загрузке STL файла: {str(e)}")
 
+    @staticmethod
+    def load_many(
+        file_paths: Iterable[Union[str, Path]], max_workers: Optional[int] = None
+    ) -> List[pv.PolyData]:
+        """
+        Загрузить несколько STL файлов параллельно в рабочих процессах
+
+        Рабочий процесс разбирает файл и публикует массивы в разделяемой памяти,
+        поэтому mesh не сериализуется через pickle.
+
+        Args:
+            file_paths: Пути к STL файлам
+            max_workers: Количество процессов (по умолчанию — число ядер)
+
+        Returns:
+            list: Загруженные mesh в порядке file_paths
+
+        Raises:
+            FileNotFoundError: Если файл не найден
+            ValueError: Если файл не является корректным STL
+        """
+        file_paths = [Path(p) for p in file_paths]
+        # Файлы других форматов — через MeshImporter.load_many
+        for file_path in file_paths:
+            if file_path.suffix.lower() != ".stl":
+                raise ValueError(f"Ожидается .stl файл, получен: {file_path.suffix}")
+        return _load_parallel(file_paths, max_workers)
+
     @staticmethod
     def validate(file_path: Union[str, Path]) -> bool:
         """
@@ -63,3 +111,121 @@ class STLImporter:
         except:
             return False
 
+
+class MeshImporter:
+    """Импорт mesh из STL, OBJ, PLY и STEP по расширению файла"""
+
+    SUFFIXES = (".stl", ".obj", ".ply") + STEP_SUFFIXES
+
+    @staticmethod
+    def load(
+        file_path: Union[str, Path], cache: Optional[MeshCache] = None, persistent: bool = True
+    ) -> pv.PolyData:
+        """
+        Загрузить mesh файл
+
+        Args:
+            file_path: Путь к STL, OBJ, PLY или STEP файлу
+            cache: Дисковый кэш (по умолчанию — общий кэш приложения)
+            persistent: Использовать дисковый кэш (для OBJ, PLY и STEP)
+
+        Returns:
+            pv.PolyData: Загруженный mesh (OBJ и PLY — треугольный, с объединенными вершинами)
+
+        Raises:
+            FileNotFoundError: Если файл не найден
+            ImportError: Если для STEP не установлен pythonocc-core
+            ValueError: Если формат не поддерживается или файл некорректен
+        """
+        file_path = Path(file_path)
+        suffix = file_path.suffix.lower()
+        if suffix not in MeshImporter.SUFFIXES:
+            raise ValueError(f"Неподдерживаемый формат файла: {file_path.suffix}")
+        if suffix == ".stl":
+            return STLImporter.load(file_path)
+        if suffix in STEP_SUFFIXES:
+            return STEPImporter(cache=cache, persistent=persistent).load(file_path)
+        if not file_path.exists():
+            raise FileNotFoundError(f"Файл не найден: {file_path}")
+
+        disk = (cache or get_cache()) if persistent else None
+        key = None
+        if disk is not None:
+            key = f"{file_hash(file_path)}-{suffix[1:]}-v{_FORMAT}"
+            arrays = disk.load("import", key)
+            if arrays is not None:
+                try:
+                    mesh = arrays_to_polydata(arrays["vertices"], arrays["faces"])
+                    _log.info("Loaded %s from cache (%d faces)", file_path.name, mesh.n_cells)
+                    return mesh
+                except (KeyError, ValueError) as e:
+                    _log.warning("Cached import is invalid, parsing again: %s", e)
+
+        t0 = time.perf_counter()
+        try:
+            if suffix == ".obj":
+                vertices, faces = parse_obj(file_path.read_bytes())
+            else:
+                vertices, faces = parse_ply(file_path)
+        except ValueError as e:
+            raise ValueError(f"Ошибка при загрузке {suffix[1:].upper()} файла: {e}")
+        if not len(faces):
+            raise ValueError("Файл не содержит данных")
+        vertices, faces = weld_vertices(vertices, faces)
+        _log.info(
+            "Parsed %s: %d vertices, %d faces in %.2fs",
+            file_path.name,
+            len(vertices),
+            len(faces),
+            time.perf_counter() - t0,
+        )
+
+        if disk is not None:
+            disk.store("import", key, {"vertices": vertices, "faces": faces})
+        return arrays_to_polydata(vertices, faces)
+
+    @staticmethod
+    def load_many(
+        file_paths: Iterable[Union[str, Path]], max_workers: Optional[int] = None
+    ) -> List[pv.PolyData]:
+        """
+        Загрузить несколько mesh файлов параллельно в рабочих процессах
+
+        Args:
+            file_paths: Пути к STL, OBJ, PLY или STEP файлам
+            max_workers: Количество процессов (по умолчанию — число ядер)
+
+        Returns:
+            list: Загруженные mesh в порядке file_paths
+
+        Raises:
+            FileNotFoundError: Если файл не найден
+            ValueError: Если формат не поддерживается или файл некорректен
+        """
+        return _load_parallel(file_paths, max_workers)
+
+
+def _load_parallel(file_paths, max_workers: Optional[int]) -> List[pv.PolyData]:
+    """Загрузить файлы в пуле процессов (MeshImporter.load) через разделяемую память"""
+    file_paths = [str(p) for p in file_paths]
+    if not file_paths:
+        return []
+
+    with create_process_pool(max_workers) as executor:
+        futures = [executor.submit(_load_shared, p) for p in file_paths]
+        results = []
+        error = None
+        # Дожидаемся всех результатов, чтобы освободить разделяемую память
+        for future in futures:
+            try:
+                results.append(adopt_result(future.result()))
+            except Exception as e:
+                error = error or e
+        if error is not None:
+            raise error
+        return results
+
+
+def _load_shared(file_path: str):
+    """Загрузить mesh в рабочем процессе и опубликовать массивы в разделяемой памяти"""
+    return publish_result(MeshImporter.load(file_path))
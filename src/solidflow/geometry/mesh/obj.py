@@ -0,0 +1,146 @@
+"""
+Разбор OBJ
+
+Файл разбирается целиком без цикла Python по строкам: строки размечаются по
+массиву байт (первые два символа строки), подряд идущие строки вершин ("v")
+и граней ("f") берутся одним срезом, и числа в срезе разбираются
+``np.fromstring`` за один вызов. Число значений в каждой строке считается по
+началам слов, поэтому допускаются вершины с цветом (v x y z r g b) и
+многоугольные грани. Ссылки на текстурные координаты и нормали
+("f 1/2/3 ...") и комментарии в конце строк ("# ...") отбрасываются
+(одной заменой по регулярному выражению на весь срез), отрицательные номера отсчитываются от
+последней прочитанной вершины, многоугольники разбиваются на треугольники
+веером.
+"""
+
+import re
+from typing import Tuple
+
+import numpy as np
+
+from solidflow.geometry.mesh.arrays import fan_triangulate
+
+# Ссылки на текстурные координаты и нормали в гранях: "/vt/vn", "//vn"
+_SLASH_REFS = re.compile(rb"/\S*")
+
+# Комментарий до конца строки
+_COMMENT = re.compile(rb"#[^\n]*")
+
+
+def split_lines(data: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Границы строк текста
+
+    Args:
+        data: Текст
+
+    Returns:
+        tuple: (начала строк (L,), концы строк без перевода строки (L,))
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    ends = np.flatnonzero(buf == 10)
+    if len(buf) and buf[-1] != 10:
+        ends = np.append(ends, len(buf))
+    starts = np.empty_like(ends)
+    if len(ends):
+        starts[0] = 0
+        starts[1:] = ends[:-1] + 1
+    return starts, ends
+
+
+def parse_lines(text: bytes, n_lines: int, dtype=np.float64) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Числа строк текста одним вызовом
+
+    Args:
+        text: Строки, разделенные переводом строки
+        n_lines: Количество строк
+        dtype: Тип чисел
+
+    Returns:
+        tuple: (все числа подряд (T,), число значений в каждой строке (n_lines,))
+
+    Raises:
+        ValueError: Если не все слова — числа
+    """
+    buf = np.frombuffer(text, dtype=np.uint8)
+    space = buf <= 32
+    word = ~space
+    word[1:] &= space[:-1]
+    line_starts, _ = split_lines(text)
+    line_starts = line_starts[:n_lines]
+    counts = (
+        np.add.reduceat(word, line_starts).astype(np.int64)
+        if len(line_starts)
+        else np.zeros(0, dtype=np.int64)
+    )
+    values = np.fromstring(text, dtype=dtype, sep=" ")
+    if len(values) != counts.sum():
+        raise ValueError("Некорректные числа в файле")
+    return values, counts
+
+
+def _chunk(data: bytes, start: int, end: int) -> bytes:
+    """Срез строк без комментариев"""
+    text = data[start:end]
+    return _COMMENT.sub(b"", text) if b"#" in text else text
+
+
+def _runs(mask: np.ndarray):
+    """Интервалы [начало, конец) подряд идущих True"""
+    edges = np.diff(np.concatenate([[0], mask.astype(np.int8), [0]]))
+    return zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1))
+
+
+def parse_obj(data: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Разобрать OBJ
+
+    Args:
+        data: Содержимое файла
+
+    Returns:
+        tuple: (вершины float64 (N, 3), треугольники int64 (M, 3))
+
+    Raises:
+        ValueError: Если файл не содержит граней или номера вершин некорректны
+    """
+    starts, ends = split_lines(data)
+    buf = np.frombuffer(data, dtype=np.uint8)
+    nonempty = ends > starts
+    first = np.zeros(len(starts), dtype=np.uint8)
+    second = np.zeros(len(starts), dtype=np.uint8)
+    first[nonempty] = buf[starts[nonempty]]
+    long_lines = ends - starts > 1
+    second[long_lines] = buf[starts[long_lines] + 1]
+    blank = (second == 32) | (second == 9)
+    is_vertex = (first == ord("v")) & blank
+    is_face = (first == ord("f")) & blank
+
+    vertices = []
+    for a, b in _runs(is_vertex):
+        text = _chunk(data, starts[a], ends[b - 1]).replace(b"v", b" ")
+        values, counts = parse_lines(text, b - a)
+        if np.any(counts < 3):
+            raise ValueError("Вершина OBJ должна иметь три координаты")
+        offsets = np.cumsum(counts) - counts
+        vertices.append(values[offsets[:, None] + np.arange(3)])
+    vertices = np.concatenate(vertices) if vertices else np.zeros((0, 3))
+
+    # Число вершин, прочитанных до каждой строки (для отрицательных номеров)
+    before = np.cumsum(is_vertex) - is_vertex
+    indices, sizes = [], []
+    for a, b in _runs(is_face):
+        text = _SLASH_REFS.sub(b"", _chunk(data, starts[a], ends[b - 1]).replace(b"f", b" "))
+        values, counts = parse_lines(text, b - a, dtype=np.int64)
+        base = np.repeat(before[a:b], counts)
+        indices.append(np.where(values < 0, base + values, values - 1))
+        sizes.append(counts)
+    if not indices:
+        raise ValueError("Файл не содержит граней")
+
+    indices = np.concatenate(indices)
+    sizes = np.concatenate(sizes)
+    if len(indices) and (indices.min() < 0 or indices.max() >= len(vertices)):
+        raise ValueError("Номер вершины грани вне диапазона")
+    return vertices, fan_triangulate(indices, sizes)
@@ -0,0 +1,354 @@
+"""
+Разбор PLY
+
+Заголовок описывает элементы (vertex, face, ...) и типы их свойств; по нему
+строится тип записи NumPy, и блок двоичного файла читается как массив
+записей без разбора по полям. Блок вершин отображается в память
+(``np.memmap``). Грани — списки переменной длины: если у всех граней одно
+число вершин (треугольники или четырехугольники — типичный случай), блок
+граней тоже читается как массив записей фиксированного размера; иначе
+записи обходятся по одной. Текстовый PLY разбирается построчно одним
+вызовом ``np.fromstring`` на элемент (см. ``parse_lines``).
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from solidflow.geometry.mesh.arrays import fan_triangulate
+from solidflow.geometry.mesh.obj import parse_lines, split_lines
+
+# Типы свойств PLY и их синонимы
+_PLY_TYPES = {
+    "char": "i1",
+    "int8": "i1",
+    "uchar": "u1",
+    "uint8": "u1",
+    "short": "i2",
+    "int16": "i2",
+    "ushort": "u2",
+    "uint16": "u2",
+    "int": "i4",
+    "int32": "i4",
+    "uint": "u4",
+    "uint32": "u4",
+    "float": "f4",
+    "float32": "f4",
+    "double": "f8",
+    "float64": "f8",
+}
+
+# Наибольший размер заголовка PLY, байт
+_MAX_HEADER = 1 << 16
+
+
+@dataclass
+class PLYElement:
+    """
+    Элемент PLY (vertex, face, ...)
+
+    Attributes:
+        name: Имя элемента
+        count: Количество записей
+        properties: Свойства: (имя, тип) или (имя, ("list", тип длины, тип значений))
+    """
+
+    name: str
+    count: int
+    properties: List[Tuple[str, object]] = field(default_factory=list)
+
+    @property
+    def has_lists(self) -> bool:
+        """Есть ли свойства-списки (записи переменной длины)"""
+        return any(isinstance(kind, tuple) for _, kind in self.properties)
+
+    def dtype(self, byte_order: str) -> np.dtype:
+        """Тип записи NumPy (только для элементов без списков)"""
+        return np.dtype([(name, byte_order + _PLY_TYPES[kind]) for name, kind in self.properties])
+
+
+@dataclass
+class PLYHeader:
+    """
+    Заголовок PLY
+
+    Attributes:
+        format: "ascii", "binary_little_endian" или "binary_big_endian"
+        elements: Элементы в порядке следования в файле
+        data_offset: Смещение данных от начала файла, байт
+    """
+
+    format: str
+    elements: List[PLYElement]
+    data_offset: int
+
+    @property
+    def byte_order(self) -> str:
+        """Порядок байт для типов NumPy"""
+        return ">" if self.format == "binary_big_endian" else "<"
+
+    def element(self, name: str) -> Optional[PLYElement]:
+        """Элемент по имени или None"""
+        for element in self.elements:
+            if element.name == name:
+                return element
+        return None
+
+    @property
+    def has_faces(self) -> bool:
+        """Есть ли в файле грани (mesh, а не облако точек)"""
+        face = self.element("face")
+        return face is not None and face.count > 0
+
+
+def read_ply_header(file_path: Union[str, Path]) -> PLYHeader:
+    """
+    Прочитать заголовок PLY
+
+    Args:
+        file_path: Путь к PLY файлу
+
+    Returns:
+        PLYHeader: Формат, элементы и смещение данных
+
+    Raises:
+        ValueError: Если заголовок некорректен
+    """
+    with open(file_path, "rb") as f:
+        head = f.read(_MAX_HEADER)
+    if not head.startswith(b"ply"):
+        raise ValueError("Файл не является PLY")
+    end = head.find(b"end_header")
+    if end < 0:
+        raise ValueError("Не найден конец заголовка PLY")
+    # Данные начинаются после перевода строки за end_header (\n или \r\n)
+    offset = head.index(b"\n", end) + 1
+    lines = head[:offset].decode("ascii", errors="replace").splitlines()
+
+    fmt, elements = None, []
+    for line in lines[1:]:
+        words = line.split()
+        if not words or words[0] in ("comment", "obj_info", "end_header"):
+            continue
+        if words[0] == "format" and len(words) >= 2:
+            fmt = words[1]
+        elif words[0] == "element" and len(words) == 3:
+            elements.append(PLYElement(words[1], int(words[2])))
+        elif words[0] == "property" and elements:
+            if words[1] == "list" and len(words) == 5:
+                kind = ("list", words[2], words[3])
+                types = kind[1:]
+            elif len(words) == 3:
+                kind = words[1]
+                types = (kind,)
+            else:
+                raise ValueError(f"Некорректное свойство PLY: {line}")
+            if any(t not in _PLY_TYPES for t in types):
+                raise ValueError(f"Неизвестный тип свойства PLY: {line}")
+            elements[-1].properties.append((words[-1], kind))
+        else:
+            raise ValueError(f"Некорректная строка заголовка PLY: {line}")
+
+    if fmt not in ("ascii", "binary_little_endian", "binary_big_endian"):
+        raise ValueError(f"Неизвестный формат PLY: {fmt}")
+    return PLYHeader(fmt, elements, offset)
+
+
+def field_view(records: np.ndarray, names: Tuple[str, ...]) -> np.ndarray:
+    """
+    Поля записей как массив (N, k)
+
+    Если поля идут подряд и одного типа, возвращается представление с шагом
+    записи без копирования; иначе — копия.
+    """
+    fields = records.dtype.fields
+    types = {fields[name][0] for name in names}
+    offsets = [fields[name][1] for name in names]
+    base = next(iter(types))
+    consecutive = all(b - a == base.itemsize for a, b in zip(offsets, offsets[1:]))
+    if len(types) == 1 and consecutive:
+        return np.ndarray(
+            (len(records), len(names)),
+            dtype=base,
+            buffer=records,
+            offset=offsets[0],
+            strides=(records.dtype.itemsize, base.itemsize),
+        )
+    return np.stack([records[name] for name in names], axis=1)
+
+
+def _ascii_lines(file_path: Path, header: PLYHeader, element: PLYElement) -> bytes:
+    """Строки элемента текстового PLY (элементы перед ним занимают по строке на запись)"""
+    with open(file_path, "rb") as f:
+        f.seek(header.data_offset)
+        data = f.read()
+    starts, ends = split_lines(data)
+    first = 0
+    for other in header.elements:
+        if other is element:
+            break
+        first += other.count
+    last = first + element.count
+    if last > len(starts):
+        raise ValueError("Файл PLY обрезан: записей меньше, чем указано в заголовке")
+    return data[starts[first] : ends[last - 1]] if element.count else b""
+
+
+def _binary_offset(header: PLYHeader, element: PLYElement) -> int:
+    """Смещение блока элемента двоичного PLY (элементы перед ним — без списков)"""
+    offset = header.data_offset
+    for other in header.elements:
+        if other is element:
+            return offset
+        if other.has_lists:
+            raise ValueError(
+                f"Элементы переменной длины перед '{element.name}' в PLY не поддерживаются"
+            )
+        offset += other.count * other.dtype(header.byte_order).itemsize
+    raise ValueError(f"В PLY нет элемента '{element.name}'")
+
+
+def ply_vertex_records(file_path: Union[str, Path], header: PLYHeader) -> np.ndarray:
+    """
+    Вершины PLY как массив записей
+
+    Args:
+        file_path: Путь к PLY файлу
+        header: Заголовок (read_ply_header)
+
+    Returns:
+        np.ndarray: Записи вершин; для двоичного PLY — отображение файла в память
+
+    Raises:
+        ValueError: Если вершин нет или у них нет координат
+    """
+    file_path = Path(file_path)
+    vertex = header.element("vertex")
+    if vertex is None or not vertex.count:
+        raise ValueError("Файл не содержит точек")
+    names = [name for name, _ in vertex.properties]
+    if vertex.has_lists or not all(axis in names for axis in "xyz"):
+        raise ValueError("Вершины PLY должны иметь свойства x, y, z")
+
+    dtype = vertex.dtype(header.byte_order)
+    if header.format == "ascii":
+        text = _ascii_lines(file_path, header, vertex)
+        values, counts = parse_lines(text, vertex.count)
+        if np.any(counts != len(names)):
+            raise ValueError("Некорректная строка вершины PLY")
+        values = values.reshape(vertex.count, len(names))
+        records = np.empty(vertex.count, dtype=dtype)
+        for k, name in enumerate(names):
+            records[name] = values[:, k]
+        return records
+
+    offset = _binary_offset(header, vertex)
+    if file_path.stat().st_size < offset + vertex.count * dtype.itemsize:
+        raise ValueError("Файл PLY обрезан: вершин меньше, чем указано в заголовке")
+    return np.memmap(file_path, dtype=dtype, mode="r", offset=offset, shape=(vertex.count,))
+
+
+def ply_faces(file_path: Union[str, Path], header: PLYHeader) -> np.ndarray:
+    """
+    Треугольники PLY (многоугольники разбиваются веером)
+
+    Args:
+        file_path: Путь к PLY файлу
+        header: Заголовок (read_ply_header)
+
+    Returns:
+        np.ndarray: Треугольники int64 (M, 3)
+
+    Raises:
+        ValueError: Если граней нет или их блок некорректен
+    """
+    file_path = Path(file_path)
+    face = header.element("face")
+    if face is None or not face.count:
+        raise ValueError("Файл не содержит граней")
+    lists = [
+        k
+        for k, (name, kind) in enumerate(face.properties)
+        if isinstance(kind, tuple) and name in ("vertex_indices", "vertex_index")
+    ]
+    if not lists:
+        raise ValueError("Грани PLY должны иметь свойство vertex_indices")
+    position = lists[0]
+    if any(isinstance(kind, tuple) for k, (_, kind) in enumerate(face.properties) if k != position):
+        raise ValueError("Грани PLY с несколькими списками не поддерживаются")
+    _, count_type, index_type = face.properties[position][1]
+
+    if header.format == "ascii":
+        values, counts = parse_lines(_ascii_lines(file_path, header, face), face.count, np.int64)
+        # Скалярные свойства перед списком — по одному значению
+        starts = np.cumsum(counts) - counts + position
+        sizes = values[starts]
+        if np.any(counts != sizes + len(face.properties)):
+            raise ValueError("Некорректная строка грани PLY")
+        first = np.repeat(starts + 1, sizes)
+        within = np.arange(int(sizes.sum())) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        return fan_triangulate(values[first + within], sizes)
+
+    order = header.byte_order
+    prefix = [(name, order + _PLY_TYPES[kind]) for name, kind in face.properties[:position]]
+    suffix = [(name, order + _PLY_TYPES[kind]) for name, kind in face.properties[position + 1 :]]
+    count_dtype = np.dtype(order + _PLY_TYPES[count_type])
+    index_dtype = np.dtype(order + _PLY_TYPES[index_type])
+    offset = _binary_offset(header, face)
+    size = file_path.stat().st_size
+    data = np.memmap(file_path, dtype=np.uint8, mode="r", offset=offset, shape=(size - offset,))
+
+    prefix_size = np.dtype(prefix).itemsize if prefix else 0
+    if len(data) < prefix_size + count_dtype.itemsize:
+        raise ValueError("Файл PLY обрезан: граней меньше, чем указано в заголовке")
+    first_count = int(data[prefix_size : prefix_size + count_dtype.itemsize].view(count_dtype)[0])
+
+    # Все грани с одним числом вершин — блок фиксированных записей
+    record = np.dtype(prefix + [("n", count_dtype), ("i", index_dtype, (first_count,))] + suffix)
+    if len(data) >= face.count * record.itemsize:
+        records = data[: face.count * record.itemsize].view(record)
+        if np.all(records["n"] == first_count):
+            sizes = np.full(face.count, first_count, dtype=np.int64)
+            return fan_triangulate(records["i"].astype(np.int64).ravel(), sizes)
+
+    # Разное число вершин — записи обходятся по одной
+    suffix_size = np.dtype(suffix).itemsize if suffix else 0
+    step = index_dtype.itemsize
+    indices, sizes = [], np.empty(face.count, dtype=np.int64)
+    cursor = 0
+    for k in range(face.count):
+        start = cursor + prefix_size + count_dtype.itemsize
+        if start > len(data):
+            raise ValueError("Файл PLY обрезан: граней меньше, чем указано в заголовке")
+        n = int(data[start - count_dtype.itemsize : start].view(count_dtype)[0])
+        end = start + n * step
+        if end > len(data):
+            raise ValueError("Файл PLY обрезан: граней меньше, чем указано в заголовке")
+        indices.append(data[start:end].view(index_dtype))
+        sizes[k] = n
+        cursor = end + suffix_size
+    return fan_triangulate(np.concatenate(indices).astype(np.int64), sizes)
+
+
+def parse_ply(file_path: Union[str, Path]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Разобрать PLY с гранями
+
+    Args:
+        file_path: Путь к PLY файлу
+
+    Returns:
+        tuple: (вершины float64 (N, 3), треугольники int64 (M, 3))
+
+    Raises:
+        ValueError: Если файл некорректен или номера вершин вне диапазона
+    """
+    header = read_ply_header(file_path)
+    records = ply_vertex_records(file_path, header)
+    vertices = np.array(field_view(records, ("x", "y", "z")), dtype=np.float64)
+    faces = ply_faces(file_path, header)
+    if len(faces) and (faces.min() < 0 or faces.max() >= len(vertices)):
+        raise ValueError("Номер вершины грани вне диапазона")
+    return vertices, faces
@@ -4,7 +4,8 @@
 
 import trimesh
 import pyvista as pv
-import numpy as np
+
+from solidflow.geometry.mesh.arrays import arrays_to_polydata, mesh_arrays
 
 
 class MeshProcessor:
@@ -15,7 +16,7 @@ class MeshProcessor:
         Инициализация
 
         Args:
-            mesh: PyVista mesh объект
+            mesh: PyVista или trimesh mesh объект
         """
         self.mesh = mesh
         self._tmesh = None
@@ -23,17 +24,13 @@ class MeshProcessor:
     def _to_trimesh(self):
         """Конвертировать в trimesh для обработки"""
         if self._tmesh is None:
-            vertices = self.mesh.points
-            faces = self.mesh.faces.reshape((-1, 4))[:, 1:]
+            vertices, faces = mesh_arrays(self.mesh)
             self._tmesh = trimesh.Trimesh(vertices=vertices, faces=faces)
         return self._tmesh
 
     def _from_trimesh(self, tmesh):
         """Конвертировать trimesh обратно в PyVista"""
-        faces = np.hstack(
-            [np.full((len(tmesh.faces), 1), 3, dtype=np.int64), tmesh.faces]
-        ).flatten()
-        return pv.PolyData(tmesh.vertices, faces)
+        return arrays_to_polydata(tmesh.vertices, tmesh.faces)
 
     def repair(self) -> pv.PolyData:
         """
@@ -51,10 +48,10 @@ class MeshProcessor:
         tmesh.merge_vertices()
 
         # Удаление дублирующихся граней
-        tmesh.remove_duplicate_faces()
+        _remove_duplicate_faces(tmesh)
 
         # Удаление вырожденных граней
-        tmesh.remove_degenerate_faces()
+        _remove_degenerate_faces(tmesh)
 
         # Удаление бесконечно малых компонентов
         tmesh.remove_infinite_values()
@@ -85,7 +82,7 @@ class MeshProcessor:
         tmesh = self._to_trimesh()
 
         tmesh.merge_vertices()
-        tmesh.remove_duplicate_faces()
+        _remove_duplicate_faces(tmesh)
 
         return self._from_trimesh(tmesh)
 
@@ -128,3 +125,90 @@ class MeshProcessor:
         tmesh.fill_holes()
         return self._from_trimesh(tmesh)
 
+    def voxel_remesh(
+        self, resolution: int = None, smooth_iterations: int = 10, check=None, progress=None
+    ) -> pv.PolyData:
+        """
+        Перестроить поверхность через воксельную модель
+
+        Запасной ремонт для моделей, которые не чинятся по граням: дыры,
+        вывернутые и пересекающиеся оболочки. Результат всегда замкнут, но
+        мелкие детали теряются с точностью до размера вокселя.
+
+        Args:
+            resolution: Вокселей по наибольшему размеру (по умолчанию Config.VOXEL_RESOLUTION)
+            smooth_iterations: Итераций сглаживания ступенек
+            check: Функция проверки отмены
+            progress: Функция прогресса 0..100
+
+        Returns:
+            pv.PolyData: Замкнутый mesh
+        """
+        from solidflow.geometry.voxel.remesh import voxel_remesh
+        from solidflow.geometry.voxel.voxelizer import Voxelizer
+
+        def stage(start, share):
+            """Прогресс этапа: доля share общего прогресса, начиная с start"""
+            if progress is None:
+                return None
+            return lambda value: progress(start + int(share * value / 100))
+
+        grid = Voxelizer(self.mesh, resolution=resolution).voxelize(check, stage(0, 60))
+        return voxel_remesh(grid, smooth_iterations, check, stage(60, 40))
+
+
+def _remove_duplicate_faces(tmesh):
+    """Удалить дублирующиеся грани (trimesh 3.x и 4.x)"""
+    if hasattr(tmesh, "remove_duplicate_faces"):
+        tmesh.remove_duplicate_faces()
+    else:
+        tmesh.update_faces(tmesh.unique_faces())
+
+
+def _remove_degenerate_faces(tmesh):
+    """Удалить вырожденные грани (trimesh 3.x и 4.x)"""
+    if hasattr(tmesh, "remove_degenerate_faces"):
+        tmesh.remove_degenerate_faces()
+    else:
+        tmesh.update_faces(tmesh.nondegenerate_faces())
+
+
+def repair_mesh(mesh) -> pv.PolyData:
+    """
+    Выполнить базовый ремонт mesh (точка входа для рабочих процессов)
+
+    Args:
+        mesh: PyVista или trimesh mesh объект
+
+    Returns:
+        pv.PolyData: Отремонтированный mesh
+    """
+    return MeshProcessor(mesh).repair()
+
+
+def fix_mesh_normals(mesh) -> pv.PolyData:
+    """
+    Исправить ориентацию нормалей (точка входа для рабочих процессов)
+
+    Args:
+        mesh: PyVista или trimesh mesh объект
+
+    Returns:
+        pv.PolyData: Mesh с исправленными нормалями
+    """
+    return MeshProcessor(mesh).fix_normals()
+
+
+def voxel_repair_mesh(mesh, check=None, progress=None) -> pv.PolyData:
+    """
+    Ремонт через воксельную модель (точка входа для фоновых задач)
+
+    Args:
+        mesh: PyVista или trimesh mesh объект
+        check: Функция проверки отмены
+        progress: Функция прогресса 0..100
+
+    Returns:
+        pv.PolyData: Замкнутый mesh
+    """
+    return MeshProcessor(mesh).voxel_remesh(check=check, progress=progress)
@@ -0,0 +1,433 @@
+"""
+Передача mesh в рабочие процессы через разделяемую память
+
+Вместо сериализации PolyData/Trimesh через pickle массивы вершин и граней
+публикуются один раз в ``multiprocessing.shared_memory``, а рабочему процессу
+передается небольшой дескриптор. Процесс получает NumPy-представления тех же
+страниц памяти без копирования.
+"""
+
+from __future__ import annotations
+
+import logging
+import sys
+import threading
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, Tuple
+
+import numpy as np
+
+from solidflow.geometry.mesh.arrays import arrays_to_polydata, geometry_version, mesh_arrays
+
+_log = logging.getLogger("SolidFlow.SharedMesh")
+
+
+@dataclass(frozen=True)
+class SharedArrayDescriptor:
+    """Описание массива в разделяемой памяти"""
+
+    name: str
+    shape: Tuple[int, ...]
+    dtype: str
+
+
+@dataclass(frozen=True)
+class SharedMeshDescriptor:
+    """Описание mesh в разделяемой памяти (передается в рабочий процесс)"""
+
+    vertices: SharedArrayDescriptor
+    faces: SharedArrayDescriptor
+
+    @property
+    def n_vertices(self) -> int:
+        return self.vertices.shape[0]
+
+    @property
+    def n_faces(self) -> int:
+        return self.faces.shape[0]
+
+
+def _create_block(array: np.ndarray) -> Tuple[shared_memory.SharedMemory, SharedArrayDescriptor]:
+    """Скопировать массив в новый блок разделяемой памяти"""
+    array = np.ascontiguousarray(array)
+    # Блок нулевого размера создать нельзя
+    shm = shared_memory.SharedMemory(
+        create=True, size=max(array.nbytes, 1), name=f"sf_{uuid.uuid4().hex[:16]}"
+    )
+    view = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+    view[...] = array
+    del view
+    return shm, SharedArrayDescriptor(shm.name, tuple(array.shape), array.dtype.str)
+
+
+def _open_block(desc: SharedArrayDescriptor) -> shared_memory.SharedMemory:
+    """Подключиться к существующему блоку"""
+    # Рабочие процессы пула разделяют resource_tracker родителя, поэтому повторная
+    # регистрация блока при подключении безопасна: удаляет блок только владелец.
+    return shared_memory.SharedMemory(name=desc.name)
+
+
+def _view(shm: shared_memory.SharedMemory, desc: SharedArrayDescriptor, writable: bool):
+    array = np.ndarray(desc.shape, dtype=np.dtype(desc.dtype), buffer=shm.buf)
+    if not writable:
+        array.flags.writeable = False
+    return array
+
+
+def _close(shm: shared_memory.SharedMemory):
+    try:
+        shm.close()
+    except BufferError:
+        # Остались внешние ссылки на представления; память освободится вместе с ними
+        _log.debug("Shared block %s still has exported views", shm.name)
+
+
+class SharedMesh:
+    """
+    Mesh, опубликованный в разделяемой памяти
+
+    Блоки памяти принадлежат этому объекту и удаляются, когда счетчик ссылок
+    опускается до нуля (см. ``acquire``/``release``).
+    """
+
+    def __init__(self, vertices: np.ndarray, faces: np.ndarray):
+        """
+        Опубликовать массивы вершин и граней
+
+        Args:
+            vertices: Вершины (N, 3)
+            faces: Треугольники (M, 3)
+        """
+        self._blocks = []
+        self._lock = threading.Lock()
+        self._refs = 1
+        self._key = None
+        try:
+            v_shm, v_desc = _create_block(np.asarray(vertices, dtype=np.float64))
+            self._blocks.append(v_shm)
+            f_shm, f_desc = _create_block(np.asarray(faces, dtype=np.int64))
+            self._blocks.append(f_shm)
+        except Exception:
+            self._unlink()
+            raise
+        self.descriptor = SharedMeshDescriptor(v_desc, f_desc)
+
+    @classmethod
+    def from_mesh(cls, mesh) -> "SharedMesh":
+        """Опубликовать PyVista или trimesh mesh"""
+        vertices, faces = mesh_arrays(mesh)
+        return cls(vertices, faces)
+
+    @classmethod
+    def adopt(cls, descriptor: SharedMeshDescriptor) -> "SharedMesh":
+        """
+        Принять владение блоками, созданными другим процессом
+
+        Используется для результатов рабочих процессов: процесс публикует mesh
+        и возвращает дескриптор, а вызывающая сторона становится владельцем.
+        """
+        self = cls.__new__(cls)
+        self._lock = threading.Lock()
+        self._refs = 1
+        self._key = None
+        self._blocks = [_open_block(descriptor.vertices), _open_block(descriptor.faces)]
+        self.descriptor = descriptor
+        return self
+
+    @property
+    def closed(self) -> bool:
+        return not self._blocks
+
+    def arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Представления массивов (только чтение) в текущем процессе"""
+        if self.closed:
+            raise ValueError("Разделяемый mesh уже освобожден")
+        return (
+            _view(self._blocks[0], self.descriptor.vertices, writable=False),
+            _view(self._blocks[1], self.descriptor.faces, writable=False),
+        )
+
+    def to_polydata(self):
+        """Скопировать mesh в новый PyVista PolyData"""
+        vertices, faces = self.arrays()
+        return arrays_to_polydata(vertices, faces)
+
+    def acquire(self) -> "SharedMesh":
+        """Увеличить счетчик ссылок"""
+        with self._lock:
+            if self.closed:
+                raise ValueError("Разделяемый mesh уже освобожден")
+            self._refs += 1
+        return self
+
+    def release(self):
+        """Уменьшить счетчик ссылок; при нуле блоки удаляются"""
+        with self._lock:
+            self._refs -= 1
+            if self._refs > 0:
+                return
+        _registry_forget(self)
+        self._unlink()
+
+    def _unlink(self):
+        blocks, self._blocks = self._blocks, []
+        for shm in blocks:
+            _close(shm)
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    def __enter__(self) -> SharedMeshDescriptor:
+        return self.descriptor
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+    def __del__(self):
+        if getattr(self, "_blocks", None):
+            self._unlink()
+
+
+# Опубликованные mesh текущего процесса: один блок на (mesh, версия геометрии)
+_registry: Dict[Tuple[int, int], SharedMesh] = {}
+_registry_lock = threading.Lock()
+
+
+def _registry_forget(shared: SharedMesh):
+    with _registry_lock:
+        if shared._key is not None and _registry.get(shared._key) is shared:
+            del _registry[shared._key]
+
+
+def share_mesh(mesh) -> SharedMesh:
+    """
+    Опубликовать mesh в разделяемой памяти (однократно)
+
+    Повторный вызов для того же mesh с неизменной геометрией возвращает уже
+    опубликованный объект с увеличенным счетчиком ссылок. Каждый вызов должен
+    сопровождаться ``release()`` (или использоваться как контекстный менеджер).
+
+    Args:
+        mesh: PyVista или trimesh mesh объект
+
+    Returns:
+        SharedMesh: Опубликованный mesh
+    """
+    if isinstance(mesh, SharedMesh):
+        return mesh.acquire()
+
+    key = (id(mesh), geometry_version(mesh))
+    with _registry_lock:
+        shared = _registry.get(key)
+        if shared is not None and not shared.closed:
+            return shared.acquire()
+
+        shared = SharedMesh.from_mesh(mesh)
+        shared._key = key
+        _registry[key] = shared
+        return shared
+
+
+@contextmanager
+def attach_arrays(descriptor: SharedMeshDescriptor) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Подключиться к mesh в разделяемой памяти (в рабочем процессе)
+
+    Возвращает представления только для чтения без копирования. Представления
+    действительны только внутри блока ``with``.
+
+    Args:
+        descriptor: Дескриптор опубликованного mesh
+
+    Yields:
+        tuple: (вершины, грани)
+    """
+    blocks = [_open_block(descriptor.vertices), _open_block(descriptor.faces)]
+    try:
+        yield (
+            _view(blocks[0], descriptor.vertices, writable=False),
+            _view(blocks[1], descriptor.faces, writable=False),
+        )
+    finally:
+        for shm in blocks:
+            _close(shm)
+
+
+@contextmanager
+def attach_mesh(descriptor: SharedMeshDescriptor):
+    """
+    Подключиться к mesh в разделяемой памяти как к trimesh объекту
+
+    Trimesh создается без обработки (``process=False``) поверх представлений,
+    поэтому вершины и грани не копируются; операции, изменяющие mesh,
+    работают с собственными копиями.
+
+    Yields:
+        trimesh.Trimesh: Mesh
+    """
+    import trimesh
+
+    with attach_arrays(descriptor) as (vertices, faces):
+        tmesh = trimesh.Trimesh(vertices=vertices, faces=faces, process=False, validate=False)
+        try:
+            yield tmesh
+        finally:
+            del tmesh
+
+
+@dataclass(frozen=True)
+class InlineMesh:
+    """Mesh-результат, переданный через pickle (платформы без передачи владения блоками)"""
+
+    vertices: np.ndarray
+    faces: np.ndarray
+
+
+def publish_result(mesh):
+    """
+    Опубликовать mesh-результат рабочего процесса
+
+    Владение блоками передается вызывающему процессу, который принимает его
+    через ``adopt_result``. В Windows блок живет, пока открыт хотя бы один
+    дескриптор, поэтому там результат передается через pickle.
+
+    Args:
+        mesh: PyVista или trimesh mesh объект
+
+    Returns:
+        SharedMeshDescriptor | InlineMesh: Описание результата
+    """
+    if sys.platform == "win32":
+        vertices, faces = mesh_arrays(mesh)
+        return InlineMesh(vertices, faces)
+
+    shared = SharedMesh.from_mesh(mesh)
+    descriptor = shared.descriptor
+    # Блоки остаются в системе: закрываем только локальные отображения
+    blocks, shared._blocks = shared._blocks, []
+    for shm in blocks:
+        _close(shm)
+    return descriptor
+
+
+def adopt_result(result):
+    """
+    Получить PyVista mesh из результата ``publish_result`` и освободить блоки
+
+    Args:
+        result: SharedMeshDescriptor или InlineMesh
+
+    Returns:
+        pv.PolyData: Mesh
+    """
+    if isinstance(result, InlineMesh):
+        return arrays_to_polydata(result.vertices, result.faces)
+
+    shared = SharedMesh.adopt(result)
+    try:
+        return shared.to_polydata()
+    finally:
+        shared.release()
+
+
+def discard_result(result):
+    """Освободить результат ``publish_result``, который больше не нужен"""
+    if isinstance(result, SharedMeshDescriptor):
+        SharedMesh.adopt(result).release()
+
+
+def is_mesh(obj) -> bool:
+    """Проверить, является ли объект mesh, который можно опубликовать"""
+    if hasattr(obj, "points") and hasattr(obj, "faces") and hasattr(obj, "n_cells"):
+        return True
+    return type(obj).__name__ == "Trimesh"
+
+
+def create_process_pool(max_workers=None):
+    """
+    Создать пул процессов для работы с разделяемыми mesh
+
+    resource_tracker запускается до создания пула, чтобы рабочие процессы
+    использовали трекер родителя. Иначе (при fork) каждый процесс заведет свой
+    трекер, и тот удалит опубликованные процессом блоки при его завершении.
+
+    Args:
+        max_workers: Количество процессов (по умолчанию — число ядер)
+
+    Returns:
+        ProcessPoolExecutor: Пул процессов
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    if sys.platform != "win32":
+        from multiprocessing import resource_tracker
+
+        resource_tracker.ensure_running()
+    return ProcessPoolExecutor(max_workers=max_workers)
+
+
+def share_args(args, kwargs):
+    """
+    Заменить mesh-аргументы дескрипторами разделяемой памяти (в вызывающем процессе)
+
+    Returns:
+        tuple: (args, kwargs, список SharedMesh для последующего release)
+    """
+    handles = []
+
+    def _convert(value):
+        if is_mesh(value) or isinstance(value, SharedMesh):
+            shared = share_mesh(value)
+            handles.append(shared)
+            return shared.descriptor
+        return value
+
+    try:
+        args = tuple(_convert(a) for a in args)
+        kwargs = {k: _convert(v) for k, v in kwargs.items()}
+    except Exception:
+        release_all(handles)
+        raise
+    return args, kwargs, handles
+
+
+def release_all(handles):
+    """Освободить список опубликованных mesh"""
+    for shared in handles:
+        shared.release()
+
+
+def call_shared(fn, args, kwargs):
+    """
+    Вызвать функцию в рабочем процессе, подключив mesh-аргументы из разделяемой памяти
+
+    Дескрипторы в аргументах заменяются на trimesh объекты поверх общей памяти,
+    mesh-результат публикуется через ``publish_result``.
+    """
+    from contextlib import ExitStack
+
+    with ExitStack() as stack:
+
+        def _attach(value):
+            if isinstance(value, SharedMeshDescriptor):
+                return stack.enter_context(attach_mesh(value))
+            return value
+
+        args = tuple(_attach(a) for a in args)
+        kwargs = {k: _attach(v) for k, v in kwargs.items()}
+        result = fn(*args, **kwargs)
+        if is_mesh(result):
+            result = publish_result(result)
+        del args, kwargs
+        return result
+
+
+def unwrap_result(result):
+    """Преобразовать результат ``call_shared`` в вызывающем процессе"""
+    if isinstance(result, (SharedMeshDescriptor, InlineMesh)):
+        return adopt_result(result)
+    return result
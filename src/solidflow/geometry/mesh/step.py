@@ -0,0 +1,403 @@
+"""
+Импорт STEP (B-Rep) с параллельной тесселяцией граней
+
+Требует pythonocc-core (``OCC.Core``). Сборка читается один раз и делится на
+детали (тела); каждая деталь сериализуется (BRep через pickle формы
+pythonocc), и по хэшу сериализации и точности ищется готовая тесселяция в
+дисковом кэше. Поэтому смена точности или повторное открытие измененной
+сборки пересчитывает только те детали, которых еще нет в кэше. Грани
+остальных деталей делятся на порции и тесселируются в рабочих процессах
+(``BRepMesh_IncrementalMesh`` для каждой грани). Дискретизация общего ребра
+зависит от ребра и точности, но соседние грани считают ее порознь (в разных
+процессах), и узлы совпадают лишь с точностью до погрешности
+параметризации. Поэтому вершины объединяются ``weld_vertices`` с допуском —
+долей линейного отклонения, а число оставшихся открытых ребер сохраняется в
+``STEPImporter.open_edges`` и показывается пользователю после загрузки.
+
+Результат целиком также кэшируется по хэшу файла и точности: повторное
+открытие того же файла не читает STEP (и не требует pythonocc).
+"""
+
+import hashlib
+import logging
+import math
+import os
+import pickle
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from solidflow.core.cache import MeshCache, file_hash, get_cache
+from solidflow.core.config import Config
+from solidflow.geometry.mesh.arrays import arrays_to_polydata, weld_vertices
+from solidflow.geometry.mesh.shared import create_process_pool
+from solidflow.geometry.mesh.topology import edge_index
+
+_log = logging.getLogger("SolidFlow.STEPImporter")
+
+# Версия формата записей кэша тесселяции (увеличивается при изменении алгоритма)
+_FORMAT = 2
+
+STEP_SUFFIXES = (".step", ".stp")
+
+# Допуск объединения узлов граней в долях линейного отклонения. BRepMesh по
+# умолчанию не строит элементов короче десятой доли отклонения, поэтому
+# половина этой величины не объединяет разные узлы одной грани
+WELD_FRACTION = 0.05
+
+# Запись треугольника двоичного STL: нормаль, три вершины, атрибут
+_STL_RECORD = np.dtype([("normal", "<f4", (3,)), ("points", "<f4", (3, 3)), ("attribute", "<u2")])
+
+# Деталь, прочитанная рабочим процессом: (хэш, форма); порции одной детали
+# обычно приходят в один процесс подряд
+_worker_part = (None, None)
+
+
+def occ_available() -> bool:
+    """Установлен ли pythonocc-core"""
+    try:
+        import OCC.Core  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _require_occ():
+    if not occ_available():
+        raise ImportError(
+            "Для импорта STEP требуется pythonocc-core "
+            "(conda install -c conda-forge pythonocc-core)"
+        )
+
+
+def read_step(file_path: Union[str, Path]):
+    """
+    Прочитать STEP файл в форму OpenCascade
+
+    Args:
+        file_path: Путь к STEP файлу
+
+    Returns:
+        TopoDS_Shape: Форма (сборка — составная форма)
+
+    Raises:
+        ImportError: Если pythonocc-core не установлен
+        ValueError: Если файл не удалось прочитать
+    """
+    _require_occ()
+    from OCC.Core.IFSelect import IFSelect_RetDone
+    from OCC.Core.STEPControl import STEPControl_Reader
+
+    reader = STEPControl_Reader()
+    if reader.ReadFile(str(file_path)) != IFSelect_RetDone:
+        raise ValueError("Не удалось прочитать STEP файл")
+    reader.TransferRoots()
+    shape = reader.OneShape()
+    if shape is None or shape.IsNull():
+        raise ValueError("STEP файл не содержит геометрии")
+    return shape
+
+
+def split_parts(shape) -> list:
+    """
+    Детали формы: тела, а если их нет — оболочки или вся форма
+
+    Args:
+        shape: Форма OpenCascade
+
+    Returns:
+        list: Формы деталей
+    """
+    from OCC.Core.TopAbs import TopAbs_SHELL, TopAbs_SOLID
+    from OCC.Core.TopExp import TopExp_Explorer
+
+    for kind in (TopAbs_SOLID, TopAbs_SHELL):
+        parts = []
+        explorer = TopExp_Explorer(shape, kind)
+        while explorer.More():
+            parts.append(explorer.Current())
+            explorer.Next()
+        if parts:
+            return parts
+    return [shape]
+
+
+def _faces(shape) -> list:
+    """Грани формы без повторов, в детерминированном порядке"""
+    from OCC.Core.TopAbs import TopAbs_FACE
+    from OCC.Core.TopExp import topexp
+    from OCC.Core.TopoDS import topods
+    from OCC.Core.TopTools import TopTools_IndexedMapOfShape
+
+    faces = TopTools_IndexedMapOfShape()
+    topexp.MapShapes(shape, TopAbs_FACE, faces)
+    return [topods.Face(faces.FindKey(i)) for i in range(1, faces.Size() + 1)]
+
+
+def tessellate_faces(faces, linear: float, angular: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Тесселяция граней
+
+    Каждая грань тесселируется отдельно, затем триангуляции всех граней
+    выгружаются одним вызовом ``StlAPI_Writer`` во временный двоичный STL и
+    читаются массивом NumPy: положение и обратную ориентацию граней учитывает
+    OpenCascade, и Python не обращается к каждому узлу и треугольнику.
+    Координаты STL — float32.
+
+    Args:
+        faces: Грани (TopoDS_Face)
+        linear: Линейное отклонение, мм
+        angular: Угловое отклонение, рад
+
+    Returns:
+        tuple: (вершины float64 (N, 3), треугольники int64 (M, 3)) с объединенными
+            одинаковыми вершинами; для вырожденных граней — пустые массивы
+    """
+    from OCC.Core.BRep import BRep_Builder, BRep_Tool
+    from OCC.Core.BRepMesh import BRepMesh_IncrementalMesh
+    from OCC.Core.StlAPI import StlAPI_Writer
+    from OCC.Core.TopLoc import TopLoc_Location
+    from OCC.Core.TopoDS import TopoDS_Compound
+
+    compound = TopoDS_Compound()
+    builder = BRep_Builder()
+    builder.MakeCompound(compound)
+    meshed = 0
+    for face in faces:
+        BRepMesh_IncrementalMesh(face, linear, False, angular, False)
+        if BRep_Tool.Triangulation(face, TopLoc_Location()) is not None:
+            builder.Add(compound, face)
+            meshed += 1
+    if not meshed:
+        return np.zeros((0, 3)), np.zeros((0, 3), dtype=np.int64)
+
+    handle, path = tempfile.mkstemp(suffix=".stl")
+    os.close(handle)
+    try:
+        writer = StlAPI_Writer()
+        writer.SetASCIIMode(False)
+        if not writer.Write(compound, path):
+            raise ValueError("Не удалось выгрузить триангуляцию граней STEP")
+        records = np.fromfile(path, dtype=_STL_RECORD, offset=84)
+    finally:
+        os.unlink(path)
+    vertices = records["points"].reshape(-1, 3).astype(np.float64)
+    triangles = np.arange(len(vertices), dtype=np.int64).reshape(-1, 3)
+    return weld_vertices(vertices, triangles)
+
+
+def tessellate_face(face, linear: float, angular: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Тесселяция одной грани (см. tessellate_faces)
+
+    Returns:
+        tuple: (вершины float64 (N, 3), треугольники int64 (M, 3))
+    """
+    return tessellate_faces([face], linear, angular)
+
+
+def _concat(pieces) -> Tuple[np.ndarray, np.ndarray]:
+    """Объединить (вершины, треугольники) нескольких кусков со сдвигом номеров"""
+    pieces = [p for p in pieces if len(p[1])]
+    if not pieces:
+        return np.zeros((0, 3)), np.zeros((0, 3), dtype=np.int64)
+    offsets = np.cumsum([0] + [len(v) for v, _ in pieces[:-1]])
+    vertices = np.concatenate([v for v, _ in pieces])
+    triangles = np.concatenate([t + o for (_, t), o in zip(pieces, offsets)])
+    return vertices, triangles
+
+
+def _tessellate_batch(key: str, brep: bytes, face_ids: List[int], linear: float, angular: float):
+    """Тесселяция порции граней детали (в рабочем процессе)"""
+    global _worker_part
+    if _worker_part[0] != key:
+        _worker_part = (key, _faces(pickle.loads(brep)))
+    faces = _worker_part[1]
+    return tessellate_faces([faces[i] for i in face_ids], linear, angular)
+
+
+class STEPImporter:
+    """Импорт STEP с параллельной тесселяцией и кэшем по точности"""
+
+    # Порций граней на рабочий процесс (для равномерной загрузки)
+    BATCHES_PER_WORKER = 4
+
+    def __init__(
+        self,
+        linear_deflection: Optional[float] = None,
+        angular_deflection: Optional[float] = None,
+        cache: Optional[MeshCache] = None,
+        persistent: bool = True,
+        max_workers: Optional[int] = None,
+    ):
+        """
+        Инициализация
+
+        Args:
+            linear_deflection: Линейное отклонение, мм (по умолчанию Config.STEP_LINEAR_DEFLECTION)
+            angular_deflection: Угловое отклонение, градусы
+                (по умолчанию Config.STEP_ANGULAR_DEFLECTION)
+            cache: Дисковый кэш (по умолчанию — общий кэш приложения)
+            persistent: Использовать дисковый кэш
+            max_workers: Количество процессов (по умолчанию — число ядер)
+        """
+        self.linear = float(
+            linear_deflection if linear_deflection is not None else Config.STEP_LINEAR_DEFLECTION
+        )
+        self.angular = float(
+            angular_deflection if angular_deflection is not None else Config.STEP_ANGULAR_DEFLECTION
+        )
+        if self.linear <= 0 or self.angular <= 0:
+            raise ValueError("Точность тесселяции должна быть положительной")
+        self.disk = (cache or get_cache()) if persistent else None
+        self.max_workers = max_workers
+        # Открытые ребра последней загруженной модели: у замкнутых тел их нет,
+        # иначе узлы общего ребра соседних граней не совпали в пределах допуска
+        self.open_edges = 0
+
+    @property
+    def tolerance_key(self) -> str:
+        """Часть ключа кэша, задающая точность"""
+        return f"{self.linear:g}-{self.angular:g}-v{_FORMAT}"
+
+    def load(
+        self,
+        file_path: Union[str, Path],
+        executor=None,
+        check: Callable[[], None] = None,
+        progress: Callable[[int], None] = None,
+    ):
+        """
+        Загрузить STEP файл как треугольный mesh
+
+        Args:
+            file_path: Путь к STEP файлу
+            executor: Пул процессов (по умолчанию создается на время загрузки)
+            check: Функция проверки отмены (например, TaskContext.check)
+            progress: Функция прогресса 0..100 (например, TaskContext.progress)
+
+        Returns:
+            pv.PolyData: Mesh с объединенными вершинами
+
+        Raises:
+            FileNotFoundError: Если файл не найден
+            ImportError: Если pythonocc-core не установлен (и результата нет в кэше)
+            ValueError: Если файл некорректен
+        """
+        file_path = Path(file_path)
+        if not file_path.exists():
+            raise FileNotFoundError(f"Файл не найден: {file_path}")
+        if file_path.suffix.lower() not in STEP_SUFFIXES:
+            raise ValueError(f"Ожидается .step или .stp файл, получен: {file_path.suffix}")
+
+        key = None
+        if self.disk is not None:
+            key = f"{file_hash(file_path)}-{self.tolerance_key}"
+            arrays = self.disk.load("step", key)
+            if arrays is not None:
+                _log.info("Loaded tessellation of %s from cache", file_path.name)
+                self.open_edges = int(
+                    edge_index(arrays["faces"], len(arrays["vertices"])).boundary.sum()
+                )
+                return arrays_to_polydata(arrays["vertices"], arrays["faces"])
+
+        t0 = time.perf_counter()
+        parts = split_parts(read_step(file_path))
+        if progress is not None:
+            progress(10)
+        vertices, faces = weld_vertices(
+            *self._tessellate(parts, executor, check, progress),
+            tolerance=self.linear * WELD_FRACTION,
+        )
+        if not len(faces):
+            raise ValueError("Не удалось построить треугольники по геометрии STEP")
+        self.open_edges = int(edge_index(faces, len(vertices)).boundary.sum())
+        _log.info(
+            "Tessellated %s: %d parts, %d faces, %d open edges in %.2fs",
+            file_path.name,
+            len(parts),
+            len(faces),
+            self.open_edges,
+            time.perf_counter() - t0,
+        )
+
+        if self.disk is not None:
+            self.disk.store("step", key, {"vertices": vertices, "faces": faces})
+        return arrays_to_polydata(vertices, faces)
+
+    def _tessellate(self, parts, executor, check, progress) -> Tuple[np.ndarray, np.ndarray]:
+        """Тесселяция деталей: из кэша или по порциям граней в пуле процессов"""
+        angular = math.radians(self.angular)
+        results = [None] * len(parts)
+        jobs = []
+        for index, part in enumerate(parts):
+            brep = pickle.dumps(part)
+            key = f"{hashlib.blake2b(brep, digest_size=20).hexdigest()}-{self.tolerance_key}"
+            arrays = self.disk.load("step-part", key) if self.disk is not None else None
+            if arrays is not None:
+                results[index] = (arrays["vertices"], arrays["faces"])
+            else:
+                jobs.append((index, key, brep, len(_faces(part))))
+
+        workers = self.max_workers or os.cpu_count() or 1
+        batches = []
+        for index, key, brep, n_faces in jobs:
+            size = max(1, -(-n_faces // (workers * self.BATCHES_PER_WORKER)))
+            for start in range(0, n_faces, size):
+                face_ids = list(range(start, min(start + size, n_faces)))
+                batches.append((index, (key, brep, face_ids, self.linear, angular)))
+        _log.info("STEP parts: %d cached, %d to tessellate", len(parts) - len(jobs), len(jobs))
+
+        pieces = self._run(batches, executor, check, progress)
+        for index, key, _, _ in jobs:
+            part = _concat(piece for (i, _), piece in zip(batches, pieces) if i == index)
+            results[index] = part
+            if self.disk is not None:
+                self.disk.store("step-part", key, {"vertices": part[0], "faces": part[1]})
+        return _concat(results)
+
+    def _run(self, batches, executor, check, progress) -> list:
+        """Выполнить порции последовательно или в пуле процессов (в порядке batches)"""
+        global _worker_part
+
+        def report(done):
+            if progress is not None:
+                progress(10 + 85 * done // max(len(batches), 1))
+
+        workers = self.max_workers or os.cpu_count() or 1
+        if len(batches) <= 1 or workers <= 1:
+            pieces = []
+            try:
+                for _, args in batches:
+                    if check is not None:
+                        check()
+                    pieces.append(_tessellate_batch(*args))
+                    report(len(pieces))
+            finally:
+                # Не держать форму последней детали в основном процессе
+                _worker_part = (None, None)
+            return pieces
+
+        own_executor = executor is None
+        if own_executor:
+            executor = create_process_pool(self.max_workers)
+        try:
+            futures = [executor.submit(_tessellate_batch, *args) for _, args in batches]
+            pieces = []
+            try:
+                for future in futures:
+                    if check is not None:
+                        check()
+                    pieces.append(future.result())
+                    report(len(pieces))
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+            return pieces
+        finally:
+            if own_executor:
+                executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,162 @@
+"""
+Топология треугольной сетки: индекс ребер, смежность граней, компоненты связности
+"""
+
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+
+
+@dataclass
+class EdgeIndex:
+    """
+    Индекс ребер сетки
+
+    Attributes:
+        edges: Уникальные ребра (E, 2), вершины упорядочены по возрастанию
+        face_edges: Номер уникального ребра для каждой стороны грани (M, 3);
+            сторона i грани f соединяет вершины faces[f, i] и faces[f, (i + 1) % 3]
+        counts: Количество граней, примыкающих к ребру (E,)
+    """
+
+    edges: np.ndarray
+    face_edges: np.ndarray
+    counts: np.ndarray
+
+    @property
+    def boundary(self) -> np.ndarray:
+        """Маска граничных ребер (одна примыкающая грань)"""
+        return self.counts == 1
+
+    @property
+    def non_manifold(self) -> np.ndarray:
+        """Маска non-manifold ребер (больше двух примыкающих граней)"""
+        return self.counts > 2
+
+    def edge_faces(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Пары граней по внутренним (manifold) ребрам
+
+        Returns:
+            tuple: (номера ребер (K,), грани (K, 2)) для ребер ровно с двумя гранями
+        """
+        slots = np.argsort(self.face_edges.ravel(), kind="stable")
+        faces = slots // 3
+        # Начало группы слотов каждого ребра
+        starts = np.concatenate([[0], np.cumsum(self.counts)[:-1]])
+        interior = np.flatnonzero(self.counts == 2)
+        first = faces[starts[interior]]
+        second = faces[starts[interior] + 1]
+        return interior, np.column_stack([first, second])
+
+
+def edge_index(faces: np.ndarray, n_vertices: int = None) -> EdgeIndex:
+    """
+    Построить индекс ребер
+
+    Args:
+        faces: Треугольники (M, 3)
+        n_vertices: Количество вершин (по умолчанию max(faces) + 1)
+
+    Returns:
+        EdgeIndex: Индекс ребер
+    """
+    faces = np.asarray(faces, dtype=np.int64)
+    if n_vertices is None:
+        n_vertices = int(faces.max()) + 1 if len(faces) else 0
+
+    sides = faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+    sides.sort(axis=1)
+    # Кодируем ребро одним int64 — np.unique по строкам заметно медленнее
+    keys = sides[:, 0] * np.int64(max(n_vertices, 1)) + sides[:, 1]
+    unique_keys, inverse, counts = np.unique(keys, return_inverse=True, return_counts=True)
+
+    edges = np.column_stack([unique_keys // max(n_vertices, 1), unique_keys % max(n_vertices, 1)])
+    return EdgeIndex(
+        edges=edges.astype(np.int64),
+        face_edges=inverse.reshape(-1, 3).astype(np.int64),
+        counts=counts.astype(np.int64),
+    )
+
+
+def face_adjacency(faces: np.ndarray, index: EdgeIndex = None) -> np.ndarray:
+    """
+    Пары смежных граней (с общим ребром)
+
+    Грани вокруг non-manifold ребра связываются цепочкой.
+
+    Args:
+        faces: Треугольники (M, 3)
+        index: Готовый индекс ребер (опционально)
+
+    Returns:
+        np.ndarray: Пары граней (K, 2)
+    """
+    if index is None:
+        index = edge_index(faces)
+
+    flat = index.face_edges.ravel()
+    slots = np.argsort(flat, kind="stable")
+    same_edge = flat[slots[1:]] == flat[slots[:-1]]
+    return np.column_stack([slots[:-1][same_edge] // 3, slots[1:][same_edge] // 3])
+
+
+def face_components(faces: np.ndarray, index: EdgeIndex = None) -> Tuple[int, np.ndarray]:
+    """
+    Разбить грани на компоненты связности по разреженному графу смежности
+
+    Args:
+        faces: Треугольники (M, 3)
+        index: Готовый индекс ребер (опционально)
+
+    Returns:
+        tuple: (количество компонент, метка компоненты для каждой грани (M,))
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    n_faces = len(faces)
+    if n_faces == 0:
+        return 0, np.zeros(0, dtype=np.int64)
+
+    pairs = face_adjacency(faces, index)
+    graph = coo_matrix(
+        (np.ones(len(pairs), dtype=np.int8), (pairs[:, 0], pairs[:, 1])),
+        shape=(n_faces, n_faces),
+    )
+    n_components, labels = connected_components(graph, directed=False)
+    return int(n_components), labels.astype(np.int64)
+
+
+def component_faces(labels: np.ndarray, n_components: int):
+    """
+    Сгруппировать номера граней по компонентам
+
+    Args:
+        labels: Метки компонент (M,)
+        n_components: Количество компонент
+
+    Returns:
+        list: Массивы номеров граней каждой компоненты
+    """
+    order = np.argsort(labels, kind="stable")
+    bounds = np.searchsorted(labels[order], np.arange(n_components + 1))
+    return [order[bounds[i] : bounds[i + 1]] for i in range(n_components)]
+
+
+def submesh_arrays(vertices: np.ndarray, faces: np.ndarray, face_ids: np.ndarray):
+    """
+    Выделить часть сетки с перенумерацией вершин
+
+    Args:
+        vertices: Вершины (N, 3)
+        faces: Треугольники (M, 3)
+        face_ids: Номера граней части
+
+    Returns:
+        tuple: (вершины части, грани части)
+    """
+    sub_faces = faces[face_ids]
+    used, inverse = np.unique(sub_faces, return_inverse=True)
+    return vertices[used], inverse.reshape(-1, 3)
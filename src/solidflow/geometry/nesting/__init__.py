@@ -0,0 +1,3 @@
+"""
+Модуль раскладки деталей на столе
+"""
@@ -0,0 +1,432 @@
+"""
+Раскладка деталей на рабочем столе
+
+Детали — компоненты связности модели (``ComponentAnalyzer.split``); оболочки,
+строго внутри габарита другой детали (внутренние стенки полых деталей),
+переносятся вместе с ней. След детали на столе — выпуклая оболочка проекции
+вершин на XY; оболочки строятся параллельно в пуле потоков.
+
+Детали поворачиваются только вокруг Z (ориентация печати сохраняется). Для
+каждой рассматриваются повороты с шагом 180°/ROTATION_STEPS и поворот к
+описанному прямоугольнику наименьшей площади (по ребрам оболочки). Габариты
+повернутых следов раскладываются эвристикой skyline: детали по убыванию
+площади, каждая — туда, где ее верхний край ниже всего (затем левее), среди
+всех поворотов и положений над "линией горизонта" уже уложенных деталей.
+
+Раскладка идет полосой шириной стола по X; если детали не помещаются по Y,
+полоса продолжается за край стола, и это отражается в сводке.
+"""
+
+import logging
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from solidflow.core.config import Config
+from solidflow.geometry.mesh.arrays import arrays_to_polydata, mesh_arrays
+from solidflow.geometry.mesh.topology import submesh_arrays
+
+_log = logging.getLogger("SolidFlow.PlateNester")
+
+
+@dataclass
+class NestingResult:
+    """
+    Раскладка деталей
+
+    Attributes:
+        source: Исходный mesh
+        parts: Номера граней каждой детали
+        transforms: Матрицы 4x4 перемещения каждой детали на стол (P, 4, 4)
+        rotations: Поворот каждой детали вокруг Z, градусы (P,)
+        plate: Размер стола (X, Y), мм
+        used_depth: Занятая длина стола по Y, мм
+        footprint_area: Суммарная площадь следов деталей, мм²
+    """
+
+    source: object
+    parts: List[np.ndarray]
+    transforms: np.ndarray
+    rotations: np.ndarray
+    plate: Tuple[float, float]
+    used_depth: float
+    footprint_area: float
+
+    @property
+    def fits(self) -> bool:
+        """Все детали помещаются на стол"""
+        return self.used_depth <= self.plate[1] + 1e-9
+
+    @property
+    def mesh(self):
+        """Все детали в новых положениях одним PyVista mesh"""
+        vertices, faces = mesh_arrays(self.source)
+        out_vertices, out_faces, offset = [], [], 0
+        for face_ids, matrix in zip(self.parts, self.transforms):
+            v, f = submesh_arrays(vertices, faces, face_ids)
+            out_vertices.append(v @ matrix[:3, :3].T + matrix[:3, 3])
+            out_faces.append(f + offset)
+            offset += len(v)
+        return arrays_to_polydata(np.vstack(out_vertices), np.vstack(out_faces))
+
+    def summary(self) -> Dict[str, any]:
+        """
+        Сводка по раскладке
+
+        Returns:
+            dict: Детали, размер стола, занятая длина, помещается ли раскладка,
+            заполнение занятой части стола и количество повернутых деталей
+        """
+        used = self.plate[0] * self.used_depth
+        return {
+            "parts": len(self.parts),
+            "plate_width": float(self.plate[0]),
+            "plate_depth": float(self.plate[1]),
+            "used_depth": float(self.used_depth),
+            "fits": self.fits,
+            "utilization": float(self.footprint_area / used) if used > 0 else 0.0,
+            "rotated": int(np.count_nonzero(np.abs(self.rotations) > 1e-6)),
+        }
+
+
+def skyline_pack(
+    candidates: Sequence[Sequence[Tuple[float, float]]],
+    width: float,
+    check: Callable[[], None] = None,
+    progress: Callable[[int], None] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Уложить прямоугольники в полосу заданной ширины (эвристика skyline)
+
+    Линия горизонта — отрезки (x, высота, длина), покрывающие [0, width].
+    Прямоугольник ставится левым краем на начало одного из отрезков, на
+    наибольшую высоту отрезков под ним; выбирается вариант с самым низким
+    верхним краем, затем самый левый.
+
+    Args:
+        candidates: Для каждого прямоугольника — варианты размеров (w, h)
+            в порядке укладки
+        width: Ширина полосы
+        check: Функция проверки отмены
+        progress: Функция прогресса 0..100
+
+    Returns:
+        tuple: (левые нижние углы (N, 2), номера выбранных вариантов (N,))
+
+    Raises:
+        ValueError: Прямоугольник не помещается в полосу ни в одном варианте
+    """
+    eps = 1e-9 * max(width, 1.0)
+    xs, ys, ws = [0.0], [0.0], [float(width)]
+    positions = np.zeros((len(candidates), 2))
+    chosen = np.zeros(len(candidates), dtype=np.int64)
+    for index, sizes in enumerate(candidates):
+        if check is not None and index % 16 == 0:
+            check()
+        best = None
+        for variant, (w, h) in enumerate(sizes):
+            for i in range(len(xs)):
+                x = xs[i]
+                end = x + w
+                if end > width + eps:
+                    break
+                y = ys[i]
+                j = i
+                while xs[j] + ws[j] < end - eps:
+                    j += 1
+                    if ys[j] > y:
+                        y = ys[j]
+                key = (y + h, x)
+                if best is None or key < best[0]:
+                    best = (key, x, y, w, h, variant)
+        if best is None:
+            raise ValueError(f"Деталь {index + 1} не помещается на стол по ширине")
+
+        _, x, y, w, h, variant = best
+        positions[index] = (x, y)
+        chosen[index] = variant
+
+        # Новый отрезок горизонта над прямоугольником, перекрытые — обрезаются
+        end = x + w
+        new_xs, new_ys, new_ws = [], [], []
+        for sx, sy, sw in zip(xs, ys, ws):
+            if sx + sw <= x + eps or sx >= end - eps:
+                new_xs.append(sx)
+                new_ys.append(sy)
+                new_ws.append(sw)
+                continue
+            if sx < x - eps:
+                new_xs.append(sx)
+                new_ys.append(sy)
+                new_ws.append(x - sx)
+            if sx + sw > end + eps:
+                new_xs.append(end)
+                new_ys.append(sy)
+                new_ws.append(sx + sw - end)
+        new_xs.append(x)
+        new_ys.append(y + h)
+        new_ws.append(w)
+        order = sorted(range(len(new_xs)), key=new_xs.__getitem__)
+        xs, ys, ws = [], [], []
+        for k in order:
+            if ys and abs(ys[-1] - new_ys[k]) <= eps:
+                ws[-1] += new_ws[k]
+            else:
+                xs.append(new_xs[k])
+                ys.append(new_ys[k])
+                ws.append(new_ws[k])
+
+        if progress is not None:
+            progress(int(100 * (index + 1) / len(candidates)))
+    return positions, chosen
+
+
+class PlateNester:
+    """Раскладка несвязанных деталей модели на рабочем столе"""
+
+    # Равномерных поворотов вокруг Z в полуобороте (поворот на 180° дает тот же габарит)
+    ROTATION_STEPS = 4
+
+    # Деталей в одной задаче пула при построении следов
+    BATCH_PARTS = 32
+
+    def __init__(
+        self,
+        mesh,
+        plate: Optional[Tuple[float, float]] = None,
+        spacing: Optional[float] = None,
+        max_workers: Optional[int] = None,
+    ):
+        """
+        Инициализация
+
+        Args:
+            mesh: PyVista или trimesh mesh объект
+            plate: Размер стола (X, Y), мм (по умолчанию Config.BUILD_PLATE)
+            spacing: Зазор между деталями, мм (по умолчанию Config.NESTING_SPACING)
+            max_workers: Количество потоков (по умолчанию — число ядер)
+        """
+        self.mesh = mesh
+        self.plate = tuple(float(v) for v in (plate if plate is not None else Config.BUILD_PLATE))
+        self.spacing = float(spacing if spacing is not None else Config.NESTING_SPACING)
+        if min(self.plate) <= 0:
+            raise ValueError("Размер стола должен быть положительным")
+        if self.spacing < 0:
+            raise ValueError("Зазор между деталями не может быть отрицательным")
+        self.max_workers = max_workers
+
+    def nest(
+        self, check: Callable[[], None] = None, progress: Callable[[int], None] = None
+    ) -> NestingResult:
+        """
+        Разложить детали на столе
+
+        Args:
+            check: Функция проверки отмены (например, TaskContext.check)
+            progress: Функция прогресса 0..100 (например, TaskContext.progress)
+
+        Returns:
+            NestingResult: Перемещения деталей
+        """
+        from solidflow.analysis.components import ComponentAnalyzer
+
+        def stage(start, share):
+            """Прогресс этапа: доля share общего прогресса, начиная с start"""
+            if progress is None:
+                return None
+            return lambda value: progress(start + int(share * value / 100))
+
+        vertices, faces = mesh_arrays(self.mesh)
+        components = ComponentAnalyzer(self.mesh).split()
+        if not components:
+            raise ValueError("Модель не содержит граней")
+
+        batches = [
+            components[i : i + self.BATCH_PARTS]
+            for i in range(0, len(components), self.BATCH_PARTS)
+        ]
+        outlines = []
+        for batch in self._run(
+            lambda parts: [self._outline(vertices, faces, ids) for ids in parts],
+            batches,
+            check,
+            stage(0, 50),
+        ):
+            outlines.extend(batch)
+
+        parts, hulls, bottoms = self._group(components, outlines)
+        candidates, angles, areas = [], [], []
+        for hull in hulls:
+            part_angles = self._angles(hull)
+            sizes = []
+            for angle in part_angles:
+                extent = np.ptp(hull @ self._rotation(angle).T, axis=0)
+                sizes.append((extent[0] + self.spacing, extent[1] + self.spacing))
+            candidates.append(sizes)
+            angles.append(part_angles)
+            areas.append(min(w * h for w, h in sizes))
+
+        # Крупные детали — первыми
+        order = np.argsort(-np.asarray(areas), kind="stable")
+        positions, chosen = skyline_pack(
+            [candidates[i] for i in order], self.plate[0] + self.spacing, check, stage(50, 45)
+        )
+
+        transforms = np.tile(np.eye(4), (len(parts), 1, 1))
+        rotations = np.zeros(len(parts))
+        used_depth = 0.0
+        for (x, y), variant, i in zip(positions, chosen, order):
+            angle = angles[i][variant]
+            rotation = self._rotation(angle)
+            rotated = hulls[i] @ rotation.T
+            transforms[i, :2, :2] = rotation
+            transforms[i, :2, 3] = np.array([x, y]) - rotated.min(axis=0)
+            transforms[i, 2, 3] = -bottoms[i]
+            rotations[i] = math.degrees(angle)
+            used_depth = max(used_depth, y + np.ptp(rotated[:, 1]))
+
+        result = NestingResult(
+            source=self.mesh,
+            parts=parts,
+            transforms=transforms,
+            rotations=rotations,
+            plate=self.plate,
+            used_depth=float(used_depth),
+            footprint_area=float(sum(self._area(hull) for hull in hulls)),
+        )
+        if progress is not None:
+            progress(100)
+        summary = result.summary()
+        _log.info(
+            "Nested %d parts (%d components) on %gx%g plate: depth %.4g, utilization %.1f%%",
+            len(parts),
+            len(components),
+            self.plate[0],
+            self.plate[1],
+            summary["used_depth"],
+            100.0 * summary["utilization"],
+        )
+        return result
+
+    def _run(self, fn, batches, check, progress):
+        """Выполнить пакеты в пуле потоков с проверкой отмены и прогрессом"""
+        workers = self.max_workers or os.cpu_count() or 1
+        results = []
+        if len(batches) <= 1 or workers == 1:
+            for index, batch in enumerate(batches):
+                if check is not None:
+                    check()
+                results.append(fn(batch))
+                if progress is not None:
+                    progress(int(100 * (index + 1) / len(batches)))
+            return results
+
+        pool = ThreadPoolExecutor(max_workers=workers)
+        futures = [pool.submit(fn, batch) for batch in batches]
+        try:
+            for index, future in enumerate(futures):
+                if check is not None:
+                    check()
+                results.append(future.result())
+                if progress is not None:
+                    progress(int(100 * (index + 1) / len(batches)))
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+        return results
+
+    @staticmethod
+    def _outline(vertices: np.ndarray, faces: np.ndarray, face_ids: np.ndarray):
+        """
+        Габарит и след одной компоненты
+
+        Returns:
+            tuple: (минимум (3,), максимум (3,), вершины выпуклой оболочки проекции (H, 2))
+        """
+        points = vertices[np.unique(faces[face_ids])]
+        return points.min(axis=0), points.max(axis=0), convex_hull_2d(points[:, :2])
+
+    @staticmethod
+    def _group(components: List[np.ndarray], outlines):
+        """
+        Объединить компоненты, лежащие строго внутри габарита другой компоненты
+
+        Returns:
+            tuple: (номера граней деталей, оболочки следов (H, 2), нижние Z деталей)
+        """
+        lo = np.array([o[0] for o in outlines])
+        hi = np.array([o[1] for o in outlines])
+        eps = 1e-6 * max(float(np.ptp(np.vstack([lo, hi]), axis=0).max()), 1.0)
+        size = np.prod(np.maximum(hi - lo, eps), axis=1)
+        order = np.argsort(-size, kind="stable")
+        lo, hi = lo[order], hi[order]
+
+        owner = np.arange(len(order))
+        for j in range(1, len(order)):
+            inside = np.all(lo[:j] < lo[j] - eps, axis=1) & np.all(hi[:j] > hi[j] + eps, axis=1)
+            if inside.any():
+                owner[j] = owner[np.argmax(inside)]
+
+        parts, hulls, bottoms = [], [], []
+        for root in np.flatnonzero(owner == np.arange(len(order))):
+            members = order[owner == root]
+            parts.append(np.concatenate([components[m] for m in members]))
+            if len(members) == 1:
+                hulls.append(outlines[members[0]][2])
+            else:
+                hulls.append(convex_hull_2d(np.vstack([outlines[m][2] for m in members])))
+            bottoms.append(lo[root, 2])
+        return parts, hulls, bottoms
+
+    def _angles(self, hull: np.ndarray) -> List[float]:
+        """Повороты вокруг Z для перебора, радианы: равномерные и к наименьшему габариту"""
+        angles = [math.pi * k / self.ROTATION_STEPS for k in range(self.ROTATION_STEPS)]
+        if len(hull) >= 3:
+            edges = np.roll(hull, -1, axis=0) - hull
+            edge_angles = -np.arctan2(edges[:, 1], edges[:, 0])
+            extents = [np.ptp(hull @ self._rotation(a).T, axis=0) for a in edge_angles]
+            best = float(edge_angles[int(np.argmin([e[0] * e[1] for e in extents]))])
+            for angle in (best, best + math.pi / 2):
+                angle = math.remainder(angle, math.pi)
+                if all(abs(math.remainder(angle - a, math.pi)) > 1e-6 for a in angles):
+                    angles.append(angle)
+        return angles
+
+    @staticmethod
+    def _rotation(angle: float) -> np.ndarray:
+        """Матрица поворота 2x2"""
+        c, s = math.cos(angle), math.sin(angle)
+        return np.array([[c, -s], [s, c]])
+
+    @staticmethod
+    def _area(hull: np.ndarray) -> float:
+        """Площадь выпуклого многоугольника"""
+        if len(hull) < 3:
+            return 0.0
+        x, y = hull[:, 0], hull[:, 1]
+        return float(abs(np.dot(x, np.roll(y, -1)) - np.dot(y, np.roll(x, -1))) / 2.0)
+
+
+def convex_hull_2d(points: np.ndarray) -> np.ndarray:
+    """
+    Выпуклая оболочка точек на плоскости
+
+    Args:
+        points: Точки (N, 2)
+
+    Returns:
+        np.ndarray: Вершины оболочки против часовой стрелки (H, 2); для
+        вырожденного набора (точки на прямой) — углы его габарита
+    """
+    from scipy.spatial import ConvexHull, QhullError
+
+    points = np.unique(np.asarray(points, dtype=np.float64), axis=0)
+    try:
+        hull = ConvexHull(points)
+    except (QhullError, ValueError):
+        lo, hi = points.min(axis=0), points.max(axis=0)
+        return np.array([[lo[0], lo[1]], [hi[0], lo[1]], [hi[0], hi[1]], [lo[0], hi[1]]])
+    return points[hull.vertices]
@@ -0,0 +1,3 @@
+"""
+Модуль облаков точек
+"""
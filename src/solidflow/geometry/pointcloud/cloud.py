@@ -0,0 +1,243 @@
+"""
+Облако точек и прореживание по вокселям
+
+Облака со сканеров содержат до сотен миллионов точек и читаются из файла без
+копирования (``np.memmap``), поэтому все операции идут порциями по
+``CHUNK_POINTS`` точек: в памяти одновременно находится только несколько
+порций, а порции обрабатываются параллельно в пуле потоков (сортировка и
+свертка NumPy отпускают GIL).
+
+Прореживание: точка относится к ячейке решетки с шагом ``voxel_size``,
+ячейка кодируется одним целым числом, и по каждой порции считаются суммы
+координат (цветов) и количество точек в ячейке — ``np.unique`` по кодам
+вместо хеш-таблицы. Частичные суммы порций сливаются тем же способом, и
+результат — центр масс точек каждой ячейки.
+"""
+
+import logging
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+_log = logging.getLogger("SolidFlow.PointCloud")
+
+# Точек в одной порции обработки
+CHUNK_POINTS = 4_000_000
+
+
+@dataclass
+class PointCloud:
+    """
+    Облако точек
+
+    Attributes:
+        points: Координаты (N, 3); может быть представлением файла без копирования
+        colors: Цвета RGB (N, 3) uint8 или None
+        normals: Нормали (N, 3) или None
+    """
+
+    points: np.ndarray
+    colors: Optional[np.ndarray] = None
+    normals: Optional[np.ndarray] = None
+
+    @property
+    def n_points(self) -> int:
+        """Количество точек"""
+        return int(len(self.points))
+
+    def bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Габарит облака (считается порциями)
+
+        Returns:
+            tuple: (минимум (3,), максимум (3,))
+        """
+        if not self.n_points:
+            raise ValueError("Облако точек пустое")
+        lo = np.full(3, np.inf)
+        hi = np.full(3, -np.inf)
+        for start in range(0, self.n_points, CHUNK_POINTS):
+            chunk = self.points[start : start + CHUNK_POINTS]
+            lo = np.minimum(lo, chunk.min(axis=0))
+            hi = np.maximum(hi, chunk.max(axis=0))
+        return lo, hi
+
+    def downsample(self, voxel_size: float, **kwargs) -> "PointCloud":
+        """
+        Прореженное облако: центр масс точек каждой ячейки
+
+        Args:
+            voxel_size: Размер ячейки
+            **kwargs: Параметры voxel_downsample
+
+        Returns:
+            PointCloud: Прореженное облако
+        """
+        points, colors, _ = voxel_downsample(self.points, voxel_size, self.colors, **kwargs)
+        return PointCloud(points=points, colors=colors)
+
+    def to_polydata(self):
+        """
+        Облако как PyVista PolyData из вершин (цвета — массив "RGB")
+
+        Returns:
+            pv.PolyData: Точки с вершинами-ячейками
+        """
+        import pyvista as pv
+
+        cloud = pv.PolyData(np.ascontiguousarray(self.points, dtype=np.float32))
+        if self.colors is not None:
+            cloud.point_data["RGB"] = np.ascontiguousarray(self.colors, dtype=np.uint8)
+        return cloud
+
+
+def map_chunks(fn, n: int, max_workers=None, check=None, progress=None) -> List:
+    """
+    Выполнить fn(start, stop) над порциями по CHUNK_POINTS в пуле потоков
+
+    Args:
+        fn: Функция порции
+        n: Количество точек
+        max_workers: Количество потоков (по умолчанию — число ядер)
+        check: Функция проверки отмены
+        progress: Функция прогресса 0..100
+
+    Returns:
+        list: Результаты порций по порядку
+    """
+    chunks = [(start, min(start + CHUNK_POINTS, n)) for start in range(0, n, CHUNK_POINTS)]
+    workers = max_workers or os.cpu_count() or 1
+    results = []
+    if len(chunks) <= 1 or workers == 1:
+        for index, (start, stop) in enumerate(chunks):
+            if check is not None:
+                check()
+            results.append(fn(start, stop))
+            if progress is not None:
+                progress(int(100 * (index + 1) / len(chunks)))
+        return results
+
+    def collect():
+        if check is not None:
+            check()
+        results.append(pending.popleft().result())
+        if progress is not None:
+            progress(int(100 * len(results) / len(chunks)))
+
+    # Не больше двух порций на поток в очереди: ограничивает память под результаты
+    pool = ThreadPoolExecutor(max_workers=workers)
+    pending = deque()
+    try:
+        for start, stop in chunks:
+            pending.append(pool.submit(fn, start, stop))
+            if len(pending) >= 2 * workers:
+                collect()
+        while pending:
+            collect()
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+    return results
+
+
+def aggregate_cells(keys: np.ndarray, *values: np.ndarray, counts: np.ndarray = None):
+    """
+    Свернуть значения по кодам ячеек
+
+    Args:
+        keys: Коды ячеек (N,)
+        *values: Массивы (N, k), суммируемые по ячейкам
+        counts: Веса строк (N,) (по умолчанию 1 — каждая строка одна точка)
+
+    Returns:
+        tuple: (коды ячеек по возрастанию (M,), количество (M,), суммы values...)
+    """
+    unique, inverse = np.unique(keys, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    weights = None if counts is None else counts.astype(np.float64)
+    total = np.bincount(inverse, weights=weights, minlength=len(unique)).astype(np.int64)
+    sums = []
+    for value in values:
+        value = np.asarray(value, dtype=np.float64)
+        sums.append(
+            np.stack(
+                [
+                    np.bincount(inverse, weights=value[:, k], minlength=len(unique))
+                    for k in range(value.shape[1])
+                ],
+                axis=1,
+            )
+        )
+    return (unique, total, *sums)
+
+
+def merge_cells(parts: List[tuple]):
+    """
+    Слить частичные свертки порций (результаты aggregate_cells)
+
+    Returns:
+        tuple: (коды, количество, суммы...) как у aggregate_cells
+    """
+    if len(parts) == 1:
+        return parts[0]
+    keys = np.concatenate([p[0] for p in parts])
+    counts = np.concatenate([p[1] for p in parts])
+    values = [np.concatenate([p[k] for p in parts]) for k in range(2, len(parts[0]))]
+    return aggregate_cells(keys, *values, counts=counts)
+
+
+def voxel_downsample(
+    points: np.ndarray,
+    voxel_size: float,
+    colors: Optional[np.ndarray] = None,
+    origin: Optional[np.ndarray] = None,
+    max_workers: Optional[int] = None,
+    check: Callable[[], None] = None,
+    progress: Callable[[int], None] = None,
+):
+    """
+    Прореживание облака по решетке: одна точка (центр масс) на ячейку
+
+    Args:
+        points: Координаты (N, 3)
+        voxel_size: Размер ячейки
+        colors: Цвета (N, 3) или None (усредняются по ячейке)
+        origin: Угол решетки (по умолчанию — минимум габарита)
+        max_workers: Количество потоков (по умолчанию — число ядер)
+        check: Функция проверки отмены (например, TaskContext.check)
+        progress: Функция прогресса 0..100 (например, TaskContext.progress)
+
+    Returns:
+        tuple: (точки (M, 3), цвета (M, 3) uint8 или None, точек в ячейке (M,))
+    """
+    if not voxel_size > 0:
+        raise ValueError("Размер ячейки должен быть положительным")
+    cloud = PointCloud(points=points, colors=colors)
+    lo, hi = cloud.bounds()
+    if origin is None:
+        origin = lo
+    origin = np.asarray(origin, dtype=np.float64)
+    dims = np.floor((hi - origin) / voxel_size).astype(np.int64) + 1
+    if np.any(lo < origin) or np.log2(dims.astype(np.float64)).sum() >= 62:
+        raise ValueError("Решетка прореживания не покрывает облако или слишком мелкая")
+
+    def chunk(start, stop):
+        block = np.asarray(points[start:stop], dtype=np.float64)
+        cell = np.floor((block - origin) / voxel_size).astype(np.int64)
+        np.minimum(cell, dims - 1, out=cell)
+        keys = (cell[:, 0] * dims[1] + cell[:, 1]) * dims[2] + cell[:, 2]
+        if colors is None:
+            return aggregate_cells(keys, block)
+        return aggregate_cells(keys, block, colors[start:stop])
+
+    merged = merge_cells(map_chunks(chunk, cloud.n_points, max_workers, check, progress))
+    counts = merged[1]
+    means = merged[2] / counts[:, None]
+    mean_colors = None
+    if colors is not None:
+        mean_colors = np.clip(np.rint(merged[3] / counts[:, None]), 0, 255).astype(np.uint8)
+    _log.info("Voxel downsample %.4g: %d -> %d points", voxel_size, cloud.n_points, len(counts))
+    return means, mean_colors, counts
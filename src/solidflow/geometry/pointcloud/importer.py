@@ -0,0 +1,79 @@
+"""
+Импорт облаков точек из PLY
+
+Двоичный PLY читается без копирования: блок вершин отображается в память
+(``np.memmap``) как массив записей, и координаты, цвета и нормали — это
+представления с шагом записи поверх тех же страниц файла. Страницы читаются
+операционной системой по мере обращения, поэтому открытие облака в сотни
+миллионов точек не требует памяти под весь файл. Заголовок и блоки элементов
+разбираются общим кодом с импортом mesh (``solidflow.geometry.mesh.ply``).
+"""
+
+import logging
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+
+from solidflow.geometry.mesh.ply import field_view, ply_vertex_records, read_ply_header
+from solidflow.geometry.pointcloud.cloud import PointCloud
+
+_log = logging.getLogger("SolidFlow.PointCloudImporter")
+
+
+class PointCloudImporter:
+    """Класс для импорта облаков точек"""
+
+    @staticmethod
+    def load(file_path: Union[str, Path]) -> PointCloud:
+        """
+        Загрузить облако точек из PLY (вершины; грани, если есть, пропускаются)
+
+        Args:
+            file_path: Путь к PLY файлу
+
+        Returns:
+            PointCloud: Облако; для двоичного PLY массивы отображены на файл
+
+        Raises:
+            FileNotFoundError: Если файл не найден
+            ValueError: Если файл не является корректным PLY с вершинами
+        """
+        file_path = Path(file_path)
+        if not file_path.exists():
+            raise FileNotFoundError(f"Файл не найден: {file_path}")
+        if file_path.suffix.lower() != ".ply":
+            raise ValueError(f"Ожидается .ply файл, получен: {file_path.suffix}")
+
+        header = read_ply_header(file_path)
+        records = ply_vertex_records(file_path, header)
+        names = records.dtype.names
+
+        cloud = PointCloud(
+            points=field_view(records, ("x", "y", "z")),
+            colors=_color_view(records),
+            normals=(
+                field_view(records, ("nx", "ny", "nz"))
+                if all(n in names for n in ("nx", "ny", "nz"))
+                else None
+            ),
+        )
+        _log.info(
+            "Loaded point cloud %s: %d points (%s)", file_path.name, cloud.n_points, header.format
+        )
+        return cloud
+
+
+def _color_view(records: np.ndarray) -> Optional[np.ndarray]:
+    """Цвета вершин uint8 (N, 3) или None"""
+    names = records.dtype.names
+    for channels in (("red", "green", "blue"), ("diffuse_red", "diffuse_green", "diffuse_blue")):
+        if all(c in names for c in channels):
+            if all(records.dtype.fields[c][0].itemsize == 1 for c in channels):
+                return field_view(records, channels).view(np.uint8)
+            # Цвета в других типах (например, float 0..1) приводятся к 0..255
+            colors = field_view(records, channels).astype(np.float64)
+            if colors.size and colors.max() <= 1.0:
+                colors = colors * 255.0
+            return np.clip(np.rint(colors), 0, 255).astype(np.uint8)
+    return None
@@ -0,0 +1,185 @@
+"""
+Октодерево облака точек для отображения с уровнями детализации
+
+Габарит облака — куб, разбиваемый на 8 частей до глубины ``depth``. Ячейка
+уровня кодируется кодом Мортона (биты x, y, z чередуются), поэтому код
+родителя — код ячейки, сдвинутый на 3 бита. Самый подробный уровень строится
+порциями по облаку (``map_chunks``), каждый следующий — сверткой предыдущего,
+без повторного чтения точек. Для уровня хранятся суммы координат (цветов) и
+количество точек ячеек; точка уровня — центр масс ячейки.
+
+Для отображения выбирается самый подробный уровень, укладывающийся в бюджет
+точек: на уровне L не больше 8^L точек, и соседние уровни отличаются по
+количеству точек примерно в 4 раза для поверхностей сканов.
+"""
+
+import logging
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from solidflow.geometry.pointcloud.cloud import (
+    PointCloud,
+    aggregate_cells,
+    map_chunks,
+    merge_cells,
+)
+
+_log = logging.getLogger("SolidFlow.PointOctree")
+
+
+def morton_codes(cells: np.ndarray) -> np.ndarray:
+    """
+    Коды Мортона целочисленных координат ячеек (до 21 бита на ось)
+
+    Args:
+        cells: Координаты ячеек (N, 3), неотрицательные
+
+    Returns:
+        np.ndarray: Коды (N,) int64
+    """
+    codes = np.zeros(len(cells), dtype=np.int64)
+    for axis in range(3):
+        v = cells[:, axis].astype(np.int64) & 0x1FFFFF
+        # Раздвинуть биты: между соседними — по два нулевых
+        v = (v | (v << 32)) & 0x1F00000000FFFF
+        v = (v | (v << 16)) & 0x1F0000FF0000FF
+        v = (v | (v << 8)) & 0x100F00F00F00F00F
+        v = (v | (v << 4)) & 0x10C30C30C30C30C3
+        v = (v | (v << 2)) & 0x1249249249249249
+        codes |= v << (2 - axis)
+    return codes
+
+
+class PointOctree:
+    """Уровни детализации облака точек по октодереву"""
+
+    # Глубина самого подробного уровня (1024 ячейки по стороне куба)
+    MAX_DEPTH = 10
+
+    def __init__(self, bounds: Tuple[np.ndarray, np.ndarray], levels: List[tuple]):
+        """
+        Инициализация (см. build)
+
+        Args:
+            bounds: Габарит облака (минимум (3,), максимум (3,)); угол куба
+                октодерева — минимум габарита, сторона — наибольший размер
+            levels: Свертки уровней 0..depth: (коды, количество, суммы координат[, цветов])
+        """
+        self.bounds = tuple(np.asarray(b, dtype=np.float64) for b in bounds)
+        self.origin = self.bounds[0]
+        self.size = max(float((self.bounds[1] - self.bounds[0]).max()), 1e-12)
+        self.levels = levels
+
+    @classmethod
+    def build(
+        cls,
+        cloud: PointCloud,
+        depth: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        check: Callable[[], None] = None,
+        progress: Callable[[int], None] = None,
+    ) -> "PointOctree":
+        """
+        Построить октодерево облака
+
+        Args:
+            cloud: Облако точек
+            depth: Глубина (по умолчанию MAX_DEPTH)
+            max_workers: Количество потоков (по умолчанию — число ядер)
+            check: Функция проверки отмены (например, TaskContext.check)
+            progress: Функция прогресса 0..100 (например, TaskContext.progress)
+
+        Returns:
+            PointOctree: Октодерево
+        """
+        depth = int(depth if depth is not None else cls.MAX_DEPTH)
+        if not 0 <= depth <= 21:
+            raise ValueError("Глубина октодерева должна быть от 0 до 21")
+        lo, hi = cloud.bounds()
+        size = max(float((hi - lo).max()), 1e-12)
+        cells_per_side = 1 << depth
+        cell = size / cells_per_side
+        points, colors = cloud.points, cloud.colors
+
+        def chunk(start, stop):
+            block = np.asarray(points[start:stop], dtype=np.float64)
+            ijk = np.floor((block - lo) / cell).astype(np.int64)
+            np.clip(ijk, 0, cells_per_side - 1, out=ijk)
+            keys = morton_codes(ijk)
+            if colors is None:
+                return aggregate_cells(keys, block)
+            return aggregate_cells(keys, block, colors[start:stop])
+
+        stage = None if progress is None else (lambda value: progress(int(0.9 * value)))
+        levels = [merge_cells(map_chunks(chunk, cloud.n_points, max_workers, check, stage))]
+        for _ in range(depth):
+            if check is not None:
+                check()
+            keys, counts, *sums = levels[0]
+            levels.insert(0, aggregate_cells(keys >> 3, *sums, counts=counts))
+        if progress is not None:
+            progress(100)
+
+        _log.info(
+            "Octree of %d points: depth %d, %d leaf cells",
+            cloud.n_points,
+            depth,
+            len(levels[-1][0]),
+        )
+        return cls((lo, hi), levels)
+
+    @property
+    def depth(self) -> int:
+        """Глубина самого подробного уровня"""
+        return len(self.levels) - 1
+
+    def level_size(self, level: int) -> int:
+        """Количество точек уровня"""
+        return int(len(self.levels[level][0]))
+
+    def level_for(self, budget: int) -> int:
+        """
+        Самый подробный уровень, укладывающийся в бюджет точек
+
+        Args:
+            budget: Наибольшее количество точек
+
+        Returns:
+            int: Номер уровня (0, если даже корень не укладывается)
+        """
+        level = 0
+        for index in range(len(self.levels)):
+            if self.level_size(index) > budget:
+                break
+            level = index
+        return level
+
+    def level(self, level: int) -> PointCloud:
+        """
+        Точки уровня: центры масс ячеек
+
+        Args:
+            level: Номер уровня 0..depth
+
+        Returns:
+            PointCloud: Облако уровня
+        """
+        _, counts, *sums = self.levels[level]
+        points = sums[0] / counts[:, None]
+        colors = None
+        if len(sums) > 1:
+            colors = np.clip(np.rint(sums[1] / counts[:, None]), 0, 255).astype(np.uint8)
+        return PointCloud(points=points, colors=colors)
+
+    def lod(self, budget: int) -> PointCloud:
+        """
+        Облако для отображения не больше чем из budget точек
+
+        Args:
+            budget: Наибольшее количество точек
+
+        Returns:
+            PointCloud: Облако самого подробного подходящего уровня
+        """
+        return self.level(self.level_for(budget))
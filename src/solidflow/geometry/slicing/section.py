@@ -0,0 +1,177 @@
+"""
+Интерактивное сечение модели плоскостью
+
+Индекс интервалов граней вдоль нормали плоскости строится один раз
+(``SectionPlane``); при перемещении плоскости пересекаются только грани из
+корзины индекса, в которую попадает плоскость. Для отображения контур
+сечения собирается в линии (``contour_polydata``), заливка среза — в
+треугольники (``cap_polydata``).
+"""
+
+import logging
+from pathlib import Path
+from typing import Tuple, Union
+
+import numpy as np
+
+from solidflow.geometry.slicing.slicer import SliceResult, Slicer, plane_basis
+
+_log = logging.getLogger("SolidFlow.SectionPlane")
+
+
+class SectionPlane:
+    """Сечения модели плоскостями с фиксированной нормалью"""
+
+    def __init__(self, mesh, normal=(0.0, 0.0, 1.0)):
+        """
+        Инициализация: объединение вершин и индекс интервалов граней
+
+        Args:
+            mesh: PyVista или trimesh mesh объект
+            normal: Нормаль плоскости сечения
+        """
+        self.mesh = mesh
+        self.slicer = Slicer(mesh, direction=normal, max_workers=1)
+        self.normal = self.slicer.direction
+
+    @property
+    def bounds(self) -> Tuple[float, float]:
+        """Диапазон положений плоскости вдоль нормали"""
+        return self.slicer.intervals.bounds
+
+    def offset(self, origin) -> float:
+        """Положение плоскости через точку origin вдоль нормали"""
+        return float(np.asarray(origin, dtype=np.float64) @ self.normal)
+
+    def cut(self, origin) -> SliceResult:
+        """
+        Сечение плоскостью через точку origin
+
+        Args:
+            origin: Точка плоскости (3,)
+
+        Returns:
+            SliceResult: Один слой с контурами сечения
+        """
+        return self.slicer.section(self.offset(origin))
+
+
+def _loop_lines(result: SliceResult, closed_only: bool = False) -> np.ndarray:
+    """Ячейки линий VTK для контуров результата: [n, i0, i1, ..., n, ...]"""
+    cells = []
+    for c in range(result.n_loops):
+        closed = bool(result.loop_closed[c])
+        if closed_only and not closed:
+            continue
+        ids = np.arange(result.loop_offsets[c], result.loop_offsets[c + 1])
+        if closed:
+            ids = np.append(ids, ids[0])
+        cells.append(np.concatenate([[len(ids)], ids]))
+    return np.concatenate(cells) if cells else np.zeros(0, dtype=np.int64)
+
+
+def contour_polydata(result: SliceResult):
+    """
+    Контуры сечения как ломаные
+
+    Args:
+        result: Сечения (все слои)
+
+    Returns:
+        pv.PolyData: Линии контуров
+    """
+    import pyvista as pv
+
+    lines = _loop_lines(result)
+    if not len(lines):
+        return pv.PolyData()
+    return pv.PolyData(result.points, lines=lines)
+
+
+def cap_polydata(result: SliceResult):
+    """
+    Заливка замкнутых контуров сечения (с учетом отверстий)
+
+    vtkContourTriangulator растет быстрее числа точек контура: у тора в 2 млн
+    треугольников (4 тыс. точек) заливка занимает ~20 мс при сечении ~3 мс,
+    в 8 млн (8 тыс. точек) — 40-85 мс при сечении ~6 мс, в 10 млн — в среднем
+    ~235 мс. Поэтому viewport при перемещении плоскости заливает только
+    небольшие срезы (Config.SECTION_DRAG_CAP_POINTS).
+
+    Args:
+        result: Сечения (все слои)
+
+    Returns:
+        pv.PolyData: Треугольники заливки
+    """
+    import pyvista as pv
+    from vtkmodules.vtkFiltersGeneral import vtkContourTriangulator
+
+    lines = _loop_lines(result, closed_only=True)
+    if not len(lines):
+        return pv.PolyData()
+
+    triangulator = vtkContourTriangulator()
+    triangulator.SetInputData(pv.PolyData(result.points, lines=lines))
+    triangulator.Update()
+    return pv.wrap(triangulator.GetOutput())
+
+
+def export_contours(result: SliceResult, file_path: Union[str, Path]):
+    """
+    Экспортировать контуры сечения
+
+    Форматы по расширению:
+    - .svg: контуры в координатах плоскости сечения, мм (отверстия — правило evenodd);
+    - .csv: точки контуров в координатах модели (слой, контур, x, y, z).
+
+    Args:
+        result: Сечения
+        file_path: Путь к файлу
+
+    Raises:
+        ValueError: Если формат не поддерживается
+    """
+    path = Path(file_path)
+    suffix = path.suffix.lower()
+    if suffix == ".svg":
+        path.write_text(_contours_svg(result), encoding="utf-8")
+    elif suffix == ".csv":
+        rows = ["layer,loop,x,y,z"]
+        for c in range(result.n_loops):
+            layer = int(result.loop_layer[c])
+            for x, y, z in result.points[result.loop_offsets[c] : result.loop_offsets[c + 1]]:
+                rows.append(f"{layer},{c},{x:.6f},{y:.6f},{z:.6f}")
+        path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+    else:
+        raise ValueError(f"Неподдерживаемый формат контуров: {path.suffix}")
+    _log.info("Exported %d section loops to %s", result.n_loops, path)
+
+
+def _contours_svg(result: SliceResult) -> str:
+    """SVG с контурами всех слоев (ось Y направлена вверх)"""
+    basis = plane_basis(result.direction)[:2].T
+    flat = result.points @ basis if len(result.points) else np.zeros((0, 2))
+    if len(flat):
+        low, high = flat.min(axis=0), flat.max(axis=0)
+    else:
+        low, high = np.zeros(2), np.ones(2)
+    size = np.maximum(high - low, 1e-6)
+
+    paths = []
+    for layer in np.unique(result.loop_layer):
+        commands = []
+        for c in np.flatnonzero(result.loop_layer == layer):
+            loop = flat[result.loop_offsets[c] : result.loop_offsets[c + 1]]
+            coords = " L ".join(f"{x - low[0]:.4f} {high[1] - y:.4f}" for x, y in loop)
+            commands.append(f"M {coords}" + (" Z" if result.loop_closed[c] else ""))
+        paths.append(
+            f'  <path d="{" ".join(commands)}" fill="none" stroke="black" '
+            f'stroke-width="0.1" fill-rule="evenodd"/>'
+        )
+
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg" '
+        f'width="{size[0]:.4f}mm" height="{size[1]:.4f}mm" '
+        f'viewBox="0 0 {size[0]:.4f} {size[1]:.4f}">\n' + "\n".join(paths) + "\n</svg>\n"
+    )
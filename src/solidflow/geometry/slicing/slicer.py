@@ -0,0 +1,560 @@
+"""
+Послойные сечения mesh
+
+Вместо сечения VTK на каждую плоскость:
+
+* грани один раз упорядочиваются по интервалу высот (``FaceIntervals``); для
+  пакета слоев активные грани — префикс по нижней высоте, отфильтрованный по
+  верхней, а каждая активная грань дает пары (слой, грань) сразу для всех
+  пересекаемых слоев пакета;
+* отрезки пересечения считаются векторно для всех пар пакета;
+* отрезки сцепляются в контуры по ключам концов: конец отрезка лежит на ребре
+  mesh, и следующий отрезок контура начинается на том же ребре (ключ — слой и
+  пара номеров вершин ребра); обход контуров — удвоение указателей.
+
+Вершина на плоскости считается лежащей выше нее, поэтому каждая пересекаемая
+грань дает ровно один отрезок. Отрезки ориентированы так, что внешние контуры
+обходятся против часовой стрелки (если смотреть против направления сечения),
+отверстия — по часовой: площадь слоя — сумма знаковых площадей контуров.
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from solidflow.geometry.mesh.arrays import mesh_arrays, weld_vertices
+
+_log = logging.getLogger("SolidFlow.Slicer")
+
+
+def plane_basis(direction) -> np.ndarray:
+    """
+    Ортонормированный базис (u, v, d) с u x v = d
+
+    Args:
+        direction: Нормаль плоскостей сечения (3,)
+
+    Returns:
+        np.ndarray: Матрица 3x3, строки — u, v, d
+    """
+    d = np.asarray(direction, dtype=np.float64).reshape(3)
+    length = np.linalg.norm(d)
+    if length == 0:
+        raise ValueError("Направление сечения не может быть нулевым")
+    d = d / length
+    if abs(d[2]) > 0.9:
+        # Для сечений вдоль Z базис совпадает с осями X, Y
+        helper = np.array([0.0, np.sign(d[2]), 0.0])
+    elif abs(d[0]) < 0.9:
+        helper = np.array([1.0, 0.0, 0.0])
+    else:
+        helper = np.array([0.0, 1.0, 0.0])
+    u = np.cross(helper, d)
+    u /= np.linalg.norm(u)
+    return np.vstack([u, np.cross(d, u), d])
+
+
+class FaceIntervals:
+    """Индекс граней по интервалам высот вдоль направления"""
+
+    # Классов протяженности граней по высоте: класс c — протяженность не больше
+    # высоты модели / 2**(SPAN_CLASSES - c); более короткие грани — в классе 0
+    SPAN_CLASSES = 24
+
+    def __init__(self, vertices: np.ndarray, faces: np.ndarray, direction=(0.0, 0.0, 1.0)):
+        """
+        Инициализация
+
+        Args:
+            vertices: Вершины (N, 3)
+            faces: Треугольники (M, 3)
+            direction: Направление, вдоль которого откладываются высоты
+        """
+        self.basis = plane_basis(direction)
+        self.direction = self.basis[2]
+        self.vertex_heights = np.asarray(vertices, dtype=np.float64) @ self.direction
+
+        z = self.vertex_heights[faces]
+        zmin, zmax = z.min(axis=1), z.max(axis=1)
+        # Грани по возрастанию нижней высоты
+        self.order = np.argsort(zmin, kind="stable")
+        self.zmin = zmin[self.order]
+        self.zmax = zmax[self.order]
+        self._classes = None
+
+    @property
+    def bounds(self):
+        """Диапазон высот (нижняя, верхняя)"""
+        if not len(self.zmin):
+            return 0.0, 0.0
+        return float(self.zmin[0]), float(self.zmax.max())
+
+    def crossing(self, height: float) -> np.ndarray:
+        """
+        Грани, пересекаемые плоскостью на высоте height
+
+        В каждом классе протяженности кандидаты — грани с нижней высотой в
+        окне (height - протяженность класса, height): два двоичных поиска,
+        затем фильтр по верхней высоте. Протяженность грани класса больше
+        половины окна, поэтому кандидатов не больше чем примерно вдвое больше
+        пересекаемых граней.
+
+        Returns:
+            np.ndarray: Номера граней (zmin < height <= zmax)
+        """
+        spans, offsets, members, lows = self._span_index()
+        found = []
+        for c in range(len(spans)):
+            start, stop = offsets[c], offsets[c + 1]
+            if start == stop:
+                continue
+            window = lows[start:stop]
+            lo = start + np.searchsorted(window, height - spans[c], side="left")
+            hi = start + np.searchsorted(window, height, side="left")
+            candidates = members[lo:hi]
+            found.append(candidates[self.zmax[candidates] >= height])
+        if not found:
+            return np.zeros(0, dtype=np.int64)
+        return self.order[np.sort(np.concatenate(found))]
+
+    def _span_index(self):
+        """
+        Грани, сгруппированные по классам протяженности по высоте
+
+        Каждая грань хранится один раз: память индекса — O(M) независимо от
+        высоты модели и толщины слоев. Строится при первом запросе.
+
+        Returns:
+            tuple: (наибольшая протяженность граней класса (C,), начала классов (C + 1,),
+            позиции граней в порядке order, сгруппированные по классам и
+            упорядоченные по нижней высоте внутри класса, их нижние высоты)
+        """
+        if self._classes is None:
+            lo, hi = self.bounds
+            limit = (hi - lo) / 2.0**self.SPAN_CLASSES
+            if not limit > 0.0:
+                limit = 1.0
+            span = self.zmax - self.zmin
+            klass = np.ceil(np.log2(np.maximum(span / limit, 1.0))).astype(np.int64)
+            klass = np.minimum(klass, self.SPAN_CLASSES)
+            # Устойчивая сортировка сохраняет порядок по нижней высоте в классе
+            members = np.argsort(klass, kind="stable")
+            offsets = np.searchsorted(klass[members], np.arange(self.SPAN_CLASSES + 2))
+            # Окно поиска класса — наибольшая фактическая протяженность его граней
+            spans = np.zeros(self.SPAN_CLASSES + 1)
+            filled = np.flatnonzero(np.diff(offsets))
+            if len(filled):
+                spans[filled] = np.maximum.reduceat(span[members], offsets[filled])
+            self._classes = (spans, offsets, members, self.zmin[members])
+        return self._classes
+
+    def layer_ranges(self, heights: np.ndarray):
+        """
+        Слои, пересекаемые каждой гранью
+
+        Args:
+            heights: Высоты слоев по возрастанию (L,)
+
+        Returns:
+            tuple: (первый слой, слой после последнего) для граней в порядке order
+        """
+        start = np.searchsorted(heights, self.zmin, side="right")
+        end = np.searchsorted(heights, self.zmax, side="right")
+        return start, end
+
+
+@dataclass
+class SliceResult:
+    """
+    Послойные контуры
+
+    Точки всех контуров хранятся подряд; контур c — точки
+    points[loop_offsets[c]:loop_offsets[c + 1]]. У замкнутого контура последняя
+    точка соединяется с первой.
+
+    Attributes:
+        direction: Нормаль плоскостей сечения (3,)
+        heights: Высоты слоев вдоль направления (L,)
+        points: Точки контуров (P, 3)
+        loop_offsets: Начала контуров в points (C + 1,)
+        loop_layer: Слой каждого контура (C,)
+        loop_closed: Замкнут ли контур (C,)
+        area: Площадь сечения каждого слоя (L,) — по замкнутым контурам
+        perimeter: Длина контуров каждого слоя (L,)
+    """
+
+    direction: np.ndarray
+    heights: np.ndarray
+    points: np.ndarray
+    loop_offsets: np.ndarray
+    loop_layer: np.ndarray
+    loop_closed: np.ndarray
+    area: np.ndarray
+    perimeter: np.ndarray
+
+    @property
+    def n_layers(self) -> int:
+        """Количество слоев"""
+        return len(self.heights)
+
+    @property
+    def n_loops(self) -> int:
+        """Количество контуров"""
+        return len(self.loop_layer)
+
+    def layer_loops(self, layer: int) -> List[np.ndarray]:
+        """
+        Контуры слоя
+
+        Args:
+            layer: Номер слоя
+
+        Returns:
+            list: Массивы точек (K, 3) контуров слоя
+        """
+        ids = np.flatnonzero(self.loop_layer == layer)
+        return [self.points[self.loop_offsets[c] : self.loop_offsets[c + 1]] for c in ids]
+
+    def layer_polygons(self, layer: int) -> List[np.ndarray]:
+        """
+        Замкнутые контуры слоя в координатах плоскости сечения
+
+        Returns:
+            list: Массивы точек (K, 2); внешние контуры — против часовой стрелки
+        """
+        basis = plane_basis(self.direction)[:2].T
+        ids = np.flatnonzero((self.loop_layer == layer) & self.loop_closed)
+        return [self.points[self.loop_offsets[c] : self.loop_offsets[c + 1]] @ basis for c in ids]
+
+    def summary(self) -> Dict[str, any]:
+        """
+        Сводка по сечениям
+
+        Returns:
+            dict: Количество слоев и контуров, незамкнутые контуры, площади
+        """
+        return {
+            "layers": self.n_layers,
+            "loops": self.n_loops,
+            "open_loops": int((~self.loop_closed).sum()),
+            "max_area": float(self.area.max()) if self.n_layers else 0.0,
+            "total_perimeter": float(self.perimeter.sum()),
+        }
+
+
+class Slicer:
+    """Послойные сечения mesh параллельными плоскостями"""
+
+    # Слоев в одном пакете (единица параллельной обработки)
+    LAYER_BATCH = 64
+
+    def __init__(self, mesh, direction=(0.0, 0.0, 1.0), max_workers: Optional[int] = None):
+        """
+        Инициализация
+
+        Args:
+            mesh: PyVista или trimesh mesh объект
+            direction: Нормаль плоскостей сечения
+            max_workers: Количество потоков (по умолчанию — число ядер)
+        """
+        self.mesh = mesh
+        self.max_workers = max_workers
+
+        vertices, faces = mesh_arrays(mesh)
+        # Ключи ребер — по объединенным вершинам: у соседних граней STL
+        # вершины могут быть продублированы
+        unique, welded = weld_vertices(vertices, faces)
+        valid = (
+            (welded[:, 0] != welded[:, 1])
+            & (welded[:, 1] != welded[:, 2])
+            & (welded[:, 2] != welded[:, 0])
+        )
+
+        self._vertices = vertices
+        self._faces = faces[valid]
+        self._welded = welded[valid]
+        self._n_welded = len(unique)
+        self.intervals = FaceIntervals(vertices, self._faces, direction)
+        self.direction = self.intervals.direction
+
+    def layer_heights(self, layer_height: float, first_layer: Optional[float] = None):
+        """
+        Высоты слоев: середины слоев толщиной layer_height от низа модели
+
+        Args:
+            layer_height: Толщина слоя
+            first_layer: Толщина первого слоя (по умолчанию равна layer_height)
+
+        Returns:
+            np.ndarray: Высоты плоскостей сечения (L,)
+        """
+        if layer_height <= 0:
+            raise ValueError("Толщина слоя должна быть положительной")
+        low, high = self.intervals.bounds
+        first = layer_height if first_layer is None else float(first_layer)
+        if high - low <= 0:
+            return np.zeros(0)
+        rest = max(0.0, high - low - first)
+        count = int(np.ceil(rest / layer_height - 1e-9))
+        heights = low + first + layer_height * (np.arange(count) + 0.5)
+        return np.concatenate([[low + 0.5 * first], heights])
+
+    def slice(
+        self,
+        layer_height: Optional[float] = None,
+        heights=None,
+        check: Callable[[], None] = None,
+        progress: Callable[[int], None] = None,
+    ) -> SliceResult:
+        """
+        Построить сечения
+
+        Args:
+            layer_height: Толщина слоя (если heights не заданы)
+            heights: Высоты плоскостей сечения вдоль направления
+            check: Функция проверки отмены (например, TaskContext.check)
+            progress: Функция прогресса 0..100 (например, TaskContext.progress)
+
+        Returns:
+            SliceResult: Контуры, площади и периметры слоев
+        """
+        if heights is None:
+            if layer_height is None:
+                raise ValueError("Нужно задать толщину слоя или высоты сечений")
+            heights = self.layer_heights(layer_height)
+        heights = np.sort(np.asarray(heights, dtype=np.float64).reshape(-1))
+
+        start, end = self.intervals.layer_ranges(heights)
+        n = len(heights)
+        batches = [(s, min(s + self.LAYER_BATCH, n)) for s in range(0, n, self.LAYER_BATCH)]
+        workers = self.max_workers or os.cpu_count() or 1
+
+        parts = []
+        if len(batches) <= 1 or workers == 1:
+            for i, (lo, hi) in enumerate(batches):
+                if check is not None:
+                    check()
+                parts.append(self._slice_batch(heights, start, end, lo, hi))
+                if progress is not None:
+                    progress(int(100 * (i + 1) / len(batches)))
+        else:
+            pool = ThreadPoolExecutor(max_workers=workers)
+            futures = [
+                pool.submit(self._slice_batch, heights, start, end, lo, hi) for lo, hi in batches
+            ]
+            try:
+                for i, future in enumerate(futures):
+                    if check is not None:
+                        check()
+                    parts.append(future.result())
+                    if progress is not None:
+                        progress(int(100 * (i + 1) / len(batches)))
+            finally:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+        result = self._merge(heights, parts)
+        _log.info(
+            "Sliced %d layers: %d loops (%d open)",
+            result.n_layers,
+            result.n_loops,
+            int((~result.loop_closed).sum()),
+        )
+        return result
+
+    def section(self, height: float) -> SliceResult:
+        """
+        Одно сечение на высоте height
+
+        Пересекаемые грани берутся из индекса интервалов, поэтому стоимость
+        определяется числом граней у плоскости, а не размером модели.
+
+        Args:
+            height: Высота плоскости вдоль направления
+
+        Returns:
+            SliceResult: Один слой
+        """
+        heights = np.array([float(height)])
+        face = self.intervals.crossing(height)
+        layer = np.zeros(len(face), dtype=np.int64)
+        return self._merge(heights, [self._slice_pairs(heights, layer, face, 0)])
+
+    def _slice_batch(self, heights, start, end, lo: int, hi: int):
+        """Отрезки и контуры слоев [lo, hi)"""
+        # Активные грани пакета: начинаются ниже верхнего слоя и заканчиваются выше нижнего
+        prefix = np.searchsorted(start, hi, side="left")
+        active = np.flatnonzero(end[:prefix] > lo)
+        first = np.maximum(start[active], lo)
+        counts = np.minimum(end[active], hi) - first
+        keep = counts > 0
+        active, first, counts = active[keep], first[keep], counts[keep]
+
+        # Пары (слой, грань)
+        total = int(counts.sum())
+        offsets = np.repeat(np.cumsum(counts) - counts, counts)
+        layer = np.repeat(first, counts) + (np.arange(total) - offsets)
+        face = self.intervals.order[np.repeat(active, counts)]
+        return self._slice_pairs(heights, layer, face, lo)
+
+    def _slice_pairs(self, heights, layer: np.ndarray, face: np.ndarray, lo: int):
+        """Отрезки пар (слой, грань) и их контуры; слои пар не меньше lo"""
+        segments = self._segments(heights[layer], face)
+        start_point, end_point, start_edge, end_edge = segments
+
+        # Ключи концов: слой в пакете и ребро
+        nv = np.int64(self._n_welded)
+        local = (layer - lo).astype(np.int64)
+        start_keys = (local * nv + start_edge[:, 0]) * nv + start_edge[:, 1]
+        end_keys = (local * nv + end_edge[:, 0]) * nv + end_edge[:, 1]
+        chains = _chain(start_keys, end_keys)
+        return layer, start_point, end_point, chains
+
+    def _segments(self, h: np.ndarray, face: np.ndarray):
+        """
+        Отрезки пересечения граней с плоскостями
+
+        Отрезок идет от точки на ребре, где грань уходит вниз через плоскость,
+        к точке на ребре, где она поднимается: при обходе граней против часовой
+        стрелки снаружи внешние контуры обходятся против часовой стрелки.
+
+        Returns:
+            tuple: (начала (S, 3), концы (S, 3), ребра начал (S, 2), ребра концов (S, 2))
+        """
+        tri = self._faces[face]
+        welded = self._welded[face]
+        z = self.intervals.vertex_heights[tri]
+        above = z >= h[:, None]
+
+        nxt = np.array([1, 2, 0])
+        going_up = ~above & above[:, nxt]
+        going_down = above & ~above[:, nxt]
+        up = np.argmax(going_up, axis=1)
+        down = np.argmax(going_down, axis=1)
+
+        rows = np.arange(len(face))
+
+        def edge_point(edge):
+            a, b = edge, nxt[edge]
+            za, zb = z[rows, a], z[rows, b]
+            t = (h - za) / (zb - za)
+            pa = self._vertices[tri[rows, a]]
+            pb = self._vertices[tri[rows, b]]
+            key = np.sort(np.column_stack([welded[rows, a], welded[rows, b]]), axis=1)
+            return pa + t[:, None] * (pb - pa), key
+
+        start_point, start_edge = edge_point(down)
+        end_point, end_edge = edge_point(up)
+        return start_point, end_point, start_edge, end_edge
+
+    def _merge(self, heights, parts) -> SliceResult:
+        """Собрать результат из пакетов"""
+        basis = self.intervals.basis
+        n = len(heights)
+        area = np.zeros(n)
+        perimeter = np.zeros(n)
+        points, offsets, loop_layer, loop_closed = [], [np.zeros(1, dtype=np.int64)], [], []
+        base = 0
+
+        for layer, start_point, end_point, chains in parts:
+            if not len(layer):
+                continue
+            order, loop_start, closed = chains
+
+            p0 = start_point @ basis[:2].T
+            p1 = end_point @ basis[:2].T
+            lengths = np.linalg.norm(p1 - p0, axis=1)
+            perimeter += np.bincount(layer, weights=lengths, minlength=n)
+
+            # Площадь — по отрезкам замкнутых контуров (формула шнурования)
+            segment_closed = np.repeat(closed, np.diff(np.append(loop_start, len(order))))
+            cross = p0[order, 0] * p1[order, 1] - p0[order, 1] * p1[order, 0]
+            area += np.bincount(layer[order], weights=0.5 * cross * segment_closed, minlength=n)
+
+            # Точки: начала отрезков, у незамкнутых контуров еще и конец последнего
+            counts = np.diff(np.append(loop_start, len(order)))
+            open_ids = np.flatnonzero(~closed)
+            last = order[loop_start[open_ids] + counts[open_ids] - 1]
+            point_counts = counts + ~closed
+            insert_at = loop_start[open_ids] + counts[open_ids]
+            loop_points = np.insert(start_point[order], insert_at, end_point[last], axis=0)
+
+            points.append(loop_points)
+            offsets.append(base + np.cumsum(point_counts))
+            base += len(loop_points)
+            loop_layer.append(layer[order[loop_start]])
+            loop_closed.append(closed)
+
+        return SliceResult(
+            direction=self.direction,
+            heights=heights,
+            points=np.concatenate(points) if points else np.zeros((0, 3)),
+            loop_offsets=np.concatenate(offsets),
+            loop_layer=np.concatenate(loop_layer) if loop_layer else np.zeros(0, dtype=np.int64),
+            loop_closed=np.concatenate(loop_closed) if loop_closed else np.zeros(0, dtype=bool),
+            area=area,
+            perimeter=perimeter,
+        )
+
+
+def _chain(start_keys: np.ndarray, end_keys: np.ndarray):
+    """
+    Сцепить отрезки в контуры по совпадению ключа конца с ключом начала
+
+    Args:
+        start_keys: Ключи начал отрезков (S,)
+        end_keys: Ключи концов отрезков (S,)
+
+    Returns:
+        tuple: (порядок отрезков по контурам (S,), начала контуров в порядке (C,),
+        замкнут ли контур (C,))
+    """
+    n = len(start_keys)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool)
+    idx = np.arange(n)
+
+    # Следующий отрезок — тот, что начинается на ребре конца текущего
+    by_start = np.argsort(start_keys, kind="stable")
+    sorted_keys = start_keys[by_start]
+    pos = np.minimum(np.searchsorted(sorted_keys, end_keys), n - 1)
+    succ = np.where(sorted_keys[pos] == end_keys, by_start[pos], -1)
+    # Неманифолдные ребра: у отрезка остается не больше одного предшественника
+    linked = np.flatnonzero(succ >= 0)
+    _, first = np.unique(succ[linked], return_index=True)
+    duplicate = np.ones(len(linked), dtype=bool)
+    duplicate[first] = False
+    succ[linked[duplicate]] = -1
+
+    steps = int(np.ceil(np.log2(n))) + 1
+
+    # Циклы: после 2^steps переходов отрезок незамкнутой цепочки приходит в ее
+    # конец; метка цикла — минимальный номер отрезка в нем
+    tail = succ < 0
+    jump = np.where(tail, idx, succ)
+    label = idx.copy()
+    for _ in range(steps):
+        label = np.minimum(label, label[jump])
+        jump = jump[jump]
+    in_cycle = ~tail[jump]
+
+    # Разрываем циклы перед минимальным отрезком: все контуры становятся цепочками
+    breaks = in_cycle & (succ == label)
+    succ = np.where(breaks, -1, succ)
+
+    # Расстояние до конца цепочки (удвоение указателей)
+    tail = succ < 0
+    jump = np.where(tail, idx, succ)
+    rank = (~tail).astype(np.int64)
+    for _ in range(steps):
+        rank = rank + rank[jump]
+        jump = jump[jump]
+
+    order = np.lexsort((-rank, jump))
+    chain = jump[order]
+    loop_start = np.flatnonzero(np.r_[True, chain[1:] != chain[:-1]])
+    closed = in_cycle[order[loop_start]]
+    return order, loop_start, closed
@@ -0,0 +1,690 @@
+"""
+BVH (bounding volume hierarchy) по треугольникам mesh
+
+Дерево хранится в плоских массивах NumPy: границы узлов, индексы потомков и
+диапазоны треугольников листьев. Построение — LBVH: треугольники сортируются по
+кодам Мортона центров, над отсортированным порядком строится сбалансированное
+бинарное дерево. Запросы выполняются пакетно: обход идет "фронтом" пар
+(запрос, узел) одновременно для всех запросов пакета, пакеты распределяются по потокам.
+Объем фронта ограничен, поэтому память не зависит от формы модели.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from solidflow.geometry.mesh.arrays import mesh_arrays
+
+
+def _expand_bits(v: np.ndarray) -> np.ndarray:
+    """Раздвинуть 10 бит так, чтобы между ними было по два нулевых бита"""
+    v = v.astype(np.uint32)
+    v = (v * np.uint32(0x00010001)) & np.uint32(0xFF0000FF)
+    v = (v * np.uint32(0x00000101)) & np.uint32(0x0F00F00F)
+    v = (v * np.uint32(0x00000011)) & np.uint32(0xC30C30C3)
+    v = (v * np.uint32(0x00000005)) & np.uint32(0x49249249)
+    return v
+
+
+def morton_codes(points: np.ndarray) -> np.ndarray:
+    """
+    30-битные коды Мортона точек
+
+    Args:
+        points: Точки (N, 3)
+
+    Returns:
+        np.ndarray: Коды (N,) uint32
+    """
+    lo = points.min(axis=0)
+    extent = np.maximum(points.max(axis=0) - lo, 1e-30)
+    q = np.clip(((points - lo) / extent) * 1023.0, 0, 1023).astype(np.uint32)
+    return (_expand_bits(q[:, 0]) << 2) | (_expand_bits(q[:, 1]) << 1) | _expand_bits(q[:, 2])
+
+
+class BVH:
+    """
+    BVH по треугольникам в плоских массивах
+
+    Attributes:
+        node_lo, node_hi: Границы узлов (K, 3)
+        node_left, node_right: Индексы потомков (K,), -1 для листьев
+        node_start, node_count: Диапазон треугольников листа в порядке ``order``
+        order: Номера исходных граней в порядке листьев (M,)
+    """
+
+    # Треугольников в листе
+    LEAF_SIZE = 8
+
+    # Запросов в одном пакете обхода
+    BATCH_SIZE = 16384
+
+    # Максимум пар (запрос, узел) во фронте обхода — ограничивает память
+    MAX_FRONTIER = 1 << 17
+
+    # Этапы длины луча (доли диагонали модели) при поиске ближайшего пересечения
+    RAY_STAGES = (1 / 64, 1 / 8, 1.0)
+
+    # Массивы дерева, сохраняемые в дисковом кэше
+    TREE_ARRAYS = (
+        "order",
+        "node_left",
+        "node_right",
+        "node_start",
+        "node_count",
+        "node_lo",
+        "node_hi",
+    )
+
+    def __init__(
+        self,
+        vertices: np.ndarray,
+        faces: np.ndarray,
+        leaf_size: int = None,
+        tree: Optional[Dict[str, np.ndarray]] = None,
+    ):
+        """
+        Построить BVH
+
+        Args:
+            vertices: Вершины (N, 3)
+            faces: Треугольники (M, 3)
+            leaf_size: Треугольников в листе
+            tree: Готовые массивы дерева (см. ``tree_arrays``) — построение пропускается
+        """
+        self.vertices = np.asarray(vertices, dtype=np.float64)
+        self.faces = np.asarray(faces, dtype=np.int64)
+        if len(self.faces) == 0:
+            raise ValueError("Mesh не содержит граней")
+
+        if tree is None:
+            self.leaf_size = int(leaf_size or self.LEAF_SIZE)
+            self._build()
+        else:
+            self._restore(tree)
+
+    @classmethod
+    def from_mesh(cls, mesh, leaf_size: int = None) -> "BVH":
+        """Построить BVH по PyVista или trimesh mesh"""
+        vertices, faces = mesh_arrays(mesh)
+        return cls(vertices, faces, leaf_size)
+
+    @property
+    def n_faces(self) -> int:
+        return len(self.faces)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.node_left)
+
+    def tree_arrays(self) -> Dict[str, np.ndarray]:
+        """
+        Массивы дерева для сохранения
+
+        Треугольники не сохраняются: они восстанавливаются из mesh по ``order``.
+
+        Returns:
+            dict: Имя массива -> массив
+        """
+        arrays = {name: getattr(self, name) for name in self.TREE_ARRAYS}
+        arrays["params"] = np.array([self.leaf_size, self.depth], dtype=np.int64)
+        return arrays
+
+    def _restore(self, tree: Dict[str, np.ndarray]):
+        """Восстановить дерево из сохраненных массивов"""
+        for name in self.TREE_ARRAYS:
+            setattr(self, name, np.asarray(tree[name]))
+        self.leaf_size, self.depth = (int(x) for x in tree["params"])
+        if len(self.order) != len(self.faces):
+            raise ValueError("Массивы BVH не соответствуют mesh")
+        self._prepare_triangles()
+
+    def _prepare_triangles(self):
+        """Данные треугольников в порядке листьев"""
+        n_faces = len(self.faces)
+        # Обратная перестановка: позиция грани в порядке листьев
+        self.face_slot = np.empty(n_faces, dtype=np.int64)
+        self.face_slot[self.order] = np.arange(n_faces)
+        tri = self.vertices[self.faces[self.order]]
+        # Вершина и два ребра (для пересечений)
+        self.tri_v0 = tri[:, 0]
+        self.tri_e1 = tri[:, 1] - tri[:, 0]
+        self.tri_e2 = tri[:, 2] - tri[:, 0]
+        self.triangles = tri
+        self._node_vertex = None
+        self.diagonal = float(np.linalg.norm(self.vertices.max(axis=0) - self.vertices.min(axis=0)))
+
+    def _build(self):
+        n_faces = len(self.faces)
+        centers = self.vertices[self.faces].mean(axis=1)
+        self.order = np.argsort(morton_codes(centers), kind="stable")
+        self._prepare_triangles()
+        tri = self.triangles
+
+        leaf = self.leaf_size
+        n_leaves = (n_faces + leaf - 1) // leaf
+        n_nodes = 2 * n_leaves - 1
+
+        self.node_left = np.full(n_nodes, -1, dtype=np.int64)
+        self.node_right = np.full(n_nodes, -1, dtype=np.int64)
+        self.node_start = np.zeros(n_nodes, dtype=np.int64)
+        self.node_count = np.zeros(n_nodes, dtype=np.int64)
+        self.node_lo = np.empty((n_nodes, 3))
+        self.node_hi = np.empty((n_nodes, 3))
+
+        # Сверху вниз по уровням: узел покрывает диапазон листьев [a, b)
+        a = np.array([0])
+        b = np.array([n_leaves])
+        ids = np.array([0])
+        next_id = 1
+        levels = []
+        while len(ids):
+            levels.append(ids)
+            is_leaf = (b - a) == 1
+            leaf_ids, leaf_a = ids[is_leaf], a[is_leaf]
+            self.node_start[leaf_ids] = leaf_a * leaf
+            self.node_count[leaf_ids] = np.minimum(leaf, n_faces - leaf_a * leaf)
+
+            inner = ~is_leaf
+            ia, ib, iid = a[inner], b[inner], ids[inner]
+            mid = (ia + ib) // 2
+            left = next_id + 2 * np.arange(len(iid))
+            right = left + 1
+            next_id += 2 * len(iid)
+            self.node_left[iid] = left
+            self.node_right[iid] = right
+            a = np.concatenate([ia, mid])
+            b = np.concatenate([mid, ib])
+            ids = np.concatenate([left, right])
+        self.depth = len(levels)
+
+        # Границы листьев — редукция по диапазонам треугольников
+        is_leaf = self.node_left < 0
+        leaf_ids = np.flatnonzero(is_leaf)
+        leaf_ids = leaf_ids[np.argsort(self.node_start[leaf_ids])]
+        starts = self.node_start[leaf_ids]
+        self.node_lo[leaf_ids] = np.minimum.reduceat(tri.min(axis=1), starts, axis=0)
+        self.node_hi[leaf_ids] = np.maximum.reduceat(tri.max(axis=1), starts, axis=0)
+
+        # Границы внутренних узлов — снизу вверх
+        for ids in reversed(levels):
+            inner = ids[self.node_left[ids] >= 0]
+            if len(inner):
+                l, r = self.node_left[inner], self.node_right[inner]
+                self.node_lo[inner] = np.minimum(self.node_lo[l], self.node_lo[r])
+                self.node_hi[inner] = np.maximum(self.node_hi[l], self.node_hi[r])
+
+    # ------------------------------------------------------------------
+    # Выполнение пакетами
+    # ------------------------------------------------------------------
+
+    def _batched(self, fn, n: int, max_workers: Optional[int], *arrays):
+        """Разбить запросы на пакеты и выполнить в пуле потоков"""
+        batch = self.BATCH_SIZE
+        ranges = [(s, min(s + batch, n)) for s in range(0, n, batch)]
+        if len(ranges) <= 1 or max_workers == 1:
+            return [fn(*(arr[s:e] for arr in arrays)) for s, e in ranges]
+
+        workers = max_workers or os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(fn, *(arr[s:e] for arr in arrays)) for s, e in ranges]
+            return [f.result() for f in futures]
+
+    def _pop_frontier(self, stack):
+        """
+        Снять со стека часть фронта обхода не больше MAX_FRONTIER пар
+
+        Потомки обработанной части кладутся поверх остатка, поэтому обход идет
+        "в глубину" по частям фронта и память ограничена даже для запросов, у
+        которых отсечение почти не работает (например, центр сферы).
+        """
+        queries, nodes = stack.pop()
+        limit = self.MAX_FRONTIER
+        if len(queries) > limit:
+            stack.append((queries[limit:], nodes[limit:]))
+            queries, nodes = queries[:limit], nodes[:limit]
+        return queries, nodes
+
+    def _children(self, queries: np.ndarray, nodes: np.ndarray):
+        """Пары (запрос, потомок) для внутренних узлов"""
+        return (
+            np.concatenate([queries, queries]),
+            np.concatenate([self.node_left[nodes], self.node_right[nodes]]),
+        )
+
+    def _expand_leaves(self, query: np.ndarray, nodes: np.ndarray):
+        """Развернуть пары (запрос, лист) в пары (запрос, треугольник)"""
+        counts = self.node_count[nodes]
+        total = int(counts.sum())
+        rep = np.repeat(np.arange(len(nodes)), counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        return query[rep], self.node_start[nodes][rep] + offsets
+
+    # ------------------------------------------------------------------
+    # Лучи
+    # ------------------------------------------------------------------
+
+    def intersect_rays(
+        self,
+        origins: np.ndarray,
+        directions: np.ndarray,
+        t_min: float = 0.0,
+        t_max: float = np.inf,
+        ignore_faces: Optional[np.ndarray] = None,
+        max_workers: Optional[int] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Найти ближайшее пересечение каждого луча с треугольниками
+
+        Args:
+            origins: Начала лучей (R, 3)
+            directions: Направления лучей (R, 3)
+            t_min: Минимальный параметр пересечения
+            t_max: Максимальный параметр пересечения
+            ignore_faces: Номер грани, игнорируемой для каждого луча (R,), -1 — нет
+            max_workers: Количество потоков (по умолчанию — число ядер)
+
+        Returns:
+            tuple: (параметр t (R,), inf если нет пересечения; номер грани (R,), -1 если нет)
+        """
+        origins = np.asarray(origins, dtype=np.float64).reshape(-1, 3)
+        directions = np.asarray(directions, dtype=np.float64).reshape(-1, 3)
+        n = len(origins)
+        if ignore_faces is None:
+            ignore_faces = np.full(n, -1, dtype=np.int64)
+        ignore_faces = np.asarray(ignore_faces, dtype=np.int64)
+
+        def run(o, d, ign):
+            return self._intersect_batch(o, d, ign, t_min, t_max)
+
+        results = self._batched(run, n, max_workers, origins, directions, ignore_faces)
+        if not results:
+            return np.zeros(0), np.zeros(0, dtype=np.int64)
+        t = np.concatenate([r[0] for r in results])
+        face = np.concatenate([r[1] for r in results])
+        return t, face
+
+    def _intersect_batch(self, origins, directions, ignore, t_min, t_max):
+        """
+        Пересечения пакета лучей с поэтапным увеличением длины луча
+
+        Обход в ширину не может отсечь узлы до того, как найдено пересечение,
+        поэтому сначала лучи ограничиваются малой долей диагонали модели: для
+        тонких стенок и близких пересечений обход затрагивает только соседние
+        узлы. Лучи без пересечения повторяются с большей длиной.
+        """
+        n = len(origins)
+        t_best = np.full(n, np.inf)
+        hit_slot = np.full(n, -1, dtype=np.int64)
+        # Нулевые компоненты направления заменяем малыми, чтобы избежать NaN в slab-тесте
+        safe = np.where(np.abs(directions) < 1e-300, 1e-300, directions)
+        inv_dir = 1.0 / safe
+
+        # Запрещенная грань — в порядке листьев
+        ignore_slot = np.full(n, -1, dtype=np.int64)
+        has_ignore = ignore >= 0
+        ignore_slot[has_ignore] = self.face_slot[ignore[has_ignore]]
+
+        # Длина в единицах параметра t: направления не обязаны быть единичными
+        scale = self.diagonal / np.maximum(np.linalg.norm(directions, axis=1), 1e-300)
+        pending = np.arange(n)
+        previous = np.full(n, t_min, dtype=np.float64)
+        for fraction in self.RAY_STAGES:
+            limit = np.minimum(scale[pending] * fraction, t_max)
+            last = fraction >= 1.0
+            if last:
+                limit = np.full(len(pending), t_max, dtype=np.float64)
+            t, slot = self._intersect_segment(
+                origins[pending],
+                directions[pending],
+                inv_dir[pending],
+                ignore_slot[pending],
+                previous[pending],
+                limit,
+            )
+            found = slot >= 0
+            t_best[pending[found]] = t[found]
+            hit_slot[pending[found]] = slot[found]
+            # Следующий этап начинается с конца уже проверенного отрезка
+            rest = ~found & (limit < t_max)
+            previous[pending[rest]] = limit[rest]
+            pending = pending[rest]
+            if last or not len(pending):
+                break
+
+        face = np.where(hit_slot >= 0, self.order[np.maximum(hit_slot, 0)], -1)
+        return t_best, face
+
+    def _intersect_segment(self, origins, directions, inv_dir, ignore_slot, t_min, t_max):
+        """Обход в ширину для лучей на отрезках (t_min, t_max]; t_min, t_max — массивы"""
+        n = len(origins)
+        t_best = t_max.copy()
+        hit_slot = np.full(n, -1, dtype=np.int64)
+
+        stack = [(np.arange(n), np.zeros(n, dtype=np.int64))]
+        while stack:
+            rays, nodes = self._pop_frontier(stack)
+            t_near, t_far = self._slab(origins[rays], inv_dir[rays], nodes)
+            keep = (t_far >= np.maximum(t_near, t_min[rays])) & (t_near <= t_best[rays])
+            rays, nodes = rays[keep], nodes[keep]
+
+            is_leaf = self.node_left[nodes] < 0
+            if np.any(is_leaf):
+                r, slot = self._expand_leaves(rays[is_leaf], nodes[is_leaf])
+                t = self._ray_triangle(origins[r], directions[r], slot)
+                ok = (t > t_min[r]) & (t <= t_best[r]) & (slot != ignore_slot[r])
+                r, slot, t = r[ok], slot[ok], t[ok]
+                if len(r):
+                    # Ближайшее пересечение для каждого луча
+                    first = np.lexsort((t, r))
+                    r, slot, t = r[first], slot[first], t[first]
+                    head = np.concatenate([[True], r[1:] != r[:-1]])
+                    t_best[r[head]] = t[head]
+                    hit_slot[r[head]] = slot[head]
+
+            inner = ~is_leaf
+            if np.any(inner):
+                stack.append(self._children(rays[inner], nodes[inner]))
+
+        t_best[hit_slot < 0] = np.inf
+        return t_best, hit_slot
+
+    def _slab(self, origins, inv_dir, nodes):
+        """Пересечение лучей с AABB узлов: (t входа, t выхода)"""
+        t1 = (self.node_lo[nodes] - origins) * inv_dir
+        t2 = (self.node_hi[nodes] - origins) * inv_dir
+        t_lo = np.minimum(t1, t2)
+        t_hi = np.maximum(t1, t2)
+        t_near = np.maximum(np.maximum(t_lo[:, 0], t_lo[:, 1]), t_lo[:, 2])
+        t_far = np.minimum(np.minimum(t_hi[:, 0], t_hi[:, 1]), t_hi[:, 2])
+        return t_near, t_far
+
+    def _ray_triangle(self, origins, directions, slots) -> np.ndarray:
+        """Пересечение луч-треугольник (Möller–Trumbore), inf если нет пересечения"""
+        e1, e2 = self.tri_e1[slots], self.tri_e2[slots]
+        p = np.cross(directions, e2)
+        det = np.einsum("ij,ij->i", e1, p)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inv_det = 1.0 / det
+            s = origins - self.tri_v0[slots]
+            u = np.einsum("ij,ij->i", s, p) * inv_det
+            q = np.cross(s, e1)
+            v = np.einsum("ij,ij->i", directions, q) * inv_det
+            t = np.einsum("ij,ij->i", e2, q) * inv_det
+            valid = (np.abs(det) > 1e-14) & (u >= 0.0) & (v >= 0.0) & (u + v <= 1.0)
+        return np.where(valid, t, np.inf)
+
+    # ------------------------------------------------------------------
+    # Ближайшая точка
+    # ------------------------------------------------------------------
+
+    def closest_point(
+        self,
+        points: np.ndarray,
+        max_distance=np.inf,
+        max_workers: Optional[int] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Найти ближайшую точку поверхности для каждой точки запроса
+
+        Args:
+            points: Точки запроса (Q, 3)
+            max_distance: Радиус поиска — число или массив (Q,); узлы дальше
+                радиуса не обходятся
+            max_workers: Количество потоков (по умолчанию — число ядер)
+
+        Returns:
+            tuple: (ближайшие точки (Q, 3), расстояния (Q,), номера граней (Q,));
+            для точек без поверхности в радиусе поиска — NaN, inf и -1
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        limit = np.broadcast_to(np.asarray(max_distance, dtype=np.float64), (len(points),))
+        results = self._batched(self._closest_batch, len(points), max_workers, points, limit)
+        if not results:
+            return np.zeros((0, 3)), np.zeros(0), np.zeros(0, dtype=np.int64)
+        closest = np.concatenate([r[0] for r in results])
+        dist = np.concatenate([r[1] for r in results])
+        face = np.concatenate([r[2] for r in results])
+        return closest, dist, face
+
+    def _box_distance_sq(self, points, nodes) -> np.ndarray:
+        d = np.maximum(self.node_lo[nodes] - points, 0.0) + np.maximum(
+            points - self.node_hi[nodes], 0.0
+        )
+        return np.einsum("ij,ij->i", d, d)
+
+    def _node_vertices(self) -> np.ndarray:
+        """Вершина первого треугольника каждого узла (K, 3) — лежит на поверхности узла"""
+        if self._node_vertex is None:
+            first = np.arange(self.n_nodes)
+            while True:
+                inner = self.node_left[first] >= 0
+                if not np.any(inner):
+                    break
+                first[inner] = self.node_left[first[inner]]
+            self._node_vertex = self.triangles[self.node_start[first], 0]
+        return self._node_vertex
+
+    def _triangle_bounds_sq(self, points, slots):
+        """
+        Оценки квадрата расстояния от точек до треугольников без точного расчета
+
+        Returns:
+            tuple: (нижние оценки — до AABB треугольников, верхние — до ближайшей вершины)
+        """
+        tri = self.triangles[slots]
+        v0, v1, v2 = tri[:, 0], tri[:, 1], tri[:, 2]
+        lo = np.minimum(np.minimum(v0, v1), v2)
+        hi = np.maximum(np.maximum(v0, v1), v2)
+        d = np.maximum(lo - points, 0.0) + np.maximum(points - hi, 0.0)
+        lower = np.einsum("ij,ij->i", d, d)
+        upper = None
+        for v in (v0, v1, v2):
+            d = v - points
+            dist_sq = np.einsum("ij,ij->i", d, d)
+            upper = dist_sq if upper is None else np.minimum(upper, dist_sq)
+        return lower, upper
+
+    def _points_triangles(self, points, slots):
+        """Ближайшие точки на треугольниках и квадраты расстояний"""
+        from trimesh.triangles import closest_point
+
+        closest = closest_point(self.triangles[slots], points)
+        diff = closest - points
+        return closest, np.einsum("ij,ij->i", diff, diff)
+
+    def _closest_batch(self, points, limit):
+        n = len(points)
+        best_sq = np.square(limit)
+        best_point = np.full((n, 3), np.nan)
+        best_slot = np.full(n, -1, dtype=np.int64)
+        # Верхняя оценка расстояния до поверхности: узлы и треугольники дальше нее
+        # не проверяются. Уточняется по вершинам узлов на каждом уровне обхода, поэтому
+        # отсечение работает и при сильно перекрывающихся боксах (кривые поверхности)
+        bound_sq = best_sq.copy()
+        node_vertex = self._node_vertices()
+
+        def _update(q, slot):
+            lower, upper = self._triangle_bounds_sq(points[q], slot)
+            np.minimum.at(bound_sq, q, upper)
+            near = lower <= bound_sq[q]
+            q, slot = q[near], slot[near]
+            closest, dist_sq = self._points_triangles(points[q], slot)
+            better = dist_sq < best_sq[q]
+            q, slot, closest, dist_sq = q[better], slot[better], closest[better], dist_sq[better]
+            if len(q):
+                np.minimum.at(best_sq, q, dist_sq)
+                winner = dist_sq == best_sq[q]
+                best_slot[q[winner]] = slot[winner]
+                best_point[q[winner]] = closest[winner]
+                np.minimum(bound_sq, best_sq, out=bound_sq)
+
+        stack = [(np.arange(n), np.zeros(n, dtype=np.int64))]
+        while stack:
+            queries, nodes = self._pop_frontier(stack)
+            diff = node_vertex[nodes] - points[queries]
+            np.minimum.at(bound_sq, queries, np.einsum("ij,ij->i", diff, diff))
+            keep = self._box_distance_sq(points[queries], nodes) <= bound_sq[queries]
+            queries, nodes = queries[keep], nodes[keep]
+
+            is_leaf = self.node_left[nodes] < 0
+            if np.any(is_leaf):
+                _update(*self._expand_leaves(queries[is_leaf], nodes[is_leaf]))
+
+            inner = ~is_leaf
+            if np.any(inner):
+                stack.append(self._children(queries[inner], nodes[inner]))
+
+        found = best_slot >= 0
+        dist = np.where(found, np.sqrt(best_sq), np.inf)
+        return best_point, dist, np.where(found, self.order[np.maximum(best_slot, 0)], -1)
+
+    # ------------------------------------------------------------------
+    # k ближайших граней
+    # ------------------------------------------------------------------
+
+    def nearest_faces(
+        self,
+        points: np.ndarray,
+        k: int = 1,
+        max_distance=np.inf,
+        max_workers: Optional[int] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Найти k ближайших граней для каждой точки запроса
+
+        Args:
+            points: Точки запроса (Q, 3)
+            k: Количество граней
+            max_distance: Радиус поиска — число или массив (Q,)
+            max_workers: Количество потоков (по умолчанию — число ядер)
+
+        Returns:
+            tuple: (расстояния (Q, k), номера граней (Q, k)) по возрастанию расстояния;
+            если в радиусе меньше k граней, недостающие — inf и -1
+        """
+        if k < 1:
+            raise ValueError("Количество ближайших граней должно быть положительным")
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        limit = np.broadcast_to(np.asarray(max_distance, dtype=np.float64), (len(points),))
+
+        def run(p, lim):
+            return self._knn_batch(p, lim, k)
+
+        results = self._batched(run, len(points), max_workers, points, limit)
+        if not results:
+            return np.zeros((0, k)), np.zeros((0, k), dtype=np.int64)
+        dist = np.concatenate([r[0] for r in results])
+        face = np.concatenate([r[1] for r in results])
+        return dist, face
+
+    def _knn_batch(self, points, limit, k):
+        n = len(points)
+        # Отсортированные k лучших; незаполненные позиции держат радиус поиска
+        best_sq = np.repeat(np.square(limit)[:, None], k, axis=1)
+        best_slot = np.full((n, k), -1, dtype=np.int64)
+
+        def _merge(q, slot):
+            near = self._triangle_bounds_sq(points[q], slot)[0] < best_sq[q, -1]
+            q, slot = q[near], slot[near]
+            _, dist_sq = self._points_triangles(points[q], slot)
+            keep = dist_sq < best_sq[q, -1]
+            q, slot, dist_sq = q[keep], slot[keep], dist_sq[keep]
+            if not len(q):
+                return
+            # Объединяем кандидатов с текущими k лучшими затронутых запросов
+            rows = np.unique(q)
+            all_q = np.concatenate([np.repeat(rows, k), q])
+            all_d = np.concatenate([best_sq[rows].ravel(), dist_sq])
+            all_s = np.concatenate([best_slot[rows].ravel(), slot])
+            order = np.lexsort((all_d, all_q))
+            all_q, all_d, all_s = all_q[order], all_d[order], all_s[order]
+            starts = np.searchsorted(all_q, rows)
+            counts = np.diff(np.append(starts, len(all_q)))
+            rank = np.arange(len(all_q)) - np.repeat(starts, counts)
+            top = rank < k
+            best_sq[all_q[top], rank[top]] = all_d[top]
+            best_slot[all_q[top], rank[top]] = all_s[top]
+
+        stack = [(np.arange(n), np.zeros(n, dtype=np.int64))]
+        while stack:
+            queries, nodes = self._pop_frontier(stack)
+            keep = self._box_distance_sq(points[queries], nodes) < best_sq[queries, -1]
+            queries, nodes = queries[keep], nodes[keep]
+
+            is_leaf = self.node_left[nodes] < 0
+            if np.any(is_leaf):
+                _merge(*self._expand_leaves(queries[is_leaf], nodes[is_leaf]))
+
+            inner = ~is_leaf
+            if np.any(inner):
+                stack.append(self._children(queries[inner], nodes[inner]))
+
+        found = best_slot >= 0
+        dist = np.where(found, np.sqrt(best_sq), np.inf)
+        return dist, np.where(found, self.order[np.maximum(best_slot, 0)], -1)
+
+    # ------------------------------------------------------------------
+    # Пересечение с боксами
+    # ------------------------------------------------------------------
+
+    def query_aabb(
+        self, lo: np.ndarray, hi: np.ndarray, max_workers: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Найти грани, AABB которых пересекается с заданными боксами
+
+        Args:
+            lo: Минимальные углы боксов (Q, 3)
+            hi: Максимальные углы боксов (Q, 3)
+            max_workers: Количество потоков (по умолчанию — число ядер)
+
+        Returns:
+            tuple: Пары (номер бокса (K,), номер грани (K,)), упорядоченные по боксу и грани
+        """
+        lo = np.asarray(lo, dtype=np.float64).reshape(-1, 3)
+        hi = np.asarray(hi, dtype=np.float64).reshape(-1, 3)
+        results = self._batched(self._aabb_batch, len(lo), max_workers, lo, hi)
+        if not results:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        # Номера боксов внутри пакета — в глобальные
+        offsets = np.arange(len(results)) * self.BATCH_SIZE
+        box = np.concatenate([r[0] + offset for r, offset in zip(results, offsets)])
+        face = np.concatenate([r[1] for r in results])
+        return box, face
+
+    def _aabb_batch(self, lo, hi):
+        n = len(lo)
+        found_box, found_slot = [], []
+
+        stack = [(np.arange(n), np.zeros(n, dtype=np.int64))]
+        while stack:
+            boxes, nodes = self._pop_frontier(stack)
+            overlap = np.all(self.node_lo[nodes] <= hi[boxes], axis=1) & np.all(
+                self.node_hi[nodes] >= lo[boxes], axis=1
+            )
+            boxes, nodes = boxes[overlap], nodes[overlap]
+
+            is_leaf = self.node_left[nodes] < 0
+            if np.any(is_leaf):
+                b, slot = self._expand_leaves(boxes[is_leaf], nodes[is_leaf])
+                tri = self.triangles[slot]
+                ok = np.all(tri.min(axis=1) <= hi[b], axis=1) & np.all(
+                    tri.max(axis=1) >= lo[b], axis=1
+                )
+                found_box.append(b[ok])
+                found_slot.append(slot[ok])
+
+            inner = ~is_leaf
+            if np.any(inner):
+                stack.append(self._children(boxes[inner], nodes[inner]))
+
+        if not found_box:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        box = np.concatenate(found_box)
+        face = self.order[np.concatenate(found_slot)]
+        order = np.lexsort((face, box))
+        return box[order], face[order]
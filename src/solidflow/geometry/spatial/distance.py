@@ -0,0 +1,81 @@
+"""
+Расстояние со знаком до поверхности mesh
+
+Запросы выполняет компилированный локатор VTK (vtkImplicitPolyDataDistance):
+обход дерева и расстояние до треугольников считаются в C++ без GIL, а сами
+точки обрабатываются параллельно потоками vtkSMPTools. Это в несколько раз
+быстрее обхода BVH на numpy, когда запросов много и радиус поиска неизвестен
+(например, вся поверхность сдвинута сглаживанием или упрощением).
+"""
+
+import threading
+from typing import Optional
+
+import numpy as np
+
+from solidflow.geometry.mesh.arrays import arrays_to_polydata
+
+_smp_guard = threading.Lock()
+
+
+def _use_threads(max_workers: Optional[int]):
+    """
+    Включить многопоточный бэкенд vtkSMPTools
+
+    По умолчанию VTK из колеса pip выполняет фильтры последовательно. Настройка
+    глобальная для процесса: max_workers=None — все ядра.
+    """
+    from vtkmodules.vtkCommonCore import vtkSMPTools
+
+    with _smp_guard:
+        if max_workers == 1:
+            return
+        if vtkSMPTools.GetBackend() == "Sequential":
+            vtkSMPTools.SetBackend("STDThread")
+        vtkSMPTools.Initialize(int(max_workers or 0))
+
+
+class SurfaceDistance:
+    """Расстояние со знаком от точек до поверхности (отрицательное — внутри)"""
+
+    def __init__(self, vertices: np.ndarray, faces: np.ndarray, max_workers: Optional[int] = None):
+        """
+        Инициализация
+
+        Args:
+            vertices: Вершины поверхности (N, 3)
+            faces: Треугольники (M, 3)
+            max_workers: Потоков для запросов (по умолчанию — все ядра)
+        """
+        from vtkmodules.vtkFiltersCore import vtkImplicitPolyDataDistance
+
+        _use_threads(max_workers)
+        self._function = vtkImplicitPolyDataDistance()
+        self._function.SetInput(arrays_to_polydata(vertices, faces))
+
+    def signed(self, points: np.ndarray) -> np.ndarray:
+        """
+        Расстояние со знаком до ближайшей точки поверхности
+
+        Знак — по нормали в ближайшей точке: положительный снаружи.
+
+        Args:
+            points: Точки (K, 3)
+
+        Returns:
+            np.ndarray: Расстояния (K,)
+        """
+        import pyvista as pv
+        from vtkmodules.util.numpy_support import vtk_to_numpy
+        from vtkmodules.vtkFiltersGeneral import vtkSampleImplicitFunctionFilter
+
+        points = np.asarray(points, dtype=np.float64)
+        if not len(points):
+            return np.zeros(0)
+        sampler = vtkSampleImplicitFunctionFilter()
+        sampler.SetImplicitFunction(self._function)
+        sampler.ComputeGradientsOff()
+        sampler.SetInputData(pv.PolyData(points))
+        sampler.Update()
+        scalars = sampler.GetOutput().GetPointData().GetArray("Implicit scalars")
+        return np.array(vtk_to_numpy(scalars), dtype=np.float64)
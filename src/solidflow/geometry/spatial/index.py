@@ -0,0 +1,83 @@
+"""
+Пространственный индекс mesh с кэшированием
+
+BVH по граням строится один раз и переиспользуется всеми анализами
+(толщина стенок, ближайшие точки, выбор граней, сравнение моделей):
+
+* в памяти — индекс хранится на самом mesh и действителен, пока не изменилась
+  геометрия (``geometry_version``);
+* на диске — в ``MeshCache`` по хэшу вершин и граней, поэтому повторное
+  открытие той же модели не требует построения.
+"""
+
+import logging
+import time
+from typing import Optional
+
+from solidflow.core.cache import MeshCache, array_hash, get_cache
+from solidflow.geometry.mesh.arrays import geometry_version, mesh_arrays, mesh_lock
+from solidflow.geometry.spatial.bvh import BVH
+
+_log = logging.getLogger("SolidFlow.SpatialIndex")
+
+# Атрибут mesh с закэшированным индексом: (версия геометрии, размер листа, BVH)
+_ATTR = "_solidflow_spatial_index"
+
+# Версия формата записи на диске; меняется при изменении построения BVH
+_FORMAT = 1
+
+
+def spatial_index(
+    mesh,
+    leaf_size: Optional[int] = None,
+    persistent: bool = True,
+    cache: Optional[MeshCache] = None,
+) -> BVH:
+    """
+    Получить BVH mesh из кэша или построить
+
+    Args:
+        mesh: PyVista или trimesh mesh объект
+        leaf_size: Треугольников в листе (по умолчанию BVH.LEAF_SIZE)
+        persistent: Использовать дисковый кэш
+        cache: Дисковый кэш (по умолчанию — общий кэш приложения)
+
+    Returns:
+        BVH: Индекс по граням mesh
+    """
+    leaf_size = int(leaf_size or BVH.LEAF_SIZE)
+    version = geometry_version(mesh)
+
+    # Один поток строит индекс этого mesh, остальные дожидаются готового
+    with mesh_lock(mesh, _ATTR):
+        cached = getattr(mesh, _ATTR, None)
+        if cached is not None and cached[0] == version and cached[1] == leaf_size:
+            return cached[2]
+
+        vertices, faces = mesh_arrays(mesh)
+        disk = (cache or get_cache()) if persistent else None
+        bvh = _load_or_build(vertices, faces, leaf_size, disk)
+        setattr(mesh, _ATTR, (version, leaf_size, bvh))
+        return bvh
+
+
+def _load_or_build(vertices, faces, leaf_size: int, disk: Optional[MeshCache]) -> BVH:
+    key = None
+    if disk is not None:
+        key = f"{array_hash(vertices, faces)}-{leaf_size}-v{_FORMAT}"
+        tree = disk.load("bvh", key)
+        if tree is not None:
+            try:
+                bvh = BVH(vertices, faces, tree=tree)
+                _log.info("Loaded BVH from cache (%d faces)", len(faces))
+                return bvh
+            except (KeyError, ValueError) as e:
+                _log.warning("Cached BVH is invalid, rebuilding: %s", e)
+
+    t0 = time.perf_counter()
+    bvh = BVH(vertices, faces, leaf_size)
+    _log.info("Built BVH: %d faces in %.2fs", len(faces), time.perf_counter() - t0)
+
+    if disk is not None:
+        disk.store("bvh", key, bvh.tree_arrays())
+    return bvh
@@ -0,0 +1,455 @@
+"""
+Генерация древовидных поддержек
+
+Точки опоры выбираются на гранях с нависанием (``OverhangAnalyzer``) и в
+нижних точках областей, начинающихся "в воздухе": случайные точки на гранях
+прореживаются до диска Пуассона с шагом ``spacing`` (жадный выбор по рангу,
+выполняемый векторно раундами). От каждой точки опоры вниз идет конический
+наконечник, затем узлы попарно сливаются в ветви: пары взаимно ближайших
+узлов (KD-дерево по проекциям на стол) соединяются в точке ниже обоих с
+наклоном ветвей не больше ``branch_angle``. Ветви проверяются на пересечение
+с моделью лучами по BVH, точка слияния — на зазор до модели (ближайшая точка
+по BVH). Оставшиеся узлы опускаются колоннами до стола или до модели.
+
+Поддержки собираются в отдельный mesh из усеченных конусов (стол вдоль +Z).
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from solidflow.analysis.overhang import OverhangAnalyzer
+from solidflow.geometry.mesh.arrays import arrays_to_polydata
+from solidflow.geometry.spatial.index import spatial_index
+
+_log = logging.getLogger("SolidFlow.SupportGenerator")
+
+_UP = np.array([0.0, 0.0, 1.0])
+
+
+@dataclass
+class SupportSettings:
+    """
+    Параметры поддержек
+
+    Длины — мм, углы — градусы.
+    """
+
+    critical_angle: Optional[float] = None
+    spacing: float = 3.0
+    tip_radius: float = 0.3
+    tip_length: float = 1.0
+    branch_radius: float = 0.8
+    max_radius: float = 2.5
+    branch_angle: float = 40.0
+    merge_distance: float = 10.0
+    clearance: float = 1.0
+    base_radius: float = 2.0
+    base_height: float = 0.6
+    sides: int = 8
+    tree: bool = True
+
+
+@dataclass
+class SupportResult:
+    """
+    Поддержки
+
+    Attributes:
+        contacts: Точки опоры на модели (C, 3)
+        starts, ends: Концы отрезков поддержек (S, 3)
+        start_radius, end_radius: Радиусы на концах отрезков (S,)
+        branches: Количество слияний узлов
+        columns: Количество колонн до стола
+        on_model: Количество колонн, опирающихся на модель
+    """
+
+    contacts: np.ndarray
+    starts: np.ndarray
+    ends: np.ndarray
+    start_radius: np.ndarray
+    end_radius: np.ndarray
+    branches: int = 0
+    columns: int = 0
+    on_model: int = 0
+    sides: int = 8
+
+    @property
+    def volume(self) -> float:
+        """Объем поддержек (сумма объемов усеченных конусов), мм³"""
+        h = np.linalg.norm(self.ends - self.starts, axis=1)
+        r0, r1 = self.start_radius, self.end_radius
+        return float(np.sum(np.pi * h * (r0 * r0 + r0 * r1 + r1 * r1) / 3.0))
+
+    @property
+    def mesh(self):
+        """Поддержки как отдельный PyVista mesh (пустой, если поддержек нет)"""
+        import pyvista as pv
+
+        if not len(self.starts):
+            return pv.PolyData()
+        vertices, faces = frustum_arrays(
+            self.starts, self.ends, self.start_radius, self.end_radius, self.sides
+        )
+        return arrays_to_polydata(vertices, faces)
+
+    def summary(self) -> Dict[str, any]:
+        """
+        Сводка по поддержкам
+
+        Returns:
+            dict: Точки опоры, слияния, колонны, объем (мм³)
+        """
+        return {
+            "contacts": int(len(self.contacts)),
+            "branches": self.branches,
+            "columns": self.columns,
+            "on_model": self.on_model,
+            "volume": self.volume,
+        }
+
+
+def frustum_arrays(starts, ends, start_radius, end_radius, sides: int = 8):
+    """
+    Треугольники усеченных конусов с крышками (нормали наружу)
+
+    Args:
+        starts, ends: Центры оснований (S, 3)
+        start_radius, end_radius: Радиусы оснований (S,)
+        sides: Число граней боковой поверхности
+
+    Returns:
+        tuple: (вершины (S * (2 * sides + 2), 3), треугольники (S * 4 * sides, 3))
+    """
+    starts = np.asarray(starts, dtype=np.float64).reshape(-1, 3)
+    ends = np.asarray(ends, dtype=np.float64).reshape(-1, 3)
+    axis = ends - starts
+    axis /= np.maximum(np.linalg.norm(axis, axis=1, keepdims=True), 1e-300)
+
+    # Ортонормированный базис u, v, axis (u x v = axis) для каждого отрезка
+    helper = np.where(np.abs(axis[:, :1]) < 0.9, [[1.0, 0.0, 0.0]], [[0.0, 1.0, 0.0]])
+    u = np.cross(axis, helper)
+    u /= np.linalg.norm(u, axis=1, keepdims=True)
+    v = np.cross(axis, u)
+
+    angle = 2.0 * np.pi * np.arange(sides) / sides
+    ring = np.cos(angle)[None, :, None] * u[:, None] + np.sin(angle)[None, :, None] * v[:, None]
+    bottom = starts[:, None] + np.asarray(start_radius)[:, None, None] * ring
+    top = ends[:, None] + np.asarray(end_radius)[:, None, None] * ring
+    vertices = np.concatenate([bottom, top, starts[:, None], ends[:, None]], axis=1)
+
+    # Шаблон граней одного отрезка: b_k = k, t_k = sides + k, центры 2 * sides и +1
+    k = np.arange(sides)
+    k1 = (k + 1) % sides
+    b, t = k, sides + k
+    b1, t1 = k1, sides + k1
+    cb = np.full(sides, 2 * sides)
+    ct = cb + 1
+    template = np.concatenate(
+        [
+            np.stack([b, b1, t1], axis=1),
+            np.stack([b, t1, t], axis=1),
+            np.stack([cb, b1, b], axis=1),
+            np.stack([ct, t, t1], axis=1),
+        ]
+    )
+    stride = 2 * sides + 2
+    faces = template[None] + (np.arange(len(starts)) * stride)[:, None, None]
+    return vertices.reshape(-1, 3), faces.reshape(-1, 3)
+
+
+def poisson_disk_select(points: np.ndarray, radius: float) -> np.ndarray:
+    """
+    Прореживание точек до диска Пуассона
+
+    Результат совпадает с последовательным жадным выбором в порядке точек:
+    точка принимается, если среди принятых раньше нет точки ближе radius.
+    Выбор идет раундами: принимаются точки, у которых не осталось
+    нерешенных соседей с меньшим номером, их соседи отбрасываются.
+
+    Args:
+        points: Точки в порядке приоритета (N, 3)
+        radius: Минимальное расстояние между выбранными точками
+
+    Returns:
+        np.ndarray: Номера выбранных точек (по возрастанию)
+    """
+    from scipy.spatial import cKDTree
+
+    n = len(points)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    # Пары соседей (младший, старший номер)
+    pairs = cKDTree(points).query_pairs(radius, output_type="ndarray")
+    lo, hi = pairs[:, 0], pairs[:, 1]
+
+    undecided = np.ones(n, dtype=bool)
+    accepted = np.zeros(n, dtype=bool)
+    while undecided.any():
+        live = undecided[lo] & undecided[hi]
+        blocked = np.zeros(n, dtype=bool)
+        blocked[hi[live]] = True
+        chosen = undecided & ~blocked
+        accepted |= chosen
+        undecided &= ~chosen
+        # Соседи принятых точек выбыли
+        undecided[hi[chosen[lo]]] = False
+        undecided[lo[chosen[hi]]] = False
+    return np.flatnonzero(accepted)
+
+
+class SupportGenerator:
+    """Древовидные поддержки по нависаниям модели (направление построения +Z)"""
+
+    # Предел числа случайных точек-кандидатов на гранях с нависанием
+    MAX_CANDIDATES = 200000
+
+    # Кандидатов на квадрат шага точек опоры
+    CANDIDATE_DENSITY = 8.0
+
+    # Предел числа раундов слияния
+    MAX_ROUNDS = 64
+
+    def __init__(self, mesh, settings: Optional[SupportSettings] = None, seed: int = 0):
+        """
+        Инициализация
+
+        Args:
+            mesh: PyVista или trimesh mesh объект
+            settings: Параметры поддержек
+            seed: Начальное значение генератора случайных точек
+        """
+        self.mesh = mesh
+        self.settings = settings or SupportSettings()
+        if self.settings.spacing <= 0 or self.settings.sides < 3:
+            raise ValueError("Некорректные параметры поддержек")
+        if not 0.0 < self.settings.branch_angle < 90.0:
+            raise ValueError("Угол ветвей должен быть в диапазоне 0..90 градусов")
+        self._rng = np.random.default_rng(seed)
+        self._analyzer = OverhangAnalyzer(mesh, self.settings.critical_angle)
+        self._bvh = None
+
+    @property
+    def bvh(self):
+        """BVH модели (из общего кэша пространственных индексов)"""
+        if self._bvh is None:
+            self._bvh = spatial_index(self.mesh)
+        return self._bvh
+
+    def contact_points(self):
+        """
+        Точки опоры на модели
+
+        Returns:
+            tuple: (точки (C, 3), номера граней (C,))
+        """
+        overhang = self._analyzer.analyze(_UP)
+        vertices, faces = self._analyzer._vertices, self._analyzer._faces
+        areas = self._analyzer._areas
+
+        # Нижние точки "в воздухе" — первыми, чтобы они точно попали в выборку
+        minima = overhang.unsupported_points.reshape(-1, 3)
+        minima_faces = self.bvh.closest_point(minima)[2]
+
+        candidates = np.flatnonzero(overhang.overhang_mask)
+        weights = areas[candidates]
+        total = float(weights.sum())
+        count = 0
+        if total > 0:
+            count = int(np.ceil(total / self.settings.spacing**2 * self.CANDIDATE_DENSITY))
+            count = min(count, self.MAX_CANDIDATES)
+        chosen = candidates[
+            np.minimum(
+                np.searchsorted(np.cumsum(weights), self._rng.random(count) * total),
+                len(candidates) - 1,
+            )
+        ]
+        # Равномерные барицентрические координаты
+        a, b = self._rng.random((2, count))
+        flip = a + b > 1.0
+        a[flip], b[flip] = 1.0 - a[flip], 1.0 - b[flip]
+        tri = vertices[faces[chosen]]
+        samples = tri[:, 0] + a[:, None] * (tri[:, 1] - tri[:, 0])
+        samples += b[:, None] * (tri[:, 2] - tri[:, 0])
+
+        points = np.concatenate([minima, samples])
+        face_ids = np.concatenate([minima_faces, chosen])
+        keep = poisson_disk_select(points, self.settings.spacing)
+        return points[keep], face_ids[keep]
+
+    def generate(
+        self,
+        check: Callable[[], None] = None,
+        progress: Callable[[int], None] = None,
+    ) -> SupportResult:
+        """
+        Построить поддержки
+
+        Args:
+            check: Функция проверки отмены (например, TaskContext.check)
+            progress: Функция прогресса 0..100 (например, TaskContext.progress)
+
+        Returns:
+            SupportResult: Отрезки поддержек и точки опоры
+        """
+        s = self.settings
+        contacts, contact_faces = self.contact_points()
+        base = float(self._analyzer._vertices[:, 2].min())
+        drop, hit = self.bvh.intersect_rays(
+            contacts, np.tile(-_UP, (len(contacts), 1)), t_min=1e-6, ignore_faces=contact_faces
+        )
+        # Луч вниз выходит через грань, обращенную вниз: точка внутри другой
+        # оболочки модели (пересекающиеся детали), опора не нужна
+        inside = (hit >= 0) & (self._analyzer._normals[np.maximum(hit, 0), 2] < 0)
+        contacts, drop = contacts[~inside], drop[~inside]
+        if progress:
+            progress(20)
+        if not len(contacts):
+            empty = np.zeros((0, 3))
+            return SupportResult(contacts, empty, empty, np.zeros(0), np.zeros(0), sides=s.sides)
+
+        segments = []
+
+        # Наконечники; у точек над самым столом или моделью наконечник короче
+        room = np.minimum(contacts[:, 2] - base, drop)
+        tip = np.minimum(s.tip_length, 0.5 * room)
+        nodes = contacts - tip[:, None] * _UP
+        radius = np.full(len(nodes), s.branch_radius)
+        segments.append((contacts, nodes, np.full(len(nodes), s.tip_radius), radius))
+
+        branches = 0
+        if s.tree:
+            nodes, radius, merged = self._merge(nodes, radius, base, segments, check)
+            branches += merged
+        if progress:
+            progress(80)
+
+        # Колонны до стола или до модели
+        drop, _ = self.bvh.intersect_rays(nodes, np.tile(-_UP, (len(nodes), 1)), t_min=1e-6)
+        on_model = drop < nodes[:, 2] - base
+        lands = nodes.copy()
+        lands[:, 2] = np.where(on_model, nodes[:, 2] - drop, base)
+
+        plate = ~on_model
+        pad_top = lands[plate]
+        pad_top[:, 2] = np.minimum(base + s.base_height, nodes[plate, 2])
+        column_end = lands.copy()
+        column_end[plate] = pad_top
+        # На модели колонна заканчивается наконечником
+        model_tip = np.minimum(s.tip_length, 0.5 * drop[on_model])
+        column_end[on_model, 2] += model_tip
+        segments.append((nodes, column_end, radius, radius))
+        segments.append((pad_top, lands[plate], radius[plate], np.full(plate.sum(), s.base_radius)))
+        segments.append(
+            (
+                column_end[on_model],
+                lands[on_model],
+                radius[on_model],
+                np.full(on_model.sum(), s.tip_radius),
+            )
+        )
+
+        starts = np.concatenate([seg[0] for seg in segments])
+        ends = np.concatenate([seg[1] for seg in segments])
+        start_radius = np.concatenate([seg[2] for seg in segments])
+        end_radius = np.concatenate([seg[3] for seg in segments])
+        # Отрезки нулевой длины (колонна от самого стола) не строятся
+        valid = np.linalg.norm(ends - starts, axis=1) > 1e-6
+
+        result = SupportResult(
+            contacts=contacts,
+            starts=starts[valid],
+            ends=ends[valid],
+            start_radius=start_radius[valid],
+            end_radius=end_radius[valid],
+            branches=branches,
+            columns=int(plate.sum()),
+            on_model=int(on_model.sum()),
+            sides=s.sides,
+        )
+        if progress:
+            progress(100)
+        _log.info(
+            "Supports: %d contacts, %d merges, %d columns (%d on model), volume %.1f",
+            len(contacts),
+            branches,
+            result.columns,
+            result.on_model,
+            result.volume,
+        )
+        return result
+
+    def _merge(self, nodes, radius, base: float, segments, check):
+        """
+        Попарное слияние узлов в ветви
+
+        В каждом раунде взаимно ближайшие по проекции на стол узлы соединяются
+        в точке ниже обоих. Пары, ветви которых задевают модель, больше не
+        участвуют в слиянии.
+
+        Returns:
+            tuple: (узлы (K, 3), радиусы (K,), количество слияний)
+        """
+        from scipy.spatial import cKDTree
+
+        s = self.settings
+        slope = np.tan(np.radians(s.branch_angle))
+        floor = base + s.base_height + s.tip_length
+        frozen = np.zeros(len(nodes), dtype=bool)
+        merged = 0
+
+        for _ in range(self.MAX_ROUNDS):
+            if check:
+                check()
+            active = np.flatnonzero(~frozen)
+            if len(active) < 2:
+                break
+            dist, near = cKDTree(nodes[active, :2]).query(
+                nodes[active, :2], k=2, distance_upper_bound=s.merge_distance
+            )
+            idx = np.arange(len(active))
+            found = near[:, 1] < len(active)
+            partner = np.where(found, near[:, 1], idx)
+            mutual = found & (partner[partner] == idx) & (idx < partner)
+            a = active[idx[mutual]]
+            b = active[partner[mutual]]
+            if not len(a):
+                break
+
+            # Точка слияния ниже обоих узлов: ветвь от нижнего узла идет под branch_angle
+            half = 0.5 * dist[mutual, 1]
+            joint = 0.5 * (nodes[a] + nodes[b])
+            joint[:, 2] = np.minimum(nodes[a, 2], nodes[b, 2]) - half / slope
+            ok = joint[:, 2] > floor
+
+            # Зазор до модели в точке слияния и пересечение ветвей с моделью
+            _, gap, _ = self.bvh.closest_point(joint, max_distance=s.clearance + s.max_radius)
+            ok &= gap > s.clearance + np.maximum(radius[a], radius[b])
+            origins = np.concatenate([nodes[a], nodes[b]])
+            t, _ = self.bvh.intersect_rays(
+                origins, np.concatenate([joint, joint]) - origins, t_min=1e-9, t_max=1.0
+            )
+            ok &= np.isinf(t[: len(a)]) & np.isinf(t[len(a) :])
+
+            frozen[a[~ok]] = True
+            frozen[b[~ok]] = True
+            a, b, joint = a[ok], b[ok], joint[ok]
+            if not len(a):
+                continue
+
+            # Закон Мюррея: r³ ствола равен сумме r³ ветвей
+            joint_radius = np.minimum(np.cbrt(radius[a] ** 3 + radius[b] ** 3), s.max_radius)
+            segments.append((nodes[a], joint, radius[a], joint_radius))
+            segments.append((nodes[b], joint, radius[b], joint_radius))
+            merged += len(a)
+
+            # Узел a становится точкой слияния, узел b удаляется
+            nodes[a] = joint
+            radius[a] = joint_radius
+            keep = np.ones(len(nodes), dtype=bool)
+            keep[b] = False
+            nodes, radius, frozen = nodes[keep], radius[keep], frozen[keep]
+
+        return nodes, radius, merged
@@ -0,0 +1,204 @@
+"""
+Блочно-разреженная воксельная сетка
+
+Сетка разбита на блоки BLOCK x BLOCK x BLOCK вокселей. Хранятся только:
+
+* номера полностью заполненных блоков (внутренность модели);
+* упакованные биты смешанных блоков (слой у поверхности) — BLOCK³ / 8 байт на блок.
+
+Пустые блоки не хранятся. Номер блока ``(bz * ny_blocks + by) * nx_blocks + bx``;
+массивы номеров отсортированы, поэтому поиск блока — двоичный. Доступ к сетке
+идет слоями блоков (``slab``) — плотный массив одного слоя, а не всей сетки.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+import numpy as np
+
+# Количество единичных битов в каждом значении байта
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+
+
+@dataclass
+class VoxelGrid:
+    """
+    Заполненные воксели модели
+
+    Attributes:
+        origin: Угол вокселя (0, 0, 0) в координатах модели (3,)
+        pitch: Размер вокселя
+        shape: Размер сетки в вокселях (nx, ny, nz), кратный BLOCK
+        full_keys: Номера заполненных блоков (F,), по возрастанию
+        mixed_keys: Номера смешанных блоков (K,), по возрастанию
+        mixed_bits: Упакованные биты смешанных блоков (K, BLOCK³ / 8); порядок
+            вокселей в блоке — (x, y, z), z меняется быстрее
+    """
+
+    # Ребро блока в вокселях
+    BLOCK = 8
+
+    origin: np.ndarray
+    pitch: float
+    shape: Tuple[int, int, int]
+    full_keys: np.ndarray
+    mixed_keys: np.ndarray
+    mixed_bits: np.ndarray
+
+    @property
+    def blocks(self) -> Tuple[int, int, int]:
+        """Размер сетки в блоках"""
+        return tuple(n // self.BLOCK for n in self.shape)
+
+    @property
+    def n_slabs(self) -> int:
+        """Количество слоев блоков по z"""
+        return self.blocks[2]
+
+    @property
+    def count(self) -> int:
+        """Количество заполненных вокселей"""
+        return int(len(self.full_keys) * self.BLOCK**3 + _POPCOUNT[self.mixed_bits].sum())
+
+    @property
+    def volume(self) -> float:
+        """Объем заполненных вокселей"""
+        return self.count * self.pitch**3
+
+    @property
+    def nbytes(self) -> int:
+        """Память под хранение сетки, байт"""
+        return int(self.full_keys.nbytes + self.mixed_keys.nbytes + self.mixed_bits.nbytes)
+
+    def slab(self, index: int) -> np.ndarray:
+        """
+        Плотный массив одного слоя блоков
+
+        Args:
+            index: Номер слоя блоков по z (0..n_slabs-1); вне сетки — пустой слой
+
+        Returns:
+            np.ndarray: Заполненность вокселей (nx, ny, BLOCK), bool
+        """
+        bx, by, bz = self.blocks
+        out = np.zeros((by * bx, self.BLOCK**3), dtype=bool)
+        if 0 <= index < bz:
+            lo = index * bx * by
+            keys = np.arange(lo, lo + bx * by, dtype=np.int64)
+            out[:] = self.block_mask(keys)
+        return blocks_to_slab(out, self.shape)
+
+    def slabs(self, start: int, stop: int) -> np.ndarray:
+        """
+        Плотный массив нескольких слоев блоков
+
+        Args:
+            start, stop: Диапазон слоев [start, stop); слои вне сетки пустые
+
+        Returns:
+            np.ndarray: Заполненность (nx, ny, (stop - start) * BLOCK)
+        """
+        return np.concatenate([self.slab(i) for i in range(start, stop)], axis=2)
+
+    def contains(self, points: np.ndarray) -> np.ndarray:
+        """
+        Проверить, попадают ли точки в заполненные воксели
+
+        Args:
+            points: Точки (Q, 3)
+
+        Returns:
+            np.ndarray: Маска (Q,)
+        """
+        b = self.BLOCK
+        bx, by, _ = self.blocks
+        index = np.floor((np.asarray(points, dtype=np.float64) - self.origin) / self.pitch)
+        inside = np.all((index >= 0) & (index < np.array(self.shape)), axis=1)
+        index = index.astype(np.int64)
+        block, local = np.divmod(index, b)
+        key = (block[:, 2] * by + block[:, 1]) * bx + block[:, 0]
+        bit = (local[:, 0] * b + local[:, 1]) * b + local[:, 2]
+
+        result = inside & _sorted_contains(self.full_keys, key)
+        pos = np.minimum(np.searchsorted(self.mixed_keys, key), max(len(self.mixed_keys) - 1, 0))
+        mixed = inside & _sorted_contains(self.mixed_keys, key)
+        if np.any(mixed):
+            byte = self.mixed_bits[pos[mixed], bit[mixed] // 8]
+            result[mixed] = (byte >> (7 - bit[mixed] % 8)) & 1 == 1
+        return result
+
+    def block_mask(self, keys: np.ndarray) -> np.ndarray:
+        """
+        Заполненность вокселей блоков
+
+        Args:
+            keys: Номера блоков (K,)
+
+        Returns:
+            np.ndarray: Заполненность (K, BLOCK³), порядок вокселей — как в mixed_bits
+        """
+        keys = np.asarray(keys, dtype=np.int64)
+        out = np.zeros((len(keys), self.BLOCK**3), dtype=bool)
+        out[_sorted_contains(self.full_keys, keys)] = True
+        mixed = _sorted_contains(self.mixed_keys, keys)
+        if np.any(mixed):
+            pos = np.searchsorted(self.mixed_keys, keys[mixed])
+            out[mixed] = np.unpackbits(self.mixed_bits[pos], axis=1).astype(bool)
+        return out
+
+    def summary(self) -> Dict[str, any]:
+        """
+        Сводка по сетке
+
+        Returns:
+            dict: Размер вокселя и сетки, заполненные воксели, объем, блоки, память
+        """
+        return {
+            "pitch": float(self.pitch),
+            "shape": tuple(int(n) for n in self.shape),
+            "voxels": self.count,
+            "volume": self.volume,
+            "full_blocks": int(len(self.full_keys)),
+            "mixed_blocks": int(len(self.mixed_keys)),
+            "memory_mb": self.nbytes / 2**20,
+        }
+
+
+def _sorted_contains(keys: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """Маска значений query, присутствующих в отсортированном массиве keys"""
+    if not len(keys):
+        return np.zeros(len(query), dtype=bool)
+    pos = np.minimum(np.searchsorted(keys, query), len(keys) - 1)
+    return keys[pos] == query
+
+
+def blocks_to_slab(blocks: np.ndarray, shape) -> np.ndarray:
+    """
+    Собрать плотный слой из блоков слоя
+
+    Args:
+        blocks: Значения блоков слоя (by * bx, BLOCK³) в порядке номеров
+        shape: Размер сетки (nx, ny, nz)
+
+    Returns:
+        np.ndarray: Слой (nx, ny, BLOCK)
+    """
+    b = VoxelGrid.BLOCK
+    nx, ny, _ = shape
+    return blocks.reshape(ny // b, nx // b, b, b, b).transpose(1, 2, 0, 3, 4).reshape(nx, ny, b)
+
+
+def slab_to_blocks(slab: np.ndarray) -> np.ndarray:
+    """
+    Разбить плотный слой на блоки (обратно к blocks_to_slab)
+
+    Args:
+        slab: Слой (nx, ny, BLOCK)
+
+    Returns:
+        np.ndarray: Значения блоков (by * bx, BLOCK³) в порядке номеров
+    """
+    b = VoxelGrid.BLOCK
+    nx, ny, _ = slab.shape
+    bx, by = nx // b, ny // b
+    return slab.reshape(bx, b, by, b, b).transpose(2, 0, 1, 3, 4).reshape(by * bx, b**3)
@@ -0,0 +1,390 @@
+"""
+Поле расстояний со знаком в узкой полосе
+
+Значения хранятся в центрах вокселей только в блоках ``VoxelGrid.BLOCK``³,
+которые лежат не дальше ширины полосы от поверхности; дальше поле ограничено
+значением ±band, а знак берется из воксельной модели. Память поэтому растет
+с площадью поверхности, а не с объемом габаритов.
+
+* модуль расстояния — по опорным точкам: для внешнего слоя вокселей (пустые
+  воксели с заполненным соседом) ближайшая точка поверхности находится точно
+  по BVH с радиусом поиска в один воксель, остальные воксели полосы берут
+  точное расстояние до граней соседних опорных точек (KD-дерево), каждая
+  грань один раз — так точных запросов к BVH на порядок меньше, чем вокселей
+  в полосе;
+* знак — заполненность вокселя по числу обхода (``Voxelizer``), поэтому поле
+  корректно и для моделей с дырами и пересекающимися оболочками, где знак по
+  нормали ближайшей грани ошибается;
+* блоки полосы считаются пакетами в пуле потоков.
+
+Поверхность уровня (например, заготовка с припуском) строится marching cubes
+по слоям блоков (``contour_slabs``).
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pyvista as pv
+
+from solidflow.geometry.spatial.index import spatial_index
+from solidflow.geometry.voxel.grid import VoxelGrid, blocks_to_slab, slab_to_blocks
+from solidflow.geometry.voxel.remesh import contour_slabs
+from solidflow.geometry.voxel.voxelizer import Voxelizer
+
+_log = logging.getLogger("SolidFlow.DistanceField")
+
+
+@dataclass
+class SignedDistanceField:
+    """
+    Расстояние со знаком до поверхности в центрах вокселей (внутри — отрицательное)
+
+    Attributes:
+        inside: Воксельная модель: сетка поля и знак вне полосы
+        band: Ширина полосы; вне ее значения равны ±band
+        keys: Номера блоков полосы (K,), по возрастанию
+        values: Значения в блоках (K, BLOCK³), float32; порядок вокселей — как
+            в VoxelGrid.mixed_bits
+    """
+
+    inside: VoxelGrid
+    band: float
+    keys: np.ndarray
+    values: np.ndarray
+
+    @property
+    def pitch(self) -> float:
+        """Размер вокселя"""
+        return self.inside.pitch
+
+    @property
+    def nbytes(self) -> int:
+        """Память под хранение поля, байт"""
+        return int(self.keys.nbytes + self.values.nbytes + self.inside.nbytes)
+
+    def slab(self, index: int) -> np.ndarray:
+        """
+        Плотный массив поля одного слоя блоков
+
+        Args:
+            index: Номер слоя блоков по z; вне сетки — слой снаружи модели
+
+        Returns:
+            np.ndarray: Значения (nx, ny, BLOCK), float32
+        """
+        grid = self.inside
+        bx, by, _ = grid.blocks
+        out = np.where(grid.slab(index), -self.band, self.band).astype(np.float32)
+        lo = index * bx * by
+        start, end = np.searchsorted(self.keys, [lo, lo + bx * by])
+        if end > start:
+            flat = slab_to_blocks(out).copy()
+            flat[self.keys[start:end] - lo] = self.values[start:end]
+            out = blocks_to_slab(flat, grid.shape)
+        return out
+
+    def contour(
+        self,
+        level: float = 0.0,
+        check: Callable[[], None] = None,
+        progress: Callable[[int], None] = None,
+    ) -> pv.PolyData:
+        """
+        Поверхность уровня поля (эквидистанта)
+
+        Args:
+            level: Расстояние: > 0 — наружу (заготовка с припуском), < 0 — внутрь;
+                по модулю меньше ширины полосы
+            check: Функция проверки отмены
+            progress: Функция прогресса 0..100
+
+        Returns:
+            pv.PolyData: Замкнутая поверхность с нормалями наружу
+        """
+        if abs(level) >= self.band - self.pitch:
+            raise ValueError(
+                f"Уровень {level:g} вне полосы поля расстояний (±{self.band - self.pitch:g})"
+            )
+        grid = self.inside
+        return contour_slabs(
+            self.slab, grid.n_slabs, grid.origin, grid.pitch, level, check, progress
+        )
+
+    def summary(self) -> Dict[str, any]:
+        """
+        Сводка по полю
+
+        Returns:
+            dict: Размер вокселя и сетки, ширина полосы, блоки полосы, память
+        """
+        return {
+            "pitch": float(self.pitch),
+            "shape": tuple(int(n) for n in self.inside.shape),
+            "band": float(self.band),
+            "band_blocks": int(len(self.keys)),
+            "samples": int(self.values.size),
+            "memory_mb": self.nbytes / 2**20,
+        }
+
+
+class DistanceFieldBuilder:
+    """Построение поля расстояний со знаком в узкой полосе у поверхности"""
+
+    # Блоков в одном пакете расчета (BLOCK³ точек на блок)
+    BATCH_BLOCKS = 128
+
+    # Точек поверхностного слоя в одном пакете запросов к BVH
+    BATCH_POINTS = 16384
+
+    # Ближайших опорных точек, из которых выбирается расстояние
+    NEIGHBORS = 4
+
+    def __init__(
+        self,
+        mesh,
+        band: float,
+        pitch: Optional[float] = None,
+        max_workers: Optional[int] = None,
+        outside_only: bool = False,
+    ):
+        """
+        Инициализация
+
+        Args:
+            mesh: PyVista или trimesh mesh объект
+            band: Наибольшее нужное расстояние от поверхности; полоса поля
+                расширяется на два вокселя, чтобы поверхности уровня до ±band
+                строились без обрезки
+            pitch: Размер вокселя (по умолчанию band / 2)
+            max_workers: Количество потоков (по умолчанию — число ядер)
+            outside_only: Считать расстояние только снаружи, внутри поле равно
+                -band: для эквидистант наружу вдвое меньше точных расстояний
+        """
+        if not band > 0:
+            raise ValueError("Ширина полосы должна быть положительной")
+        self.mesh = mesh
+        self.pitch = float(pitch) if pitch else band / 2.0
+        if not self.pitch > 0:
+            raise ValueError("Размер вокселя должен быть положительным")
+        self.band = float(band) + 2.0 * self.pitch
+        self.max_workers = max_workers
+        self.outside_only = outside_only
+
+    def build(
+        self, check: Callable[[], None] = None, progress: Callable[[int], None] = None
+    ) -> SignedDistanceField:
+        """
+        Построить поле
+
+        Args:
+            check: Функция проверки отмены (например, TaskContext.check)
+            progress: Функция прогресса 0..100 (например, TaskContext.progress)
+
+        Returns:
+            SignedDistanceField: Поле расстояний
+        """
+        from scipy.spatial import cKDTree
+
+        def stage(start, share):
+            """Прогресс этапа: доля share общего прогресса, начиная с start"""
+            if progress is None:
+                return None
+            return lambda value: progress(start + int(share * value / 100))
+
+        padding = int(np.ceil(self.band / self.pitch)) + 1
+        inside = Voxelizer(
+            self.mesh, pitch=self.pitch, max_workers=self.max_workers, padding=padding
+        ).voxelize(check, stage(0, 30))
+
+        # Опорные точки: точные ближайшие точки поверхности для внешнего слоя вокселей
+        surface = self._surface_voxels(inside)
+        centers = inside.origin + (surface + 0.5) * inside.pitch
+        bvh = spatial_index(self.mesh)
+        batches = [
+            centers[s : s + self.BATCH_POINTS] for s in range(0, len(centers), self.BATCH_POINTS)
+        ]
+        closest = self._run(lambda batch: self._closest(bvh, batch), batches, check, stage(30, 30))
+        anchors = np.concatenate([c[0] for c in closest]) if closest else np.zeros((0, 3))
+        anchor_face = np.concatenate([c[1] for c in closest]) if closest else np.zeros(0, int)
+        found = anchor_face >= 0
+        if not np.any(found):
+            raise ValueError("Не найдено поверхности для поля расстояний")
+        tree = cKDTree(anchors[found])
+        anchor_face = anchor_face[found]
+
+        keys = self._band_blocks(inside, surface, tree)
+        if self.outside_only:
+            # Целиком заполненные блоки совпадают со значением -band вне полосы
+            keys = keys[~np.isin(keys, inside.full_keys)]
+        batches = [keys[s : s + self.BATCH_BLOCKS] for s in range(0, len(keys), self.BATCH_BLOCKS)]
+        values = self._run(
+            lambda batch: self._evaluate(inside, bvh, tree, anchor_face, batch),
+            batches,
+            check,
+            stage(60, 40),
+        )
+
+        b = VoxelGrid.BLOCK
+        field = SignedDistanceField(
+            inside=inside,
+            band=self.band,
+            keys=keys,
+            values=(np.concatenate(values) if values else np.zeros((0, b**3), dtype=np.float32)),
+        )
+        _log.info(
+            "Distance field: pitch %.4g, band %.4g, %d anchors, %d band blocks, %.1f MB",
+            self.pitch,
+            self.band,
+            len(anchor_face),
+            len(keys),
+            field.nbytes / 2**20,
+        )
+        return field
+
+    def _run(self, fn, batches, check, progress):
+        """Выполнить пакеты в пуле потоков с проверкой отмены и прогрессом"""
+        workers = self.max_workers or os.cpu_count() or 1
+        results = []
+        if len(batches) <= 1 or workers == 1:
+            for index, batch in enumerate(batches):
+                if check is not None:
+                    check()
+                results.append(fn(batch))
+                if progress is not None:
+                    progress(int(100 * (index + 1) / len(batches)))
+            return results
+
+        pool = ThreadPoolExecutor(max_workers=workers)
+        futures = [pool.submit(fn, batch) for batch in batches]
+        try:
+            for index, future in enumerate(futures):
+                if check is not None:
+                    check()
+                results.append(future.result())
+                if progress is not None:
+                    progress(int(100 * (index + 1) / len(batches)))
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+        return results
+
+    @staticmethod
+    def _surface_voxels(grid: VoxelGrid) -> np.ndarray:
+        """
+        Внешний слой: пустые воксели с заполненным соседом по грани
+
+        Отрезок между центрами соседей пересекает поверхность, поэтому она не
+        дальше одного вокселя от центра.
+
+        Returns:
+            np.ndarray: Индексы вокселей (S, 3)
+        """
+        b = VoxelGrid.BLOCK
+        parts = []
+        previous = grid.slab(-1)
+        current = grid.slab(0)
+        for index in range(grid.n_slabs):
+            following = grid.slab(index + 1)
+            near = np.zeros_like(current)
+            near[1:] |= current[:-1]
+            near[:-1] |= current[1:]
+            near[:, 1:] |= current[:, :-1]
+            near[:, :-1] |= current[:, 1:]
+            near[:, :, 1:] |= current[:, :, :-1]
+            near[:, :, :-1] |= current[:, :, 1:]
+            near[:, :, 0] |= previous[:, :, -1]
+            near[:, :, -1] |= following[:, :, 0]
+            ijk = np.argwhere(near & ~current)
+            ijk[:, 2] += index * b
+            parts.append(ijk)
+            previous, current = current, following
+        return np.concatenate(parts)
+
+    def _closest(self, bvh, points: np.ndarray):
+        """
+        Ближайшие точки поверхности для точек внешнего слоя
+
+        Returns:
+            tuple: (точки (S, 3), номера граней (S,)); -1 — поверхность не найдена
+        """
+        # Поверхность не дальше вокселя; у дыр знак по вокселям может меняться и
+        # без поверхности рядом — для них поиск повторяется в пределах полосы
+        closest, dist, face = bvh.closest_point(points, max_distance=self.pitch, max_workers=1)
+        missed = ~np.isfinite(dist)
+        if np.any(missed):
+            closest[missed], _, face[missed] = bvh.closest_point(
+                points[missed], max_distance=self.band, max_workers=1
+            )
+        return closest, face
+
+    def _block_corners(self, grid: VoxelGrid, keys: np.ndarray) -> np.ndarray:
+        """Индексы первых вокселей блоков (K, 3)"""
+        bx, by, _ = grid.blocks
+        return np.stack([keys % bx, keys // bx % by, keys // (bx * by)], axis=1) * VoxelGrid.BLOCK
+
+    def _band_blocks(self, grid: VoxelGrid, surface: np.ndarray, tree) -> np.ndarray:
+        """
+        Номера блоков, в которых есть точки не дальше ширины полосы от поверхности
+
+        Кандидаты — блоки внешнего слоя и их соседи в пределах полосы; затем
+        отбрасываются блоки, центр которых дальше полосы плюс полудиагональ
+        блока от ближайшей опорной точки.
+        """
+        b = VoxelGrid.BLOCK
+        blocks = np.array(grid.blocks, dtype=np.int64)
+        bx, by, _ = grid.blocks
+        seeds = np.unique(surface // b, axis=0)
+        reach = int(np.ceil(self.band / (b * grid.pitch)))
+        offsets = np.indices((2 * reach + 1,) * 3).reshape(3, -1).T - reach
+        keys = []
+        for offset in offsets:
+            cell = np.clip(seeds + offset, 0, blocks - 1)
+            keys.append((cell[:, 2] * by + cell[:, 1]) * bx + cell[:, 0])
+        keys = np.unique(np.concatenate(keys))
+
+        centers = grid.origin + (self._block_corners(grid, keys) + b / 2.0) * grid.pitch
+        radius = self.band + np.sqrt(3.0) * b / 2.0 * grid.pitch
+        dist, _ = tree.query(centers, distance_upper_bound=radius, workers=self.max_workers or -1)
+        return keys[np.isfinite(dist)]
+
+    def _evaluate(self, grid: VoxelGrid, bvh, tree, anchor_face, keys: np.ndarray) -> np.ndarray:
+        """
+        Значения поля в вокселях пакета блоков (K, BLOCK³)
+
+        Расстояние — точное до граней NEIGHBORS ближайших опорных точек. Опорные
+        точки лежат на поверхности с шагом около вокселя, поэтому среди их граней
+        почти всегда есть ближайшая; иначе ошибка — доли вокселя в большую сторону.
+        """
+        from trimesh.triangles import closest_point
+
+        b = VoxelGrid.BLOCK
+        local = np.indices((b, b, b)).reshape(3, -1).T
+        index = self._block_corners(grid, keys)[:, None, :] + local[None, :, :]
+        points = grid.origin + (index.reshape(-1, 3) + 0.5) * grid.pitch
+        inside = grid.block_mask(keys).ravel()
+        dist = np.full(len(points), self.band)
+
+        todo = np.flatnonzero(~inside) if self.outside_only else np.arange(len(points))
+        _, nearest = tree.query(
+            points[todo], k=self.NEIGHBORS, distance_upper_bound=self.band + grid.pitch, workers=1
+        )
+        near = nearest[:, 0] < tree.n
+        todo, nearest = todo[near], nearest[near]
+        # Недостающие соседи заменяются первым, и каждая грань вокселя запрашивается
+        # один раз: у крупных граней (CAD) все соседи обычно лежат на одной грани
+        nearest = np.where(nearest < tree.n, nearest, nearest[:, :1])
+        faces = np.sort(anchor_face[nearest], axis=1)
+        first = np.ones(faces.shape, dtype=bool)
+        first[:, 1:] = faces[:, 1:] != faces[:, :-1]
+        row, col = np.nonzero(first)
+        query = points[todo[row]]
+        foot = closest_point(bvh.triangles[bvh.face_slot[faces[row, col]]], query)
+        candidate = np.full(faces.shape, np.inf)
+        candidate[row, col] = np.linalg.norm(foot - query, axis=1)
+        dist[todo] = np.minimum(candidate.min(axis=1), self.band)
+
+        dist = dist.reshape(len(keys), b**3)
+        return np.where(inside.reshape(len(keys), -1), -dist, dist).astype(np.float32)
@@ -0,0 +1,364 @@
+"""
+Вокселизация mesh
+
+Заполненность вокселя определяется по лучам вдоль трех осей через центры вокселей:
+
+* на луче пересечения с гранями дают число обхода (winding number): вход в тело
+  (нормаль против луча) +1, выход -1; воксель внутри, если число обхода ненулевое,
+  поэтому пересекающиеся оболочки заполняются без пустот на пересечении;
+* если сумма по всему лучу ненулевая (несогласованные нормали), луч голосует по
+  четности числа пересечений; луч с нечетным числом пересечений прошел через
+  дыру и не голосует;
+* воксель заполнен по большинству голосов осей; без голосов или при равенстве —
+  по большинству четностей.
+
+Небольшие дыры портят только прошедшие через них лучи и не "протекают" на всю модель.
+
+Пересечения лучей с гранями считаются один раз векторно. Сетка строится слоями
+блоков по z параллельно в пуле потоков, и каждый слой сразу сжимается в блоки
+``VoxelGrid``: память определяется площадью поверхности, а не габаритами модели.
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+import numpy as np
+
+from solidflow.core.config import Config
+from solidflow.geometry.mesh.arrays import geometry_version, mesh_arrays, mesh_lock
+from solidflow.geometry.voxel.grid import VoxelGrid, slab_to_blocks
+
+_log = logging.getLogger("SolidFlow.Voxelizer")
+
+# Атрибут mesh с закэшированной сеткой: (версия геометрии, разрешение, VoxelGrid)
+_ATTR = "_solidflow_voxels"
+
+
+class Voxelizer:
+    """Построение блочно-разреженной воксельной сетки по лучам вдоль осей"""
+
+    # Пустых вокселей вокруг модели (внешнее пространство связно)
+    PAD = 1
+
+    # Сдвиг сетки в долях вокселя: центры не попадают точно на ребра и вершины
+    JITTER = np.sqrt([2.0, 3.0, 5.0]) * 1e-3
+
+    # Пар (луч, грань) в одном пакете при поиске пересечений
+    CHUNK_PAIRS = 1 << 22
+
+    def __init__(
+        self,
+        mesh,
+        pitch: Optional[float] = None,
+        resolution: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        padding: int = 0,
+    ):
+        """
+        Инициализация: сетка вокруг модели
+
+        Args:
+            mesh: PyVista или trimesh mesh объект
+            pitch: Размер вокселя (по умолчанию — по разрешению)
+            resolution: Вокселей по наибольшему размеру модели
+                (по умолчанию Config.VOXEL_RESOLUTION)
+            max_workers: Количество потоков (по умолчанию — число ядер)
+            padding: Дополнительных пустых вокселей вокруг модели (например,
+                для поля расстояний за пределами модели)
+        """
+        self.mesh = mesh
+        self.max_workers = max_workers
+        vertices, faces = mesh_arrays(mesh)
+        if len(faces) == 0:
+            raise ValueError("Mesh не содержит граней")
+
+        lo, hi = vertices.min(axis=0), vertices.max(axis=0)
+        if pitch is None:
+            resolution = int(resolution or Config.VOXEL_RESOLUTION)
+            pitch = float((hi - lo).max()) / resolution
+        if not pitch > 0:
+            raise ValueError("Размер вокселя должен быть положительным")
+
+        b = VoxelGrid.BLOCK
+        self.pitch = float(pitch)
+        pad = self.PAD + max(int(padding), 0)
+        self.origin = lo - self.pitch * (pad + self.JITTER)
+        size = np.ceil((hi - self.origin) / self.pitch).astype(np.int64) + pad
+        self.shape = tuple(int(n) for n in -(-size // b) * b)
+        # Координаты в единицах вокселей: центр вокселя i — целое число i
+        self._triangles = ((vertices - self.origin) / self.pitch - 0.5)[faces]
+
+    def voxelize(
+        self, check: Callable[[], None] = None, progress: Callable[[int], None] = None
+    ) -> VoxelGrid:
+        """
+        Построить сетку
+
+        Args:
+            check: Функция проверки отмены (например, TaskContext.check)
+            progress: Функция прогресса 0..100 (например, TaskContext.progress)
+
+        Returns:
+            VoxelGrid: Заполненные воксели
+        """
+        self._rays = []
+        for axis in range(3):
+            if check is not None:
+                check()
+            self._rays.append(self._crossings(axis))
+            if progress is not None:
+                progress(10 * (axis + 1))
+
+        n = self.shape[2] // VoxelGrid.BLOCK
+        workers = self.max_workers or os.cpu_count() or 1
+        parts = []
+        if n <= 1 or workers == 1:
+            for index in range(n):
+                if check is not None:
+                    check()
+                parts.append(self._slab(index))
+                if progress is not None:
+                    progress(30 + int(70 * (index + 1) / n))
+        else:
+            pool = ThreadPoolExecutor(max_workers=workers)
+            futures = [pool.submit(self._slab, index) for index in range(n)]
+            try:
+                for index, future in enumerate(futures):
+                    if check is not None:
+                        check()
+                    parts.append(future.result())
+                    if progress is not None:
+                        progress(30 + int(70 * (index + 1) / n))
+            finally:
+                pool.shutdown(wait=True, cancel_futures=True)
+        self._rays = None
+
+        block_bytes = VoxelGrid.BLOCK**3 // 8
+        grid = VoxelGrid(
+            origin=self.origin,
+            pitch=self.pitch,
+            shape=self.shape,
+            full_keys=np.concatenate([p[0] for p in parts]),
+            mixed_keys=np.concatenate([p[1] for p in parts]),
+            mixed_bits=np.concatenate([p[2] for p in parts]).reshape(-1, block_bytes),
+        )
+        summary = grid.summary()
+        _log.info(
+            "Voxelized %s at pitch %.4g: %d voxels, %d full / %d mixed blocks, %.1f MB",
+            self.shape,
+            self.pitch,
+            summary["voxels"],
+            summary["full_blocks"],
+            summary["mixed_blocks"],
+            summary["memory_mb"],
+        )
+        return grid
+
+    def _crossings(self, axis: int):
+        """
+        Пересечения лучей вдоль оси с гранями
+
+        Лучи проходят через центры вокселей. Для пересечения хранятся номера
+        луча (u, v), ячейка — номер первого центра за точкой пересечения — и
+        приращение числа обхода.
+
+        Returns:
+            dict: Массивы пересечений, отсортированные по слою z, и маски лучей
+            с нулевой суммой числа обхода (wind_ok) и четным числом
+            пересечений (parity_ok) формы (n_u, n_v)
+        """
+        u_axis, v_axis = (axis + 1) % 3, (axis + 2) % 3
+        n_a, n_u, n_v = self.shape[axis], self.shape[u_axis], self.shape[v_axis]
+        tri = self._triangles
+        pu, pv, pw = tri[:, :, u_axis], tri[:, :, v_axis], tri[:, :, axis]
+        # Удвоенная знаковая площадь проекции = компонента нормали вдоль луча
+        area = (pu[:, 1] - pu[:, 0]) * (pv[:, 2] - pv[:, 0]) - (pv[:, 1] - pv[:, 0]) * (
+            pu[:, 2] - pu[:, 0]
+        )
+        u0 = np.clip(np.ceil(pu.min(axis=1)), 0, n_u).astype(np.int64)
+        u1 = np.clip(np.floor(pu.max(axis=1)), -1, n_u - 1).astype(np.int64)
+        v0 = np.clip(np.ceil(pv.min(axis=1)), 0, n_v).astype(np.int64)
+        v1 = np.clip(np.floor(pv.max(axis=1)), -1, n_v - 1).astype(np.int64)
+        cu = np.maximum(u1 - u0 + 1, 0)
+        cv = np.maximum(v1 - v0 + 1, 0)
+        count = np.where(area != 0, cu * cv, 0)
+
+        parts = []
+        faces = np.flatnonzero(count)
+        bounds = np.cumsum(count[faces])
+        start = 0
+        while start < len(faces):
+            stop = int(
+                np.searchsorted(bounds, bounds[start] - count[faces[start]] + self.CHUNK_PAIRS)
+            )
+            stop = max(stop, start + 1)
+            parts.append(
+                self._chunk_crossings(faces[start:stop], count, u0, v0, cv, pu, pv, pw, area)
+            )
+            start = stop
+
+        if parts:
+            u, v, cell, step = (np.concatenate([p[k] for p in parts]) for k in range(4))
+        else:
+            u = v = cell = np.zeros(0, dtype=np.int64)
+            step = np.zeros(0, dtype=np.int8)
+        cell = np.clip(cell, 0, n_a)
+
+        ray = u * n_v + v
+        winding = np.bincount(ray, weights=step, minlength=n_u * n_v)
+        crossings = np.bincount(ray, minlength=n_u * n_v)
+        # Слой z пересечения: для лучей вдоль z — ячейка, иначе координата луча
+        layer = cell if axis == 2 else (v if v_axis == 2 else u)
+        order = np.argsort(layer, kind="stable")
+        return {
+            "u": u[order],
+            "v": v[order],
+            "cell": cell[order],
+            "step": step[order],
+            "layer": layer[order],
+            "wind_ok": (winding == 0).reshape(n_u, n_v),
+            "parity_ok": (crossings % 2 == 0).reshape(n_u, n_v),
+        }
+
+    @staticmethod
+    def _chunk_crossings(faces, count, u0, v0, cv, pu, pv, pw, area):
+        """Пересечения для пакета граней: пары (луч в габарите проекции, грань)"""
+        counts = count[faces]
+        total = int(counts.sum())
+        f = np.repeat(faces, counts)
+        local = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        u = u0[f] + local // cv[f]
+        v = v0[f] + local % cv[f]
+
+        a, b, c = pu[f], pv[f], pw[f]
+
+        def edge(i, j):
+            return (a[:, j] - a[:, i]) * (v - b[:, i]) - (b[:, j] - b[:, i]) * (u - a[:, i])
+
+        e01, e12, e20 = edge(0, 1), edge(1, 2), edge(2, 0)
+        s = np.sign(area[f])
+        inside = (e01 * s >= 0) & (e12 * s >= 0) & (e20 * s >= 0)
+        # Глубина точки пересечения — барицентрическая интерполяция
+        depth = (e12 * c[:, 0] + e20 * c[:, 1] + e01 * c[:, 2]) / area[f]
+        cell = np.floor(depth).astype(np.int64) + 1
+        step = (-s).astype(np.int8)
+        return u[inside], v[inside], cell[inside], step[inside]
+
+    def _slab_sums(self, axis: int, k0: int, k1: int):
+        """
+        Число обхода и число пересечений в центрах вокселей слоя [k0, k1) для лучей оси
+
+        Returns:
+            tuple: (число обхода, число пересечений), массивы (nx, ny, k1 - k0)
+        """
+        nx, ny, _ = self.shape
+        s = k1 - k0
+        rays = self._rays[axis]
+        layer = rays["layer"]
+        lo, hi = np.searchsorted(layer, [k0, k1])
+        u, v, cell, step = (rays[k][lo:hi] for k in ("u", "v", "cell", "step"))
+
+        if axis == 2:
+            # Лучи вдоль z: пересечения ниже слоя дают начальное значение
+            flat = (u * ny + v) * s + (cell - k0)
+            base_ray = rays["u"][:lo] * ny + rays["v"][:lo]
+            base_w = np.bincount(base_ray, weights=rays["step"][:lo], minlength=nx * ny).astype(
+                np.int64
+            )
+            base_c = np.bincount(base_ray, minlength=nx * ny)
+        elif axis == 0:
+            # Лучи вдоль x: u — y, v — z, ячейка — x
+            keep = cell < nx
+            flat = ((cell * ny + u) * s + (v - k0))[keep]
+            step = step[keep]
+        else:
+            # Лучи вдоль y: u — z, v — x, ячейка — y
+            keep = cell < ny
+            flat = ((v * ny + cell) * s + (u - k0))[keep]
+            step = step[keep]
+
+        size = nx * ny * s
+        winding = (
+            np.bincount(flat, weights=step, minlength=size).astype(np.int64).reshape(nx, ny, s)
+        )
+        crossings = np.bincount(flat, minlength=size).reshape(nx, ny, s)
+        if axis == 2:
+            winding[:, :, 0] += base_w.reshape(nx, ny)
+            crossings[:, :, 0] += base_c.reshape(nx, ny)
+        return np.cumsum(winding, axis=axis), np.cumsum(crossings, axis=axis)
+
+    def _ray_masks(self, axis: int, k0: int, k1: int):
+        """Маски лучей (wind_ok, parity_ok), приведенные к форме слоя"""
+        rays = self._rays[axis]
+        masks = []
+        for name in ("wind_ok", "parity_ok"):
+            ok = rays[name]
+            if axis == 2:
+                masks.append(ok[:, :, None])
+            elif axis == 0:
+                masks.append(ok[:, k0:k1][None, :, :])
+            else:
+                masks.append(ok[k0:k1, :].T[:, None, :])
+        return masks
+
+    def _slab(self, index: int):
+        """Заполненность слоя блоков: голосование лучей трех осей и сжатие в блоки"""
+        b = VoxelGrid.BLOCK
+        k0, k1 = index * b, (index + 1) * b
+        nx, ny, _ = self.shape
+        votes = np.zeros((nx, ny, b), dtype=np.int8)
+        voters = np.zeros((nx, ny, b), dtype=np.int8)
+        parity = np.zeros((nx, ny, b), dtype=np.int8)
+        for axis in range(3):
+            winding, crossings = self._slab_sums(axis, k0, k1)
+            wind_ok, parity_ok = self._ray_masks(axis, k0, k1)
+            odd = crossings % 2 == 1
+            vote = np.where(wind_ok, winding != 0, odd)
+            valid = wind_ok | parity_ok
+            votes += vote & valid
+            voters += valid
+            parity += odd
+        inside = np.where(2 * votes != voters, 2 * votes > voters, parity >= 2)
+
+        # Сжатие: блоки слоя в порядке (by, bx) — номера блоков по возрастанию
+        bx, by = nx // b, ny // b
+        flat = slab_to_blocks(inside)
+        filled = flat.sum(axis=1)
+        keys = index * bx * by + np.arange(bx * by, dtype=np.int64)
+        full = filled == b**3
+        mixed = (filled > 0) & ~full
+        return keys[full], keys[mixed], np.packbits(flat[mixed], axis=1).ravel()
+
+
+def voxel_grid(
+    mesh,
+    resolution: Optional[int] = None,
+    check: Callable[[], None] = None,
+    progress: Callable[[int], None] = None,
+) -> VoxelGrid:
+    """
+    Получить воксельную сетку mesh из кэша или построить
+
+    Сетка хранится на самом mesh и действительна, пока не изменилась геометрия
+    (``geometry_version``), — объем, пустоты и воксельный ремонт используют одну сетку.
+
+    Args:
+        mesh: PyVista или trimesh mesh объект
+        resolution: Вокселей по наибольшему размеру (по умолчанию Config.VOXEL_RESOLUTION)
+        check: Функция проверки отмены при построении (например, TaskContext.check)
+        progress: Функция прогресса построения 0..100
+
+    Returns:
+        VoxelGrid: Заполненные воксели
+    """
+    resolution = int(resolution or Config.VOXEL_RESOLUTION)
+    version = geometry_version(mesh)
+    with mesh_lock(mesh, _ATTR):
+        cached = getattr(mesh, _ATTR, None)
+        if cached is not None and cached[0] == version and cached[1] == resolution:
+            return cached[2]
+        grid = Voxelizer(mesh, resolution=resolution).voxelize(check, progress)
+        setattr(mesh, _ATTR, (version, resolution, grid))
+        return grid
@@ -3,6 +3,7 @@
 """
 
 import logging
+import numpy as np
 from PySide6.QtWidgets import (
     QMainWindow,
     QWidget,
@@ -13,17 +14,89 @@ from PySide6.QtWidgets import (
     QFileDialog,
     QMessageBox,
     QSplitter,
+    QProgressBar,
+    QPushButton,
 )
 from PySide6.QtGui import QAction, QCursor
 from PySide6.QtCore import Qt, QTimer
 from pathlib import Path
 from solidflow.core.config import Config
+from solidflow.core.tasks import TaskScheduler
 from solidflow.gui.viewport.viewport3d import Viewport3D
-from solidflow.geometry.mesh.importer import STLImporter
+from solidflow.gui.widgets.print_estimate import PrintEstimateDialog
+from solidflow.gui.widgets.tessellation import TessellationDialog
 from solidflow.geometry.mesh.exporter import STLExporter
-from solidflow.geometry.mesh.processor import MeshProcessor
-from solidflow.analysis.validator import MeshValidator
-from solidflow.analysis.statistics import MeshStatistics
+from solidflow.geometry.mesh.step import STEP_SUFFIXES
+from solidflow.gui.tasks import (
+    analyze_task,
+    components_analyze_task,
+    components_repair_task,
+    curvature_task,
+    defects_task,
+    deviation_task,
+    edges_task,
+    estimate_task,
+    fix_normals_task,
+    format_component_reports,
+    format_curvature_summary,
+    format_defects_summary,
+    format_deviation_summary,
+    format_edges_summary,
+    format_nesting_summary,
+    format_orientation_summary,
+    format_overhang_summary,
+    format_porosity_summary,
+    format_stock_summary,
+    format_supports_summary,
+    format_thickness_summary,
+    load_task,
+    nesting_task,
+    orientation_task,
+    overhang_task,
+    porosity_task,
+    repair_task,
+    stock_task,
+    supports_task,
+    thickness_task,
+    voxel_repair_task,
+)
+
+
+# Диалоги ошибок фоновых задач: ключ задачи -> (заголовок, текст); {error} —
+# текст исключения. Ошибки загрузки разбираются отдельно по типу исключения
+_TASK_ERRORS = {
+    "analyze": ("Ошибка анализа", "Не удалось выполнить анализ:\n{error}"),
+    "repair": (
+        "Ошибка ремонта",
+        "Не удалось выполнить ремонт:\n{error}\n\n"
+        "Попробуйте использовать специализированные инструменты.",
+    ),
+    "voxel_repair": ("Ошибка ремонта", "Не удалось выполнить ремонт через воксели:\n{error}"),
+    "fix_normals": ("Ошибка исправления", "Не удалось исправить нормали:\n{error}"),
+    "components_analyze": ("Ошибка обработки деталей", "Не удалось обработать детали:\n{error}"),
+    "components_repair": ("Ошибка обработки деталей", "Не удалось обработать детали:\n{error}"),
+    "thickness": ("Ошибка анализа толщины", "Не удалось измерить толщину:\n{error}"),
+    "porosity": ("Ошибка анализа пустот", "Не удалось найти пустоты:\n{error}"),
+    "overhang": ("Ошибка анализа нависаний", "Не удалось найти нависания:\n{error}"),
+    "defects": ("Ошибка поиска дефектов", "Не удалось найти дефекты сетки:\n{error}"),
+    "edges": ("Ошибка анализа кромок", "Не удалось найти острые кромки:\n{error}"),
+    "curvature": ("Ошибка анализа кривизны", "Не удалось вычислить кривизну:\n{error}"),
+    "deviation": ("Ошибка сравнения", "Не удалось сравнить с исходной моделью:\n{error}"),
+    "orientation": ("Ошибка автоориентации", "Не удалось подобрать ориентацию:\n{error}"),
+    "nesting": ("Ошибка раскладки", "Не удалось разложить детали:\n{error}"),
+    "estimate": ("Ошибка оценки печати", "Не удалось оценить печать:\n{error}"),
+    "supports": ("Ошибка генерации поддержек", "Не удалось построить поддержки:\n{error}"),
+    "stock": ("Ошибка построения заготовки", "Не удалось построить заготовку:\n{error}"),
+}
+
+# Подписи видов дефектов в меню подсветки (ключи — DEFECT_COLORS viewport)
+_DEFECT_LABELS = {
+    "self_intersection": "Самопересечения",
+    "degenerate": "Вырожденные грани",
+    "flipped": "Перевернутые грани",
+    "non_manifold": "Non-manifold ребра",
+    "boundary": "Открытые края",
+}
 
 
 class MainWindow(QMainWindow):
@@ -51,12 +124,60 @@ class MainWindow(QMainWindow):
         self.current_stats = None
         self.current_validation = None
 
+        # Модель в том виде, в каком была загружена (для сравнения после ремонта)
+        self.original_mesh = None
+
+        # Сгенерированные поддержки текущей модели (отдельный mesh)
+        self.current_supports = None
+
+        # Заготовка с припуском для текущей модели (отдельный mesh)
+        self.current_stock = None
+
+        # Загруженное облако точек (вместо модели)
+        self.current_cloud = None
+
+        # Точность тесселяции открытой STEP модели (линейное мм, угловое градусы)
+        self.step_deflection = None
+
+        # Файл, загрузка которого выполняется в фоне
+        self._pending_file = None
+
         # Флаг изменений
         self.is_modified = False
 
+        # Фоновые задачи (загрузка/анализ/ремонт), результаты приходят через сигналы
+        self.tasks = TaskScheduler(self)
+        self._task_handlers = {
+            "open": self._on_open_finished,
+            "analyze": self._on_analyze_finished,
+            "repair": self._on_repair_finished,
+            "fix_normals": self._on_fix_normals_finished,
+            "components_analyze": self._on_components_analyze_finished,
+            "components_repair": self._on_components_repair_finished,
+            "thickness": self._on_thickness_finished,
+            "porosity": self._on_porosity_finished,
+            "voxel_repair": self._on_voxel_repair_finished,
+            "overhang": self._on_overhang_finished,
+            "edges": self._on_edges_finished,
+            "defects": self._on_defects_finished,
+            "curvature": self._on_curvature_finished,
+            "deviation": self._on_deviation_finished,
+            "stock": self._on_stock_finished,
+            "orientation": self._on_orientation_finished,
+            "nesting": self._on_nesting_finished,
+            "estimate": self._on_estimate_finished,
+            "supports": self._on_supports_finished,
+        }
+        self.tasks.task_progress.connect(self._on_task_progress)
+        self.tasks.task_finished.connect(self._on_task_finished)
+        self.tasks.task_failed.connect(self._on_task_failed)
+        self.tasks.task_cancelled.connect(self._on_task_cancelled)
+        self.tasks.busy_changed.connect(self._on_busy_changed)
+
         self._setup_ui()
         self._create_menu()
         self._create_toolbar()
+        self._create_progress_widgets()
         self._update_window_title()
 
         # Откладываем тяжелую инициализацию 3D viewport на следующий тик event loop,
@@ -126,6 +247,7 @@ class MainWindow(QMainWindow):
             if not self._maybe_save_changes():
                 event.ignore()
                 return
+        self.tasks.shutdown()
         event.accept()
 
     def _setup_ui(self):
@@ -186,6 +308,8 @@ class MainWindow(QMainWindow):
             self._viewport_placeholder = None
 
         self._viewport_host.layout().addWidget(self.viewport)
+        if self.render_stats_action.isChecked():
+            self.viewport.set_stats_overlay(True)
         self._log.info("Viewport3D initialized and attached")
 
     def _create_info_panel(self):
@@ -216,11 +340,21 @@ class MainWindow(QMainWindow):
         # Action: Open
         self.open_action = QAction("Открыть...", self)
         self.open_action.setShortcut("Ctrl+O")
-        self.open_action.setStatusTip("Открыть STL файл")
-        self.open_action.setToolTip("Открыть 3D-модель в формате STL")
+        self.open_action.setStatusTip("Открыть файл модели")
+        self.open_action.setToolTip("Открыть 3D-модель (STL, STEP, OBJ, PLY) или облако точек")
         self.open_action.triggered.connect(self._on_open)
         file_menu.addAction(self.open_action)
 
+        # Action: STEP tessellation
+        self.tessellation_action = QAction("Точность тесселяции...", self)
+        self.tessellation_action.setStatusTip("Построить треугольники STEP модели заново")
+        self.tessellation_action.setToolTip(
+            "Изменить линейное и угловое отклонение тесселяции открытой STEP модели"
+        )
+        self.tessellation_action.setEnabled(False)
+        self.tessellation_action.triggered.connect(self._on_tessellation)
+        file_menu.addAction(self.tessellation_action)
+
         # Action: Save
         self.save_action = QAction("Сохранить", self)
         self.save_action.setShortcut("Ctrl+S")
@@ -239,6 +373,22 @@ class MainWindow(QMainWindow):
         self.save_as_action.triggered.connect(self._on_save_as)
         file_menu.addAction(self.save_as_action)
 
+        # Action: Export Supports
+        self.supports_export_action = QAction("Экспорт поддержек...", self)
+        self.supports_export_action.setStatusTip("Сохранить поддержки в отдельный STL файл")
+        self.supports_export_action.setToolTip("Сохранить сгенерированные поддержки в STL")
+        self.supports_export_action.setEnabled(False)
+        self.supports_export_action.triggered.connect(self._on_supports_export)
+        file_menu.addAction(self.supports_export_action)
+
+        # Action: Export Stock
+        self.stock_export_action = QAction("Экспорт заготовки...", self)
+        self.stock_export_action.setStatusTip("Сохранить заготовку с припуском в отдельный STL файл")
+        self.stock_export_action.setToolTip("Сохранить построенную заготовку в STL")
+        self.stock_export_action.setEnabled(False)
+        self.stock_export_action.triggered.connect(self._on_stock_export)
+        file_menu.addAction(self.stock_export_action)
+
         file_menu.addSeparator()
 
         # Action: Exit
@@ -271,6 +421,61 @@ class MainWindow(QMainWindow):
 
         view_menu.addSeparator()
 
+        # Action: Section
+        self.section_action = QAction("Сечение плоскостью", self)
+        self.section_action.setCheckable(True)
+        self.section_action.setStatusTip("Разрез модели перемещаемой плоскостью")
+        self.section_action.setToolTip("Показать сечение модели горизонтальной плоскостью")
+        self.section_action.setEnabled(False)
+        self.section_action.triggered.connect(self._on_section)
+        view_menu.addAction(self.section_action)
+
+        # Action: Export Section
+        self.section_export_action = QAction("Экспорт контура сечения...", self)
+        self.section_export_action.setStatusTip("Сохранить контуры сечения в SVG или CSV")
+        self.section_export_action.setToolTip("Сохранить контуры текущего сечения")
+        self.section_export_action.setEnabled(False)
+        self.section_export_action.triggered.connect(self._on_section_export)
+        view_menu.addAction(self.section_export_action)
+
+        view_menu.addSeparator()
+
+        # Menu: Defect highlighting
+        defects_menu = view_menu.addMenu("Подсветка дефектов")
+        self.defect_actions = {}
+        for kind, label in _DEFECT_LABELS.items():
+            action = QAction(label, self)
+            action.setCheckable(True)
+            action.setChecked(True)
+            action.setStatusTip(f"Показать или скрыть подсветку: {label.lower()}")
+            action.toggled.connect(lambda checked, kind=kind: self._on_defect_visible(kind, checked))
+            defects_menu.addAction(action)
+            self.defect_actions[kind] = action
+        defects_menu.addSeparator()
+        clear_defects_action = QAction("Убрать подсветку", self)
+        clear_defects_action.setStatusTip("Убрать подсветку дефектов с модели")
+        clear_defects_action.triggered.connect(self._on_clear_defects)
+        defects_menu.addAction(clear_defects_action)
+
+        view_menu.addSeparator()
+
+        # Action: Render statistics
+        self.render_stats_action = QAction("Статистика отрисовки", self)
+        self.render_stats_action.setCheckable(True)
+        self.render_stats_action.setStatusTip(
+            "Показать время кадра, количество треугольников и память поверх модели"
+        )
+        self.render_stats_action.toggled.connect(self._on_render_stats)
+        view_menu.addAction(self.render_stats_action)
+
+        # Action: Export render statistics
+        render_stats_export_action = QAction("Экспорт статистики отрисовки...", self)
+        render_stats_export_action.setStatusTip("Сохранить данные последних кадров в CSV")
+        render_stats_export_action.triggered.connect(self._on_render_stats_export)
+        view_menu.addAction(render_stats_export_action)
+
+        view_menu.addSeparator()
+
         # Action: Reset Camera
         reset_camera_action = QAction("Сбросить камеру", self)
         reset_camera_action.setShortcut("Home")
@@ -291,6 +496,140 @@ class MainWindow(QMainWindow):
         tools_menu.addAction(analyze_action)
         self.analyze_action = analyze_action
 
+        # Action: Analyze by components
+        components_analyze_action = QAction("Анализ по деталям", self)
+        components_analyze_action.setStatusTip("Проанализировать каждую несвязанную деталь отдельно")
+        components_analyze_action.setToolTip(
+            "Разбить модель на компоненты связности и проверить каждую деталь"
+        )
+        components_analyze_action.setEnabled(False)
+        components_analyze_action.triggered.connect(self._on_components_analyze)
+        tools_menu.addAction(components_analyze_action)
+        self.components_analyze_action = components_analyze_action
+
+        # Action: Mesh defects
+        defects_action = QAction("Дефекты сетки", self)
+        defects_action.setStatusTip("Показать дефекты сетки на модели")
+        defects_action.setToolTip(
+            "Подсветить перевернутые, вырожденные и самопересекающиеся грани, "
+            "открытые и non-manifold ребра"
+        )
+        defects_action.setEnabled(False)
+        defects_action.triggered.connect(self._on_defects)
+        tools_menu.addAction(defects_action)
+        self.defects_action = defects_action
+
+        # Action: Wall thickness
+        thickness_action = QAction("Анализ толщины стенок", self)
+        thickness_action.setStatusTip("Измерить толщину стенок и показать карту толщин")
+        thickness_action.setToolTip(
+            f"Найти стенки тоньше {Config.MIN_WALL_THICKNESS:g} мм и раскрасить модель по толщине"
+        )
+        thickness_action.setEnabled(False)
+        thickness_action.triggered.connect(self._on_thickness)
+        tools_menu.addAction(thickness_action)
+        self.thickness_action = thickness_action
+
+        # Action: Voids and porosity
+        porosity_action = QAction("Пустоты и пористость", self)
+        porosity_action.setStatusTip("Найти внутренние пустоты и оценить толщину по вокселям")
+        porosity_action.setToolTip(
+            "Работает и для незамкнутых моделей: пустоты, пористость и тонкие стенки"
+        )
+        porosity_action.setEnabled(False)
+        porosity_action.triggered.connect(self._on_porosity)
+        tools_menu.addAction(porosity_action)
+        self.porosity_action = porosity_action
+
+        # Action: Overhangs
+        overhang_action = QAction("Анализ нависаний", self)
+        overhang_action.setStatusTip("Найти грани, требующие поддержек при печати")
+        overhang_action.setToolTip(
+            f"Показать нависания круче {Config.OVERHANG_ANGLE:g}° от вертикали и площадь поддержек"
+        )
+        overhang_action.setEnabled(False)
+        overhang_action.triggered.connect(self._on_overhang)
+        tools_menu.addAction(overhang_action)
+        self.overhang_action = overhang_action
+
+        # Action: Auto orientation
+        orientation_action = QAction("Автоориентация", self)
+        orientation_action.setStatusTip("Подобрать ориентацию модели для печати")
+        orientation_action.setToolTip(
+            "Подобрать ориентацию с минимумом поддержек, высоты и площади на столе"
+        )
+        orientation_action.setEnabled(False)
+        orientation_action.triggered.connect(self._on_orientation)
+        tools_menu.addAction(orientation_action)
+        self.orientation_action = orientation_action
+
+        # Action: Nesting
+        nesting_action = QAction("Раскладка на столе", self)
+        nesting_action.setStatusTip("Разложить несвязанные детали на рабочем столе")
+        nesting_action.setToolTip(
+            f"Плотная раскладка деталей на столе {Config.BUILD_PLATE[0]:g} x "
+            f"{Config.BUILD_PLATE[1]:g} мм с поворотами вокруг вертикали"
+        )
+        nesting_action.setEnabled(False)
+        nesting_action.triggered.connect(self._on_nesting)
+        tools_menu.addAction(nesting_action)
+        self.nesting_action = nesting_action
+
+        # Action: Sharp edges
+        edges_action = QAction("Острые кромки", self)
+        edges_action.setStatusTip("Найти острые кромки, вершины и тонкие лезвия")
+        edges_action.setToolTip(
+            "Показать ребра с изломом больше порога, острые вершины и тонкие лезвия"
+        )
+        edges_action.setEnabled(False)
+        edges_action.triggered.connect(self._on_edges)
+        tools_menu.addAction(edges_action)
+        self.edges_action = edges_action
+
+        # Action: Curvature
+        curvature_action = QAction("Карта кривизны", self)
+        curvature_action.setStatusTip("Показать среднюю кривизну поверхности")
+        curvature_action.setToolTip(
+            "Раскрасить модель по средней кривизне и найти участки малого радиуса"
+        )
+        curvature_action.setEnabled(False)
+        curvature_action.triggered.connect(self._on_curvature)
+        tools_menu.addAction(curvature_action)
+        self.curvature_action = curvature_action
+
+        # Action: Print estimate
+        estimate_action = QAction("Оценка печати", self)
+        estimate_action.setStatusTip("Оценить время печати и расход материала")
+        estimate_action.setToolTip(
+            "Оценить время печати и расход материала для профиля FDM или фотополимера"
+        )
+        estimate_action.setEnabled(False)
+        estimate_action.triggered.connect(self._on_estimate)
+        tools_menu.addAction(estimate_action)
+        self.estimate_action = estimate_action
+
+        # Action: Supports
+        supports_action = QAction("Поддержки", self)
+        supports_action.setStatusTip("Сгенерировать древовидные поддержки")
+        supports_action.setToolTip(
+            "Построить поддержки под нависаниями для текущей ориентации модели"
+        )
+        supports_action.setEnabled(False)
+        supports_action.triggered.connect(self._on_supports)
+        tools_menu.addAction(supports_action)
+        self.supports_action = supports_action
+
+        # Action: Stock with allowance
+        stock_action = QAction("Заготовка с припуском", self)
+        stock_action.setStatusTip("Построить заготовку для механообработки")
+        stock_action.setToolTip(
+            f"Эквидистанта детали на расстоянии {Config.STOCK_ALLOWANCE:g} мм по полю расстояний"
+        )
+        stock_action.setEnabled(False)
+        stock_action.triggered.connect(self._on_stock)
+        tools_menu.addAction(stock_action)
+        self.stock_action = stock_action
+
         tools_menu.addSeparator()
 
         # Action: Repair
@@ -302,6 +641,30 @@ class MainWindow(QMainWindow):
         tools_menu.addAction(repair_action)
         self.repair_action = repair_action
 
+        # Action: Repair by components
+        components_repair_action = QAction("Ремонт по деталям", self)
+        components_repair_action.setStatusTip("Отремонтировать каждую несвязанную деталь отдельно")
+        components_repair_action.setToolTip(
+            "Ремонт компонент связности параллельно; сбой на одной детали не затрагивает остальные"
+        )
+        components_repair_action.setEnabled(False)
+        components_repair_action.triggered.connect(self._on_components_repair)
+        tools_menu.addAction(components_repair_action)
+        self.components_repair_action = components_repair_action
+
+        # Action: Voxel repair
+        voxel_repair_action = QAction("Ремонт через воксели", self)
+        voxel_repair_action.setStatusTip(
+            "Перестроить поверхность по воксельной модели (для моделей, не поддающихся ремонту)"
+        )
+        voxel_repair_action.setToolTip(
+            "Всегда дает замкнутую модель; детали мельче вокселя сглаживаются"
+        )
+        voxel_repair_action.setEnabled(False)
+        voxel_repair_action.triggered.connect(self._on_voxel_repair)
+        tools_menu.addAction(voxel_repair_action)
+        self.voxel_repair_action = voxel_repair_action
+
         # Action: Fix Normals
         fix_normals_action = QAction("Исправить нормали", self)
         fix_normals_action.setStatusTip("Исправить ориентацию нормалей")
@@ -311,6 +674,17 @@ class MainWindow(QMainWindow):
         tools_menu.addAction(fix_normals_action)
         self.fix_normals_action = fix_normals_action
 
+        # Action: Deviation from original
+        deviation_action = QAction("Отклонение от исходной", self)
+        deviation_action.setStatusTip("Сравнить текущую модель с загруженной")
+        deviation_action.setToolTip(
+            "Показать, насколько ремонт или упрощение сдвинули поверхность модели"
+        )
+        deviation_action.setEnabled(False)
+        deviation_action.triggered.connect(self._on_deviation)
+        tools_menu.addAction(deviation_action)
+        self.deviation_action = deviation_action
+
         # Меню Help
         help_menu = menubar.addMenu("Справка")
 
@@ -335,84 +709,226 @@ class MainWindow(QMainWindow):
         toolbar.addAction(self.wireframe_action)
         toolbar.addAction(self.solid_action)
 
+    def _create_progress_widgets(self):
+        """Создать индикатор прогресса и кнопку отмены в статус баре"""
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setMaximumWidth(200)
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setVisible(False)
+        self.statusBar().addPermanentWidget(self.progress_bar)
+
+        self.cancel_button = QPushButton("Отмена")
+        self.cancel_button.setToolTip("Отменить выполняемую операцию")
+        self.cancel_button.setVisible(False)
+        self.cancel_button.clicked.connect(self._on_cancel_tasks)
+        self.statusBar().addPermanentWidget(self.cancel_button)
+
+    def _on_busy_changed(self, busy: bool):
+        """Показать/скрыть индикатор прогресса"""
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(busy)
+        self.cancel_button.setVisible(busy)
+        self.cancel_button.setEnabled(busy)
+
+    def _on_task_progress(self, key: str, percent: int):
+        """Обновить индикатор прогресса"""
+        if percent < 0:
+            # Неопределенный прогресс — "бегущая" полоса
+            self.progress_bar.setRange(0, 0)
+        else:
+            self.progress_bar.setRange(0, 100)
+            self.progress_bar.setValue(percent)
+
+    def _on_cancel_tasks(self):
+        """Обработчик кнопки отмены"""
+        self.cancel_button.setEnabled(False)
+        self.statusBar().showMessage("Отмена операции...")
+        self.tasks.cancel()
+
+    def _on_task_finished(self, key: str, result):
+        """Передать результат фоновой задачи обработчику"""
+        handler = self._task_handlers.get(key)
+        if handler is not None:
+            handler(result)
+
+    def _on_task_cancelled(self, key: str):
+        """Обработчик отмены фоновой задачи"""
+        self.statusBar().showMessage("Операция отменена", 3000)
+
+    def _on_task_failed(self, key: str, error):
+        """Обработчик ошибки фоновой задачи"""
+        self._log.error("Task %s failed: %s", key, error)
+        self.statusBar().clearMessage()
+
+        if key == "open":
+            file_name = self._pending_file
+            if isinstance(error, FileNotFoundError):
+                QMessageBox.critical(self, "Ошибка загрузки", f"Файл не найден:\n{file_name}")
+            elif isinstance(error, PermissionError):
+                QMessageBox.critical(
+                    self, "Ошибка загрузки", f"Нет доступа к файлу:\n{file_name}"
+                )
+            elif isinstance(error, ValueError):
+                QMessageBox.critical(self, "Ошибка загрузки", f"Некорректный файл:\n{str(error)}")
+            elif isinstance(error, ImportError):
+                QMessageBox.critical(self, "Ошибка загрузки", str(error))
+            else:
+                QMessageBox.critical(
+                    self,
+                    "Ошибка загрузки",
+                    f"Не удалось загрузить файл:\n{str(error)}\n\n"
+                    f"Убедитесь, что файл является корректной моделью STL, OBJ, PLY или STEP.",
+                )
+        elif key == "analyze":
+            self.current_stats = None
+            self.current_validation = None
+            self._update_info()
+
+        if key in _TASK_ERRORS:
+            title, message = _TASK_ERRORS[key]
+            QMessageBox.critical(self, title, message.format(error=error))
+
+    def _is_current_source(self, result) -> bool:
+        """Проверить, что результат посчитан для модели, которая сейчас отображается"""
+        return self.viewport is not None and self.viewport.current_mesh is result["source"]
+
     def _on_open(self):
         """Обработчик открытия файла"""
+        if self.tasks.is_running("open"):
+            self.statusBar().showMessage("Модель уже загружается...", 2000)
+            return
+
         # Если текущая модель изменена, спросим что делать
         if self.viewport and self.viewport.current_mesh and self.is_modified:
             if not self._maybe_save_changes():
                 return
 
         file_name, _ = QFileDialog.getOpenFileName(
-            self, "Открыть STL файл", "", Config.get_file_filter()
+            self, "Открыть файл", "", Config.get_file_filter()
         )
 
         if file_name:
-            self.statusBar().showMessage("Загрузка модели...")
-            self.setCursor(QCursor(Qt.WaitCursor))
-            
-            try:
-                # Используем STLImporter для загрузки
-                mesh = STLImporter.load(file_name)
-                
-                if mesh is None or mesh.n_cells == 0:
-                    raise ValueError("Файл пустой или не содержит геометрии")
-                
-                self.viewport.load_mesh(mesh)
-                self.current_file = file_name
-                self._set_modified(False)
+            deflection = None
+            if Path(file_name).suffix.lower() in STEP_SUFFIXES:
+                dialog = TessellationDialog(self.step_deflection, self)
+                if not dialog.exec():
+                    return
+                deflection = dialog.deflection()
+            self._open_file(file_name, deflection)
+
+    def _open_file(self, file_name: str, deflection=None):
+        """Запустить загрузку файла (для STEP — с заданной точностью тесселяции)"""
+        self.statusBar().showMessage("Загрузка модели...")
+        self._pending_file = file_name
+        self.tasks.submit("open", load_task, file_name, deflection=deflection)
+
+    def _on_tessellation(self):
+        """Обработчик смены точности тесселяции: повторная загрузка текущего STEP"""
+        if not self.current_file or Path(self.current_file).suffix.lower() not in STEP_SUFFIXES:
+            return
+        if self.tasks.is_running("open"):
+            self.statusBar().showMessage("Модель уже загружается...", 2000)
+            return
+        if self.is_modified and not self._maybe_save_changes():
+            return
 
-                # Включаем действия
-                self.save_action.setEnabled(True)
-                self.save_as_action.setEnabled(True)
-                self.analyze_action.setEnabled(True)
-                self.repair_action.setEnabled(True)
-                self.fix_normals_action.setEnabled(True)
+        dialog = TessellationDialog(self.step_deflection, self)
+        if dialog.exec():
+            self._open_file(self.current_file, dialog.deflection())
+
+    def _set_mesh_actions_enabled(self, enabled: bool):
+        """Включить или выключить действия, работающие с моделью"""
+        self.save_action.setEnabled(enabled)
+        self.save_as_action.setEnabled(enabled)
+        self.analyze_action.setEnabled(enabled)
+        self.repair_action.setEnabled(enabled)
+        self.components_analyze_action.setEnabled(enabled)
+        self.defects_action.setEnabled(enabled)
+        self.components_repair_action.setEnabled(enabled)
+        self.voxel_repair_action.setEnabled(enabled)
+        self.thickness_action.setEnabled(enabled)
+        self.porosity_action.setEnabled(enabled)
+        self.overhang_action.setEnabled(enabled)
+        self.edges_action.setEnabled(enabled)
+        self.curvature_action.setEnabled(enabled)
+        self.deviation_action.setEnabled(enabled)
+        self.orientation_action.setEnabled(enabled)
+        self.nesting_action.setEnabled(enabled)
+        self.estimate_action.setEnabled(enabled)
+        self.fix_normals_action.setEnabled(enabled)
+        self.section_action.setEnabled(enabled)
+        self.supports_action.setEnabled(enabled)
+        self.stock_action.setEnabled(enabled)
+
+    def _on_open_finished(self, result):
+        """Загрузка и анализ завершены: показать модель"""
+        if "cloud" in result:
+            self._on_cloud_opened(result)
+            return
 
-                # Автоматический анализ
-                self.statusBar().showMessage("Анализ модели...")
-                self._perform_analysis()
+        mesh = result["mesh"]
+        file_name = result["file"]
 
-                # Обновить информацию
-                self._update_info()
+        self.viewport.load_mesh(mesh)
+        self.original_mesh = mesh
+        self.current_file = file_name
+        self.current_stats = result["stats"]
+        self.current_validation = result["validation"]
+        self._set_modified(False)
 
-                self.setCursor(QCursor(Qt.ArrowCursor))
-                self.statusBar().showMessage(
-                    f"Загружено: {Path(file_name).name} ({mesh.n_cells} треугольников)", 
-                    5000
-                )
-                self._update_window_title()
-            except FileNotFoundError:
-                self.setCursor(QCursor(Qt.ArrowCursor))
-                QMessageBox.critical(
-                    self, 
-                    "Ошибка загрузки", 
-                    f"Файл не найден:\n{file_name}"
-                )
-            except PermissionError:
-                self.setCursor(QCursor(Qt.ArrowCursor))
-                QMessageBox.critical(
-                    self, 
-                    "Ошибка загрузки", 
-                    f"Нет доступа к файлу:\n{file_name}"
-                )
-            except ValueError as e:
-                self.setCursor(QCursor(Qt.ArrowCursor))
-                QMessageBox.critical(
-                    self, 
-                    "Ошибка загрузки", 
-                    f"Некорректный файл:\n{str(e)}"
-                )
-            except Exception as e:
-                self.setCursor(QCursor(Qt.ArrowCursor))
-                QMessageBox.critical(
-                    self, 
-                    "Ошибка загрузки", 
-                    f"Не удалось загрузить файл:\n{str(e)}\n\n"
-                    f"Убедитесь, что файл является корректным STL."
-                )
+        # Включаем действия
+        self._set_mesh_actions_enabled(True)
+        is_step = Path(file_name).suffix.lower() in STEP_SUFFIXES
+        self.step_deflection = result.get("deflection") if is_step else None
+        self.tessellation_action.setEnabled(is_step)
+
+        # Обновить информацию
+        self._update_info()
+
+        self.statusBar().showMessage(
+            f"Загружено: {Path(file_name).name} ({mesh.n_cells} треугольников)", 5000
+        )
+        self._update_window_title()
+
+        # Узлы общих ребер граней STEP не сошлись — в сетке остались щели
+        open_edges = result.get("open_edges", 0)
+        if open_edges:
+            QMessageBox.warning(
+                self,
+                "Открытые ребра",
+                f"После тесселяции в сетке осталось открытых ребер: {open_edges}.\n\n"
+                "Узлы на общих ребрах соседних граней не совпали. Уменьшите "
+                "линейное отклонение (Точность тесселяции) или выполните ремонт сетки.",
+            )
+
+    def _on_cloud_opened(self, result):
+        """Облако точек загружено: показать уровень октодерева"""
+        file_name = result["file"]
+        self.viewport.load_point_cloud(result["octree"])
+        self.original_mesh = None
+        self.current_file = file_name
+        self.current_cloud = result["cloud"]
+        self.current_stats = None
+        self.current_validation = None
+        self._set_modified(False)
+
+        # Облако — не mesh: анализ, ремонт и сохранение в STL недоступны
+        self._set_mesh_actions_enabled(False)
+        self.step_deflection = None
+        self.tessellation_action.setEnabled(False)
+        self._update_info()
+
+        self.statusBar().showMessage(
+            f"Загружено: {Path(file_name).name} ({self.current_cloud.n_points} точек)", 5000
+        )
+        self._update_window_title()
 
     def _on_save(self) -> bool:
         """Обработчик сохранения файла"""
+        # Сохранение только в STL: модель из OBJ, PLY или STEP сохраняется как новый файл
+        if self.current_file and Path(self.current_file).suffix.lower() != ".stl":
+            return self._on_save_as()
         if self.current_file and self.viewport.current_mesh:
             self.statusBar().showMessage("Сохранение...")
             self.setCursor(QCursor(Qt.WaitCursor))
@@ -457,12 +973,13 @@ class MainWindow(QMainWindow):
             # Предлагаем имя по умолчанию
             default_name = ""
             if self.current_file:
-                default_name = str(Path(self.current_file).with_name(
-                    Path(self.current_file).stem + "_edited.stl"
-                ))
+                # Модель из OBJ, PLY или STEP предлагается сохранить рядом в STL
+                source = Path(self.current_file)
+                suffix = "_edited.stl" if source.suffix.lower() == ".stl" else ".stl"
+                default_name = str(source.with_name(source.stem + suffix))
             
             file_name, _ = QFileDialog.getSaveFileName(
-                self, "Сохранить STL файл", default_name, Config.get_file_filter()
+                self, "Сохранить STL файл", default_name, Config.get_save_filter()
             )
 
             if file_name:
@@ -523,31 +1040,107 @@ class MainWindow(QMainWindow):
         self.wireframe_action.setChecked(False)
         self.statusBar().showMessage("Режим отображения: Заливка", 2000)
 
+    def _on_section(self, checked):
+        """Включение/выключение сечения плоскостью"""
+        if checked and self.viewport.current_mesh is not None:
+            self.setCursor(QCursor(Qt.WaitCursor))
+            try:
+                self.viewport.enable_section()
+            finally:
+                self.setCursor(QCursor(Qt.ArrowCursor))
+            self.statusBar().showMessage("Перемещайте плоскость сечения мышью", 3000)
+        else:
+            self.viewport.disable_section()
+        self.section_action.setChecked(self.viewport.has_section())
+        self.section_export_action.setEnabled(self.viewport.has_section())
+
+    def _on_section_export(self):
+        """Экспорт контуров текущего сечения"""
+        if self.viewport.section_result() is None:
+            return
+        default_name = ""
+        if self.current_file:
+            default_name = str(Path(self.current_file).with_name(
+                Path(self.current_file).stem + "_section.svg"
+            ))
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, "Экспорт контура сечения", default_name, "SVG (*.svg);;CSV (*.csv)"
+        )
+        if not file_name:
+            return
+        if Path(file_name).suffix.lower() not in (".svg", ".csv"):
+            file_name += ".svg"
+        try:
+            self.viewport.export_section(file_name)
+        except (OSError, ValueError) as e:
+            QMessageBox.critical(
+                self, "Ошибка экспорта", f"Не удалось сохранить контур сечения:\n{str(e)}"
+            )
+            return
+        self.statusBar().showMessage(f"Контур сечения сохранен: {Path(file_name).name}", 3000)
+
+    def _on_render_stats(self, visible: bool):
+        """Показ/скрытие статистики отрисовки поверх модели"""
+        if self.viewport is not None:
+            self.viewport.set_stats_overlay(visible)
+
+    def _on_render_stats_export(self):
+        """Экспорт статистики последних кадров"""
+        if self.viewport is None:
+            return
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, "Экспорт статистики отрисовки", "render_stats.csv", "CSV (*.csv)"
+        )
+        if not file_name:
+            return
+        if Path(file_name).suffix.lower() != ".csv":
+            file_name += ".csv"
+        try:
+            frames = self.viewport.export_render_stats(file_name)
+        except OSError as e:
+            QMessageBox.critical(
+                self, "Ошибка экспорта", f"Не удалось сохранить статистику отрисовки:\n{str(e)}"
+            )
+            return
+        self.statusBar().showMessage(
+            f"Статистика отрисовки сохранена ({frames} кадров): {Path(file_name).name}", 3000
+        )
+
     def _on_reset_camera(self):
         """Сброс камеры"""
         self.viewport.reset_camera()
         self.statusBar().showMessage("Камера сброшена", 2000)
 
-    def _perform_analysis(self):
-        """Выполнить анализ модели"""
-        if self.viewport.current_mesh:
-            try:
-                # Статистика
-                stats = MeshStatistics(self.viewport.current_mesh)
-                self.current_stats = stats.compute_all()
-
-                # Валидация
-                validator = MeshValidator(self.viewport.current_mesh)
-                self.current_validation = validator.validate()
-
-            except Exception as e:
-                print(f"Ошибка анализа: {e}")
-                self.current_stats = None
-                self.current_validation = None
-
     def _update_info(self):
         """Обновить информацию о модели"""
-        if self.viewport.current_mesh is not None:
+        # Замена модели выключает сечение и убирает поддержки
+        self.section_action.setChecked(self.viewport.has_section())
+        self.section_export_action.setEnabled(self.viewport.has_section())
+        if not self.viewport.has_supports():
+            self.current_supports = None
+        self.supports_export_action.setEnabled(self.current_supports is not None)
+        if not self.viewport.has_stock():
+            self.current_stock = None
+        self.stock_export_action.setEnabled(self.current_stock is not None)
+
+        if not self.viewport.has_point_cloud():
+            self.current_cloud = None
+
+        if self.current_cloud is not None:
+            octree = self.viewport.current_cloud
+            size = octree.bounds[1] - octree.bounds[0]
+            level = self.viewport.point_cloud_level()
+            shown = octree.level_size(level)
+            info = f'<b>Файл:</b> {Path(self.current_file).name if self.current_file else "Не указан"}<br><br>'
+            info += "<b>Облако точек:</b><br>"
+            info += f"Точек: {self.current_cloud.n_points}<br>"
+            info += f"Показано: {shown} (уровень {level})<br><br>"
+            info += "<b>Размеры:</b><br>"
+            info += f"X: {size[0]:.2f} мм<br>"
+            info += f"Y: {size[1]:.2f} мм<br>"
+            info += f"Z: {size[2]:.2f} мм<br>"
+            self.info_text.setText(info)
+        elif self.viewport.current_mesh is not None:
             mesh = self.viewport.current_mesh
 
             info = f'<b>Файл:</b> {Path(self.current_file).name if self.current_file else "Не указан"}<br><br>'
@@ -569,7 +1162,9 @@ class MainWindow(QMainWindow):
                 volume = self.current_stats["volume"]
                 area = self.current_stats["surface_area"]
                 if volume > 0:
-                    info += f"<b>Объем:</b> {volume:.2f} мм³<br>"
+                    # Негерметичная модель: объем оценен по вокселям
+                    approx = "≈" if self.current_stats.get("volume_estimated") else ""
+                    info += f"<b>Объем:</b> {approx}{volume:.2f} мм³<br>"
                 info += f"<b>Площадь:</b> {area:.2f} мм²<br><br>"
 
             # Валидация
@@ -592,23 +1187,37 @@ class MainWindow(QMainWindow):
     def _on_analyze(self):
         """Обработчик анализа модели"""
         if self.viewport.current_mesh:
-            self._perform_analysis()
-            self._update_info()
+            self.statusBar().showMessage("Анализ модели...")
+            self.tasks.submit("analyze", analyze_task, self.viewport.current_mesh)
 
-            # Показать детальную информацию
-            if self.current_validation:
-                issues = self.current_validation["issues"]
-                if issues:
-                    msg = "Найдены проблемы:\n\n" + "\n".join(f"• {issue}" for issue in issues)
-                    QMessageBox.warning(self, "Результаты анализа", msg)
-                else:
-                    QMessageBox.information(
-                        self, "Результаты анализа", "Модель не содержит проблем!"
-                    )
+    def _on_analyze_finished(self, result):
+        """Анализ завершен: показать результаты"""
+        if not self._is_current_source(result):
+            return
+
+        self.current_stats = result["stats"]
+        self.current_validation = result["validation"]
+        self._update_info()
+        self.statusBar().showMessage("Анализ выполнен", 3000)
+
+        # Показать детальную информацию
+        if self.current_validation:
+            issues = self.current_validation["issues"]
+            if issues:
+                msg = "Найдены проблемы:\n\n" + "\n".join(f"• {issue}" for issue in issues)
+                QMessageBox.warning(self, "Результаты анализа", msg)
+            else:
+                QMessageBox.information(
+                    self, "Результаты анализа", "Модель не содержит проблем!"
+                )
 
     def _on_repair(self):
         """Обработчик ремонта модели"""
         if self.viewport.current_mesh:
+            if self.tasks.is_running("repair"):
+                self.statusBar().showMessage("Ремонт уже выполняется...", 2000)
+                return
+
             # Предупреждение пользователю
             reply = QMessageBox.question(
                 self,
@@ -619,78 +1228,544 @@ class MainWindow(QMainWindow):
                 QMessageBox.Yes | QMessageBox.No,
                 QMessageBox.No
             )
-            
+
             if reply == QMessageBox.No:
                 return
-            
+
             self.statusBar().showMessage("Выполняется ремонт...")
-            self.setCursor(QCursor(Qt.WaitCursor))
-            
-            try:
-                processor = MeshProcessor(self.viewport.current_mesh)
-                repaired_mesh = processor.repair()
+            self.tasks.submit("repair", repair_task, self.viewport.current_mesh)
 
-                self.viewport.load_mesh(repaired_mesh)
-                self._set_modified(True)
-                
-                # Повторный анализ
-                self._perform_analysis()
-                self._update_info()
+    def _on_repair_finished(self, result):
+        """Ремонт завершен: показать модель и результаты"""
+        if not self._is_current_source(result):
+            return
 
-                self.setCursor(QCursor(Qt.ArrowCursor))
-                self.statusBar().showMessage("Ремонт выполнен", 3000)
-                
-                # Показать результаты
-                msg = "Модель успешно отремонтирована!\n\n"
-                if self.current_validation:
-                    if self.current_validation["valid"]:
-                        msg += "Модель теперь корректна."
-                    else:
-                        msg += "Внимание: некоторые проблемы могут остаться.\n"
-                        msg += "Проверьте результаты в панели информации."
-                
-                QMessageBox.information(self, "Ремонт модели", msg)
-            except Exception as e:
-                self.setCursor(QCursor(Qt.ArrowCursor))
-                QMessageBox.critical(
-                    self, 
-                    "Ошибка ремонта", 
-                    f"Не удалось выполнить ремонт:\n{str(e)}\n\n"
-                    f"Попробуйте использовать специализированные инструменты."
-                )
+        self.viewport.load_mesh(result["mesh"])
+        self.current_stats = result["stats"]
+        self.current_validation = result["validation"]
+        self._set_modified(True)
+        self._update_info()
+
+        self.statusBar().showMessage("Ремонт выполнен", 3000)
+
+        # Показать результаты
+        msg = "Модель успешно отремонтирована!\n\n"
+        if self.current_validation:
+            if self.current_validation["valid"]:
+                msg += "Модель теперь корректна."
+            else:
+                msg += "Внимание: некоторые проблемы могут остаться.\n"
+                msg += "Проверьте результаты в панели информации.\n\n"
+                msg += "Если модель не удается починить, используйте\n"
+                msg += '"Ремонт через воксели" в меню "Инструменты".'
+
+        QMessageBox.information(self, "Ремонт модели", msg)
+
+    def _on_voxel_repair(self):
+        """Обработчик ремонта через воксели"""
+        if self.viewport.current_mesh:
+            if self.tasks.is_running("voxel_repair"):
+                self.statusBar().showMessage("Ремонт уже выполняется...", 2000)
+                return
+
+            reply = QMessageBox.question(
+                self,
+                "Ремонт через воксели",
+                "Перестроить поверхность модели по воксельной модели?\n\n"
+                f"Шаг сетки — 1/{Config.VOXEL_RESOLUTION} наибольшего размера модели:\n"
+                "детали мельче шага будут сглажены.\n"
+                "Рекомендуется сохранить резервную копию оригинала.",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.No,
+            )
+            if reply == QMessageBox.No:
+                return
+
+            self.statusBar().showMessage("Выполняется ремонт через воксели...")
+            self.tasks.submit("voxel_repair", voxel_repair_task, self.viewport.current_mesh)
+
+    def _on_voxel_repair_finished(self, result):
+        """Ремонт через воксели завершен"""
+        if not self._is_current_source(result):
+            return
+
+        self.viewport.load_mesh(result["mesh"])
+        self.current_stats = result["stats"]
+        self.current_validation = result["validation"]
+        self._set_modified(True)
+        self._update_info()
+
+        self.statusBar().showMessage("Ремонт через воксели выполнен", 3000)
+        QMessageBox.information(
+            self,
+            "Ремонт через воксели",
+            f"Поверхность перестроена: {result['mesh'].n_cells} треугольников.\n\n"
+            'Сравнить с исходной моделью: "Отклонение от исходной" в меню "Инструменты".',
+        )
 
     def _on_fix_normals(self):
         """Обработчик исправления нормалей"""
         if self.viewport.current_mesh:
             self.statusBar().showMessage("Исправление нормалей...")
-            self.setCursor(QCursor(Qt.WaitCursor))
-            
-            try:
-                processor = MeshProcessor(self.viewport.current_mesh)
-                fixed_mesh = processor.fix_normals()
+            self.tasks.submit("fix_normals", fix_normals_task, self.viewport.current_mesh)
 
-                self.viewport.load_mesh(fixed_mesh)
-                self._set_modified(True)
-                
-                # Повторный анализ
-                self._perform_analysis()
-                self._update_info()
+    def _on_fix_normals_finished(self, result):
+        """Исправление нормалей завершено"""
+        if not self._is_current_source(result):
+            return
 
-                self.setCursor(QCursor(Qt.ArrowCursor))
-                self.statusBar().showMessage("Нормали исправлены", 3000)
-                QMessageBox.information(
-                    self, 
-                    "Исправление нормалей", 
-                    "Нормали успешно исправлены!\n\n"
-                    "Модель должна отображаться корректно."
-                )
-            except Exception as e:
-                self.setCursor(QCursor(Qt.ArrowCursor))
-                QMessageBox.critical(
-                    self, 
-                    "Ошибка исправления", 
-                    f"Не удалось исправить нормали:\n{str(e)}"
+        self.viewport.load_mesh(result["mesh"])
+        self.current_stats = result["stats"]
+        self.current_validation = result["validation"]
+        self._set_modified(True)
+        self._update_info()
+
+        self.statusBar().showMessage("Нормали исправлены", 3000)
+        QMessageBox.information(
+            self,
+            "Исправление нормалей",
+            "Нормали успешно исправлены!\n\n"
+            "Модель должна отображаться корректно."
+        )
+
+    def _on_components_analyze(self):
+        """Обработчик анализа по деталям"""
+        if self.viewport.current_mesh:
+            self.statusBar().showMessage("Анализ деталей...")
+            self.tasks.submit(
+                "components_analyze", components_analyze_task, self.viewport.current_mesh
+            )
+
+    def _on_components_analyze_finished(self, result):
+        """Анализ по деталям завершен"""
+        if not self._is_current_source(result):
+            return
+
+        self.statusBar().showMessage("Анализ деталей выполнен", 3000)
+        QMessageBox.information(
+            self, "Анализ по деталям", format_component_reports(result["reports"])
+        )
+
+    def _on_thickness(self):
+        """Обработчик анализа толщины стенок"""
+        mesh = self.viewport.current_mesh
+        if not mesh:
+            return
+
+        max_points = None
+        if mesh.n_cells > Config.LARGE_TASK_FACES:
+            # Полный анализ крупной модели занимает минуты: предлагаем оценку по выборке
+            msg_box = QMessageBox(self)
+            msg_box.setIcon(QMessageBox.Question)
+            msg_box.setWindowTitle("Анализ толщины стенок")
+            msg_box.setText(
+                f"Модель содержит {mesh.n_cells} треугольников, полный анализ займет "
+                "несколько минут."
+            )
+            msg_box.setInformativeText(
+                f"Быстрая оценка измерит {Config.THICKNESS_SAMPLE_FACES} случайных граней "
+                "за секунды, остальные будут окрашены по ближайшей измеренной."
+            )
+            quick_btn = msg_box.addButton("Быстрая оценка", QMessageBox.AcceptRole)
+            full_btn = msg_box.addButton("Полный анализ", QMessageBox.DestructiveRole)
+            msg_box.addButton("Отмена", QMessageBox.RejectRole)
+            msg_box.setDefaultButton(quick_btn)
+            msg_box.exec()
+
+            clicked = msg_box.clickedButton()
+            if clicked == quick_btn:
+                max_points = Config.THICKNESS_SAMPLE_FACES
+            elif clicked != full_btn:
+                return
+
+        self.statusBar().showMessage("Анализ толщины стенок...")
+        self.tasks.submit("thickness", thickness_task, mesh, max_points)
+
+    def _on_thickness_finished(self, result):
+        """Анализ толщины завершен: карта толщин и сводка"""
+        if not self._is_current_source(result):
+            return
+
+        thickness = result["thickness"]
+        self.viewport.show_face_scalars(thickness.face_thickness, "Толщина, мм")
+        self.solid_action.setChecked(True)
+        self.wireframe_action.setChecked(False)
+
+        self.statusBar().showMessage("Анализ толщины выполнен", 3000)
+        QMessageBox.information(
+            self,
+            "Анализ толщины стенок",
+            format_thickness_summary(thickness, Config.MIN_WALL_THICKNESS),
+        )
+
+    def _on_porosity(self):
+        """Обработчик поиска пустот"""
+        if self.viewport.current_mesh:
+            self.statusBar().showMessage("Поиск внутренних пустот...")
+            self.tasks.submit("porosity", porosity_task, self.viewport.current_mesh)
+
+    def _on_porosity_finished(self, result):
+        """Поиск пустот завершен: сводка"""
+        if not self._is_current_source(result):
+            return
+
+        self.statusBar().showMessage("Поиск пустот выполнен", 3000)
+        QMessageBox.information(
+            self, "Пустоты и пористость", format_porosity_summary(result["porosity"])
+        )
+
+    def _on_overhang(self):
+        """Обработчик анализа нависаний"""
+        if self.viewport.current_mesh:
+            self.statusBar().showMessage("Анализ нависаний...")
+            self.tasks.submit("overhang", overhang_task, self.viewport.current_mesh)
+
+    def _on_overhang_finished(self, result):
+        """Анализ нависаний завершен: подсветка граней и сводка"""
+        if not self._is_current_source(result):
+            return
+
+        overhang = result["overhang"]
+        # Цветом показываются только грани, требующие поддержки
+        angles = np.where(overhang.overhang_mask, overhang.overhang_angle, np.nan)
+        self.viewport.show_face_scalars(
+            angles, "Нависание, °", cmap="Reds", clim=(overhang.critical_angle, 90.0)
+        )
+        self.solid_action.setChecked(True)
+        self.wireframe_action.setChecked(False)
+
+        self.statusBar().showMessage("Анализ нависаний выполнен", 3000)
+        QMessageBox.information(self, "Анализ нависаний", format_overhang_summary(overhang))
+
+    def _on_defects(self):
+        """Обработчик поиска дефектов сетки"""
+        if self.viewport.current_mesh:
+            self.statusBar().showMessage("Поиск дефектов сетки...")
+            self.tasks.submit("defects", defects_task, self.viewport.current_mesh)
+
+    def _on_defects_finished(self, result):
+        """Поиск дефектов завершен: подсветка на модели и сводка"""
+        if not self._is_current_source(result):
+            return
+
+        defects = result["defects"]
+        for kind, action in self.defect_actions.items():
+            self.viewport.set_defect_visible(kind, action.isChecked())
+        self.viewport.show_defects(defects)
+        self.solid_action.setChecked(True)
+        self.wireframe_action.setChecked(False)
+
+        self.statusBar().showMessage("Поиск дефектов сетки выполнен", 3000)
+        QMessageBox.information(self, "Дефекты сетки", format_defects_summary(defects))
+
+    def _on_defect_visible(self, kind: str, visible: bool):
+        """Включение/выключение подсветки вида дефекта"""
+        if self.viewport is not None:
+            self.viewport.set_defect_visible(kind, visible)
+
+    def _on_clear_defects(self):
+        """Убрать подсветку дефектов"""
+        if self.viewport is not None:
+            self.viewport.clear_defects()
+
+    def _on_edges(self):
+        """Обработчик анализа острых кромок"""
+        if self.viewport.current_mesh:
+            self.statusBar().showMessage("Анализ острых кромок...")
+            self.tasks.submit("edges", edges_task, self.viewport.current_mesh)
+
+    def _on_edges_finished(self, result):
+        """Анализ кромок завершен: линии кромок поверх модели и сводка"""
+        if not self._is_current_source(result):
+            return
+
+        edges = result["edges"]
+        feature = edges.feature_mask
+        self.viewport.show_edge_scalars(
+            edges.vertices,
+            edges.edges[feature],
+            edges.dihedral[feature],
+            "Излом, °",
+            clim=(edges.sharp_angle, 180.0),
+        )
+
+        self.statusBar().showMessage("Анализ острых кромок выполнен", 3000)
+        QMessageBox.information(self, "Острые кромки", format_edges_summary(edges))
+
+    def _on_curvature(self):
+        """Обработчик анализа кривизны"""
+        if self.viewport.current_mesh:
+            self.statusBar().showMessage("Расчет кривизны...")
+            self.tasks.submit("curvature", curvature_task, self.viewport.current_mesh)
+
+    def _on_curvature_finished(self, result):
+        """Кривизна вычислена: карта средней кривизны и сводка"""
+        if not self._is_current_source(result):
+            return
+
+        curvature = result["curvature"]
+        values = curvature.face_values(curvature.mean)
+        finite = values[np.isfinite(values)]
+        # Симметричный диапазон палитры без выбросов: 0 — плоские участки
+        limit = float(np.percentile(np.abs(finite), 98)) if len(finite) else 1.0
+        self.viewport.show_face_scalars(
+            values, "Средняя кривизна, 1/мм", cmap="coolwarm", clim=(-limit, limit)
+        )
+        self.solid_action.setChecked(True)
+        self.wireframe_action.setChecked(False)
+
+        self.statusBar().showMessage("Карта кривизны построена", 3000)
+        QMessageBox.information(self, "Карта кривизны", format_curvature_summary(curvature))
+
+    def _on_deviation(self):
+        """Обработчик сравнения с исходной моделью"""
+        mesh = self.viewport.current_mesh
+        if not mesh or self.original_mesh is None:
+            return
+        if mesh is self.original_mesh:
+            QMessageBox.information(
+                self,
+                "Отклонение от исходной",
+                "Модель не изменялась после загрузки.\n\n"
+                "Сравнение доступно после ремонта, исправления нормалей или ремонта по деталям.",
+            )
+            return
+        if mesh.n_cells + self.original_mesh.n_cells > 2 * Config.LARGE_TASK_FACES:
+            # Сглаживание и упрощение сдвигают всю поверхность: запрашивается каждая точка
+            self.statusBar().showMessage(
+                "Сравнение с исходной моделью: крупная модель, при изменении всей "
+                "поверхности займет до нескольких минут (можно отменить)..."
+            )
+        else:
+            self.statusBar().showMessage("Сравнение с исходной моделью...")
+        self.tasks.submit("deviation", deviation_task, mesh, self.original_mesh)
+
+    def _on_deviation_finished(self, result):
+        """Сравнение завершено: карта отклонений и сводка"""
+        if not self._is_current_source(result):
+            return
+
+        deviation = result["deviation"]
+        limit = deviation.summary()["forward_max"] or Config.MAX_DEVIATION
+        self.viewport.show_face_scalars(
+            deviation.face_values(), "Отклонение, мм", cmap="coolwarm", clim=(-limit, limit)
+        )
+        self.solid_action.setChecked(True)
+        self.wireframe_action.setChecked(False)
+
+        self.statusBar().showMessage("Сравнение выполнено", 3000)
+        QMessageBox.information(
+            self, "Отклонение от исходной", format_deviation_summary(deviation)
+        )
+
+    def _on_orientation(self):
+        """Обработчик автоориентации"""
+        if self.viewport.current_mesh:
+            self.statusBar().showMessage("Подбор ориентации...")
+            self.tasks.submit("orientation", orientation_task, self.viewport.current_mesh)
+
+    def _on_orientation_finished(self, result):
+        """Подбор ориентации завершен: сводка и применение"""
+        if not self._is_current_source(result):
+            return
+
+        self.statusBar().showMessage("Ориентация подобрана", 3000)
+        reply = QMessageBox.question(
+            self,
+            "Автоориентация",
+            format_orientation_summary(result["orientation"]) + "\n\nПовернуть модель?",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.Yes,
+        )
+        if reply == QMessageBox.No:
+            return
+
+        self.viewport.load_mesh(result["mesh"])
+        # Поворот — не изменение формы: сравнение дальше ведется с повернутой моделью
+        self.original_mesh = result["mesh"]
+        self.current_stats = result["stats"]
+        self.current_validation = result["validation"]
+        self._set_modified(True)
+        self._update_info()
+
+    def _on_nesting(self):
+        """Обработчик раскладки деталей"""
+        if self.viewport.current_mesh:
+            self.statusBar().showMessage("Раскладка деталей...")
+            self.tasks.submit("nesting", nesting_task, self.viewport.current_mesh)
+
+    def _on_nesting_finished(self, result):
+        """Раскладка завершена: сводка и применение"""
+        if not self._is_current_source(result):
+            return
+
+        self.statusBar().showMessage("Раскладка построена", 3000)
+        reply = QMessageBox.question(
+            self,
+            "Раскладка на столе",
+            format_nesting_summary(result["nesting"]) + "\n\nПрименить раскладку?",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.Yes,
+        )
+        if reply == QMessageBox.No:
+            return
+
+        self.viewport.load_mesh(result["mesh"])
+        # Перемещение деталей — не изменение формы: сравнение дальше ведется с раскладкой
+        self.original_mesh = result["mesh"]
+        self.current_stats = result["stats"]
+        self.current_validation = result["validation"]
+        self._set_modified(True)
+        self._update_info()
+
+    def _on_estimate(self):
+        """Обработчик оценки печати"""
+        if self.viewport.current_mesh:
+            self.statusBar().showMessage("Построение сечений...")
+            self.tasks.submit("estimate", estimate_task, self.viewport.current_mesh)
+
+    def _on_estimate_finished(self, result):
+        """Сечения построены: диалог параметров и оценки"""
+        if not self._is_current_source(result):
+            return
+
+        self.statusBar().clearMessage()
+        PrintEstimateDialog(result["estimator"], self).exec()
+
+    def _on_supports(self):
+        """Обработчик генерации поддержек"""
+        if self.viewport.current_mesh:
+            self.statusBar().showMessage("Генерация поддержек...")
+            self.tasks.submit("supports", supports_task, self.viewport.current_mesh)
+
+    def _on_supports_finished(self, result):
+        """Поддержки построены: отображение и сводка"""
+        if not self._is_current_source(result):
+            return
+
+        supports = result["supports"]
+        if result["supports_mesh"].n_cells:
+            self.viewport.show_supports(result["supports_mesh"])
+            self.current_supports = result["supports_mesh"]
+        else:
+            self.viewport.clear_supports()
+            self.current_supports = None
+        self.supports_export_action.setEnabled(self.current_supports is not None)
+
+        self.statusBar().showMessage("Поддержки построены", 3000)
+        QMessageBox.information(self, "Поддержки", format_supports_summary(supports))
+
+    def _on_supports_export(self):
+        """Экспорт поддержек в отдельный STL файл"""
+        if self.current_supports is None:
+            return
+        self._export_polydata(
+            "Экспорт поддержек", self._sibling_file_name("_supports.stl"), self.current_supports
+        )
+
+    def _sibling_file_name(self, suffix: str) -> str:
+        """Имя файла рядом с открытой моделью: <имя модели><suffix> (пусто без модели)"""
+        if not self.current_file:
+            return ""
+        path = Path(self.current_file)
+        return str(path.with_name(path.stem + suffix))
+
+    def _export_polydata(self, title: str, default_name: str, mesh):
+        """
+        Сохранить mesh в STL файл, выбранный в диалоге
+
+        Args:
+            title: Заголовок диалога
+            default_name: Предлагаемое имя файла
+            mesh: Сохраняемый mesh
+        """
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, title, default_name, Config.get_save_filter()
+        )
+        if not file_name:
+            return
+        try:
+            STLExporter.save(mesh, file_name)
+        except (IOError, ValueError) as e:
+            QMessageBox.critical(
+                self, "Ошибка экспорта", f"Не удалось сохранить {Path(file_name).name}:\n{str(e)}"
+            )
+            return
+        self.statusBar().showMessage(f"Файл сохранен: {Path(file_name).name}", 3000)
+
+    def _on_stock(self):
+        """Обработчик построения заготовки"""
+        mesh = self.viewport.current_mesh
+        if mesh:
+            if mesh.n_cells > Config.LARGE_TASK_FACES:
+                self.statusBar().showMessage(
+                    "Построение заготовки: крупная модель, займет до нескольких минут "
+                    "(можно отменить)..."
                 )
+            else:
+                self.statusBar().showMessage("Построение заготовки...")
+            self.tasks.submit("stock", stock_task, mesh)
+
+    def _on_stock_finished(self, result):
+        """Заготовка построена: отображение и сводка"""
+        if not self._is_current_source(result):
+            return
+
+        allowance = result["allowance"]
+        self.viewport.show_stock(allowance.stock)
+        self.current_stock = allowance.stock
+        self.stock_export_action.setEnabled(True)
+
+        self.statusBar().showMessage("Заготовка построена", 3000)
+        QMessageBox.information(self, "Заготовка с припуском", format_stock_summary(allowance))
+
+    def _on_stock_export(self):
+        """Экспорт заготовки в отдельный STL файл"""
+        if self.current_stock is None:
+            return
+        self._export_polydata(
+            "Экспорт заготовки", self._sibling_file_name("_stock.stl"), self.current_stock
+        )
+
+    def _on_components_repair(self):
+        """Обработчик ремонта по деталям"""
+        if self.viewport.current_mesh:
+            if self.tasks.is_running("components_repair"):
+                self.statusBar().showMessage("Ремонт уже выполняется...", 2000)
+                return
+
+            reply = QMessageBox.question(
+                self,
+                "Ремонт по деталям",
+                "Выполнить автоматический ремонт каждой детали?\n\n"
+                "Это может изменить геометрию.\n"
+                "Рекомендуется сохранить резервную копию оригинала.",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.No,
+            )
+            if reply == QMessageBox.No:
+                return
+
+            self.statusBar().showMessage("Выполняется ремонт деталей...")
+            self.tasks.submit(
+                "components_repair", components_repair_task, self.viewport.current_mesh
+            )
+
+    def _on_components_repair_finished(self, result):
+        """Ремонт по деталям завершен"""
+        if not self._is_current_source(result):
+            return
+
+        self.viewport.load_mesh(result["mesh"])
+        self.current_stats = result["stats"]
+        self.current_validation = result["validation"]
+        self._set_modified(True)
+        self._update_info()
+
+        self.statusBar().showMessage("Ремонт деталей выполнен", 3000)
+        QMessageBox.information(
+            self, "Ремонт по деталям", format_component_reports(result["reports"])
+        )
 
     def _on_about(self):
         """Обработчик О программе"""
@@ -0,0 +1,527 @@
+"""
+Фоновые задачи главного окна и тексты сводок их результатов
+
+Задачи выполняются в TaskScheduler (``fn(*args, ctx=ctx)``) и возвращают словарь
+результата; ``source`` — mesh, для которого задача запущена: окно отбрасывает
+результат, если модель за это время сменилась. Функции ``format_*`` готовят
+текст итоговых диалогов.
+"""
+
+from pathlib import Path
+
+from solidflow.analysis.allowance import AllowanceAnalyzer
+from solidflow.analysis.components import ComponentAnalyzer
+from solidflow.analysis.curvature import mesh_curvature
+from solidflow.analysis.defects import DefectAnalyzer
+from solidflow.analysis.deviation import DeviationAnalyzer
+from solidflow.analysis.edges import EdgeAnalyzer
+from solidflow.analysis.estimate import PrintEstimator
+from solidflow.analysis.orientation import OrientationOptimizer, orient_mesh
+from solidflow.analysis.overhang import OverhangAnalyzer
+from solidflow.analysis.porosity import PorosityAnalyzer
+from solidflow.analysis.statistics import MeshStatistics
+from solidflow.analysis.thickness import ThicknessAnalyzer
+from solidflow.analysis.validator import MeshValidator, validate_mesh
+from solidflow.geometry.mesh.importer import MeshImporter
+from solidflow.geometry.mesh.ply import read_ply_header
+from solidflow.geometry.mesh.processor import fix_mesh_normals, repair_mesh, voxel_repair_mesh
+from solidflow.geometry.mesh.step import STEP_SUFFIXES, STEPImporter
+from solidflow.geometry.nesting.nester import PlateNester
+from solidflow.geometry.pointcloud.importer import PointCloudImporter
+from solidflow.geometry.pointcloud.octree import PointOctree
+from solidflow.geometry.supports.generator import SupportGenerator
+from solidflow.geometry.voxel.voxelizer import voxel_grid
+
+
+def analyze_mesh(mesh, ctx=None):
+    """
+    Вычислить статистику и валидацию mesh (выполняется в фоновом потоке)
+
+    Args:
+        mesh: PyVista mesh
+        ctx: Контекст задачи (TaskContext) для прогресса и отмены
+
+    Returns:
+        tuple: (статистика, результаты валидации)
+    """
+    if ctx is not None:
+        ctx.progress(60)
+        # Объем негерметичной модели оценивается по вокселям: с отменой и прогрессом
+        stats = MeshStatistics(mesh).compute_all(
+            check=ctx.check, progress=lambda value: ctx.progress(60 + value // 5)
+        )
+    else:
+        stats = MeshStatistics(mesh).compute_all()
+
+    if ctx is not None:
+        ctx.progress(80)
+        # Валидация (trimesh, упирается в GIL) — в рабочем процессе
+        validation = ctx.run_in_process(validate_mesh, mesh)
+    else:
+        validation = MeshValidator(mesh).validate()
+
+    if ctx is not None:
+        ctx.progress(100)
+    return stats, validation
+
+
+def load_task(file_name, ctx, deflection=None):
+    """Фоновая задача: загрузка файла и анализ"""
+    suffix = Path(file_name).suffix.lower()
+    # PLY без граней — облако точек
+    if suffix == ".ply" and not read_ply_header(file_name).has_faces:
+        return load_cloud_task(file_name, ctx)
+
+    open_edges = 0
+    if suffix in STEP_SUFFIXES:
+        linear, angular = deflection or (None, None)
+        importer = STEPImporter(linear, angular)
+        mesh = importer.load(
+            file_name,
+            executor=ctx.executor,
+            check=ctx.check,
+            progress=lambda value: ctx.progress(value // 2),
+        )
+        open_edges = importer.open_edges
+    else:
+        ctx.progress(-1)
+        mesh = MeshImporter.load(file_name)
+
+    if mesh is None or mesh.n_cells == 0:
+        raise ValueError("Файл пустой или не содержит геометрии")
+
+    ctx.progress(50)
+    stats, validation = analyze_mesh(mesh, ctx)
+    return {
+        "file": file_name,
+        "mesh": mesh,
+        "stats": stats,
+        "validation": validation,
+        "deflection": deflection,
+        "open_edges": open_edges,
+    }
+
+
+def load_cloud_task(file_name, ctx):
+    """Фоновая задача: загрузка облака точек и октодерево для отображения"""
+    ctx.progress(0)
+    cloud = PointCloudImporter.load(file_name)
+    octree = PointOctree.build(cloud, check=ctx.check, progress=ctx.progress)
+    return {"file": file_name, "cloud": cloud, "octree": octree}
+
+
+def analyze_task(mesh, ctx):
+    """Фоновая задача: анализ текущей модели"""
+    stats, validation = analyze_mesh(mesh, ctx)
+    return {"source": mesh, "stats": stats, "validation": validation}
+
+
+def repair_task(mesh, ctx):
+    """Фоновая задача: ремонт модели и повторный анализ"""
+    ctx.progress(-1)
+    repaired = ctx.run_in_process(repair_mesh, mesh)
+    ctx.progress(50)
+    stats, validation = analyze_mesh(repaired, ctx)
+    return {"source": mesh, "mesh": repaired, "stats": stats, "validation": validation}
+
+
+def fix_normals_task(mesh, ctx):
+    """Фоновая задача: исправление нормалей и повторный анализ"""
+    ctx.progress(-1)
+    fixed = ctx.run_in_process(fix_mesh_normals, mesh)
+    ctx.progress(50)
+    stats, validation = analyze_mesh(fixed, ctx)
+    return {"source": mesh, "mesh": fixed, "stats": stats, "validation": validation}
+
+
+def voxel_repair_task(mesh, ctx):
+    """Фоновая задача: ремонт через воксельную модель и повторный анализ"""
+    ctx.progress(0)
+    # Вокселизация и marching cubes — numpy и VTK, GIL отпускается; процесс не нужен
+    repaired = voxel_repair_mesh(mesh, check=ctx.check, progress=lambda p: ctx.progress(p // 2))
+    stats, validation = analyze_mesh(repaired, ctx)
+    return {"source": mesh, "mesh": repaired, "stats": stats, "validation": validation}
+
+
+def components_analyze_task(mesh, ctx):
+    """Фоновая задача: анализ по компонентам связности"""
+    ctx.progress(-1)
+    analyzer = ComponentAnalyzer(mesh)
+    reports = analyzer.analyze(executor=ctx.executor, check=ctx.check)
+    return {"source": mesh, "reports": reports}
+
+
+def components_repair_task(mesh, ctx):
+    """Фоновая задача: ремонт по компонентам связности и повторный анализ"""
+    ctx.progress(-1)
+    analyzer = ComponentAnalyzer(mesh)
+    repaired, reports = analyzer.repair(executor=ctx.executor, check=ctx.check)
+    ctx.progress(50)
+    stats, validation = analyze_mesh(repaired, ctx)
+    return {
+        "source": mesh,
+        "mesh": repaired,
+        "reports": reports,
+        "stats": stats,
+        "validation": validation,
+    }
+
+
+def thickness_task(mesh, max_points, ctx):
+    """Фоновая задача: анализ толщины стенок (max_points — быстрая оценка по выборке)"""
+    ctx.progress(0)
+    result = ThicknessAnalyzer(mesh).analyze(
+        max_points=max_points, check=ctx.check, progress=ctx.progress
+    )
+    return {"source": mesh, "thickness": result}
+
+
+def format_thickness_summary(result, min_thickness):
+    """Текст сводки по толщине стенок для диалога"""
+    summary = result.summary()
+    if summary["measured"] == 0:
+        return "Не удалось измерить толщину: модель не замкнута или не содержит объема."
+
+    lines = []
+    if summary["sampled"]:
+        lines += [
+            f"Быстрая оценка: измерено {summary['measured']} из {summary['faces']} граней.",
+            "Остальные грани окрашены по ближайшей измеренной, отдельные тонкие места",
+            "могут быть пропущены. Для точного результата запустите полный анализ.",
+            "",
+        ]
+    lines += [
+        f"Минимальная толщина: {summary['min']:.3f} мм",
+        f"Максимальная толщина: {summary['max']:.3f} мм",
+        f"Средняя толщина: {summary['mean']:.3f} мм",
+    ]
+    for p, value in summary["percentiles"].items():
+        lines.append(f"{p:g}-й процентиль: {value:.3f} мм")
+
+    unmeasured = summary["faces"] - summary["measured"]
+    if unmeasured and not summary["sampled"]:
+        lines.append(f"Не измерено граней: {unmeasured}")
+
+    thin = len(result.thin_faces(min_thickness))
+    lines.append("")
+    if thin:
+        lines.append(f"Граней тоньше {min_thickness:g} мм: {thin}")
+    else:
+        lines.append(f"Все стенки не тоньше {min_thickness:g} мм")
+    return "\n".join(lines)
+
+
+def porosity_task(mesh, ctx):
+    """Фоновая задача: внутренние пустоты и толщина по вокселям"""
+    ctx.progress(0)
+    # Вокселизация — первая половина прогресса, поиск пустот и толщина — вторая
+    grid = voxel_grid(mesh, check=ctx.check, progress=lambda p: ctx.progress(p // 2))
+    result = PorosityAnalyzer(grid).analyze(
+        check=ctx.check, progress=lambda p: ctx.progress(50 + p // 2)
+    )
+    return {"source": mesh, "porosity": result}
+
+
+def format_porosity_summary(result):
+    """Текст сводки по пустотам и толщине по вокселям для диалога"""
+    summary = result.summary()
+    lines = [
+        f"Размер вокселя: {summary['pitch']:.3f} мм",
+        f"Объем материала: {summary['solid_volume']:.2f} мм³",
+        "",
+    ]
+    if summary["voids"]:
+        lines.append(
+            f"Внутренних пустот: {summary['voids']}, общий объем {summary['void_volume']:.2f} мм³ "
+            f"(пористость {summary['porosity'] * 100:.2f}%)"
+        )
+        for void in result.voids[:5]:
+            x, y, z = void["center"]
+            lines.append(f"  {void['volume']:.2f} мм³ в точке ({x:.1f}, {y:.1f}, {z:.1f})")
+        if summary["voids"] > 5:
+            lines.append(f"  ... и еще {summary['voids'] - 5}")
+    else:
+        lines.append("Внутренних пустот не найдено")
+    lines.append("")
+    lines.append(
+        f"Толщина стенок: минимум {summary['thickness_min']:.2f} мм, "
+        f"5% {summary['thickness_p5']:.2f} мм, медиана {summary['thickness_median']:.2f} мм"
+    )
+    if summary["thin_fraction"] > 0:
+        lines.append(
+            f"Тоньше {summary['min_thickness']:g} мм: "
+            f"{summary['thin_fraction'] * 100:.1f}% срединной поверхности"
+        )
+    return "\n".join(lines)
+
+
+def overhang_task(mesh, ctx):
+    """Фоновая задача: анализ нависаний для текущей ориентации"""
+    ctx.progress(-1)
+    result = OverhangAnalyzer(mesh).analyze()
+    return {"source": mesh, "overhang": result}
+
+
+def format_overhang_summary(result):
+    """Текст сводки по нависаниям для диалога"""
+    summary = result.summary()
+    if not summary["needs_support"]:
+        return (
+            f"Модель печатается без поддержек "
+            f"(критический угол {summary['critical_angle']:g}°)."
+        )
+
+    lines = [
+        f"Критический угол: {summary['critical_angle']:g}°",
+        f"Граней с нависанием: {summary['overhang_faces']}",
+        f"Площадь поддержек: {summary['support_area']:.2f} мм²",
+    ]
+    if summary["unsupported_regions"]:
+        lines.append(f"Областей, начинающихся в воздухе: {summary['unsupported_regions']}")
+        for point in result.unsupported_points[:5]:
+            lines.append(f"• ({point[0]:.2f}, {point[1]:.2f}, {point[2]:.2f})")
+    return "\n".join(lines)
+
+
+def orientation_task(mesh, ctx):
+    """Фоновая задача: подбор ориентации и повернутая модель"""
+    ctx.progress(-1)
+    result = OrientationOptimizer(mesh).optimize(check=ctx.check)
+    oriented = orient_mesh(mesh, result.best_direction)
+    stats, validation = analyze_mesh(oriented, ctx)
+    return {
+        "source": mesh,
+        "orientation": result,
+        "mesh": oriented,
+        "stats": stats,
+        "validation": validation,
+    }
+
+
+def format_orientation_summary(result):
+    """Текст сводки по подобранной ориентации для диалога"""
+    best = result.candidate(result.best_index)
+    x, y, z = best["direction"]
+    return "\n".join(
+        [
+            f"Направление построения: ({x:.3f}, {y:.3f}, {z:.3f})",
+            f"Площадь поддержек: {best['support_area']:.2f} мм²",
+            f"Высота построения: {best['build_height']:.2f} мм",
+            f"Площадь на столе: {best['footprint']:.2f} мм²",
+            f"Объем под нависаниями: {best['overhang_volume']:.2f} мм³",
+            "",
+            f"Проверено ориентаций: {len(result.directions)}, "
+            f"оптимальных по Парето: {len(result.pareto)}",
+        ]
+    )
+
+
+def defects_task(mesh, ctx):
+    """Фоновая задача: дефектные грани и ребра для подсветки"""
+    ctx.progress(0)
+    result = DefectAnalyzer(mesh).analyze(check=ctx.check, progress=ctx.progress)
+    return {"source": mesh, "defects": result}
+
+
+def format_defects_summary(result):
+    """Текст сводки по дефектам для диалога"""
+    summary = result.summary()
+    if not any(summary.values()):
+        return "Дефектов не найдено."
+
+    lines = [
+        f"Перевернутых граней: {summary['flipped_faces']}",
+        f"Вырожденных граней: {summary['degenerate_faces']}",
+        f"Самопересекающихся граней: {summary['self_intersecting_faces']}",
+        f"Открытых ребер: {summary['boundary_edges']} " f"(отверстий: {summary['boundary_loops']})",
+        f"Non-manifold ребер: {summary['non_manifold_edges']}",
+    ]
+    if summary["non_orientable"]:
+        lines.append(f"Неориентируемых компонент: {summary['non_orientable']}")
+    return "\n".join(lines)
+
+
+def edges_task(mesh, ctx):
+    """Фоновая задача: углы излома ребер, острые вершины и лезвия"""
+    ctx.progress(-1)
+    result = EdgeAnalyzer(mesh).analyze()
+    return {"source": mesh, "edges": result}
+
+
+def format_edges_summary(result):
+    """Текст сводки по острым кромкам для диалога"""
+    summary = result.summary()
+    if not summary["feature_edges"] and not summary["sharp_clusters"]:
+        return f"Острых кромок нет (порог излома {summary['sharp_angle']:g}°)."
+
+    lines = [
+        f"Порог излома: {summary['sharp_angle']:g}°",
+        f"Кромок: {summary['feature_edges']} (вогнутых: {summary['concave_edges']}), "
+        f"длина {summary['feature_length']:.2f} мм",
+        f"Наибольший излом: {summary['max_dihedral']:.1f}°",
+    ]
+    if summary["sharp_clusters"]:
+        lines.append(f"Острых вершин: {summary['sharp_vertices']}")
+        for point in result.sharp_points[:5]:
+            lines.append(f"• ({point[0]:.2f}, {point[1]:.2f}, {point[2]:.2f})")
+    if summary["blade_regions"]:
+        lines.append(
+            f"Тонких лезвий: {summary['blade_regions']}, длина {summary['blade_length']:.2f} мм"
+        )
+    return "\n".join(lines)
+
+
+def curvature_task(mesh, ctx):
+    """Фоновая задача: средняя и гауссова кривизна в вершинах"""
+    ctx.progress(-1)
+    result = mesh_curvature(mesh)
+    return {"source": mesh, "curvature": result}
+
+
+def format_curvature_summary(result):
+    """Текст сводки по кривизне для диалога"""
+    summary = result.summary()
+    lines = [
+        f"Средняя кривизна, 1/мм: медиана {summary['mean_median']:.4f}, "
+        f"1% {summary['mean_p1']:.4f}, 99% {summary['mean_p99']:.4f}",
+        f"Участков с радиусом меньше {summary['min_radius']:g} мм: "
+        f"{summary['small_radius_vertices']} вершин, "
+        f"{summary['small_radius_fraction'] * 100:.1f}% площади",
+    ]
+    if summary["small_radius_vertices"]:
+        lines.append("Возможны шум сканирования или микроскругления.")
+    return "\n".join(lines)
+
+
+def deviation_task(mesh, reference, ctx):
+    """Фоновая задача: отклонение текущей модели от исходной"""
+    ctx.progress(0)
+    result = DeviationAnalyzer(reference, mesh).analyze(check=ctx.check, progress=ctx.progress)
+    return {"source": mesh, "deviation": result}
+
+
+def format_deviation_summary(result):
+    """Текст сводки по отклонению от исходной модели для диалога"""
+    summary = result.summary()
+    lines = [
+        f"Наибольшее отклонение наружу: {summary['max_outside']:.4f} мм",
+        f"Наибольшее отклонение внутрь: {summary['max_inside']:.4f} мм",
+        f"Среднее отклонение: {summary['mean']:.4f} мм (СКО {summary['rms']:.4f} мм)",
+        f"Расстояние Хаусдорфа: {summary['hausdorff']:.4f} мм",
+        "",
+    ]
+    if summary["exceed_fraction"] > 0:
+        lines.append(
+            f"Сверх допуска {summary['tolerance']:g} мм: "
+            f"{summary['exceed_fraction'] * 100:.1f}% точек поверхности"
+        )
+    else:
+        lines.append(f"Отклонение в пределах допуска {summary['tolerance']:g} мм")
+    return "\n".join(lines)
+
+
+def estimate_task(mesh, ctx):
+    """Фоновая задача: сечения модели для оценки печати"""
+    ctx.progress(0)
+    estimator = PrintEstimator.from_mesh(mesh, check=ctx.check, progress=ctx.progress)
+    return {"source": mesh, "estimator": estimator}
+
+
+def supports_task(mesh, ctx):
+    """Фоновая задача: генерация поддержек для текущей ориентации"""
+    ctx.progress(0)
+    supports = SupportGenerator(mesh).generate(check=ctx.check, progress=ctx.progress)
+    return {"source": mesh, "supports": supports, "supports_mesh": supports.mesh}
+
+
+def format_supports_summary(supports):
+    """Текст сводки по поддержкам для диалога"""
+    summary = supports.summary()
+    if not summary["contacts"]:
+        return "Модель печатается без поддержек."
+    lines = [
+        f"Точек опоры: {summary['contacts']}",
+        f"Слияний ветвей: {summary['branches']}",
+        f"Колонн до стола: {summary['columns']}",
+    ]
+    if summary["on_model"]:
+        lines.append(f"Колонн на модели: {summary['on_model']}")
+    lines.append(f"Объем поддержек: {summary['volume'] / 1000.0:.2f} см³")
+    return "\n".join(lines)
+
+
+def nesting_task(mesh, ctx):
+    """Фоновая задача: раскладка деталей на столе"""
+    ctx.progress(0)
+    result = PlateNester(mesh).nest(check=ctx.check, progress=lambda p: ctx.progress(p // 2))
+    nested = result.mesh
+    stats, validation = analyze_mesh(nested, ctx)
+    return {
+        "source": mesh,
+        "nesting": result,
+        "mesh": nested,
+        "stats": stats,
+        "validation": validation,
+    }
+
+
+def format_nesting_summary(result):
+    """Текст сводки по раскладке для диалога"""
+    summary = result.summary()
+    lines = [
+        f"Деталей: {summary['parts']} (повернуто: {summary['rotated']})",
+        f"Стол: {summary['plate_width']:g} x {summary['plate_depth']:g} мм",
+        f"Занято по Y: {summary['used_depth']:.1f} мм",
+        f"Заполнение занятой части стола: {100.0 * summary['utilization']:.1f}%",
+    ]
+    if not summary["fits"]:
+        lines.append("")
+        lines.append("Детали не помещаются на один стол: раскладка выходит за край по Y.")
+    return "\n".join(lines)
+
+
+def stock_task(mesh, ctx):
+    """Фоновая задача: заготовка с припуском"""
+    ctx.progress(0)
+    result = AllowanceAnalyzer(mesh).analyze(check=ctx.check, progress=ctx.progress)
+    return {"source": mesh, "allowance": result}
+
+
+def format_stock_summary(result):
+    """Текст сводки по заготовке для диалога"""
+    summary = result.summary()
+    return "\n".join(
+        [
+            f"Припуск: {summary['allowance']:g} мм (шаг поля {summary['pitch']:g} мм)",
+            f"Поверхность заготовки: {summary['level']:.3f} мм от детали (запас на хорды)",
+            f"Объем заготовки: {summary['stock_volume'] / 1000.0:.2f} см³",
+            f"Треугольников: {summary['stock_faces']}",
+            "",
+            f"Фактический припуск: {summary['min']:.3f} - {summary['max']:.3f} мм "
+            f"(среднее {summary['mean']:.3f} мм)",
+            f"Наибольшее отклонение от заданного: {summary['max_error']:.3f} мм",
+        ]
+    )
+
+
+def format_component_reports(reports, limit=20):
+    """Текст отчета по деталям для диалога"""
+    summary = ComponentAnalyzer.summarize(reports)
+    lines = [
+        f"Деталей: {summary['parts']}",
+        f"Корректных: {summary['valid']}",
+        f"Негерметичных: {summary['not_watertight']}",
+        f"Ошибок обработки: {summary['failed']}",
+        f"Суммарный объем: {summary['total_volume']:.2f} мм³",
+    ]
+    problems = [r for r in reports if not r["valid"]]
+    if problems:
+        lines.append("")
+        lines.append("Проблемные детали:")
+        for r in problems[:limit]:
+            lines.append(
+                f"• #{r['index'] + 1} ({r['triangles']} треуг.): " + "; ".join(r["issues"])
+            )
+        if len(problems) > limit:
+            lines.append(f"... и еще {len(problems) - limit}")
+    return "\n".join(lines)
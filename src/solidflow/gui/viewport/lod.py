@@ -0,0 +1,323 @@
+"""
+Уровни детализации модели во время движения камеры
+
+Для большой модели в фоновом потоке строится пирамида упрощенных копий
+(``lod_pyramid``). Время каждого кадра измеряется по событиям окна
+отрисовки и пересчитывается во время кадра на один треугольник; при начале
+вращения, сдвига или масштабирования камеры actor модели получает самый
+подробный уровень, укладывающийся в бюджет времени кадра, а при остановке
+камеры — снова полную модель. Подменяется только входной набор данных
+mapper (``mapper.dataset`` PyVista сохраняет выбор массива раскраски),
+поэтому свойства actor, плоскость сечения и раскраска сохраняются.
+"""
+
+import logging
+import threading
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from solidflow.core.config import Config
+from solidflow.geometry.mesh.arrays import vertex_normals
+from solidflow.geometry.mesh.decimate import lod_pyramid
+
+_log = logging.getLogger("SolidFlow.InteractionLOD")
+
+
+class InteractionLOD:
+    """Подмена модели упрощенной копией на время движения камеры"""
+
+    # Уровни проще этого количества треугольников не строятся
+    COARSEST_FACES = 20_000
+
+    # Вес нового измерения в скользящей оценке времени кадра
+    SMOOTHING = 0.3
+
+    def __init__(self, budget_ms: Optional[float] = None, min_faces: Optional[int] = None):
+        """
+        Инициализация
+
+        Args:
+            budget_ms: Бюджет времени кадра, мс (по умолчанию Config.FRAME_BUDGET_MS)
+            min_faces: Модели меньше этого количества треугольников не упрощаются
+                (по умолчанию Config.LOD_MIN_FACES)
+        """
+        self.budget = (budget_ms if budget_ms is not None else Config.FRAME_BUDGET_MS) / 1000.0
+        self.min_faces = int(min_faces if min_faces is not None else Config.LOD_MIN_FACES)
+
+        self._plotter = None
+        self._style = None
+        self._style_observers = []
+        self._frame_start = None
+
+        self._actor = None
+        self._full = None
+        # Уровни: (количество треугольников, pv.PolyData) от подробного к простому
+        # и номера исходных треугольников каждого уровня
+        self._levels = []
+        self._kept = []
+        self._generation = 0
+        # Проверка поколения и установка уровней фоновым потоком — под этой
+        # блокировкой, как и смена модели в потоке GUI: иначе уровни старой
+        # модели могли бы установиться после clear() или set_actor()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._shown = 0
+        self._interacting = False
+        # Оценка времени кадра на один треугольник, с
+        self._face_time = None
+
+    def attach(self, plotter):
+        """
+        Подключиться к окну отрисовки и стилю управления камерой
+
+        Args:
+            plotter: PyVista plotter (QtInteractor)
+        """
+        self._plotter = plotter
+        window = plotter.ren_win
+        window.AddObserver("StartEvent", self._on_render_start)
+        window.AddObserver("EndEvent", self._on_render_end)
+        self._observe_style()
+
+    def _observe_style(self):
+        """Подписаться на начало и конец движения камеры у текущего стиля"""
+        iren = getattr(self._plotter, "iren", None)
+        style = iren.interactor.GetInteractorStyle() if iren is not None else None
+        if style is self._style:
+            return
+        if self._style is not None:
+            for observer in self._style_observers:
+                self._style.RemoveObserver(observer)
+        self._style = style
+        self._style_observers = []
+        if style is not None:
+            self._style_observers = [
+                style.AddObserver("StartInteractionEvent", lambda *_: self.start_interaction()),
+                style.AddObserver("EndInteractionEvent", lambda *_: self.end_interaction()),
+            ]
+
+    def set_actor(self, actor):
+        """
+        Отслеживать actor модели; для большой модели начать построение уровней
+
+        Args:
+            actor: Actor модели PyVista (полная модель — текущий набор данных его mapper)
+        """
+        self.clear()
+        full = actor.mapper.dataset
+        if full is None:
+            return
+        with self._lock:
+            self._actor = actor
+            self._full = full
+            self._shown = full.n_cells
+            if self._shown < self.min_faces or not full.is_all_triangles:
+                return
+            self._generation += 1
+            generation = self._generation
+
+        self._thread = threading.Thread(target=self._build, args=(generation, full), daemon=True)
+        self._thread.start()
+
+    def clear(self):
+        """Перестать отслеживать actor (уровни отбрасываются)"""
+        if self._actor is not None and self._interacting:
+            self._swap(self._full)
+        with self._lock:
+            self._generation += 1
+            self._actor = None
+            self._full = None
+            self._levels = []
+            self._kept = []
+        self._thread = None
+        self._shown = 0
+        self._interacting = False
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Дождаться построения уровней
+
+        Returns:
+            bool: True если уровни построены (или не нужны)
+        """
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+            return not thread.is_alive()
+        return True
+
+    @property
+    def levels(self) -> List[int]:
+        """Количество треугольников построенных уровней (от подробного к простому)"""
+        return [n for n, _ in self._levels]
+
+    @property
+    def shown_faces(self) -> int:
+        """Количество треугольников показанного сейчас набора"""
+        return self._shown
+
+    @property
+    def shown_level(self) -> int:
+        """Номер показанного набора: 0 — полная модель, 1.. — уровни от подробного"""
+        if self._full is None or self._shown == self._full.n_cells:
+            return 0
+        levels = self.levels
+        return levels.index(self._shown) + 1 if self._shown in levels else 0
+
+    @property
+    def frame_time_per_face(self) -> Optional[float]:
+        """Оценка времени кадра на один треугольник, с (None до первого кадра)"""
+        return self._face_time
+
+    def _build(self, generation: int, mesh):
+        """Построение уровней (в фоновом потоке)"""
+        import pyvista as pv
+
+        t0 = time.perf_counter()
+        faces = np.asarray(mesh.faces).reshape(-1, 4)[:, 1:]
+        scalars = mesh.cell_data.active_scalars_name
+        normals = mesh.point_data.active_normals_name
+        levels, kept_ids = [], []
+        try:
+            for vertices, tris, kept in lod_pyramid(
+                np.asarray(mesh.points), faces, self.COARSEST_FACES, check=self._check(generation)
+            ):
+                proxy = pv.PolyData(
+                    vertices,
+                    np.column_stack([np.full(len(tris), 3, dtype=np.int64), tris]).ravel(),
+                )
+                for name in mesh.cell_data.keys():
+                    proxy.cell_data[name] = np.asarray(mesh.cell_data[name])[kept]
+                if scalars is not None:
+                    proxy.cell_data.active_scalars_name = scalars
+                if normals is not None:
+                    # Модель с гладким затенением: нормали вершин нужны и копии
+                    proxy.point_data[normals] = vertex_normals(vertices, tris)
+                    proxy.point_data.active_normals_name = normals
+                levels.append((len(tris), proxy))
+                kept_ids.append(kept)
+        except _Stale:
+            return
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._kept = kept_ids
+            self._levels = levels
+            # Массивы, добавленные к модели во время построения
+            self._sync_cell_data()
+        _log.info(
+            "LOD levels for %d faces: %s (%.2fs)",
+            len(faces),
+            [n for n, _ in levels],
+            time.perf_counter() - t0,
+        )
+
+    def update_cell_data(self):
+        """
+        Перенести на уровни массивы на гранях, добавленные к модели или удаленные из нее
+
+        Геометрия уровней не перестраивается: значения берутся по номерам
+        исходных треугольников.
+        """
+        with self._lock:
+            self._sync_cell_data()
+
+    def _sync_cell_data(self):
+        """Перенос массивов на уровни (вызывается под блокировкой)"""
+        if self._full is None:
+            return
+        full = self._full.cell_data
+        for (_, proxy), kept in zip(self._levels, self._kept):
+            for name in list(proxy.cell_data.keys()):
+                if name not in full:
+                    proxy.cell_data.pop(name)
+            for name in full.keys():
+                if name not in proxy.cell_data:
+                    proxy.cell_data[name] = np.asarray(full[name])[kept]
+
+    def _check(self, generation: int):
+        def check():
+            if generation != self._generation:
+                raise _Stale()
+
+        return check
+
+    def choose(self) -> int:
+        """
+        Количество треугольников уровня для следующего кадра
+
+        Выбирается самый подробный набор (полная модель или уровень), чье
+        ожидаемое время кадра укладывается в бюджет; если не укладывается ни
+        один — самый простой уровень. До первого измерения — полная модель.
+        """
+        if self._full is None:
+            return 0
+        options = [self._full.n_cells] + self.levels
+        if self._face_time is None:
+            return options[0]
+        for n in options:
+            if n * self._face_time <= self.budget:
+                return n
+        return options[-1]
+
+    def start_interaction(self):
+        """Камера начала движение: показать уровень по бюджету кадра"""
+        self._interacting = True
+        self._show(self.choose())
+
+    def end_interaction(self):
+        """Камера остановилась: вернуть полную модель"""
+        self._interacting = False
+        if self._full is not None and self._shown != self._full.n_cells:
+            self._swap(self._full)
+            if self._plotter is not None:
+                self._plotter.render()
+
+    def record_frame(self, seconds: float):
+        """
+        Учесть измеренное время кадра
+
+        Args:
+            seconds: Время отрисовки кадра, с
+        """
+        if self._shown <= 0:
+            return
+        face_time = seconds / self._shown
+        if self._face_time is None:
+            self._face_time = face_time
+        else:
+            self._face_time += self.SMOOTHING * (face_time - self._face_time)
+        if self._interacting:
+            # Следующий кадр движения — уже по уточненной оценке
+            self._show(self.choose())
+
+    def _show(self, n_faces: int):
+        """Показать набор с заданным количеством треугольников"""
+        if self._actor is None or n_faces == self._shown:
+            return
+        for n, proxy in [(self._full.n_cells, self._full)] + self._levels:
+            if n == n_faces:
+                self._swap(proxy)
+                return
+
+    def _swap(self, data):
+        self._actor.mapper.dataset = data
+        self._shown = data.n_cells
+
+    def _on_render_start(self, *args):
+        self._frame_start = time.perf_counter()
+
+    def _on_render_end(self, *args):
+        if self._frame_start is None:
+            return
+        seconds = time.perf_counter() - self._frame_start
+        self._frame_start = None
+        # Стиль управления мог смениться (например, при включении виджета)
+        self._observe_style()
+        self.record_frame(seconds)
+
+
+class _Stale(Exception):
+    """Уровни строятся для модели, которая уже не отображается"""
@@ -0,0 +1,440 @@
+"""
+Миниатюры и изображения для отчетов без окна
+
+Viewport3D рисует только внутри окна Qt. ThumbnailRenderer создает одно
+окно отрисовки VTK вне экрана (EGL или OSMesa, дисплей не нужен) и один
+actor модели; для каждого файла подменяется только входной набор данных
+mapper, а окно, освещение и actor переиспользуются. Модель перед
+отрисовкой упрощается до ``THUMBNAIL_MAX_FACES`` треугольников
+(кластеризация вершин, как у уровней детализации viewport); упрощенная
+копия кэшируется на диске по хэшу файла, поэтому повторная отрисовка
+архива не разбирает исходные файлы. Сглаживание краев (MSAA) выключено и
+используется один источник света у камеры: при программной отрисовке это
+в разы быстрее освещения по умолчанию.
+
+Пакет файлов делится между рабочими процессами; каждый процесс держит
+один ThumbnailRenderer на все свои файлы.
+"""
+
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from solidflow.core.cache import MeshCache, file_hash, get_cache
+from solidflow.core.config import Config
+from solidflow.geometry.mesh.arrays import arrays_to_polydata, mesh_arrays, vertex_normals
+from solidflow.geometry.mesh.decimate import decimate_to
+
+_log = logging.getLogger("SolidFlow.ThumbnailRenderer")
+
+# Стандартные виды: имя в файле изображения -> (направление на камеру, вверх)
+VIEWS = {
+    "iso": ((1.0, 1.0, 1.0), (0.0, 0.0, 1.0)),
+    "top": ((0.0, 0.0, 1.0), (0.0, 1.0, 0.0)),
+    "front": ((0.0, -1.0, 0.0), (0.0, 0.0, 1.0)),
+    "side": ((1.0, 0.0, 0.0), (0.0, 0.0, 1.0)),
+}
+
+# Версия формата упрощенной копии в дисковом кэше
+_FORMAT = 1
+
+# Массив значений на гранях для раскраски изображения отчета
+_VALUES = "values"
+
+
+class ThumbnailRenderer:
+    """Отрисовка моделей в изображения вне экрана с одним окном на все модели"""
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        max_faces: Optional[int] = None,
+        background: str = "white",
+        color: str = "lightblue",
+        cache: Optional[MeshCache] = None,
+        persistent: bool = True,
+    ):
+        """
+        Инициализация (окно отрисовки создается при первой отрисовке)
+
+        Args:
+            size: Сторона изображения, пикс. (по умолчанию Config.THUMBNAIL_SIZE)
+            max_faces: Наибольшее количество треугольников упрощенной копии
+                (по умолчанию Config.THUMBNAIL_MAX_FACES)
+            background: Цвет фона
+            color: Цвет модели
+            cache: Дисковый кэш (по умолчанию — общий кэш приложения)
+            persistent: Кэшировать упрощенные копии файлов на диске
+        """
+        self.size = int(size or Config.THUMBNAIL_SIZE)
+        self.max_faces = int(max_faces or Config.THUMBNAIL_MAX_FACES)
+        if self.size < 16:
+            raise ValueError("Сторона изображения должна быть не меньше 16 пикселей")
+        self.background = background
+        self.color = color
+        self._disk = (cache or get_cache()) if persistent else None
+        self._plotter = None
+        self._actor = None
+
+    def prepare(self, mesh, face_values: Optional[np.ndarray] = None):
+        """
+        Упрощенная копия модели для отрисовки
+
+        Args:
+            mesh: PyVista или trimesh mesh объект
+            face_values: Значения на гранях исходной модели (M,) для раскраски
+
+        Returns:
+            pv.PolyData: Не больше max_faces треугольников, с нормалями вершин
+        """
+        vertices, faces = mesh_arrays(mesh)
+        vertices, faces, kept = decimate_to(vertices, faces, self.max_faces)
+        data = self._polydata(vertices, faces)
+        if face_values is not None:
+            data.cell_data[_VALUES] = np.asarray(face_values, dtype=np.float64)[kept]
+        return data
+
+    def load(self, file_path: Union[str, Path]):
+        """
+        Упрощенная копия модели из файла (из дискового кэша, если есть)
+
+        Args:
+            file_path: Путь к STL, OBJ, PLY или STEP файлу
+
+        Returns:
+            pv.PolyData: Не больше max_faces треугольников, с нормалями вершин
+        """
+        from solidflow.geometry.mesh.importer import MeshImporter
+
+        file_path = Path(file_path)
+        if not file_path.exists():
+            raise FileNotFoundError(f"Файл не найден: {file_path}")
+
+        key = None
+        if self._disk is not None:
+            key = f"{file_hash(file_path)}-{self.max_faces}-v{_FORMAT}"
+            arrays = self._disk.load("thumbnail", key)
+            if arrays is not None:
+                try:
+                    return self._polydata(arrays["vertices"], arrays["faces"])
+                except (KeyError, ValueError) as e:
+                    _log.warning("Cached thumbnail mesh is invalid, loading again: %s", e)
+
+        # Полная копия в кэш импорта не пишется: нужна только упрощенная
+        mesh = MeshImporter.load(file_path, persistent=False)
+        vertices, faces, _ = decimate_to(*mesh_arrays(mesh), self.max_faces)
+        if self._disk is not None:
+            self._disk.store("thumbnail", key, {"vertices": vertices, "faces": faces})
+        return self._polydata(vertices, faces)
+
+    @staticmethod
+    def _polydata(vertices: np.ndarray, faces: np.ndarray):
+        """PolyData с нормалями вершин (нормали не пересчитываются при отрисовке)"""
+        vertices = np.asarray(vertices, dtype=np.float64)
+        faces = np.asarray(faces, dtype=np.int64)
+        if not len(faces):
+            raise ValueError("Mesh не содержит граней")
+        data = arrays_to_polydata(vertices, faces)
+        data.point_data["Normals"] = vertex_normals(vertices, faces)
+        data.point_data.active_normals_name = "Normals"
+        return data
+
+    def _is_prepared(self, mesh) -> bool:
+        """Готов ли mesh к отрисовке без упрощения (результат prepare или load)"""
+        point_data = getattr(mesh, "point_data", None)
+        return (
+            point_data is not None
+            and "Normals" in point_data
+            and mesh.n_cells <= self.max_faces
+            and mesh.is_all_triangles
+        )
+
+    def render(
+        self,
+        mesh,
+        views: Optional[Sequence[str]] = None,
+        face_values: Optional[np.ndarray] = None,
+        cmap: str = "jet_r",
+        clim=None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Отрисовать модель со стандартных видов
+
+        Args:
+            mesh: PyVista или trimesh mesh объект (или результат prepare/load)
+            views: Имена видов из VIEWS (по умолчанию Config.THUMBNAIL_VIEWS)
+            face_values: Значения на гранях (M,) для раскраски (изображение отчета);
+                NaN отображается серым
+            cmap: Палитра раскраски
+            clim: Диапазон палитры (min, max), по умолчанию — по значениям
+
+        Returns:
+            dict: Вид -> изображение (size, size, 3) uint8
+        """
+        views = tuple(views or Config.THUMBNAIL_VIEWS)
+        unknown = [view for view in views if view not in VIEWS]
+        if unknown:
+            raise ValueError(f"Неизвестные виды: {', '.join(unknown)}")
+
+        if face_values is None and self._is_prepared(mesh):
+            data = mesh
+        else:
+            data = self.prepare(mesh, face_values)
+        self._show(data, cmap, clim)
+
+        images = {}
+        for view in views:
+            # Камера ставится без отрисовки: один кадр на вид
+            vector, viewup = VIEWS[view]
+            self._plotter.view_vector(vector, viewup, render=False)
+            self._plotter.render()
+            images[view] = self._plotter.screenshot(return_img=True)
+        return images
+
+    def render_file(
+        self,
+        file_path: Union[str, Path],
+        out_dir: Union[str, Path],
+        views: Optional[Sequence[str]] = None,
+    ) -> List[Path]:
+        """
+        Отрисовать файл модели в PNG: ``<имя файла>-<вид>.png``
+
+        Args:
+            file_path: Путь к STL, OBJ, PLY или STEP файлу
+            out_dir: Каталог изображений (создается при необходимости)
+            views: Имена видов из VIEWS (по умолчанию Config.THUMBNAIL_VIEWS)
+
+        Returns:
+            list: Пути записанных изображений
+        """
+        file_path = Path(file_path)
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        images = self.render(self.load(file_path), views)
+        paths = []
+        for view, image in images.items():
+            path = out_dir / f"{file_path.stem}-{view}.png"
+            _write_png(image, path)
+            paths.append(path)
+        return paths
+
+    def _show(self, data, cmap: str, clim):
+        """Показать набор данных в окне отрисовки (окно и actor создаются один раз)"""
+        import pyvista as pv
+
+        if self._plotter is None:
+            plotter = pv.Plotter(
+                off_screen=True, window_size=(self.size, self.size), lighting="none"
+            )
+            plotter.add_light(pv.Light(light_type="headlight"))
+            plotter.ren_win.SetMultiSamples(0)
+            plotter.set_background(self.background)
+            self._plotter = plotter
+
+        if self._actor is None:
+            self._actor = self._plotter.add_mesh(
+                data, color=self.color, smooth_shading=True, reset_camera=False
+            )
+            # Mapper подключается к набору данных напрямую, без конвейера сглаживания:
+            # нормали уже посчитаны, а следующие модели только подменяют вход
+            self._actor.mapper.dataset = data
+        else:
+            self._actor.mapper.dataset = data
+
+        mapper = self._actor.mapper
+        colored = _VALUES in data.cell_data
+        if colored:
+            values = np.asarray(data.cell_data[_VALUES])
+            if clim is None:
+                finite = values[np.isfinite(values)]
+                clim = (finite.min(), finite.max()) if len(finite) else (0.0, 1.0)
+            lut = pv.LookupTable(cmap=cmap)
+            lut.scalar_range = (float(clim[0]), float(clim[1]))
+            lut.nan_color = "lightgrey"
+            mapper.SetScalarModeToUseCellFieldData()
+            mapper.SelectColorArray(_VALUES)
+            mapper.SetLookupTable(lut)
+            mapper.SetUseLookupTableScalarRange(True)
+            mapper.SetColorModeToMapScalars()
+        mapper.scalar_visibility = colored
+
+    def close(self):
+        """Закрыть окно отрисовки"""
+        if self._plotter is not None:
+            self._plotter.close()
+        self._plotter = None
+        self._actor = None
+
+
+def _write_png(image: np.ndarray, path: Path):
+    """Записать изображение (H, W, 3) uint8 в PNG средствами VTK"""
+    from vtkmodules.util.numpy_support import numpy_to_vtk
+    from vtkmodules.vtkCommonDataModel import vtkImageData
+    from vtkmodules.vtkIOImage import vtkPNGWriter
+
+    height, width = image.shape[:2]
+    # Строки изображения VTK идут снизу вверх
+    pixels = np.ascontiguousarray(image[::-1].reshape(-1, image.shape[2]))
+    data = vtkImageData()
+    data.SetDimensions(width, height, 1)
+    data.GetPointData().SetScalars(numpy_to_vtk(pixels, deep=True))
+    writer = vtkPNGWriter()
+    writer.SetFileName(str(path))
+    writer.SetInputData(data)
+    writer.Write()
+
+
+# Отрисовщик рабочего процесса: одно окно на все файлы процесса
+_worker_renderer = None
+
+
+def _render_files(
+    file_paths: List[str], out_dir: str, views, size: int, max_faces: int
+) -> List[Dict[str, any]]:
+    """Рабочий процесс: отрисовать группу файлов"""
+    global _worker_renderer
+    renderer = _worker_renderer
+    if renderer is None or renderer.size != size or renderer.max_faces != max_faces:
+        if renderer is not None:
+            renderer.close()
+        renderer = _worker_renderer = ThumbnailRenderer(size, max_faces)
+    return [_render_one(renderer, path, out_dir, views) for path in file_paths]
+
+
+def _render_one(renderer: ThumbnailRenderer, file_path: str, out_dir, views) -> Dict[str, any]:
+    """Отрисовать один файл; ошибка файла не прерывает пакет"""
+    try:
+        images = renderer.render_file(file_path, out_dir, views)
+        return {"file": file_path, "images": [str(p) for p in images], "error": None}
+    except Exception as e:
+        _log.warning("Thumbnail for %s failed: %s", file_path, e)
+        return {"file": file_path, "images": [], "error": str(e)}
+
+
+def render_thumbnails(
+    file_paths: Iterable[Union[str, Path]],
+    out_dir: Union[str, Path],
+    views: Optional[Sequence[str]] = None,
+    size: Optional[int] = None,
+    max_faces: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    check: Callable[[], None] = None,
+    progress: Callable[[int], None] = None,
+) -> List[Dict[str, any]]:
+    """
+    Отрисовать миниатюры пакета файлов в PNG
+
+    Файлы делятся между рабочими процессами группами; процесс рисует свои
+    группы в одном окне. С одним процессом или одной группой отрисовка идет
+    в вызывающем процессе.
+
+    Args:
+        file_paths: Пути к STL, OBJ, PLY или STEP файлам
+        out_dir: Каталог изображений
+        views: Имена видов из VIEWS (по умолчанию Config.THUMBNAIL_VIEWS)
+        size: Сторона изображения, пикс. (по умолчанию Config.THUMBNAIL_SIZE)
+        max_faces: Треугольников упрощенной копии (по умолчанию Config.THUMBNAIL_MAX_FACES)
+        max_workers: Количество процессов (по умолчанию — число ядер)
+        check: Функция проверки отмены (например, TaskContext.check)
+        progress: Функция прогресса 0..100 (например, TaskContext.progress)
+
+    Returns:
+        list: Для каждого файла (в порядке file_paths) словарь: file, images
+        (пути записанных PNG), error (текст ошибки или None)
+    """
+    file_paths = [str(p) for p in file_paths]
+    views = tuple(views or Config.THUMBNAIL_VIEWS)
+    size = int(size or Config.THUMBNAIL_SIZE)
+    max_faces = int(max_faces or Config.THUMBNAIL_MAX_FACES)
+    out_dir = str(out_dir)
+    if not file_paths:
+        return []
+
+    t0 = time.perf_counter()
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(file_paths)))
+    # Несколько групп на процесс — для прогресса и отмены
+    chunk = max(1, min(32, -(-len(file_paths) // (workers * 4))))
+    groups = [file_paths[s : s + chunk] for s in range(0, len(file_paths), chunk)]
+
+    results = []
+    if workers == 1 or len(groups) <= 1:
+        for group in groups:
+            if check is not None:
+                check()
+            results.extend(_render_files(group, out_dir, views, size, max_faces))
+            if progress is not None:
+                progress(int(100 * len(results) / len(file_paths)))
+    else:
+        from solidflow.geometry.mesh.shared import create_process_pool
+
+        executor = create_process_pool(workers)
+        try:
+            futures = [
+                executor.submit(_render_files, group, out_dir, views, size, max_faces)
+                for group in groups
+            ]
+            for future in futures:
+                if check is not None:
+                    check()
+                results.extend(future.result())
+                if progress is not None:
+                    progress(int(100 * len(results) / len(file_paths)))
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    elapsed = time.perf_counter() - t0
+    failed = sum(1 for r in results if r["error"])
+    _log.info(
+        "Rendered %d thumbnails (%d failed) in %.2fs (%.1f files/s, %d workers)",
+        len(results) - failed,
+        failed,
+        elapsed,
+        len(results) / elapsed if elapsed > 0 else 0.0,
+        workers,
+    )
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Пакетная отрисовка миниатюр из командной строки:
+    ``python -m solidflow thumbnails <файлы или каталоги> -o <каталог>``
+
+    Returns:
+        int: Код завершения (1, если хотя бы один файл не отрисован)
+    """
+    import argparse
+    import sys
+
+    from solidflow.geometry.mesh.importer import MeshImporter
+
+    parser = argparse.ArgumentParser(prog="solidflow thumbnails", description="Миниатюры моделей")
+    parser.add_argument("paths", nargs="+", help="Файлы моделей или каталоги")
+    parser.add_argument("-o", "--out", required=True, help="Каталог изображений")
+    parser.add_argument("--size", type=int, default=None, help="Сторона изображения, пикс.")
+    parser.add_argument("--views", default=None, help=f"Виды через запятую: {', '.join(VIEWS)}")
+    parser.add_argument("--workers", type=int, default=None, help="Количество процессов")
+    args = parser.parse_args(argv)
+
+    files = []
+    for path in map(Path, args.paths):
+        if path.is_dir():
+            files.extend(
+                sorted(p for p in path.rglob("*") if p.suffix.lower() in MeshImporter.SUFFIXES)
+            )
+        else:
+            files.append(path)
+    views = args.views.split(",") if args.views else None
+
+    results = render_thumbnails(
+        files, args.out, views=views, size=args.size, max_workers=args.workers
+    )
+    for result in results:
+        if result["error"]:
+            print(f"{result['file']}: {result['error']}", file=sys.stderr)
+    return 0 if results and all(not r["error"] for r in results) else 1
@@ -0,0 +1,293 @@
+"""
+Статистика отрисовки viewport
+
+RenderStats подписывается на начало и конец кадра окна отрисовки (как
+InteractionLOD) и для каждого кадра запоминает время отрисовки, количество
+треугольников и точек видимых actor, уровень детализации, режим
+отображения и оценку памяти: наборы данных VTK в оперативной памяти
+(``GetActualMemorySize``) и буферы вершин, нормалей, цветов и индексов на
+видеокарте. Занятую видеопамять VTK не сообщает, поэтому вторая величина —
+оценка по количеству точек и граней.
+
+Последние кадры хранятся в кольцевом буфере и выгружаются в CSV; сводка за
+интервал пишется в журнал, поэтому жалоба на медленный viewport приходит
+вместе с файлом журнала и данными. По запросу статистика показывается
+текстом поверх модели.
+"""
+
+import csv
+import logging
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+
+import numpy as np
+
+from solidflow.core.config import Config
+
+_log = logging.getLogger("SolidFlow.RenderStats")
+
+# Поля записи кадра (столбцы CSV)
+FIELDS = (
+    "time",
+    "frame_ms",
+    "triangles",
+    "points",
+    "lod_level",
+    "display_mode",
+    "cpu_kb",
+    "gpu_kb",
+)
+
+# Кадров в скользящем среднем надписи поверх модели
+_OVERLAY_FRAMES = 30
+
+# Угол надписи поверх модели (vtkCornerAnnotation: верхний левый)
+_OVERLAY_CORNER = 2
+
+
+class RenderStats:
+    """Измерение кадров окна отрисовки и надпись со статистикой поверх модели"""
+
+    def __init__(
+        self,
+        context: Optional[Callable[[], Dict[str, object]]] = None,
+        max_frames: Optional[int] = None,
+        log_interval: Optional[float] = None,
+    ):
+        """
+        Инициализация
+
+        Args:
+            context: Функция состояния viewport для записи кадра: словарь с
+                ключами lod_level и display_mode
+            max_frames: Кадров в кольцевом буфере (по умолчанию Config.RENDER_STATS_FRAMES)
+            log_interval: Интервал сводки в журнале, с (по умолчанию
+                Config.RENDER_STATS_LOG_S; 0 — не писать)
+        """
+        self.context = context
+        self.max_frames = int(max_frames or Config.RENDER_STATS_FRAMES)
+        self.log_interval = float(
+            log_interval if log_interval is not None else Config.RENDER_STATS_LOG_S
+        )
+
+        self._plotter = None
+        self._frames = deque(maxlen=self.max_frames)
+        self._frame_start = None
+        self._scene = None
+        self._overlay = None
+
+        # Кадры с последней сводки в журнале
+        self._log_start = time.monotonic()
+        self._log_frames = []
+
+    def attach(self, plotter):
+        """
+        Подключиться к окну отрисовки
+
+        Args:
+            plotter: PyVista plotter
+        """
+        self._plotter = plotter
+        window = plotter.ren_win
+        window.AddObserver("StartEvent", self._on_render_start)
+        window.AddObserver("EndEvent", self._on_render_end)
+
+    @property
+    def frames(self):
+        """Записи последних кадров (кортежи по FIELDS), от старых к новым"""
+        return list(self._frames)
+
+    def clear(self):
+        """Забыть измеренные кадры"""
+        self._frames.clear()
+        self._log_frames = []
+        self._log_start = time.monotonic()
+
+    def summary(self, frames=None) -> Dict[str, float]:
+        """
+        Сводка по кадрам
+
+        Args:
+            frames: Записи кадров (по умолчанию — кольцевой буфер)
+
+        Returns:
+            dict: frames, mean_ms, p95_ms, max_ms, fps (по среднему времени кадра);
+            пустой словарь, если кадров нет
+        """
+        frames = self.frames if frames is None else frames
+        if not frames:
+            return {}
+        times = np.array([f[1] for f in frames], dtype=np.float64)
+        mean = float(times.mean())
+        return {
+            "frames": len(times),
+            "mean_ms": mean,
+            "p95_ms": float(np.percentile(times, 95)),
+            "max_ms": float(times.max()),
+            "fps": 1000.0 / mean if mean > 0 else 0.0,
+        }
+
+    def export(self, file_path: Union[str, Path]) -> int:
+        """
+        Выгрузить записи кадров в CSV (столбцы FIELDS)
+
+        Args:
+            file_path: Путь к файлу
+
+        Returns:
+            int: Количество выгруженных кадров
+        """
+        frames = self.frames
+        with open(file_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+            for record in frames:
+                stamp = datetime.fromtimestamp(record[0]).isoformat(timespec="milliseconds")
+                writer.writerow((stamp, f"{record[1]:.3f}") + record[2:])
+        stats = self.summary(frames)
+        _log.info(
+            "Exported %d frames to %s (mean %.1f ms, p95 %.1f ms)",
+            len(frames),
+            file_path,
+            stats.get("mean_ms", 0.0),
+            stats.get("p95_ms", 0.0),
+        )
+        return len(frames)
+
+    def set_overlay(self, visible: bool = True):
+        """
+        Показать/скрыть надпись со статистикой поверх модели
+
+        Надпись обновляется в начале каждого кадра данными предыдущего,
+        поэтому отдельной отрисовки для нее не нужно.
+        """
+        if self._plotter is None:
+            return
+        if visible and self._overlay is None:
+            self._overlay = self._plotter.add_text(
+                "", position="upper_left", font_size=9, color="white", render=False
+            )
+            self._overlay.SetText(_OVERLAY_CORNER, self._overlay_text())
+        elif not visible and self._overlay is not None:
+            self._plotter.remove_actor(self._overlay, render=False)
+            self._overlay = None
+        self._plotter.render()
+
+    def overlay_visible(self) -> bool:
+        """Показывается ли надпись со статистикой"""
+        return self._overlay is not None
+
+    def _overlay_text(self) -> str:
+        """Текст надписи: последний кадр и содержимое сцены"""
+        if not self._frames:
+            return "Кадров еще нет"
+        recent = list(self._frames)[-_OVERLAY_FRAMES:]
+        last = recent[-1]
+        stats = self.summary(recent)
+        lines = [
+            f"Кадр {last[1]:.1f} мс, {stats['fps']:.0f} кадр/с",
+            f"Треугольников {last[2]:,}".replace(",", " "),
+            f"Уровень детализации {last[4]}, режим {last[5]}",
+            f"Память: ОЗУ {last[6] / 1024:.1f} МБ, видео ~{last[7] / 1024:.1f} МБ",
+        ]
+        return "\n".join(lines)
+
+    def _measure_scene(self):
+        """Треугольники, точки и память видимых actor (перед отрисовкой кадра)"""
+        triangles = points = cpu = gpu = 0
+        seen = set()
+        for renderer in self._plotter.renderers:
+            actors = renderer.GetActors()
+            actors.InitTraversal()
+            for _ in range(actors.GetNumberOfItems()):
+                actor = actors.GetNextActor()
+                mapper = actor.GetMapper()
+                if not actor.GetVisibility() or mapper is None:
+                    continue
+                data = mapper.GetInput()
+                if data is None:
+                    continue
+                polys = data.GetNumberOfPolys() if hasattr(data, "GetNumberOfPolys") else 0
+                triangles += polys
+                points += data.GetNumberOfPoints()
+                gpu += _gpu_bytes(actor, mapper, data, polys)
+                if id(data) not in seen:
+                    seen.add(id(data))
+                    cpu += data.GetActualMemorySize()
+        return triangles, points, cpu, gpu // 1024
+
+    def _on_render_start(self, *args):
+        if self._overlay is not None:
+            self._overlay.SetText(_OVERLAY_CORNER, self._overlay_text())
+        self._scene = self._measure_scene()
+        self._frame_start = time.perf_counter()
+
+    def _on_render_end(self, *args):
+        if self._frame_start is None:
+            return
+        frame_ms = (time.perf_counter() - self._frame_start) * 1000.0
+        self._frame_start = None
+        context = self.context() if self.context is not None else {}
+        triangles, points, cpu, gpu = self._scene
+        record = (
+            time.time(),
+            frame_ms,
+            triangles,
+            points,
+            context.get("lod_level", 0),
+            context.get("display_mode", ""),
+            cpu,
+            gpu,
+        )
+        self._frames.append(record)
+        self._log_frames.append(record)
+        if self.log_interval > 0 and time.monotonic() - self._log_start >= self.log_interval:
+            self._log_summary()
+
+    def _log_summary(self):
+        """Сводка кадров с прошлой сводки в журнал"""
+        stats = self.summary(self._log_frames)
+        last = self._log_frames[-1]
+        _log.info(
+            "Render: %d frames, mean %.1f ms, p95 %.1f ms, max %.1f ms; "
+            "%d triangles, LOD %s, mode %s, memory %.1f MB (GPU ~%.1f MB)",
+            stats["frames"],
+            stats["mean_ms"],
+            stats["p95_ms"],
+            stats["max_ms"],
+            last[2],
+            last[4],
+            last[5],
+            last[6] / 1024.0,
+            last[7] / 1024.0,
+        )
+        self._log_frames = []
+        self._log_start = time.monotonic()
+
+
+def _gpu_bytes(actor, mapper, data, polys: int) -> int:
+    """
+    Оценка буферов actor на видеокарте, байт
+
+    Координаты и нормали хранятся как float32, цвета — RGBA по байту,
+    индексы — uint32; цвета граней VTK передает текстурным буфером, а ребра
+    в режиме заливки с ребрами — отдельным буфером индексов линий.
+    """
+    n_points = data.GetNumberOfPoints()
+    size = n_points * 12
+    point_data = data.GetPointData()
+    if point_data.GetNormals() is not None:
+        size += n_points * 12
+    if mapper.GetScalarVisibility():
+        # Режимы VTK_SCALAR_MODE_USE_CELL_DATA и VTK_SCALAR_MODE_USE_CELL_FIELD_DATA
+        per_cell = mapper.GetScalarMode() in (2, 4)
+        size += 4 * (data.GetNumberOfCells() if per_cell else n_points)
+    size += polys * 3 * 4
+    if hasattr(data, "GetNumberOfLines"):
+        size += data.GetNumberOfLines() * 2 * 4 + data.GetNumberOfVerts() * 4
+    if actor.GetProperty().GetEdgeVisibility():
+        size += polys * 3 * 2 * 4
+    return size
@@ -5,8 +5,25 @@
 import logging
 import time
 
+import numpy as np
 from PySide6.QtWidgets import QFrame, QVBoxLayout
 
+from solidflow.analysis.defects import EDGE_DEFECTS, FACE_DEFECTS
+from solidflow.gui.viewport.lod import InteractionLOD
+from solidflow.gui.viewport.render_stats import RenderStats
+
+# Цвета подсветки дефектов; у грани с несколькими дефектами — цвет первого по списку
+DEFECT_COLORS = {
+    "self_intersection": "red",
+    "degenerate": "magenta",
+    "flipped": "orange",
+    "non_manifold": "red",
+    "boundary": "yellow",
+}
+
+# Массив кодов дефектов на гранях набора данных actor модели
+_DEFECTS_ARRAY = "Дефекты"
+
 
 class Viewport3D(QFrame):
     """3D viewport виджет для отображения моделей"""
@@ -33,12 +50,58 @@ class Viewport3D(QFrame):
 
         self._init_plotter()
 
-        # Текущая загруженная модель
+        # Текущая загруженная модель и показанный actor: actor модели
+        # (создается один раз, с нормалями для гладкого затенения) или actor
+        # раскраски по значениям; второй при этом скрыт, а не удален
         self.current_mesh = None
         self.current_actor = None
+        self._mesh_actor = None
+        self._scalars_actor = None
 
         # Режим отображения
         self._display_mode = "solid"  # solid или wireframe
+        self._edges_visible = False
+
+        # Раскраска по значениям на гранях: (значения, подпись, палитра, диапазон)
+        self._face_scalars = None
+
+        # Сечение плоскостью: индекс граней вдоль нормали (SectionPlane),
+        # плоскость отсечения модели, заливка и контур среза
+        self._section = None
+        self._section_plane = None
+        self._section_meshes = None
+        self._section_actors = []
+        self._section_result = None
+        self._section_cap_pending = False
+
+        # Поддержки: отдельный mesh со своим actor
+        self.supports_mesh = None
+        self._supports_actor = None
+        self.stock_mesh = None
+        self._stock_actor = None
+
+        # Облако точек: октодерево, показанный уровень и его actor
+        self.current_cloud = None
+        self._cloud_level = None
+        self._cloud_actor = None
+
+        # Линии поверх модели со значениями на ребрах: (actor, подпись шкалы)
+        self._edge_overlay = None
+
+        # Подсветка дефектов: коды на гранях actor модели и линии дефектных
+        # ребер раскрашиваются таблицами цветов, поэтому включение и выключение
+        # вида дефекта меняет только таблицу, а не данные модели
+        self._defect_faces = False
+        self._defect_lines = None
+        self._defect_face_lut = None
+        self._defect_edge_lut = None
+        self._defect_visible = {kind: True for kind in DEFECT_COLORS}
+
+        # Упрощенные копии модели на время движения камеры
+        self.lod = InteractionLOD()
+
+        # Время кадров, треугольники и память для диагностики медленной отрисовки
+        self.stats = RenderStats(context=self._render_context)
 
         self._setup_plotter()
 
@@ -79,6 +142,9 @@ class Viewport3D(QFrame):
         self.plotter.camera_position = "iso"
         self.plotter.reset_camera()
 
+        self.lod.attach(self.plotter)
+        self.stats.attach(self.plotter)
+
     def load_mesh(self, mesh):
         """
         Загрузить mesh для отображения
@@ -90,9 +156,16 @@ class Viewport3D(QFrame):
             self._log.error("Viewport is not initialized (plotter is None).")
             return
 
-        # Удаление предыдущей модели
-        if self.current_actor is not None:
-            self.plotter.remove_actor(self.current_actor)
+        # Удаление предыдущей модели (раскраска и сечение относятся к ней)
+        self.disable_section()
+        self._section = None
+        self.clear_supports()
+        self.clear_stock()
+        self.clear_edge_scalars()
+        self.clear_defects()
+        self.clear_point_cloud()
+        self._remove_current_actor()
+        self._face_scalars = None
 
         # Загрузка mesh
         if isinstance(mesh, str):
@@ -107,30 +180,446 @@ class Viewport3D(QFrame):
         self.plotter.reset_camera()
 
     def _display_mesh(self):
-        """Отобразить текущий mesh"""
+        """
+        Отобразить текущий mesh
+
+        Actor модели создается один раз: нормали для гладкого затенения
+        считаются здесь, а режим отображения, ребра и цвет переключаются
+        свойствами actor (_apply_display_properties). Раскраска по значениям —
+        отдельный actor; actor модели на это время скрывается.
+        """
         if self.current_mesh is None:
             return
 
-        # Параметры отображения в зависимости от режима
-        if self._display_mode == "wireframe":
-            self.current_actor = self.plotter.add_mesh(
-                self.current_mesh,
-                color="white",
-                style="wireframe",
-                line_width=1,
-                lighting=False,
-            )
-        else:  # solid
-            self.current_actor = self.plotter.add_mesh(
+        if self._mesh_actor is None:
+            self._mesh_actor = self.plotter.add_mesh(
                 self.current_mesh,
                 color="lightblue",
                 show_edges=False,
                 smooth_shading=True,
             )
+            # Mapper подключается к готовому набору данных с нормалями, а не к
+            # конвейеру сглаживания: массивы, добавленные к набору (подсветка
+            # дефектов), не пересчитывают нормали и не попадают в current_mesh
+            self._mesh_actor.mapper.dataset = self._mesh_actor.mapper.dataset
+        if self._face_scalars is not None and self._scalars_actor is None:
+            values, title, cmap, clim = self._face_scalars
+            display = self.current_mesh
+            if display.n_cells != len(values):
+                # Значения посчитаны для триангулированной модели
+                display = display.triangulate()
+            else:
+                display = display.copy(deep=False)
+            display.cell_data[title] = values
+            self._scalars_actor = self.plotter.add_mesh(
+                display,
+                scalars=title,
+                cmap=cmap,
+                clim=clim,
+                nan_color="lightgrey",
+                show_edges=False,
+                scalar_bar_args={"title": title},
+            )
+
+        actor = self._scalars_actor if self._scalars_actor is not None else self._mesh_actor
+        self._mesh_actor.SetVisibility(actor is self._mesh_actor)
+        if actor is not self.current_actor:
+            if self.current_actor is not None and self._section_plane is not None:
+                self.current_actor.GetMapper().RemoveAllClippingPlanes()
+            self.current_actor = actor
+            self._apply_section_clipping()
+            self.lod.set_actor(actor)
+        self._apply_display_properties()
+
+    def _apply_display_properties(self):
+        """Режим отображения, ребра и цвет модели — через свойства actor"""
+        if self.current_actor is None:
+            return
+        prop = self.current_actor.prop
+        wireframe = self._display_mode == "wireframe"
+        # Раскраска по значениям и подсветка дефектов видны только в режиме заливки
+        if self.current_actor is self._scalars_actor:
+            colored = self._face_scalars is not None and not wireframe
+        else:
+            colored = self._defect_faces and not wireframe
+        self.current_actor.mapper.scalar_visibility = colored
+        if self._face_scalars is not None and self._face_scalars[1] in self.plotter.scalar_bars:
+            self.plotter.scalar_bars[self._face_scalars[1]].SetVisibility(
+                colored and self.current_actor is self._scalars_actor
+            )
+
+        if wireframe:
+            prop.style = "wireframe"
+            prop.color = "white"
+            prop.line_width = 1
+            prop.lighting = False
+            prop.show_edges = False
+        else:
+            prop.style = "surface"
+            prop.color = "lightblue"
+            prop.lighting = True
+            prop.show_edges = self._edges_visible
+            prop.edge_color = "black"
+
+    def _remove_scalars_actor(self):
+        """Удалить actor раскраски по значениям и шкалу"""
+        if self._scalars_actor is None:
+            return
+        if self.current_actor is self._scalars_actor:
+            self.lod.clear()
+            self.current_actor = None
+        self.plotter.remove_actor(self._scalars_actor)
+        self._scalars_actor = None
+        try:
+            self.plotter.remove_scalar_bar(self._face_scalars[1])
+        except (KeyError, StopIteration, AttributeError):
+            pass
+
+    def _remove_current_actor(self):
+        """Удалить actor модели и раскраски (при смене модели)"""
+        self._remove_scalars_actor()
+        if self._mesh_actor is None:
+            return
+        self.lod.clear()
+        self.plotter.remove_actor(self._mesh_actor)
+        self._mesh_actor = None
+        self.current_actor = None
+
+    def show_face_scalars(self, values, title: str, cmap: str = "jet_r", clim=None):
+        """
+        Раскрасить модель по значениям на гранях (например, карта толщин)
+
+        Args:
+            values: Значение для каждой грани (M,); NaN отображается серым
+            title: Подпись шкалы значений
+            cmap: Палитра
+            clim: Диапазон палитры (min, max), по умолчанию — по значениям
+        """
+        if self.current_mesh is None:
+            return
+
+        self._remove_scalars_actor()
+        self._face_scalars = (values, title, cmap, clim)
+        # Раскраска видна только в режиме заливки
+        self._display_mode = "solid"
+        self._display_mesh()
+
+    def clear_face_scalars(self):
+        """Убрать раскраску по значениям (снова показывается actor модели)"""
+        if self._face_scalars is None:
+            return
+        self._remove_scalars_actor()
+        self._face_scalars = None
+        self._display_mesh()
+
+    def has_face_scalars(self) -> bool:
+        """Показана ли раскраска по значениям"""
+        return self._face_scalars is not None
+
+    def show_edge_scalars(self, points, edges, values, title: str, cmap: str = "plasma", clim=None):
+        """
+        Показать ребра линиями поверх модели, раскрашенными по значениям
+
+        Actor модели не перестраивается: линии — отдельный actor.
+
+        Args:
+            points: Вершины (N, 3)
+            edges: Ребра (E, 2)
+            values: Значение для каждого ребра (E,)
+            title: Подпись шкалы значений
+            cmap: Палитра
+            clim: Диапазон палитры (min, max), по умолчанию — по значениям
+        """
+        if self.plotter is None:
+            return
+        self.clear_edge_scalars()
+        edges = np.asarray(edges, dtype=np.int64).reshape(-1, 2)
+        if not len(edges):
+            return
+
+        lines = np.column_stack([np.full(len(edges), 2, dtype=np.int64), edges]).ravel()
+        overlay = self._pv.PolyData(np.asarray(points, dtype=np.float64), lines=lines)
+        overlay.cell_data[title] = np.asarray(values, dtype=np.float64)
+        actor = self.plotter.add_mesh(
+            overlay,
+            scalars=title,
+            cmap=cmap,
+            clim=clim,
+            line_width=3,
+            lighting=False,
+            reset_camera=False,
+            scalar_bar_args={"title": title},
+        )
+        self._edge_overlay = (actor, title)
+
+    def clear_edge_scalars(self):
+        """Убрать линии ребер"""
+        if self._edge_overlay is None:
+            return
+        actor, title = self._edge_overlay
+        self._edge_overlay = None
+        self.plotter.remove_actor(actor)
+        try:
+            self.plotter.remove_scalar_bar(title)
+        except (KeyError, StopIteration, AttributeError):
+            pass
+
+    def has_edge_scalars(self) -> bool:
+        """Показаны ли линии ребер"""
+        return self._edge_overlay is not None
+
+    def show_defects(self, defects):
+        """
+        Подсветить дефекты модели
+
+        Коды дефектов граней добавляются массивом к набору данных actor модели
+        (модель не копируется), дефектные ребра — один actor линий.
+        Раскраска по значениям на это время снимается.
+
+        Args:
+            defects: DefectResult (face_codes, points, edges, edge_kinds)
+        """
+        if self.current_mesh is None or self._mesh_actor is None:
+            return
+        self.clear_defects()
+        self.clear_face_scalars()
+
+        dataset = self._mesh_actor.mapper.dataset
+        codes = defects.face_codes
+        if dataset.n_cells == len(codes):
+            dataset.cell_data[_DEFECTS_ARRAY] = codes
+            self.lod.update_cell_data()
+            self._defect_face_lut = self._pv.LookupTable()
+            self._defect_face_lut.SetNumberOfTableValues(8)
+            self._defect_face_lut.SetTableRange(0, 7)
+            mapper = self._mesh_actor.mapper
+            mapper.SetScalarModeToUseCellFieldData()
+            mapper.SelectColorArray(_DEFECTS_ARRAY)
+            mapper.SetLookupTable(self._defect_face_lut)
+            mapper.SetUseLookupTableScalarRange(True)
+            mapper.SetColorModeToMapScalars()
+            self._defect_faces = True
+        else:
+            # Коды посчитаны для триангулированной модели
+            self._log.warning(
+                "Defect codes for %d faces do not match %d cells", len(codes), dataset.n_cells
+            )
+
+        edges = np.asarray(defects.edges, dtype=np.int64).reshape(-1, 2)
+        if len(edges):
+            lines = np.column_stack([np.full(len(edges), 2, dtype=np.int64), edges]).ravel()
+            overlay = self._pv.PolyData(np.asarray(defects.points, dtype=np.float64), lines=lines)
+            overlay.cell_data[_DEFECTS_ARRAY] = np.asarray(defects.edge_kinds, dtype=np.uint8)
+            self._defect_lines = self.plotter.add_mesh(
+                overlay,
+                scalars=_DEFECTS_ARRAY,
+                show_scalar_bar=False,
+                line_width=4,
+                lighting=False,
+                reset_camera=False,
+            )
+            self._defect_edge_lut = self._pv.LookupTable()
+            self._defect_edge_lut.SetNumberOfTableValues(len(EDGE_DEFECTS))
+            self._defect_edge_lut.SetTableRange(0, len(EDGE_DEFECTS) - 1)
+            self._defect_lines.mapper.SetLookupTable(self._defect_edge_lut)
+            self._defect_lines.mapper.SetUseLookupTableScalarRange(True)
+
+        self._display_mode = "solid"
+        self._display_mesh()
+        self._update_defect_colors()
+
+    def _update_defect_colors(self):
+        """Заполнить таблицы цветов дефектов по включенным видам"""
+        Color = self._pv.Color
+        visible = [kind for kind in DEFECT_COLORS if self._defect_visible[kind]]
+        if self._defect_face_lut is not None:
+            base = Color("lightblue").float_rgb
+            for code in range(8):
+                color = base
+                for kind in visible:
+                    if kind in FACE_DEFECTS and code & FACE_DEFECTS[kind]:
+                        color = Color(DEFECT_COLORS[kind]).float_rgb
+                        break
+                self._defect_face_lut.SetTableValue(code, *color, 1.0)
+            self._defect_face_lut.Modified()
+
+        if self._defect_lines is not None:
+            for kind, code in EDGE_DEFECTS.items():
+                # Скрытый вид ребер — прозрачный цвет в таблице
+                opacity = 1.0 if kind in visible else 0.0
+                self._defect_edge_lut.SetTableValue(
+                    code, *Color(DEFECT_COLORS[kind]).float_rgb, opacity
+                )
+            self._defect_edge_lut.Modified()
+            self._defect_lines.SetVisibility(any(kind in visible for kind in EDGE_DEFECTS))
+
+    def set_defect_visible(self, kind: str, visible: bool = True):
+        """
+        Показать или скрыть подсветку вида дефекта (данные модели не меняются)
+
+        Args:
+            kind: Вид дефекта (ключ DEFECT_COLORS)
+            visible: True для показа
+        """
+        if kind not in self._defect_visible:
+            raise ValueError(f"Неизвестный вид дефекта: {kind}")
+        self._defect_visible[kind] = bool(visible)
+        if self.has_defects():
+            self._update_defect_colors()
+            self.plotter.render()
+
+    def defect_visible(self, kind: str) -> bool:
+        """Включена ли подсветка вида дефекта"""
+        return self._defect_visible[kind]
+
+    def clear_defects(self):
+        """Убрать подсветку дефектов"""
+        if self._defect_lines is not None:
+            self.plotter.remove_actor(self._defect_lines)
+            self._defect_lines = None
+        self._defect_edge_lut = None
+        if not self._defect_faces:
+            return
+        self._defect_faces = False
+        self._defect_face_lut = None
+        if self._mesh_actor is not None:
+            self._mesh_actor.mapper.dataset.cell_data.pop(_DEFECTS_ARRAY, None)
+            self.lod.update_cell_data()
+            self._apply_display_properties()
+
+    def has_defects(self) -> bool:
+        """Показана ли подсветка дефектов"""
+        return self._defect_faces or self._defect_lines is not None
+
+    def show_supports(self, mesh):
+        """
+        Показать поддержки отдельным mesh
+
+        Args:
+            mesh: PyVista mesh поддержек
+        """
+        if self.plotter is None:
+            return
+        self.clear_supports()
+        self.supports_mesh = mesh
+        if mesh.n_cells:
+            self._supports_actor = self.plotter.add_mesh(
+                mesh, color="khaki", show_edges=False, reset_camera=False
+            )
+
+    def clear_supports(self):
+        """Убрать поддержки"""
+        if self._supports_actor is not None:
+            self.plotter.remove_actor(self._supports_actor)
+            self._supports_actor = None
+        self.supports_mesh = None
+
+    def has_supports(self) -> bool:
+        """Показаны ли поддержки"""
+        return self.supports_mesh is not None
+
+    def show_stock(self, mesh):
+        """
+        Показать заготовку полупрозрачной поверх детали
+
+        Args:
+            mesh: PyVista mesh заготовки
+        """
+        if self.plotter is None:
+            return
+        self.clear_stock()
+        self.stock_mesh = mesh
+        if mesh.n_cells:
+            self._stock_actor = self.plotter.add_mesh(
+                mesh, color="lightsteelblue", opacity=0.35, show_edges=False, reset_camera=False
+            )
+
+    def clear_stock(self):
+        """Убрать заготовку"""
+        if self._stock_actor is not None:
+            self.plotter.remove_actor(self._stock_actor)
+            self._stock_actor = None
+        self.stock_mesh = None
+
+    def has_stock(self) -> bool:
+        """Показана ли заготовка"""
+        return self.stock_mesh is not None
+
+    def load_point_cloud(self, octree, budget: int = None):
+        """
+        Показать облако точек вместо модели
+
+        Отображается самый подробный уровень октодерева, укладывающийся в
+        бюджет точек.
+
+        Args:
+            octree: PointOctree облака
+            budget: Наибольшее количество точек (по умолчанию Config.POINT_BUDGET)
+        """
+        if self.plotter is None or self._pv is None:
+            self._log.error("Viewport is not initialized (plotter is None).")
+            return
+
+        self.clear()
+        self.current_cloud = octree
+        self.set_point_budget(budget)
+        self.plotter.reset_camera()
+
+    def set_point_budget(self, budget: int = None):
+        """
+        Сменить бюджет точек облака (уровень октодерева перестраивается, если изменился)
+
+        Args:
+            budget: Наибольшее количество точек (по умолчанию Config.POINT_BUDGET)
+        """
+        if self.current_cloud is None:
+            return
+        from solidflow.core.config import Config
+
+        level = self.current_cloud.level_for(budget if budget is not None else Config.POINT_BUDGET)
+        if level == self._cloud_level and self._cloud_actor is not None:
+            return
+        if self._cloud_actor is not None:
+            self.plotter.remove_actor(self._cloud_actor, render=False)
+        cloud = self.current_cloud.level(level)
+        display = cloud.to_polydata()
+        self._cloud_actor = self.plotter.add_mesh(
+            display,
+            scalars="RGB" if cloud.colors is not None else None,
+            rgb=cloud.colors is not None,
+            color=None if cloud.colors is not None else "lightblue",
+            point_size=2,
+            render_points_as_spheres=False,
+            lighting=False,
+            reset_camera=False,
+        )
+        self._cloud_level = level
+        self._log.info("Point cloud level %d: %d points", level, display.n_points)
+
+    def clear_point_cloud(self):
+        """Убрать облако точек"""
+        if self._cloud_actor is not None:
+            self.plotter.remove_actor(self._cloud_actor)
+            self._cloud_actor = None
+        self.current_cloud = None
+        self._cloud_level = None
+
+    def has_point_cloud(self) -> bool:
+        """Показано ли облако точек"""
+        return self.current_cloud is not None
+
+    def point_cloud_level(self):
+        """
+        Показанный уровень октодерева облака
+
+        Returns:
+            int или None, если облако не показано
+        """
+        return self._cloud_level
 
     def set_display_mode(self, mode):
         """
-        Установить режим отображения
+        Установить режим отображения (actor модели не пересоздается)
 
         Args:
             mode: "solid" или "wireframe"
@@ -141,9 +630,9 @@ class Viewport3D(QFrame):
         self._display_mode = mode
 
         # Обновить отображение если есть модель
-        if self.current_mesh is not None:
-            self.plotter.remove_actor(self.current_actor)
-            self._display_mesh()
+        if self.current_actor is not None:
+            self._apply_display_properties()
+            self.plotter.render()
 
     def get_display_mode(self):
         """
@@ -154,11 +643,50 @@ class Viewport3D(QFrame):
         """
         return self._display_mode
 
+    def _render_context(self):
+        """Состояние viewport для записи кадра в статистику отрисовки"""
+        mode = self._display_mode
+        if self._edges_visible and mode == "solid":
+            mode = "solid+edges"
+        return {"lod_level": self.lod.shown_level, "display_mode": mode}
+
+    def set_stats_overlay(self, visible=True):
+        """
+        Показать/скрыть статистику отрисовки поверх модели
+
+        Args:
+            visible: True для показа
+        """
+        self.stats.set_overlay(visible)
+
+    def stats_overlay_visible(self) -> bool:
+        """Показывается ли статистика отрисовки поверх модели"""
+        return self.stats.overlay_visible()
+
+    def export_render_stats(self, file_path):
+        """
+        Выгрузить статистику последних кадров в CSV
+
+        Args:
+            file_path: Путь к файлу
+
+        Returns:
+            int: Количество выгруженных кадров
+        """
+        return self.stats.export(file_path)
+
     def clear(self):
         """Очистить viewport"""
+        self.clear_point_cloud()
         if self.current_actor is not None:
-            self.plotter.remove_actor(self.current_actor)
-            self.current_actor = None
+            self.disable_section()
+            self._section = None
+            self.clear_supports()
+            self.clear_stock()
+            self.clear_edge_scalars()
+            self.clear_defects()
+            self._remove_current_actor()
+            self._face_scalars = None
             self.current_mesh = None
 
     def reset_camera(self):
@@ -167,18 +695,170 @@ class Viewport3D(QFrame):
 
     def show_edges(self, show=True):
         """
-        Показать/скрыть ребра модели
+        Показать/скрыть ребра модели (в режиме заливки)
 
         Args:
             show: True для показа ребер
         """
-        if self.current_mesh is not None and self._display_mode == "solid":
-            self.plotter.remove_actor(self.current_actor)
-            self.current_actor = self.plotter.add_mesh(
-                self.current_mesh,
-                color="lightblue",
-                show_edges=show,
-                smooth_shading=True,
-                edge_color="black",
+        self._edges_visible = bool(show)
+        if self.current_actor is not None:
+            self._apply_display_properties()
+            self.plotter.render()
+
+    def edges_visible(self) -> bool:
+        """Показываются ли ребра модели в режиме заливки"""
+        return self._edges_visible
+
+    def enable_section(self, normal=(0.0, 0.0, 1.0), origin=None, widget: bool = True):
+        """
+        Включить сечение модели плоскостью
+
+        Часть модели по нормали от плоскости отсекается при отрисовке, срез
+        заливается и обводится контуром. Индекс граней строится один раз для
+        модели и нормали, поэтому перемещение плоскости пересекает только
+        грани вблизи нее.
+
+        Args:
+            normal: Нормаль плоскости (отсекается сторона, куда она направлена)
+            origin: Точка плоскости (по умолчанию — центр модели)
+            widget: Показать виджет для перемещения плоскости мышью
+        """
+        if self.current_mesh is None or self.plotter is None:
+            return
+        from solidflow.geometry.slicing.section import SectionPlane
+
+        normal = np.asarray(normal, dtype=np.float64)
+        normal = normal / np.linalg.norm(normal)
+        if self._section is None or not np.allclose(self._section.normal, normal):
+            self._section = SectionPlane(self.current_mesh, normal)
+        if origin is None:
+            origin = self.current_mesh.center
+
+        if self._section_plane is None:
+            from vtkmodules.vtkCommonDataModel import vtkPlane
+
+            self._section_plane = vtkPlane()
+            self._section_meshes = (self._pv.PolyData(), self._pv.PolyData())
+            cap, contour = self._section_meshes
+            self._section_actors = [
+                self._add_section_actor(cap, color="orange"),
+                self._add_section_actor(contour, color="red", line_width=3),
+            ]
+        self._apply_section_clipping()
+
+        self.plotter.clear_plane_widgets()
+        if widget:
+            plane_widget = self.plotter.add_plane_widget(
+                self._on_section_widget,
+                normal=normal,
+                origin=origin,
+                normal_rotation=False,
+                outline_translation=False,
+                interaction_event="always",
             )
+            plane_widget.AddObserver("EndInteractionEvent", self._on_section_widget_released)
+        self.set_section_origin(origin)
+
+    def _add_section_actor(self, mesh, color, line_width=1):
+        """Actor заливки или контура сечения (сетка может быть пустой)"""
+        actor = self._pv.Actor(mapper=self._pv.DataSetMapper(mesh))
+        actor.prop.color = color
+        actor.prop.line_width = line_width
+        actor.prop.lighting = False
+        self.plotter.add_actor(actor, reset_camera=False, pickable=False)
+        return actor
+
+    def _on_section_widget(self, normal, origin):
+        """Перемещение плоскости виджетом: заливка большого среза — после отпускания"""
+        self.set_section_origin(origin, cap=False)
+
+    def _on_section_widget_released(self, *args):
+        """Плоскость отпущена: построить отложенную заливку среза"""
+        if self._section_cap_pending and self._section_plane is not None:
+            self.set_section_origin(self._section_plane.GetOrigin())
+
+    def set_section_origin(self, origin, cap: bool = True):
+        """
+        Переместить плоскость сечения
+
+        Триангуляция заливки растет быстрее числа точек контура (см.
+        cap_polydata), поэтому при перемещении плоскости заливка большого
+        среза откладывается до отпускания, а показывается контур.
+
+        Args:
+            origin: Точка плоскости (3,)
+            cap: Построить заливку среза; при False она строится, только если
+                в контуре не больше Config.SECTION_DRAG_CAP_POINTS точек
+        """
+        if self._section is None or self._section_plane is None:
+            return
+        from solidflow.geometry.slicing.section import cap_polydata, contour_polydata
+
+        origin = np.asarray(origin, dtype=np.float64)
+        self._section_result = self._section.cut(origin)
+        self._section_plane.SetOrigin(*origin)
+        self._section_plane.SetNormal(*(-self._section.normal))
+
+        from solidflow.core.config import Config
+
+        cap_mesh, contour = self._section_meshes
+        points = len(self._section_result.points)
+        if cap or points <= Config.SECTION_DRAG_CAP_POINTS:
+            cap_mesh.copy_from(cap_polydata(self._section_result))
+            self._section_cap_pending = False
+        else:
+            # Устаревшая заливка на другом уровне хуже, чем ее отсутствие
+            cap_mesh.copy_from(self._pv.PolyData())
+            self._section_cap_pending = True
+        contour.copy_from(contour_polydata(self._section_result))
+        self.plotter.render()
+
+    def _apply_section_clipping(self):
+        """Назначить плоскость отсечения текущему actor модели"""
+        if self.current_actor is None or self._section_plane is None:
+            return
+        mapper = self.current_actor.GetMapper()
+        mapper.RemoveAllClippingPlanes()
+        mapper.AddClippingPlane(self._section_plane)
+
+    def disable_section(self):
+        """Выключить сечение (индекс граней сохраняется до смены модели)"""
+        if self._section_plane is None:
+            return
+        self.plotter.clear_plane_widgets()
+        if self.current_actor is not None:
+            self.current_actor.GetMapper().RemoveAllClippingPlanes()
+        for actor in self._section_actors:
+            self.plotter.remove_actor(actor, render=False)
+        self._section_plane = None
+        self._section_meshes = None
+        self._section_actors = []
+        self._section_result = None
+        self._section_cap_pending = False
+        self.plotter.render()
+
+    def has_section(self) -> bool:
+        """Включено ли сечение"""
+        return self._section_plane is not None
+
+    def section_result(self):
+        """
+        Текущее сечение
+
+        Returns:
+            SliceResult или None, если сечение выключено
+        """
+        return self._section_result
+
+    def export_section(self, file_path):
+        """
+        Экспортировать контуры текущего сечения (.svg или .csv)
+
+        Args:
+            file_path: Путь к файлу
+        """
+        if self._section_result is None:
+            raise ValueError("Сечение не включено")
+        from solidflow.geometry.slicing.section import export_contours
 
+        export_contours(self._section_result, file_path)
@@ -0,0 +1,152 @@
+"""
+Диалог оценки времени печати и расхода материала
+"""
+
+from dataclasses import fields
+
+from PySide6.QtWidgets import (
+    QComboBox,
+    QDialog,
+    QDialogButtonBox,
+    QDoubleSpinBox,
+    QFormLayout,
+    QLabel,
+    QSpinBox,
+    QStackedWidget,
+    QVBoxLayout,
+    QWidget,
+)
+
+from solidflow.analysis.estimate import FDMProfile, PrintEstimator, ResinProfile
+
+# Поле профиля -> (подпись, минимум, максимум, шаг, знаков после запятой)
+_FIELDS = {
+    "layer_height": ("Толщина слоя, мм", 0.01, 1.0, 0.05, 3),
+    "line_width": ("Ширина линии, мм", 0.1, 2.0, 0.05, 2),
+    "wall_count": ("Число стенок", 0, 20, 1, 0),
+    "top_bottom_layers": ("Сплошных слоев сверху/снизу", 0, 50, 1, 0),
+    "infill_density": ("Заполнение, доля", 0.0, 1.0, 0.05, 2),
+    "wall_speed": ("Скорость стенок, мм/с", 1.0, 1000.0, 5.0, 0),
+    "infill_speed": ("Скорость заполнения, мм/с", 1.0, 1000.0, 5.0, 0),
+    "travel_speed": ("Скорость перемещений, мм/с", 1.0, 1000.0, 10.0, 0),
+    "acceleration": ("Ускорение, мм/с²", 0.0, 50000.0, 100.0, 0),
+    "min_layer_time": ("Минимальное время слоя, с", 0.0, 120.0, 1.0, 1),
+    "filament_diameter": ("Диаметр нити, мм", 1.0, 3.0, 0.05, 2),
+    "filament_density": ("Плотность материала, г/см³", 0.5, 3.0, 0.01, 2),
+    "exposure_time": ("Засветка слоя, с", 0.1, 60.0, 0.1, 1),
+    "bottom_exposure_time": ("Засветка нижних слоев, с", 0.1, 300.0, 1.0, 1),
+    "bottom_layers": ("Нижних слоев", 0, 50, 1, 0),
+    "lift_distance": ("Подъем платформы, мм", 0.0, 20.0, 0.5, 1),
+    "lift_speed": ("Скорость подъема, мм/с", 0.1, 20.0, 0.1, 1),
+    "retract_speed": ("Скорость опускания, мм/с", 0.1, 20.0, 0.1, 1),
+    "resin_density": ("Плотность смолы, г/см³", 0.5, 3.0, 0.01, 2),
+}
+
+
+def format_duration(seconds: float) -> str:
+    """
+    Длительность в виде "1 ч 05 мин"
+
+    Args:
+        seconds: Длительность, с
+
+    Returns:
+        str: Строка длительности
+    """
+    minutes = int(round(seconds / 60.0))
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours} ч {minutes:02d} мин"
+    return f"{minutes} мин"
+
+
+class PrintEstimateDialog(QDialog):
+    """Параметры печати и оценка, пересчитываемая при каждом изменении"""
+
+    def __init__(self, estimator: PrintEstimator, parent=None):
+        """
+        Инициализация
+
+        Args:
+            estimator: Оценщик, построенный по сечениям модели
+            parent: Родительский виджет
+        """
+        super().__init__(parent)
+        self.estimator = estimator
+        self.setWindowTitle("Оценка печати")
+
+        self._profiles = [FDMProfile, ResinProfile]
+        self._editors = []
+
+        self.technology_combo = QComboBox()
+        self.technology_combo.addItems(["FDM", "Фотополимер"])
+
+        self._pages = QStackedWidget()
+        for profile_type in self._profiles:
+            page, editors = self._create_page(profile_type())
+            self._pages.addWidget(page)
+            self._editors.append(editors)
+
+        self.result_label = QLabel()
+        self.result_label.setWordWrap(True)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Close)
+        buttons.rejected.connect(self.reject)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.technology_combo)
+        layout.addWidget(self._pages)
+        layout.addWidget(self.result_label)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+
+        self.technology_combo.currentIndexChanged.connect(self._pages.setCurrentIndex)
+        self.technology_combo.currentIndexChanged.connect(self._recalculate)
+        self._recalculate()
+
+    def _create_page(self, profile):
+        """Форма полей профиля"""
+        page = QWidget()
+        form = QFormLayout()
+        editors = {}
+        for item in fields(profile):
+            label, low, high, step, decimals = _FIELDS[item.name]
+            value = getattr(profile, item.name)
+            if decimals == 0 and isinstance(value, int):
+                editor = QSpinBox()
+                editor.setRange(int(low), int(high))
+            else:
+                editor = QDoubleSpinBox()
+                editor.setRange(low, high)
+                editor.setDecimals(decimals)
+            editor.setSingleStep(step)
+            editor.setValue(value)
+            editor.valueChanged.connect(self._recalculate)
+            form.addRow(label, editor)
+            editors[item.name] = editor
+        page.setLayout(form)
+        return page, editors
+
+    def profile(self):
+        """Профиль печати по текущим значениям формы"""
+        index = self.technology_combo.currentIndex()
+        values = {name: editor.value() for name, editor in self._editors[index].items()}
+        return self._profiles[index](**values)
+
+    def _recalculate(self, *args):
+        """Пересчитать оценку"""
+        try:
+            estimate = self.estimator.estimate(self.profile())
+        except ValueError as e:
+            self.result_label.setText(f"Некорректные параметры: {e}")
+            return
+
+        summary = estimate.summary()
+        lines = [
+            f"Время печати: {format_duration(summary['time'])}",
+            f"Слоев: {summary['layers']}",
+            f"Материал: {summary['volume'] / 1000.0:.2f} см³, {summary['mass']:.1f} г",
+        ]
+        if summary["technology"] == "fdm":
+            lines.append(f"Длина нити: {summary['filament_length_m']:.2f} м")
+        self.result_label.setText("\n".join(lines))
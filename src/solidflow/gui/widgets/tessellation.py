@@ -0,0 +1,72 @@
+"""
+Диалог точности тесселяции STEP
+"""
+
+from typing import Optional, Tuple
+
+from PySide6.QtWidgets import (
+    QDialog,
+    QDialogButtonBox,
+    QDoubleSpinBox,
+    QFormLayout,
+    QLabel,
+    QVBoxLayout,
+)
+
+from solidflow.core.config import Config
+
+
+class TessellationDialog(QDialog):
+    """Линейное и угловое отклонение при построении треугольников по B-Rep"""
+
+    def __init__(self, deflection: Optional[Tuple[float, float]] = None, parent=None):
+        """
+        Инициализация
+
+        Args:
+            deflection: Начальные (линейное мм, угловое градусы) отклонения
+                (по умолчанию из Config)
+            parent: Родительский виджет
+        """
+        super().__init__(parent)
+        self.setWindowTitle("Точность тесселяции")
+        linear, angular = deflection or (
+            Config.STEP_LINEAR_DEFLECTION,
+            Config.STEP_ANGULAR_DEFLECTION,
+        )
+
+        self.linear_spin = QDoubleSpinBox()
+        self.linear_spin.setRange(0.001, 10.0)
+        self.linear_spin.setDecimals(3)
+        self.linear_spin.setSingleStep(0.01)
+        self.linear_spin.setValue(linear)
+
+        self.angular_spin = QDoubleSpinBox()
+        self.angular_spin.setRange(1.0, 90.0)
+        self.angular_spin.setDecimals(1)
+        self.angular_spin.setSingleStep(1.0)
+        self.angular_spin.setValue(angular)
+
+        hint = QLabel(
+            "Меньшие значения дают более точную и более тяжелую модель. "
+            "Уже построенные детали берутся из кэша."
+        )
+        hint.setWordWrap(True)
+
+        form = QFormLayout()
+        form.addRow("Линейное отклонение, мм", self.linear_spin)
+        form.addRow("Угловое отклонение, градусы", self.angular_spin)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+
+        layout = QVBoxLayout()
+        layout.addLayout(form)
+        layout.addWidget(hint)
+        layout.addWidget(buttons)
+        self.setLayout(layout)
+
+    def deflection(self) -> Tuple[float, float]:
+        """Выбранные (линейное мм, угловое градусы) отклонения"""
+        return self.linear_spin.value(), self.angular_spin.value()
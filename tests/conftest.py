@@ -1,11 +1,13 @@
+import os
 import sys
+import tempfile
 from pathlib import Path
 
-
 # Ensure we can import `solidflow` without installing the package (src-layout).
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 SRC_DIR = PROJECT_ROOT / "src"
 if str(SRC_DIR) not in sys.path:
     sys.path.insert(0, str(SRC_DIR))
 
-
+# Keep the on-disk mesh cache out of the user's cache directory.
+os.environ["SOLIDFLOW_CACHE_DIR"] = tempfile.mkdtemp(prefix="solidflow-test-cache-")
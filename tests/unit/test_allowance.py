@@ -0,0 +1,64 @@
+"""
+Тесты для заготовки с припуском
+"""
+
+import numpy as np
+import pytest
+
+trimesh = pytest.importorskip("trimesh")
+pytest.importorskip("scipy")
+pytest.importorskip("pyvista")
+
+from solidflow.analysis.allowance import AllowanceAnalyzer
+
+
+def test_box_stock_allowance():
+    """Тест коробки: габариты заготовки больше на припуск, фактический припуск близок к заданному"""
+    box = trimesh.creation.box(extents=[20, 10, 5])
+    result = AllowanceAnalyzer(box, allowance=1.0, pitch=0.25).analyze()
+    summary = result.summary()
+
+    # Поверхность заготовки — на уровне припуска с запасом на хорды
+    d = result.level
+    assert 1.0 < d < 1.05
+    bounds = np.array(result.stock.bounds).reshape(3, 2)
+    assert np.allclose(bounds[:, 1] - bounds[:, 0], np.array([20, 10, 5]) + 2 * d, atol=0.05)
+    assert summary["max_error"] < 0.05
+    # Объем эквидистанты коробки: V + A·d + (π/4)·d²·Σ ребер + (4/3)·π·d³
+    expected = 1000 + 700 * d + np.pi / 4 * 140 * d**2 + 4 / 3 * np.pi * d**3
+    assert summary["stock_volume"] == pytest.approx(expected, rel=0.01)
+
+
+def test_stock_not_inside_allowance():
+    """Тест: заготовка нигде не ближе к детали, чем заданный припуск"""
+    from solidflow.geometry.spatial.index import spatial_index
+
+    sphere = trimesh.creation.icosphere(subdivisions=3, radius=5)
+    result = AllowanceAnalyzer(sphere, allowance=1.0).analyze()
+    assert result.summary()["min"] >= 1.0
+
+    # Проверяются и точки внутри треугольников, а не только вершины
+    points = np.asarray(result.stock.points)
+    tri = points[result.stock.faces.reshape(-1, 4)[:, 1:]]
+    samples = np.concatenate([tri.mean(axis=1), (tri[:, 0] + tri[:, 1]) / 2.0, points])
+    _, distance, _ = spatial_index(sphere).closest_point(samples, max_distance=3.0)
+    assert distance.min() >= 1.0
+    assert distance.max() <= result.level + 1e-6
+
+
+def test_stock_of_open_mesh():
+    """Тест незамкнутой модели: заготовка строится по вокселям, дыра не мешает"""
+    sphere = trimesh.creation.icosphere(subdivisions=4, radius=10)
+    holed = trimesh.Trimesh(sphere.vertices, sphere.faces[20:])
+    result = AllowanceAnalyzer(holed, allowance=1.0).analyze()
+    stock = trimesh.Trimesh(result.stock.points, result.stock.faces.reshape(-1, 4)[:, 1:])
+
+    assert stock.is_watertight
+    assert stock.volume == pytest.approx(4 / 3 * np.pi * 11**3, rel=0.02)
+
+
+def test_allowance_must_be_positive():
+    """Тест проверки припуска"""
+    box = trimesh.creation.box(extents=[1, 1, 1])
+    with pytest.raises(ValueError):
+        AllowanceAnalyzer(box, allowance=0.0)
@@ -0,0 +1,79 @@
+"""
+Тесты для анализа по компонентам связности
+"""
+
+import numpy as np
+import pytest
+
+trimesh = pytest.importorskip("trimesh")
+pytest.importorskip("pyvista")
+pytest.importorskip("scipy")
+
+from solidflow.analysis.components import ComponentAnalyzer
+from solidflow.geometry.mesh.topology import edge_index, face_components
+
+
+def _plate(count=3):
+    """Несколько несвязанных кубов"""
+    boxes = [trimesh.creation.box().apply_translation([i * 3.0, 0, 0]) for i in range(count)]
+    return trimesh.util.concatenate(boxes)
+
+
+def test_edge_index_closed_box():
+    """Тест индекса ребер замкнутого куба"""
+    box = trimesh.creation.box()
+    index = edge_index(box.faces)
+
+    assert len(index.edges) == 18
+    assert np.all(index.counts == 2)
+    assert not index.boundary.any()
+
+
+def test_face_components():
+    """Тест разбиения на компоненты"""
+    plate = _plate(3)
+    n_components, labels = face_components(plate.faces)
+
+    assert n_components == 3
+    assert len(np.unique(labels)) == 3
+
+
+def test_component_analyzer_reports():
+    """Тест отчетов по деталям"""
+    plate = _plate(3)
+    analyzer = ComponentAnalyzer(plate, max_workers=2)
+    reports = analyzer.analyze()
+
+    assert analyzer.n_components == 3
+    assert len(reports) == 3
+    assert all(r["watertight"] for r in reports)
+    assert ComponentAnalyzer.summarize(reports)["total_volume"] == pytest.approx(3.0)
+
+
+def test_component_analyzer_repair_localizes_parts():
+    """Тест ремонта по деталям: дырка в одной детали не влияет на другие"""
+    plate = _plate(2)
+    holed = trimesh.Trimesh(vertices=plate.vertices, faces=plate.faces[1:])
+
+    repaired, reports = ComponentAnalyzer(holed, max_workers=2).repair()
+
+    # Детали отсортированы по размеру: целый куб первый
+    assert repaired.n_cells >= holed.faces.shape[0]
+    assert len(reports) == 2
+    assert reports[0]["error"] is None
+    assert reports[0]["watertight"]
+
+
+def test_component_analyzer_single_chunk_cancel():
+    """Тест: одна группа деталей без пула процессов тоже отменяется"""
+    calls = []
+
+    def check():
+        calls.append(1)
+        if len(calls) > 1:
+            raise InterruptedError
+
+    analyzer = ComponentAnalyzer(trimesh.creation.box())
+    with pytest.raises(InterruptedError):
+        analyzer.analyze(check=check)
+    assert len(calls) == 2
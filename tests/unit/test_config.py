@@ -28,3 +28,7 @@ def test_config_file_filter():
     assert "STL" in filter_str
     assert "All Files" in filter_str
 
+
+def test_config_save_filter():
+    """Проверка фильтра сохранения: только STL"""
+    assert Config.get_save_filter() == "STL Files (*.stl)"
@@ -0,0 +1,69 @@
+"""
+Тесты для анализа кривизны
+"""
+
+import numpy as np
+import pytest
+
+trimesh = pytest.importorskip("trimesh")
+pytest.importorskip("scipy")
+
+from solidflow.analysis.curvature import CurvatureAnalyzer, mesh_curvature
+
+
+def test_sphere_curvature():
+    """Тест сферы: H = 1/r, K = 1/r², площади вершин дают площадь поверхности"""
+    sphere = trimesh.creation.icosphere(subdivisions=4, radius=2.0)
+    result = CurvatureAnalyzer(sphere).compute()
+
+    assert np.allclose(result.mean, 0.5, rtol=0.02)
+    assert np.allclose(result.gaussian, 0.25, rtol=0.05)
+    assert result.area.sum() == pytest.approx(sphere.area)
+    k1, k2 = result.principal()
+    assert np.allclose(k1, 0.5, rtol=0.05) and np.allclose(k2, 0.5, rtol=0.05)
+
+
+def test_chunked_matches_sparse():
+    """Тест расчета пакетами: совпадает с разреженным лапласианом"""
+    torus = trimesh.creation.torus(major_radius=5, minor_radius=1.5)
+    analyzer = CurvatureAnalyzer(torus)
+    sparse = analyzer.compute()
+    chunked = analyzer.compute(chunk_faces=97)
+    assert np.allclose(chunked.mean, sparse.mean)
+    assert np.allclose(chunked.gaussian, sparse.gaussian)
+
+    laplacian = analyzer.cotangent_laplacian()
+    assert abs(laplacian - laplacian.T).max() < 1e-12
+    assert np.allclose(np.asarray(laplacian.sum(axis=1)).ravel(), 0.0)
+    # Внешний экватор выпуклый, внутренний — седловой
+    assert np.nanmax(sparse.gaussian) > 0 and np.nanmin(sparse.gaussian) < 0
+
+
+def test_open_mesh_and_small_radius():
+    """Тест границы открытой поверхности и поиска участков малого радиуса"""
+    sphere = trimesh.creation.icosphere(subdivisions=3, radius=0.2)
+    keep = sphere.triangles_center[:, 2] > -0.1
+    cap = trimesh.Trimesh(sphere.vertices, sphere.faces[keep])
+    result = CurvatureAnalyzer(cap).compute()
+
+    boundary = np.isnan(result.mean)
+    assert boundary.any() and not boundary.all()
+    assert np.array_equal(boundary, np.isnan(result.gaussian))
+
+    summary = result.summary(min_radius=0.5)
+    assert summary["small_radius_vertices"] == summary["vertices"]
+    assert summary["small_radius_fraction"] == pytest.approx(1.0)
+    assert result.summary(min_radius=0.1)["small_radius_vertices"] == 0
+    assert len(result.face_values(result.mean)) == len(cap.faces)
+
+
+def test_cache_by_geometry_version():
+    """Тест кэша: повторный вызов без пересчета, сброс при изменении геометрии"""
+    sphere = trimesh.creation.icosphere(subdivisions=2, radius=1.0)
+    first = mesh_curvature(sphere)
+    assert mesh_curvature(sphere) is first
+
+    sphere.vertices = sphere.vertices * 2.0
+    second = mesh_curvature(sphere)
+    assert second is not first
+    assert np.allclose(second.mean, 0.5, rtol=0.02)
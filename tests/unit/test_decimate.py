@@ -0,0 +1,58 @@
+"""
+Тесты для упрощения mesh кластеризацией вершин
+"""
+
+import numpy as np
+import pytest
+
+pv = pytest.importorskip("pyvista")
+
+from solidflow.geometry.mesh.arrays import mesh_arrays, vertex_normals
+from solidflow.geometry.mesh.decimate import cluster_decimate, decimate_to, lod_pyramid
+
+
+def _sphere():
+    return mesh_arrays(pv.Sphere(radius=10.0, theta_resolution=200, phi_resolution=200))
+
+
+def test_cluster_decimate():
+    """Тест кластеризации: меньше треугольников, форма и соответствие граней сохраняются"""
+    vertices, faces = _sphere()
+    simple, simple_faces, kept = cluster_decimate(vertices, faces, 1.0)
+    assert len(simple_faces) < len(faces) / 4
+    assert len(kept) == len(simple_faces)
+    assert np.all(np.diff(kept) > 0)
+    # Центры ячеек лежат вблизи сферы; вырожденных треугольников нет
+    assert np.allclose(np.linalg.norm(simple, axis=1), 10.0, atol=0.2)
+    assert np.all(simple_faces[:, 0] != simple_faces[:, 1])
+
+
+def test_lod_pyramid():
+    """Тест пирамиды уровней: каждый уровень проще предыдущего, номера граней исходные"""
+    vertices, faces = _sphere()
+    levels = lod_pyramid(vertices, faces, min_faces=2000)
+    counts = [len(level[1]) for level in levels]
+    assert len(levels) >= 2
+    assert counts == sorted(counts, reverse=True)
+    assert counts[0] <= 0.75 * len(faces) and counts[-1] >= 2000
+    assert all(level[2].max() < len(faces) for level in levels)
+
+
+def test_vertex_normals():
+    """Тест нормалей вершин сферы: направлены от центра"""
+    vertices, faces = _sphere()
+    normals = vertex_normals(vertices, faces)
+    radial = vertices / np.linalg.norm(vertices, axis=1, keepdims=True)
+    assert np.all(np.einsum("ij,ij->i", normals, radial) > 0.99)
+
+
+def test_decimate_to():
+    """Тест упрощения до заданного количества треугольников"""
+    vertices, faces = _sphere()
+    simple, simple_faces, kept = decimate_to(vertices, faces, 5000)
+    assert 0 < len(simple_faces) <= 5000
+    assert len(kept) == len(simple_faces)
+    assert np.allclose(np.linalg.norm(simple, axis=1), 10.0, atol=0.5)
+    # Mesh не больше предела не меняется
+    same = decimate_to(vertices, faces, len(faces))
+    assert same[1] is faces or np.array_equal(same[1], faces)
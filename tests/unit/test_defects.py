@@ -0,0 +1,70 @@
+"""
+Тесты для поиска дефектов mesh по граням и ребрам
+"""
+
+import numpy as np
+import pytest
+
+trimesh = pytest.importorskip("trimesh")
+pytest.importorskip("scipy")
+
+from solidflow.analysis.defects import EDGE_DEFECTS, FACE_DEFECTS, DefectAnalyzer
+
+
+def test_clean_box_has_no_defects():
+    """Тест: у замкнутого согласованного куба дефектов нет"""
+    result = DefectAnalyzer(trimesh.creation.box()).analyze()
+    assert not any(result.summary().values())
+    assert len(result.edges) == 0
+    assert not result.face_codes.any()
+
+
+def test_flipped_faces():
+    """Тест: развернутая грань и вывернутая наизнанку модель"""
+    box = trimesh.creation.box()
+    faces = box.faces.copy()
+    faces[3] = faces[3][::-1]
+    result = DefectAnalyzer(trimesh.Trimesh(box.vertices, faces, process=False)).analyze()
+    assert np.flatnonzero(result.flipped).tolist() == [3]
+    assert result.face_codes[3] == FACE_DEFECTS["flipped"]
+
+    # Согласованная, но вывернутая модель отмечается целиком
+    inverted = box.copy()
+    inverted.invert()
+    assert DefectAnalyzer(inverted).analyze().flipped.all()
+
+
+def test_boundary_and_non_manifold_edges():
+    """Тест: отверстие от удаленной грани и ребро с тремя гранями"""
+    box = trimesh.creation.box()
+    open_box = trimesh.Trimesh(box.vertices, box.faces[1:], process=False)
+    result = DefectAnalyzer(open_box).analyze()
+    assert result.summary()["boundary_edges"] == 3
+    assert result.boundary_loops == 1
+    assert not result.flipped.any()
+
+    # Лишний треугольник на ребре куба
+    a, b = box.faces[0][:2]
+    fin = np.vstack([box.vertices, box.vertices[[a, b]].mean(axis=0) + [0.0, 0.0, 2.0]])
+    faces = np.vstack([box.faces, [a, b, len(fin) - 1]])
+    result = DefectAnalyzer(trimesh.Trimesh(fin, faces, process=False)).analyze()
+    kinds = result.edge_kinds
+    assert (kinds == EDGE_DEFECTS["non_manifold"]).sum() == 1
+    assert (kinds == EDGE_DEFECTS["boundary"]).sum() == 2
+
+
+def test_degenerate_and_self_intersecting_faces():
+    """Тест: вырожденная грань и два пересекающихся куба"""
+    box = trimesh.creation.box()
+    vertices = np.vstack([box.vertices, [[2.0, 0.0, 0.0], [3.0, 0.0, 0.0], [4.0, 0.0, 0.0]]])
+    faces = np.vstack([box.faces, [[8, 9, 10]]])
+    result = DefectAnalyzer(trimesh.Trimesh(vertices, faces, process=False)).analyze()
+    assert np.flatnonzero(result.degenerate).tolist() == [12]
+    assert not result.self_intersecting.any()
+
+    shifted = trimesh.creation.box()
+    shifted.apply_translation([0.5, 0.3, 0.2])
+    result = DefectAnalyzer(trimesh.util.concatenate([box, shifted])).analyze()
+    assert result.self_intersecting.any()
+    # Касание по вершинам соседних граней пересечением не считается
+    assert not DefectAnalyzer(trimesh.creation.icosphere(3)).analyze().self_intersecting.any()
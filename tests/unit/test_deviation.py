@@ -0,0 +1,109 @@
+"""
+Тесты для анализа отклонения между моделями
+"""
+
+import numpy as np
+import pytest
+
+trimesh = pytest.importorskip("trimesh")
+pytest.importorskip("scipy")
+
+from solidflow.analysis.deviation import DeviationAnalyzer, sample_surface
+
+
+def _brute_signed(mesh, points):
+    """Отклонение со знаком перебором всех граней"""
+    from trimesh.triangles import closest_point
+
+    result = []
+    for p in points:
+        closest = closest_point(mesh.triangles, np.repeat(p[None], len(mesh.faces), axis=0))
+        dist = np.linalg.norm(closest - p, axis=1)
+        i = np.argmin(dist)
+        side = np.dot(p - closest[i], mesh.face_normals[i])
+        result.append(-dist[i] if side < 0 else dist[i])
+    return np.array(result)
+
+
+def test_scaled_sphere_matches_brute_force():
+    """Тест раздутой и сжатой сферы: знак, величина и совпадение с перебором"""
+    sphere = trimesh.creation.icosphere(subdivisions=3, radius=5.0)
+    inflated = trimesh.Trimesh(sphere.vertices * 1.02, sphere.faces)
+    result = DeviationAnalyzer(sphere, inflated).analyze(samples=300)
+
+    assert np.allclose(result.vertex_distance, 0.1)
+    assert np.all(result.sample_distance > 0)
+    assert np.allclose(
+        result.sample_distance,
+        _brute_signed(sphere, sample_surface(inflated.vertices, inflated.faces, 300)[0]),
+    )
+
+    shrunk = trimesh.Trimesh(sphere.vertices * 0.98, sphere.faces)
+    summary = DeviationAnalyzer(sphere, shrunk).analyze().summary(tolerance=0.05)
+    assert summary["max_outside"] == 0.0
+    # Вершины внутри граненой сферы чуть ближе к ее граням, чем к вершинам
+    assert summary["max_inside"] == pytest.approx(0.1, rel=0.01)
+    assert summary["exceed_fraction"] > 0.9
+
+
+def test_unchanged_surface_and_local_change():
+    """Тест неизмененных участков: нулевое отклонение только вне сдвинутой области"""
+    sphere = trimesh.creation.icosphere(subdivisions=3, radius=5.0)
+    result = DeviationAnalyzer(sphere, sphere.copy()).analyze()
+    assert result.summary()["hausdorff"] == 0.0
+
+    vertices = sphere.vertices.copy()
+    moved = vertices[:, 2] > 4.5
+    vertices[moved] *= 0.96
+    dented = trimesh.Trimesh(vertices, sphere.faces)
+    result = DeviationAnalyzer(sphere, dented).analyze()
+    assert np.all(result.vertex_distance[~moved] == 0.0)
+    assert np.all(result.vertex_distance[moved] < -0.1)
+    assert result.summary()["max_inside"] == pytest.approx(0.2, rel=0.01)
+    # Гистограмма учитывает все точки измененной модели
+    assert result.histogram.sum() == result.summary()["points"]
+    assert len(result.face_values()) == len(sphere.faces)
+
+
+def test_removed_part_found_in_reverse_direction():
+    """Тест удаленной детали: видна только в обратном направлении (Хаусдорф)"""
+    part = trimesh.creation.box(extents=[2, 2, 2])
+    shell = part.copy()
+    shell.apply_translation([10, 0, 0])
+    both = trimesh.util.concatenate([part, shell])
+
+    result = DeviationAnalyzer(both, part).analyze()
+    summary = result.summary()
+    assert summary["forward_max"] == 0.0
+    # Дальняя грань удаленной детали — в 10 мм от ближней грани оставшейся
+    assert summary["reverse_max"] == pytest.approx(10.0)
+    assert summary["hausdorff"] == summary["reverse_max"]
+
+    one_way = DeviationAnalyzer(both, part).analyze(symmetric=False)
+    assert one_way.summary()["hausdorff"] == 0.0
+
+
+def test_sample_surface_uniform_by_area():
+    """Тест случайных точек: на гранях и пропорционально площади"""
+    big = trimesh.creation.box(extents=[4, 4, 4])
+    small = trimesh.creation.box(extents=[1, 1, 1])
+    small.apply_translation([10, 0, 0])
+    mesh = trimesh.util.concatenate([big, small])
+
+    points, faces = sample_surface(mesh.vertices, mesh.faces, 20000, seed=3)
+    assert np.all(np.diff(faces) >= 0)
+    assert np.mean(faces >= len(big.faces)) == pytest.approx(1 / 17, abs=0.01)
+    _, dist, _ = trimesh.proximity.closest_point_naive(mesh, points[:200])
+    assert np.allclose(dist, 0.0, atol=1e-9)
+
+
+def test_surface_distance_threads_match_brute_force():
+    """Тест расстояния до поверхности: потоки VTK не меняют результат"""
+    from solidflow.geometry.spatial.distance import SurfaceDistance
+
+    sphere = trimesh.creation.icosphere(subdivisions=3, radius=5.0)
+    points = np.random.default_rng(1).uniform(-7, 7, size=(200, 3))
+    expected = _brute_signed(sphere, points)
+    for workers in (1, 4):
+        surface = SurfaceDistance(sphere.vertices, sphere.faces, max_workers=workers)
+        np.testing.assert_allclose(surface.signed(points), expected, atol=1e-9)
@@ -0,0 +1,110 @@
+"""
+Тесты для анализа острых кромок
+"""
+
+import numpy as np
+import pytest
+
+trimesh = pytest.importorskip("trimesh")
+pytest.importorskip("pyvista")
+pytest.importorskip("scipy")
+
+from solidflow.analysis.edges import EdgeAnalyzer
+
+
+@pytest.fixture
+def qapp():
+    """Fixture для Qt приложения"""
+    QApplication = pytest.importorskip("PySide6.QtWidgets").QApplication
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    return app
+
+
+def _prism(outline, height, center):
+    """Призма над многоугольником (против часовой стрелки), основания — веером от center"""
+    outline = np.asarray(outline, dtype=float)
+    n = len(outline)
+    vertices = np.vstack(
+        [np.column_stack([outline, np.zeros(n)]), np.column_stack([outline, np.full(n, height)])]
+    )
+    ring = [(center + k) % n for k in range(n)]
+    fan = [(ring[0], ring[k], ring[k + 1]) for k in range(1, n - 1)]
+    faces = [(a, c, b) for a, b, c in fan] + [(a + n, b + n, c + n) for a, b, c in fan]
+    for i in range(n):
+        j = (i + 1) % n
+        faces += [(i, j, j + n), (i, j + n, i + n)]
+    return trimesh.Trimesh(vertices, faces, process=False)
+
+
+def test_box_edges():
+    """Тест куба: 12 кромок по 90°, диагонали граней плоские, STL без общих вершин"""
+    box = trimesh.creation.box(extents=[2, 2, 2])
+    soup = trimesh.Trimesh(box.triangles.reshape(-1, 3), np.arange(36).reshape(-1, 3))
+    result = EdgeAnalyzer(soup).analyze()
+    summary = result.summary()
+
+    assert len(result.vertices) == 8 and len(result.edges) == 18
+    assert summary["feature_edges"] == 12 and summary["concave_edges"] == 0
+    assert summary["feature_length"] == pytest.approx(24.0)
+    assert np.allclose(np.sort(result.dihedral)[:6], 0.0)
+    assert np.allclose(result.vertex_defect, 90.0)
+    # Угол куба не считается острой вершиной
+    assert summary["sharp_clusters"] == 0 and summary["blade_regions"] == 0
+
+
+def test_concave_edge_and_orientation():
+    """Тест вогнутой кромки L-профиля и несогласованной ориентации граней"""
+    profile = _prism([(0, 0), (4, 0), (4, 1), (1, 1), (1, 4), (0, 4)], 2, center=3)
+    result = EdgeAnalyzer(profile).analyze()
+    concave = result.feature_mask & result.concave
+    assert result.summary()["feature_edges"] == 18
+    assert concave.sum() == 1
+    assert np.allclose(result.vertices[result.edges[concave]][:, :, :2], 1.0)
+
+    # Перевернутая грань: излом не меняется
+    faces = profile.faces.copy()
+    faces[5] = faces[5][::-1]
+    flipped = EdgeAnalyzer(trimesh.Trimesh(profile.vertices, faces, process=False)).analyze()
+    assert np.allclose(flipped.dihedral, result.dihedral, equal_nan=True)
+
+
+def test_blade_and_sharp_vertices():
+    """Тест тонкого клина (лезвие) и острия конуса"""
+    wedge = _prism([(0, 0), (10, 0), (0, 0.5)], 3, center=0)
+    result = EdgeAnalyzer(wedge).analyze()
+    summary = result.summary()
+    assert summary["blade_regions"] == 1
+    assert summary["blade_length"] == pytest.approx(3.0)
+    assert summary["max_dihedral"] > 170.0
+    # Вершины лезвия сверху и снизу — один кластер
+    assert summary["sharp_clusters"] == 1 and summary["sharp_vertices"] == 2
+
+    cone = trimesh.creation.cone(radius=0.5, height=5, sections=32)
+    result = EdgeAnalyzer(cone, sharp_angle=60.0).analyze()
+    assert np.allclose(result.sharp_points, [[0, 0, 5]])
+    assert result.summary()["blade_regions"] == 0
+
+
+def test_viewport_edge_overlay(qapp):
+    """Тест линий ребер поверх модели без перестроения actor модели"""
+    pytest.importorskip("pyvistaqt")
+    import pyvista as pv
+
+    from solidflow.gui.viewport.viewport3d import Viewport3D
+
+    viewport = Viewport3D()
+    viewport.load_mesh(pv.Cube().triangulate())
+    actor = viewport.current_actor
+
+    result = EdgeAnalyzer(viewport.current_mesh).analyze()
+    feature = result.feature_mask
+    viewport.show_edge_scalars(
+        result.vertices, result.edges[feature], result.dihedral[feature], "Излом, °"
+    )
+    assert viewport.has_edge_scalars()
+    assert viewport.current_actor is actor
+
+    viewport.load_mesh(pv.Sphere())
+    assert not viewport.has_edge_scalars()
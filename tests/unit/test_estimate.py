@@ -0,0 +1,95 @@
+"""
+Тесты для оценки времени печати и расхода материала
+"""
+
+import numpy as np
+import pytest
+
+trimesh = pytest.importorskip("trimesh")
+pytest.importorskip("pyvista")
+
+from solidflow.analysis.estimate import FDMProfile, PrintEstimator, ResinProfile, move_time
+
+
+@pytest.fixture
+def qapp():
+    """Fixture для Qt приложения"""
+    QApplication = pytest.importorskip("PySide6.QtWidgets").QApplication
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    return app
+
+
+def _estimator():
+    """Куб 20 x 20 x 10 на столе"""
+    box = trimesh.creation.box(extents=[20, 20, 10])
+    box.apply_translation([0, 0, 5])
+    return PrintEstimator.from_mesh(box)
+
+
+def test_move_time():
+    """Тест времени перемещений с ограничением ускорения"""
+    # Разгон до 100 мм/с на 1000 мм/с² занимает 5 мм: длинное перемещение
+    assert move_time(100.0, 1, 100.0, 1000.0) == pytest.approx(1.0 + 0.1)
+    # Короткое перемещение не успевает разогнаться
+    assert move_time(4.0, 2, 100.0, 1000.0) == pytest.approx(2 * 2 * np.sqrt(2.0 / 1000.0))
+    assert move_time(0.0, 0, 100.0, 1000.0) == 0.0
+    assert move_time(50.0, 1, 100.0, 0.0) == pytest.approx(0.5)
+
+
+def test_fdm_estimate():
+    """Тест оценки FDM: объем, длина нити, влияние заполнения и толщины слоя"""
+    estimator = _estimator()
+
+    full = estimator.estimate(FDMProfile(infill_density=1.0))
+    assert full.layers == 50
+    assert full.volume == pytest.approx(4000.0, rel=1e-6)
+    area = np.pi * (1.75 / 2) ** 2
+    assert full.filament_length == pytest.approx(full.volume / area)
+    assert full.mass == pytest.approx(4.0 * 1.24, rel=1e-6)
+
+    sparse = estimator.estimate(FDMProfile(infill_density=0.2))
+    assert sparse.volume < full.volume
+    assert sparse.time < full.time
+
+    # Другая толщина слоя — без повторного построения сечений
+    fine = estimator.estimate(FDMProfile(layer_height=0.1))
+    assert fine.layers == 100
+    assert fine.time > sparse.time
+
+    with pytest.raises(ValueError):
+        estimator.estimate(FDMProfile(infill_density=2.0))
+
+
+def test_resin_estimate():
+    """Тест оценки фотополимерной печати"""
+    profile = ResinProfile(layer_height=0.1, bottom_layers=3)
+    estimate = _estimator().estimate(profile)
+
+    lift = profile.lift_distance / profile.lift_speed + profile.lift_distance / 3.0
+    expected = 3 * profile.bottom_exposure_time + 97 * profile.exposure_time + 100 * lift
+    assert estimate.layers == 100
+    assert estimate.time == pytest.approx(expected)
+    assert estimate.volume == pytest.approx(4000.0, rel=1e-6)
+    assert estimate.filament_length == 0.0
+
+
+def test_estimate_dialog_recalculates(qapp):
+    """Тест пересчета оценки в диалоге при изменении параметров"""
+    pytest.importorskip("PySide6")
+    from solidflow.gui.widgets.print_estimate import PrintEstimateDialog, format_duration
+
+    dialog = PrintEstimateDialog(_estimator())
+    before = dialog.result_label.text()
+    assert "Время печати" in before and "Длина нити" in before
+
+    dialog._editors[0]["infill_density"].setValue(1.0)
+    assert dialog.profile().infill_density == 1.0
+    assert dialog.result_label.text() != before
+
+    dialog.technology_combo.setCurrentIndex(1)
+    assert isinstance(dialog.profile(), ResinProfile)
+    assert "Длина нити" not in dialog.result_label.text()
+
+    assert format_duration(3900) == "1 ч 05 мин"
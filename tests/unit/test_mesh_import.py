@@ -0,0 +1,174 @@
+"""
+Тесты для импорта mesh из OBJ и PLY
+"""
+
+import numpy as np
+import pytest
+
+from solidflow.core.cache import MeshCache
+from solidflow.geometry.mesh import importer as importer_module
+from solidflow.geometry.mesh.arrays import weld_vertices
+from solidflow.geometry.mesh.importer import MeshImporter, STLImporter
+from solidflow.geometry.mesh.obj import parse_obj
+
+CUBE_OBJ = b"""# cube
+o cube
+v 0 0 0
+v 1 0 0
+v 1 1 0
+v 0 1 0
+vt 0 0
+vn 0 0 1
+f 1/1/1 4/1/1 3/1/1 2/1/1
+v 0 0 1
+v 1 0 1
+v 1 1 1
+v 0 1 1
+f -4//1 -3//1 -2//1 -1//1
+f 1 2 6 5
+f 2 3 7 6
+s off
+f 3 4 8 7
+f 4 1 5 8
+"""
+
+
+def _write_ply_mesh(path, vertices, polygons, fmt="binary_little_endian"):
+    """Записать mesh (вершины float32, многоугольники) в PLY"""
+    header = [
+        "ply",
+        f"format {fmt} 1.0",
+        f"element vertex {len(vertices)}",
+        "property float x",
+        "property float y",
+        "property float z",
+        f"element face {len(polygons)}",
+        "property list uchar int vertex_indices",
+        "end_header",
+    ]
+    with open(path, "wb") as f:
+        f.write(("\n".join(header) + "\n").encode("ascii"))
+        if fmt == "ascii":
+            for v in vertices:
+                f.write(("%.9g %.9g %.9g\n" % tuple(v)).encode("ascii"))
+            for p in polygons:
+                f.write((" ".join(map(str, [len(p), *p])) + "\n").encode("ascii"))
+        else:
+            order = ">" if fmt == "binary_big_endian" else "<"
+            f.write(np.asarray(vertices, dtype=order + "f4").tobytes())
+            for p in polygons:
+                f.write(np.uint8(len(p)).tobytes() + np.asarray(p, dtype=order + "i4").tobytes())
+
+
+def test_parse_obj():
+    """Тест разбора OBJ: четырехугольники, отрицательные номера и ссылки v/vt/vn"""
+    vertices, faces = parse_obj(CUBE_OBJ)
+    assert vertices.shape == (8, 3)
+    assert faces.shape == (12, 3)
+    assert faces.tolist()[:4] == [[0, 3, 2], [0, 2, 1], [4, 5, 6], [4, 6, 7]]
+
+    with pytest.raises(ValueError):
+        parse_obj(b"v 0 0 0\nv 1 0 0\nv 0 1 0\nf 1 2 5\n")
+    with pytest.raises(ValueError):
+        parse_obj(b"v 0 0 0\n")
+
+
+def test_parse_obj_inline_comments():
+    """Тест OBJ с комментариями в конце строк вершин и граней v/vt/vn"""
+    data = (
+        b"# quad\n"
+        b"v 0 0 0 # origin\n"
+        b"v 1 0 0\n"
+        b"v 1 1 0 #corner\n"
+        b"v 0 1 0\n"
+        b"vt 0 0\n"
+        b"vn 0 0 1 # up\n"
+        b"f 1/1/1 2/1/1 3/1/1 # tri\n"
+        b"f 1//1 3//1 4//1#tri\n"
+    )
+    vertices, faces = parse_obj(data)
+    assert vertices.shape == (4, 3)
+    assert vertices[2].tolist() == [1.0, 1.0, 0.0]
+    assert faces.tolist() == [[0, 1, 2], [0, 2, 3]]
+
+
+def test_ply_mesh_formats(tmp_path):
+    """Тест PLY: двоичный и текстовый форматы, смешанные многоугольники"""
+    vertices = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [0.5, 0.5, 1]])
+    polygons = [[0, 3, 2, 1], [0, 1, 4], [1, 2, 4], [2, 3, 4], [3, 0, 4]]
+    cache = MeshCache(tmp_path / "cache")
+    for fmt in ("binary_little_endian", "binary_big_endian", "ascii"):
+        path = tmp_path / f"{fmt}.ply"
+        _write_ply_mesh(path, vertices, polygons, fmt=fmt)
+        mesh = MeshImporter.load(path, cache=cache)
+        assert mesh.n_points == 5
+        assert mesh.n_cells == 6 and mesh.is_all_triangles
+        assert np.allclose(mesh.points, vertices)
+
+
+def test_weld_vertices():
+    """Тест объединения вершин: порядок первого появления, -0.0 равен 0.0"""
+    vertices = np.array([[1, 0, 0], [0, 0, 0], [1, 0, 0], [-0.0, 0, 0], [0, 1, 0], [0, 1, 0]])
+    faces = np.array([[0, 1, 4], [2, 3, 5]])
+    welded, remapped = weld_vertices(vertices, faces)
+    assert welded.tolist() == [[1, 0, 0], [0, 0, 0], [0, 1, 0]]
+    assert remapped.tolist() == [[0, 1, 2], [0, 1, 2]]
+
+
+def test_weld_vertices_round_coordinates():
+    """Тест объединения треугольного супа с круглыми координатами (как у STL куба)"""
+    corners = np.array(np.meshgrid([-2.0, 2.0], [-1.0, 1.0], [-3.0, 3.0])).reshape(3, -1).T
+    rng = np.random.default_rng(0)
+    vertices = corners[rng.integers(0, 8, size=60)]
+    welded, remapped = weld_vertices(vertices, np.arange(60).reshape(-1, 3))
+    assert len(welded) == len(np.unique(vertices, axis=0)) == 8
+    assert np.array_equal(welded[remapped].reshape(-1, 3), vertices)
+
+
+def test_weld_vertices_tolerance():
+    """Тест объединения с допуском: узлы общего ребра с погрешностью, ребра сетки целы"""
+    vertices = np.array(
+        [[0, 0, 0], [1, 0, 0], [0, 1, 0], [1 + 1e-7, 0, 0], [1e-7, 1, 0], [1, 1, 0]]
+    )
+    faces = np.array([[0, 1, 2], [3, 5, 4]])
+    assert len(weld_vertices(vertices, faces)[0]) == 6
+
+    welded, remapped = weld_vertices(vertices, faces, tolerance=1e-5)
+    assert welded.tolist() == [[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 1, 0]]
+    assert remapped.tolist() == [[0, 1, 2], [1, 3, 2]]
+
+
+def test_weld_tolerance_does_not_chain():
+    """Тест допуска: цепочка близких узлов не стягивается в одну вершину"""
+    vertices = np.array([[0.0, 0, 0], [0.6, 0, 0], [1.2, 0, 0], [1.8, 0, 0], [0, 5, 0]])
+    faces = np.array([[0, 1, 4], [2, 3, 4]])
+
+    welded, remapped = weld_vertices(vertices, faces, tolerance=1.0)
+    # Каждая вершина не дальше допуска от своего представителя
+    assert welded.tolist() == [[0, 0, 0], [1.2, 0, 0], [0, 5, 0]]
+    assert remapped.tolist() == [[0, 0, 2], [1, 1, 2]]
+
+
+def test_import_cache(tmp_path, monkeypatch):
+    """Тест кэша импорта: повторная загрузка не разбирает файл"""
+    path = tmp_path / "cube.obj"
+    path.write_bytes(CUBE_OBJ)
+    cache = MeshCache(tmp_path / "cache")
+    mesh = MeshImporter.load(path, cache=cache)
+    assert mesh.n_points == 8 and mesh.n_cells == 12
+
+    def fail(data):
+        raise AssertionError("файл разобран повторно")
+
+    monkeypatch.setattr(importer_module, "parse_obj", fail)
+    cached = MeshImporter.load(path, cache=cache)
+    assert np.array_equal(cached.points, mesh.points)
+    assert np.array_equal(cached.faces, mesh.faces)
+
+    with pytest.raises(ValueError):
+        MeshImporter.load(tmp_path / "model.3mf")
+    with pytest.raises(FileNotFoundError):
+        MeshImporter.load(tmp_path / "missing.obj")
+    # Пакетная загрузка STL не принимает другие форматы
+    with pytest.raises(ValueError):
+        STLImporter.load_many([path])
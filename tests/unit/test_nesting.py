@@ -0,0 +1,90 @@
+"""
+Тесты для раскладки деталей на столе
+"""
+
+import numpy as np
+import pytest
+
+trimesh = pytest.importorskip("trimesh")
+pytest.importorskip("pyvista")
+pytest.importorskip("scipy")
+
+from solidflow.geometry.nesting.nester import PlateNester, skyline_pack
+
+
+def _plate(count, seed=0):
+    """Разбросанные в пространстве коробки и цилиндры, повернутые вокруг Z"""
+    rng = np.random.default_rng(seed)
+    parts = []
+    for i in range(count):
+        if i % 2:
+            part = trimesh.creation.box(extents=rng.uniform([4, 2, 1], [20, 10, 8]))
+        else:
+            part = trimesh.creation.cylinder(radius=rng.uniform(2, 6), height=4, sections=24)
+        angle = rng.uniform(0, 2 * np.pi)
+        part.apply_transform(trimesh.transformations.rotation_matrix(angle, [0, 0, 1]))
+        part.apply_translation(rng.uniform(-300, 300, 3))
+        parts.append(part)
+    return trimesh.util.concatenate(parts)
+
+
+def test_skyline_pack():
+    """Тест укладки прямоугольников без наложений и выбора поворота"""
+    positions, chosen = skyline_pack([[(6, 4)], [(4, 4)], [(10, 2), (2, 10)]], 10)
+    assert np.allclose(positions[:2], [[0, 0], [6, 0]])
+    # Полоса 10 x 2 ложится сверху плашмя, а не стоймя
+    assert chosen[2] == 0 and np.allclose(positions[2], [0, 4])
+
+    with pytest.raises(ValueError):
+        skyline_pack([[(12, 1)]], 10)
+
+
+def test_parts_do_not_overlap():
+    """Тест: детали на столе, в пределах ширины и с зазором между габаритами"""
+    mesh = _plate(60)
+    result = PlateNester(mesh, plate=(120, 200), spacing=1.5).nest()
+    assert len(result.parts) == 60
+
+    nested = result.mesh
+    assert nested.n_cells == len(mesh.faces)
+    assert np.isclose(nested.bounds[4], 0.0)
+
+    vertices = np.asarray(nested.points)
+    faces = np.asarray(nested.faces).reshape(-1, 4)[:, 1:]
+    boxes, offset = [], 0
+    for face_ids in result.parts:
+        points = vertices[faces[offset : offset + len(face_ids)].ravel()]
+        boxes.append((points[:, :2].min(axis=0), points[:, :2].max(axis=0)))
+        offset += len(face_ids)
+    for lo, hi in boxes:
+        assert lo.min() > -1e-6 and hi[0] < 120 + 1e-6
+    for i in range(len(boxes)):
+        for j in range(i):
+            gap = np.maximum(boxes[j][0] - boxes[i][1], boxes[i][0] - boxes[j][1]).max()
+            assert gap > 1.5 - 1e-6
+
+    summary = result.summary()
+    assert summary["fits"] and 0 < summary["utilization"] <= 1
+
+
+def test_rotation_to_minimal_footprint():
+    """Тест: длинная деталь под углом разворачивается вдоль оси"""
+    bar = trimesh.creation.box(extents=[100, 4, 3])
+    bar.apply_transform(trimesh.transformations.rotation_matrix(np.radians(30), [0, 0, 1]))
+    result = PlateNester(bar, plate=(110, 50), spacing=0).nest()
+    assert result.fits
+    assert result.used_depth == pytest.approx(4.0, abs=1e-6)
+
+
+def test_inner_shell_moves_with_part():
+    """Тест: внутренняя оболочка полой детали остается внутри нее"""
+    outer = trimesh.creation.box(extents=[20, 20, 20])
+    inner = trimesh.creation.box(extents=[10, 10, 10])
+    inner.invert()
+    hollow = trimesh.util.concatenate([outer, inner])
+    hollow.apply_translation([50, -30, 7])
+    result = PlateNester(hollow, plate=(100, 100)).nest()
+    assert len(result.parts) == 1
+
+    bounds = result.mesh.bounds
+    assert np.allclose([bounds[1] - bounds[0], bounds[5] - bounds[4]], 20)
@@ -0,0 +1,107 @@
+"""
+Тесты для отрисовки миниатюр вне экрана
+"""
+
+import numpy as np
+import pytest
+
+pv = pytest.importorskip("pyvista")
+
+from solidflow.core.cache import MeshCache
+from solidflow.geometry.mesh.importer import MeshImporter
+from solidflow.gui.viewport.offscreen import ThumbnailRenderer, main, render_thumbnails
+
+
+@pytest.fixture
+def renderer(tmp_path):
+    renderer = ThumbnailRenderer(size=64, max_faces=2000, cache=MeshCache(tmp_path / "cache"))
+    yield renderer
+    renderer.close()
+
+
+def test_render_views(renderer):
+    """Тест отрисовки: по изображению на вид, виды различаются, модель упрощена"""
+    mesh = pv.Cylinder(resolution=60).triangulate().subdivide(2)
+    assert mesh.n_cells > 2000
+    data = renderer.prepare(mesh)
+    assert data.n_cells <= 2000
+
+    images = renderer.render(data, ["iso", "top", "side"])
+    assert list(images) == ["iso", "top", "side"]
+    for image in images.values():
+        assert image.shape == (64, 64, 3)
+        assert image.dtype == np.uint8
+    assert not np.array_equal(images["iso"], images["top"])
+    assert not np.array_equal(images["top"], images["side"])
+
+    with pytest.raises(ValueError):
+        renderer.render(data, ["bottom"])
+
+
+def test_render_face_values(renderer):
+    """Тест изображения отчета: раскраска значениями на гранях, затем снова без нее"""
+    mesh = pv.Sphere(theta_resolution=30, phi_resolution=30)
+    plain = renderer.render(mesh, ["iso"])["iso"]
+    values = mesh.cell_centers().points[:, 2]
+    colored = renderer.render(mesh, ["iso"], face_values=values)["iso"]
+    assert not np.array_equal(plain, colored)
+    assert np.array_equal(renderer.render(mesh, ["iso"])["iso"], plain)
+
+
+def test_render_file_cache(renderer, tmp_path, monkeypatch):
+    """Тест отрисовки файла: PNG по видам, в кэше только упрощенная копия"""
+    path = tmp_path / "part.ply"
+    pv.Sphere(theta_resolution=60, phi_resolution=60).save(path)
+
+    written = renderer.render_file(path, tmp_path / "out", ["iso", "front"])
+    assert [p.name for p in written] == ["part-iso.png", "part-front.png"]
+    assert all(p.stat().st_size > 0 for p in written)
+    image = pv.read(written[0])
+    assert tuple(image.dimensions[:2]) == (64, 64)
+
+    assert len(list((tmp_path / "cache" / "thumbnail").glob("*.npz"))) == 1
+    assert not (tmp_path / "cache" / "import").exists()
+
+    # Повторная загрузка не разбирает файл
+    def fail(*args, **kwargs):
+        raise AssertionError("файл разбирается повторно")
+
+    monkeypatch.setattr(MeshImporter, "load", fail)
+    assert renderer.load(path).n_cells <= 2000
+
+
+def test_render_thumbnails_errors(tmp_path):
+    """Тест пакетной отрисовки: ошибка одного файла не прерывает пакет"""
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"part{i}.stl"
+        pv.Cube(center=(i, 0, 0)).triangulate().save(path)
+        paths.append(path)
+    paths.insert(1, tmp_path / "missing.stl")
+
+    progress = []
+    results = render_thumbnails(
+        paths, tmp_path / "out", size=32, max_workers=1, progress=progress.append
+    )
+    assert [r["file"] for r in results] == [str(p) for p in paths]
+    assert results[1]["error"] and not results[1]["images"]
+    assert all(
+        r["error"] is None and len(r["images"]) == 1 for i, r in enumerate(results) if i != 1
+    )
+    assert progress[-1] == 100
+
+
+def test_thumbnails_cli_exit_code(tmp_path, capsys):
+    """Тест командной строки: ошибки в stderr, код 1 при любом неотрисованном файле"""
+    path = tmp_path / "part.stl"
+    pv.Cube().triangulate().save(path)
+    out = str(tmp_path / "out")
+
+    assert main([str(path), "-o", out, "--size", "32", "--views", "iso", "--workers", "1"]) == 0
+    assert (tmp_path / "out" / "part-iso.png").exists()
+
+    missing = tmp_path / "missing.stl"
+    args = [str(path), str(missing), "-o", out, "--size", "32", "--views", "iso", "--workers", "1"]
+    assert main(args) == 1
+    captured = capsys.readouterr()
+    assert str(missing) in captured.err and str(missing) not in captured.out
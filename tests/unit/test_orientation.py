@@ -0,0 +1,117 @@
+"""
+Тесты для подбора ориентации
+"""
+
+import numpy as np
+import pytest
+
+trimesh = pytest.importorskip("trimesh")
+pytest.importorskip("pyvista")
+pytest.importorskip("scipy")
+
+from solidflow.analysis.orientation import (
+    OrientationOptimizer,
+    OrientationWeights,
+    fibonacci_sphere,
+    orient_mesh,
+    pareto_front,
+    rotation_to_z,
+)
+from solidflow.analysis.overhang import OverhangAnalyzer
+
+
+def _bracket():
+    """Г-образный кронштейн, повернутый произвольно"""
+    base = trimesh.creation.box(extents=[20, 10, 2])
+    wall = trimesh.creation.box(extents=[2, 10, 15])
+    wall.apply_translation([9, 0, 8.5])
+    mesh = trimesh.util.concatenate([base, wall])
+    mesh.apply_transform(trimesh.transformations.rotation_matrix(0.7, [1, 1, 0]))
+    return mesh
+
+
+def test_rotation_and_orient_mesh():
+    """Тест поворота направления построения в ось Z"""
+    directions = fibonacci_sphere(50)
+    assert np.allclose(np.linalg.norm(directions, axis=1), 1.0)
+
+    for d in np.vstack([directions, [[0, 0, 1], [0, 0, -1]]]):
+        R = rotation_to_z(d)
+        assert np.allclose(R @ d, [0, 0, 1])
+        assert np.allclose(R @ R.T, np.eye(3))
+
+    oriented = orient_mesh(trimesh.creation.box(extents=[1, 2, 3]), [0, 1, 0])
+    bounds = np.array(oriented.bounds)
+    assert bounds[4] == pytest.approx(0.0)
+    assert bounds[5] - bounds[4] == pytest.approx(2.0)
+
+
+def test_metrics_match_brute_force():
+    """Тест пакетных метрик против прямого расчета по граням"""
+    mesh = _bracket()
+    optimizer = OrientationOptimizer(mesh)
+    directions = fibonacci_sphere(40)
+    metrics = optimizer.evaluate(directions)
+
+    expected_support = OverhangAnalyzer(mesh).support_areas(directions)
+    assert np.allclose(metrics["support_area"], expected_support)
+
+    heights = mesh.vertices @ directions.T
+    assert np.allclose(metrics["build_height"], np.ptp(heights, axis=0))
+
+    cosines = mesh.face_normals @ directions.T
+    lift = mesh.triangles_center @ directions.T - heights.min(axis=0)
+    overhang = cosines < optimizer.threshold
+    volume = (mesh.area_faces[:, None] * np.where(overhang, -cosines * lift, 0.0)).sum(axis=0)
+    assert np.allclose(metrics["overhang_volume"], volume)
+
+    box = OrientationOptimizer(trimesh.creation.box(extents=[20, 10, 2]))
+    assert box.evaluate([0, 0, 1])["footprint"][0] == pytest.approx(200.0)
+
+
+def test_optimize_lays_bracket_flat():
+    """Тест: лучшая ориентация кронштейна — основанием на стол, без поддержек"""
+    mesh = _bracket()
+    result = OrientationOptimizer(mesh).optimize(n_samples=500)
+    best = result.candidate(result.best_index)
+
+    assert best["support_area"] == pytest.approx(0.0, abs=1e-6)
+    assert OverhangAnalyzer(mesh).analyze(result.best_direction).support_area == pytest.approx(0.0)
+    # Лучшая по взвешенной оценке ориентация лежит на фронте Парето
+    assert result.scores[result.pareto].min() == pytest.approx(result.scores[result.best_index])
+
+    # Только высота построения: кронштейн ложится на бок толщиной 10
+    weights = OrientationWeights(support_area=0, build_height=1, footprint=0, overhang_volume=0)
+    low = OrientationOptimizer(mesh, weights=weights).optimize(n_samples=500)
+    assert low.metrics["build_height"][low.best_index] == pytest.approx(10.0, abs=1e-3)
+
+
+def test_pareto_front_matches_brute_force():
+    """Тест фронта Парето против попарного сравнения"""
+    values = np.random.default_rng(0).random((300, 3))
+    expected = [
+        i
+        for i in range(len(values))
+        if not np.any(np.all(values <= values[i], axis=1) & np.any(values < values[i], axis=1))
+    ]
+    assert list(pareto_front(values, chunk=32)) == expected
+
+
+def test_reduced_hull_matches_exact(monkeypatch):
+    """Тест прореженной оболочки: метрики близки к точным, опорные участки те же"""
+    sphere = trimesh.creation.icosphere(subdivisions=4, radius=10.0)
+    sphere.apply_translation([0, 0, 10])
+    mesh = trimesh.util.concatenate([sphere, _bracket()])
+    directions = fibonacci_sphere(200)
+    exact = OrientationOptimizer(mesh)
+
+    monkeypatch.setattr(OrientationOptimizer, "HULL_INPUT_POINTS", 0)
+    monkeypatch.setattr(OrientationOptimizer, "HULL_GRID", 32)
+    reduced = OrientationOptimizer(mesh)
+    assert len(reduced._hull_points) < len(exact._hull_points)
+    assert np.array_equal(reduced._patch_supporting, exact._patch_supporting)
+
+    expected = exact.evaluate(directions)
+    metrics = reduced.evaluate(directions)
+    for name in ("build_height", "footprint"):
+        assert np.allclose(metrics[name], expected[name], rtol=0.01)
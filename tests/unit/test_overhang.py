@@ -0,0 +1,95 @@
+"""
+Тесты для анализа нависаний
+"""
+
+import numpy as np
+import pytest
+
+trimesh = pytest.importorskip("trimesh")
+pytest.importorskip("pyvista")
+pytest.importorskip("scipy")
+
+from solidflow.analysis.overhang import OverhangAnalyzer
+
+
+def _block():
+    """Брусок 4 x 2 x 1 на столе"""
+    box = trimesh.creation.box(extents=[4, 2, 1])
+    box.apply_translation([0, 0, 0.5])
+    return box
+
+
+def _tilted(angle):
+    """Направление построения, отклоненное от оси z к оси y"""
+    angle = np.radians(angle)
+    return np.array([0.0, np.sin(angle), np.cos(angle)])
+
+
+def test_block_on_plate_needs_no_support():
+    """Тест бруска на столе: нижняя грань лежит на столе"""
+    result = OverhangAnalyzer(_block()).analyze()
+
+    assert not result.needs_support
+    assert result.support_area == 0.0
+    assert len(result.unsupported_points) == 0
+
+
+def test_critical_angle_classification():
+    """Тест классификации граней по критическому углу"""
+    analyzer = OverhangAnalyzer(_block(), critical_angle=45.0)
+
+    # Наклон 30°: нижняя грань обращена вниз круче критического угла
+    assert analyzer.analyze(_tilted(30)).support_area == pytest.approx(8.0)
+    # Наклон 60°: нижняя грань уже достаточно крутая, нависает боковая
+    assert analyzer.analyze(_tilted(60)).support_area == pytest.approx(4.0)
+    # Критический угол 70° — обе ориентации без поддержек
+    assert OverhangAnalyzer(_block(), critical_angle=70.0).analyze(_tilted(60)).support_area == 0
+
+
+def test_batched_directions_match_single():
+    """Тест пакетного расчета для множества направлений"""
+    analyzer = OverhangAnalyzer(trimesh.creation.icosphere(subdivisions=2))
+    directions = np.random.default_rng(0).normal(size=(50, 3))
+    analyzer.MAX_ELEMENTS = 1000  # несколько пакетов
+
+    areas = analyzer.support_areas(directions)
+    masks = analyzer.overhang_masks(directions[:3])
+
+    for i in range(3):
+        single = analyzer.analyze(directions[i])
+        assert areas[i] == pytest.approx(single.support_area)
+        assert np.array_equal(masks[i], single.overhang_mask)
+
+
+def test_floating_part_lowest_region():
+    """Тест области, начинающейся в воздухе"""
+    pillar = trimesh.creation.box(extents=[2, 2, 10])
+    pillar.apply_translation([0, 0, 5])
+    cap = trimesh.creation.box(extents=[10, 10, 2])
+    cap.apply_translation([0, 0, 11])
+    mesh = trimesh.util.concatenate([pillar, cap])
+
+    result = OverhangAnalyzer(mesh).analyze()
+
+    assert result.support_area == pytest.approx(100.0)
+    assert len(result.unsupported_points) == 1
+    assert result.unsupported_points[0][2] == pytest.approx(10.0)
+    # Область — четыре нижние вершины крышки
+    assert np.allclose(mesh.vertices[result.unsupported_vertices[0]][:, 2], 10.0)
+    assert len(result.unsupported_vertices[0]) == 4
+
+
+def test_dented_top_is_not_unsupported():
+    """Тест вмятины на верхней грани: локальный минимум, но не область в воздухе"""
+    pv = pytest.importorskip("pyvista")
+    box = pv.Box(level=4).triangulate()
+    box.points[:, 2] += 1.0
+    top = np.flatnonzero(np.isclose(box.points[:, 2], 2.0))
+    # Внутренняя вершина верхней грани
+    inner = top[np.argmin(np.abs(box.points[top, :2]).sum(axis=1))]
+    box.points[inner, 2] -= 0.1
+
+    result = OverhangAnalyzer(box).analyze()
+    assert result.summary()["overhang_faces"] == 0
+    assert len(result.unsupported_points) == 0
+    assert not result.needs_support
@@ -0,0 +1,119 @@
+"""
+Тесты для облаков точек: импорт PLY, прореживание и октодерево
+"""
+
+import numpy as np
+import pytest
+
+from solidflow.geometry.pointcloud import cloud as cloud_module
+from solidflow.geometry.pointcloud.cloud import PointCloud, voxel_downsample
+from solidflow.geometry.pointcloud.importer import PointCloudImporter
+from solidflow.geometry.pointcloud.octree import PointOctree, morton_codes
+
+
+def _write_ply(path, records, fmt="binary_little_endian", extra=""):
+    """Записать вершины (массив записей) в PLY"""
+    types = {"f4": "float", "f8": "double", "u1": "uchar", "i4": "int"}
+    lines = ["ply", f"format {fmt} 1.0", "comment test", f"element vertex {len(records)}"]
+    for name in records.dtype.names:
+        lines.append(f"property {types[records.dtype[name].str[1:]]} {name}")
+    if extra:
+        lines.append(extra.rstrip("\n"))
+    lines.append("end_header")
+    with open(path, "wb") as f:
+        f.write(("\n".join(lines) + "\n").encode("ascii"))
+        if fmt == "ascii":
+            np.savetxt(f, [list(r) for r in records.tolist()], fmt="%.9g")
+        else:
+            records.tofile(f)
+
+
+def test_binary_ply_zero_copy(tmp_path):
+    """Тест: координаты и цвета двоичного PLY — представления файла без копирования"""
+    rng = np.random.default_rng(0)
+    dtype = np.dtype(
+        [("x", "<f4"), ("y", "<f4"), ("z", "<f4"), ("red", "u1"), ("green", "u1"), ("blue", "u1")]
+    )
+    records = np.zeros(1000, dtype=dtype)
+    xyz = rng.uniform(-5, 5, (1000, 3)).astype(np.float32)
+    rgb = rng.integers(0, 256, (1000, 3)).astype(np.uint8)
+    for k, name in enumerate(dtype.names):
+        records[name] = (xyz if k < 3 else rgb)[:, k % 3]
+    path = tmp_path / "cloud.ply"
+    _write_ply(path, records, extra="element face 0\nproperty list uchar int vertex_indices\n")
+
+    cloud = PointCloudImporter.load(path)
+    assert cloud.n_points == 1000
+    assert not cloud.points.flags.owndata and isinstance(cloud.points.base, np.memmap)
+    assert np.array_equal(cloud.points, xyz)
+    assert np.array_equal(cloud.colors, rgb)
+    assert cloud.normals is None
+
+    # Обратный порядок байт и текстовый формат дают те же точки
+    big = tmp_path / "big.ply"
+    _write_ply(big, records.astype(dtype.newbyteorder(">")), fmt="binary_big_endian")
+    assert np.array_equal(PointCloudImporter.load(big).points, xyz)
+    text = tmp_path / "text.ply"
+    _write_ply(text, records, fmt="ascii")
+    assert np.allclose(PointCloudImporter.load(text).points, xyz)
+
+
+def test_invalid_ply(tmp_path):
+    """Тест ошибок импорта"""
+    path = tmp_path / "bad.ply"
+    path.write_bytes(b"solid cube\nendsolid\n")
+    with pytest.raises(ValueError):
+        PointCloudImporter.load(path)
+
+    records = np.zeros(10, dtype=[("x", "<f4"), ("y", "<f4"), ("z", "<f4")])
+    truncated = tmp_path / "truncated.ply"
+    _write_ply(truncated, records)
+    truncated.write_bytes(truncated.read_bytes()[:-6])
+    with pytest.raises(ValueError):
+        PointCloudImporter.load(truncated)
+    with pytest.raises(FileNotFoundError):
+        PointCloudImporter.load(tmp_path / "missing.ply")
+
+
+def test_voxel_downsample(monkeypatch):
+    """Тест прореживания: центр масс каждой ячейки, в том числе по нескольким порциям"""
+    rng = np.random.default_rng(1)
+    points = rng.uniform(0, 10, (20000, 3))
+    colors = rng.integers(0, 256, (20000, 3)).astype(np.uint8)
+
+    expected_cells = np.unique(np.floor(points).astype(np.int64), axis=0)
+    # Порции по 3000 точек и два потока — тот же результат, что и одной порцией
+    monkeypatch.setattr(cloud_module, "CHUNK_POINTS", 3000)
+    means, mean_colors, counts = voxel_downsample(
+        points, 1.0, colors, origin=np.zeros(3), max_workers=2
+    )
+    assert len(means) == len(expected_cells)
+    assert counts.sum() == len(points)
+    assert np.array_equal(np.unique(np.floor(means).astype(np.int64), axis=0), expected_cells)
+
+    cell = np.all(np.floor(points).astype(np.int64) == [3, 4, 5], axis=1)
+    index = np.flatnonzero(np.all(np.floor(means) == [3, 4, 5], axis=1))[0]
+    assert np.allclose(means[index], points[cell].mean(axis=0))
+    assert np.allclose(mean_colors[index], colors[cell].mean(axis=0), atol=0.5)
+
+
+def test_octree_levels():
+    """Тест уровней детализации октодерева"""
+    codes = morton_codes(np.array([[1, 0, 0], [0, 1, 0], [0, 0, 1], [3, 3, 3]]))
+    assert codes.tolist() == [4, 2, 1, 63]
+
+    rng = np.random.default_rng(2)
+    direction = rng.normal(size=(50000, 3))
+    points = 10 * direction / np.linalg.norm(direction, axis=1, keepdims=True)
+    octree = PointOctree.build(PointCloud(points=points), depth=6)
+
+    sizes = [octree.level_size(level) for level in range(octree.depth + 1)]
+    assert sizes[0] == 1 and sizes == sorted(sizes)
+    assert all(size <= 8**level for level, size in enumerate(sizes))
+    # Корень — центр масс всех точек; сумма весов сохраняется на каждом уровне
+    assert np.allclose(octree.level(0).points[0], points.mean(axis=0))
+    assert all(octree.levels[level][1].sum() == len(points) for level in range(7))
+
+    level = octree.level_for(5000)
+    assert sizes[level] <= 5000 < sizes[level + 1]
+    assert octree.lod(5000).n_points == sizes[level]
@@ -0,0 +1,54 @@
+"""
+Тесты для анализа пустот и толщины по вокселям
+"""
+
+import numpy as np
+import pytest
+
+trimesh = pytest.importorskip("trimesh")
+pytest.importorskip("scipy")
+
+from solidflow.analysis.porosity import PorosityAnalyzer
+from solidflow.geometry.voxel.voxelizer import Voxelizer
+
+
+def _hollow_sphere():
+    """Сфера радиуса 10 с внутренней полостью радиуса 4 со смещением по x"""
+    outer = trimesh.creation.icosphere(subdivisions=4, radius=10)
+    inner = trimesh.creation.icosphere(subdivisions=4, radius=4)
+    inner.invert()
+    inner.apply_translation([2, 0, 0])
+    return trimesh.util.concatenate([outer, inner])
+
+
+def test_internal_void_detected():
+    """Тест пустоты: объем и центр полости, пористость"""
+    grid = Voxelizer(_hollow_sphere(), resolution=80).voxelize()
+    result = PorosityAnalyzer(grid).analyze()
+
+    assert len(result.voids) == 1
+    void = result.voids[0]
+    assert void["volume"] == pytest.approx(4 / 3 * np.pi * 64, rel=0.05)
+    assert np.allclose(void["center"], [2, 0, 0], atol=grid.pitch)
+    assert result.porosity == pytest.approx(64 / 1000, rel=0.05)
+
+
+def test_solid_has_no_voids():
+    """Тест сплошного тела: пустот нет, внешнее пространство не считается пустотой"""
+    sphere = trimesh.creation.icosphere(subdivisions=3, radius=5)
+    result = PorosityAnalyzer(Voxelizer(sphere, resolution=40).voxelize()).analyze()
+
+    assert result.voids == []
+    assert result.summary()["porosity"] == 0.0
+
+
+def test_thin_plate_thickness():
+    """Тест толщины пластины по срединной поверхности"""
+    plate = trimesh.creation.box(extents=[20, 20, 0.5])
+    result = PorosityAnalyzer(Voxelizer(plate, pitch=0.1).voxelize()).analyze()
+    summary = result.summary(min_thickness=0.8)
+
+    assert summary["thickness_median"] == pytest.approx(0.5, abs=0.1)
+    assert summary["thin_fraction"] > 0.9
+    assert len(result.thin_points(0.8)) > 0
+    assert np.all(np.abs(result.thin_points(0.8)[:, 2]) < 0.1)
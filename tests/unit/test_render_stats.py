@@ -0,0 +1,82 @@
+"""
+Тесты для статистики отрисовки viewport
+"""
+
+import csv
+
+import pytest
+
+pv = pytest.importorskip("pyvista")
+
+from solidflow.gui.viewport.render_stats import FIELDS, RenderStats
+
+
+@pytest.fixture
+def plotter():
+    plotter = pv.Plotter(off_screen=True, window_size=(64, 64))
+    yield plotter
+    plotter.close()
+
+
+def test_frame_records(plotter):
+    """Тест записи кадров: время, треугольники видимых actor, память, состояние viewport"""
+    stats = RenderStats(context=lambda: {"lod_level": 1, "display_mode": "solid"})
+    stats.attach(plotter)
+    sphere = pv.Sphere()
+    plotter.add_mesh(sphere)
+    hidden = plotter.add_mesh(pv.Cube().triangulate())
+    hidden.SetVisibility(False)
+    plotter.show(auto_close=False)
+    plotter.render()
+
+    frames = stats.frames
+    assert frames
+    record = dict(zip(FIELDS, frames[-1]))
+    assert record["frame_ms"] > 0
+    assert record["triangles"] == sphere.n_cells
+    assert record["points"] == sphere.n_points
+    assert record["lod_level"] == 1 and record["display_mode"] == "solid"
+    assert record["cpu_kb"] > 0 and record["gpu_kb"] > 0
+
+    summary = stats.summary()
+    assert summary["frames"] == len(frames)
+    assert summary["max_ms"] >= summary["mean_ms"] > 0
+
+
+def test_ring_buffer_and_export(plotter, tmp_path):
+    """Тест кольцевого буфера и выгрузки в CSV"""
+    stats = RenderStats(max_frames=3, log_interval=0)
+    stats.attach(plotter)
+    plotter.add_mesh(pv.Sphere())
+    plotter.show(auto_close=False)
+    for _ in range(5):
+        plotter.render()
+    assert len(stats.frames) == 3
+
+    path = tmp_path / "stats.csv"
+    assert stats.export(path) == 3
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert tuple(rows[0]) == FIELDS
+    assert len(rows) == 4
+
+    stats.clear()
+    assert stats.frames == [] and stats.summary() == {}
+
+
+def test_overlay(plotter):
+    """Тест надписи: обновляется при отрисовке и не учитывается в треугольниках"""
+    stats = RenderStats()
+    stats.attach(plotter)
+    sphere = pv.Sphere()
+    plotter.add_mesh(sphere)
+    plotter.show(auto_close=False)
+    stats.set_overlay(True)
+    assert stats.overlay_visible()
+    plotter.render()
+    plotter.render()
+    assert "Треугольников" in stats._overlay.GetText(2)
+    assert stats.frames[-1][2] == sphere.n_cells
+
+    stats.set_overlay(False)
+    assert not stats.overlay_visible()
@@ -0,0 +1,86 @@
+"""
+Тесты для поля расстояний со знаком
+"""
+
+import numpy as np
+import pytest
+
+trimesh = pytest.importorskip("trimesh")
+pytest.importorskip("scipy")
+pytest.importorskip("pyvista")
+
+from solidflow.geometry.spatial.index import spatial_index
+from solidflow.geometry.voxel.sdf import DistanceFieldBuilder
+
+
+def _field_points(field):
+    """Центры вокселей полосы и значения поля в них"""
+    grid = field.inside
+    bx, by, _ = grid.blocks
+    b = grid.BLOCK
+    corner = np.stack([field.keys % bx, field.keys // bx % by, field.keys // (bx * by)], axis=1)
+    local = np.indices((b, b, b)).reshape(3, -1).T
+    index = corner[:, None, :] * b + local[None, :, :]
+    points = grid.origin + (index.reshape(-1, 3) + 0.5) * grid.pitch
+    return points, field.values.ravel()
+
+
+def test_distance_matches_exact():
+    """Тест значений в полосе: не меньше точного расстояния и почти равны ему, знак — внутри"""
+    sphere = trimesh.creation.icosphere(subdivisions=4, radius=10)
+    field = DistanceFieldBuilder(sphere, 1.0, pitch=0.25).build()
+    points, values = _field_points(field)
+    band = np.flatnonzero(np.abs(values) < field.band - 1e-6)
+    sample = np.random.default_rng(0).choice(band, 5000, replace=False)
+    points, values = points[sample], values[sample]
+
+    _, exact, _ = spatial_index(sphere, persistent=False).closest_point(points)
+    error = np.abs(values) - exact
+    assert error.min() > -1e-5
+    assert np.percentile(error, 99) < 0.01
+    assert error.max() < field.pitch / 4
+    # Знак вдали от граней: икосфера отличается от сферы меньше чем на 0.05
+    radius = np.linalg.norm(points, axis=1)
+    far = np.abs(radius - 10) > 0.05
+    assert np.array_equal(values[far] < 0, radius[far] < 10)
+    assert np.all(np.abs(field.values) <= field.band + 1e-6)
+    assert field.slab(-1).min() == pytest.approx(field.band)
+
+
+def test_narrow_band_size():
+    """Тест узкой полосы: значения хранятся только в блоках у поверхности"""
+    sphere = trimesh.creation.icosphere(subdivisions=3, radius=10)
+    field = DistanceFieldBuilder(sphere, 0.5, pitch=0.25).build()
+
+    assert field.values.size < np.prod(field.inside.shape) / 2
+    assert field.summary()["band_blocks"] == len(field.keys)
+
+
+def test_offset_surfaces():
+    """Тест эквидистант наружу и внутрь: объемы сфер радиусов r ± d"""
+    sphere = trimesh.creation.icosphere(subdivisions=4, radius=10)
+    field = DistanceFieldBuilder(sphere, 1.0, pitch=0.25, max_workers=2).build()
+
+    for level in (1.0, -1.0):
+        surface = field.contour(level)
+        faces = surface.faces.reshape(-1, 4)[:, 1:]
+        offset = trimesh.Trimesh(surface.points, faces)
+        assert offset.is_watertight
+        assert offset.volume == pytest.approx(4 / 3 * np.pi * (10 + level) ** 3, rel=0.01)
+
+    with pytest.raises(ValueError):
+        field.contour(5.0)
+
+
+def test_outside_only_field():
+    """Тест поля только снаружи: значения снаружи те же, внутри поле равно -band"""
+    sphere = trimesh.creation.icosphere(subdivisions=3, radius=10)
+    full = DistanceFieldBuilder(sphere, 1.0, pitch=0.25).build()
+    outside = DistanceFieldBuilder(sphere, 1.0, pitch=0.25, outside_only=True).build()
+
+    assert len(outside.keys) < len(full.keys)
+    for index in range(full.inside.n_slabs):
+        a, b = full.slab(index), outside.slab(index)
+        assert np.array_equal(a[a >= 0], b[a >= 0])
+        assert np.all(b[a < 0] == -outside.band)
+    assert outside.contour(1.0).n_cells == full.contour(1.0).n_cells
@@ -0,0 +1,133 @@
+"""
+Тесты для интерактивного сечения плоскостью
+"""
+
+import numpy as np
+import pytest
+
+trimesh = pytest.importorskip("trimesh")
+pv = pytest.importorskip("pyvista")
+
+from solidflow.geometry.slicing.section import (
+    SectionPlane,
+    cap_polydata,
+    contour_polydata,
+    export_contours,
+)
+from solidflow.geometry.slicing.slicer import Slicer
+
+
+@pytest.fixture
+def qapp():
+    """Fixture для Qt приложения"""
+    QApplication = pytest.importorskip("PySide6.QtWidgets").QApplication
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    return app
+
+
+def test_cut_matches_slicer():
+    """Тест сечения через точку против послойных сечений"""
+    mesh = trimesh.creation.icosphere(subdivisions=3)
+    mesh.vertices *= [3, 2, 1]
+    section = SectionPlane(mesh, normal=(0, 0, 2))
+    assert np.allclose(section.normal, [0, 0, 1])
+    assert section.bounds == pytest.approx((-1.0, 1.0))
+
+    heights = np.linspace(-0.9, 0.9, 7)
+    expected = Slicer(mesh).slice(heights=heights)
+    for i, h in enumerate(heights):
+        result = section.cut((5.0, -3.0, h))
+        assert result.heights[0] == pytest.approx(h)
+        assert result.area[0] == pytest.approx(expected.area[i])
+        assert result.perimeter[0] == pytest.approx(expected.perimeter[i])
+
+
+def test_cap_with_hole():
+    """Тест заливки сечения кольца: площадь без отверстия"""
+    ring = trimesh.creation.annulus(r_min=3, r_max=5, height=10, sections=64)
+    result = SectionPlane(ring, normal=(0, 0, 1)).cut((0, 0, 1.0))
+
+    cap = cap_polydata(result)
+    assert cap.n_cells > 0
+    assert cap.area == pytest.approx(result.area[0])
+    assert np.allclose(cap.points[:, 2], 1.0)
+
+    contour = contour_polydata(result)
+    assert contour.n_lines == 2
+
+    empty = SectionPlane(ring).cut((0, 0, 20.0))
+    assert cap_polydata(empty).n_cells == 0
+    assert contour_polydata(empty).n_points == 0
+
+
+def test_export_contours(tmp_path):
+    """Тест экспорта контуров в SVG и CSV"""
+    box = trimesh.creation.box(extents=[4, 2, 6])
+    result = SectionPlane(box, normal=(1, 0, 0)).cut((0.5, 0, 0))
+
+    svg = tmp_path / "section.svg"
+    export_contours(result, svg)
+    text = svg.read_text(encoding="utf-8")
+    assert text.startswith("<svg") and 'height="2.0000mm"' in text
+    assert 'width="6.0000mm"' in text and " Z" in text
+
+    csv = tmp_path / "section.csv"
+    export_contours(result, csv)
+    lines = csv.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == "layer,loop,x,y,z"
+    assert len(lines) - 1 == len(result.points)
+    assert all(float(row.split(",")[2]) == pytest.approx(0.5) for row in lines[1:])
+
+    with pytest.raises(ValueError):
+        export_contours(result, tmp_path / "section.dxf")
+
+
+def test_viewport_section(qapp, tmp_path):
+    """Тест сечения во viewport: отсечение, заливка, перемещение и выключение"""
+    pytest.importorskip("pyvistaqt")
+    from solidflow.gui.viewport.viewport3d import Viewport3D
+
+    viewport = Viewport3D()
+    viewport.load_mesh(pv.Cube().triangulate())
+    viewport.enable_section(normal=(1, 0, 0), widget=False)
+    assert viewport.has_section()
+    assert viewport.section_result().area[0] == pytest.approx(1.0)
+    planes = viewport.current_actor.GetMapper().GetClippingPlanes()
+    assert planes.GetNumberOfItems() == 1
+
+    viewport.set_section_origin((0.25, 0, 0))
+    assert viewport.section_result().heights[0] == pytest.approx(0.25)
+    # Отсечение сохраняется при смене режима отображения
+    viewport.set_display_mode("wireframe")
+    assert viewport.current_actor.GetMapper().GetClippingPlanes().GetNumberOfItems() == 1
+
+    viewport.export_section(tmp_path / "section.csv")
+    assert (tmp_path / "section.csv").exists()
+
+    viewport.disable_section()
+    assert not viewport.has_section() and viewport.section_result() is None
+    assert viewport.current_actor.GetMapper().GetClippingPlanes().GetNumberOfItems() == 0
+
+
+def test_viewport_section_cap_on_release(qapp, monkeypatch):
+    """Тест перемещения плоскости: заливка большого среза — после отпускания"""
+    pytest.importorskip("pyvistaqt")
+    from solidflow.core.config import Config
+    from solidflow.gui.viewport.viewport3d import Viewport3D
+
+    monkeypatch.setattr(Config, "SECTION_DRAG_CAP_POINTS", 3)
+    viewport = Viewport3D()
+    viewport.load_mesh(pv.Cube().triangulate())
+    viewport.enable_section(normal=(1, 0, 0), widget=False)
+    cap, contour = viewport._section_meshes
+    assert cap.n_cells > 0
+
+    viewport._on_section_widget((1, 0, 0), (0.25, 0, 0))
+    assert cap.n_cells == 0 and contour.n_cells > 0
+    assert viewport.section_result().heights[0] == pytest.approx(0.25)
+
+    viewport._on_section_widget_released()
+    assert cap.n_cells > 0
+    viewport.disable_section()
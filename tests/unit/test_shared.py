@@ -0,0 +1,72 @@
+"""
+Тесты для передачи mesh через разделяемую память
+"""
+
+import numpy as np
+import pytest
+
+trimesh = pytest.importorskip("trimesh")
+pytest.importorskip("pyvista")
+
+from solidflow.geometry.mesh.shared import (
+    SharedMesh,
+    attach_arrays,
+    call_shared,
+    create_process_pool,
+    share_args,
+    share_mesh,
+    release_all,
+    unwrap_result,
+)
+
+
+def _face_count(mesh):
+    return len(mesh.faces)
+
+
+def _scaled(mesh):
+    return trimesh.Trimesh(vertices=mesh.vertices * 2.0, faces=mesh.faces)
+
+
+def test_shared_mesh_roundtrip():
+    """Тест публикации и подключения к mesh"""
+    box = trimesh.creation.box()
+    shared = SharedMesh.from_mesh(box)
+
+    with attach_arrays(shared.descriptor) as (vertices, faces):
+        assert np.allclose(vertices, box.vertices)
+        assert np.array_equal(faces, box.faces)
+        assert not vertices.flags.writeable
+
+    shared.release()
+    assert shared.closed
+
+
+def test_share_mesh_reference_counting():
+    """Тест однократной публикации и счетчика ссылок"""
+    box = trimesh.creation.box()
+    first = share_mesh(box)
+    second = share_mesh(box)
+
+    assert first is second
+
+    first.release()
+    assert not second.closed
+    second.release()
+    assert second.closed
+
+
+def test_call_shared_in_worker_process():
+    """Тест вызова функции в рабочем процессе с mesh-аргументом и mesh-результатом"""
+    box = trimesh.creation.box()
+    args, kwargs, handles = share_args((box,), {})
+    try:
+        with create_process_pool(1) as executor:
+            count = executor.submit(call_shared, _face_count, args, kwargs).result()
+            scaled = unwrap_result(executor.submit(call_shared, _scaled, args, kwargs).result())
+    finally:
+        release_all(handles)
+
+    assert count == 12
+    assert scaled.n_cells == 12
+    assert np.allclose(scaled.bounds[1], box.bounds[1][0] * 2.0)
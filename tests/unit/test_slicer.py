@@ -0,0 +1,106 @@
+"""
+Тесты для послойных сечений
+"""
+
+import numpy as np
+import pytest
+
+trimesh = pytest.importorskip("trimesh")
+pytest.importorskip("pyvista")
+
+from solidflow.geometry.slicing.slicer import FaceIntervals, Slicer
+
+
+def _signed_area(polygon):
+    x, y = polygon[:, 0], polygon[:, 1]
+    return 0.5 * np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y)
+
+
+def test_annulus_layers():
+    """Тест площади, периметра и ориентации контуров кольца"""
+    ring = trimesh.creation.annulus(r_min=3, r_max=5, height=10, sections=64)
+    result = Slicer(ring).slice(layer_height=0.5)
+
+    assert result.n_layers == 20
+    assert np.all(result.loop_closed)
+    assert np.allclose(result.area, ring.volume / 10)
+    assert np.allclose(result.heights, -5 + 0.5 * (np.arange(20) + 0.5))
+
+    polygons = result.layer_polygons(7)
+    signs = sorted(np.sign(_signed_area(p)) for p in polygons)
+    # Внешний контур против часовой стрелки, отверстие — по часовой
+    assert signs == [-1.0, 1.0]
+    perimeter = sum(np.linalg.norm(np.roll(p, -1, axis=0) - p, axis=1).sum() for p in polygons)
+    assert result.perimeter[7] == pytest.approx(perimeter)
+
+
+def test_unwelded_and_tilted_slices():
+    """Тест модели без общих вершин (STL) и наклонного направления сечений"""
+    box = trimesh.creation.box(extents=[4, 2, 6])
+    soup = trimesh.Trimesh(
+        box.triangles.reshape(-1, 3), np.arange(len(box.faces) * 3).reshape(-1, 3), process=False
+    )
+    result = Slicer(soup, direction=(1, 0, 0)).slice(layer_height=1.0)
+    assert result.n_layers == 4
+    assert np.all(result.loop_closed)
+    assert np.allclose(result.area, 12.0)
+    assert np.allclose(result.perimeter, 16.0)
+
+    tilted = Slicer(box, direction=(1, 1, 1)).section(0.0)
+    assert tilted.n_loops == 1 and tilted.loop_closed[0]
+    assert tilted.area[0] > 0
+
+
+def test_open_mesh_loops():
+    """Тест незамкнутых контуров у модели с отверстием"""
+    box = trimesh.creation.box(extents=[2, 2, 2])
+    open_box = trimesh.Trimesh(box.vertices, box.faces[box.face_normals[:, 0] < 0.5])
+    result = Slicer(open_box).section(0.0)
+
+    assert result.summary()["open_loops"] == 1
+    assert result.area[0] == 0.0
+    assert len(result.layer_loops(0)[0]) == 7
+    assert result.perimeter[0] == pytest.approx(6.0)
+
+
+def test_matches_trimesh_sections():
+    """Тест периметров и граней сечения против trimesh"""
+    mesh = trimesh.creation.icosphere(subdivisions=3)
+    mesh.vertices *= [3, 2, 1]
+    heights = np.linspace(-0.95, 0.95, 25)
+    slicer = Slicer(mesh, max_workers=2)
+    # Несколько пакетов слоев — параллельная обработка
+    slicer.LAYER_BATCH = 4
+    result = slicer.slice(heights=heights)
+    assert np.all(result.loop_closed) and result.n_loops == len(heights)
+
+    intervals = FaceIntervals(mesh.vertices, mesh.faces)
+    for i, h in enumerate(heights):
+        lines = trimesh.intersections.mesh_plane(mesh, [0, 0, 1], [0, 0, h])
+        expected = np.linalg.norm(lines[:, 1] - lines[:, 0], axis=1).sum()
+        assert result.perimeter[i] == pytest.approx(expected)
+
+        z = mesh.vertices[mesh.faces][:, :, 2]
+        brute = np.flatnonzero((z.min(axis=1) < h) & (z.max(axis=1) >= h))
+        assert set(intervals.crossing(h)) == set(brute)
+
+
+def test_face_intervals_index_size():
+    """Тест индекса одиночных сечений: каждая грань хранится один раз, ответы точные"""
+    # Высокий цилиндр: длинные боковые грани и мелкие грани торцов
+    mesh = trimesh.creation.cylinder(radius=1.0, height=500.0, sections=256)
+    rng = np.random.default_rng(0)
+    mesh = trimesh.util.concatenate([mesh, trimesh.creation.icosphere(4)])
+    intervals = FaceIntervals(mesh.vertices, mesh.faces)
+
+    zmin = mesh.vertices[mesh.faces][:, :, 2].min(axis=1)
+    zmax = mesh.vertices[mesh.faces][:, :, 2].max(axis=1)
+    # Тонкие слои по всей высоте и в области мелких граней
+    heights = np.concatenate([np.arange(-250.0, 250.0, 0.05), rng.uniform(-1, 1, 200)])
+    for h in heights[::97]:
+        expected = np.flatnonzero((zmin < h) & (zmax >= h))
+        assert np.array_equal(np.sort(intervals.crossing(h)), expected)
+
+    spans, offsets, members, lows = intervals._span_index()
+    assert len(members) == len(lows) == len(mesh.faces)
+    assert offsets[-1] == len(mesh.faces)
@@ -0,0 +1,120 @@
+"""
+Тесты для пространственного индекса и дискового кэша
+"""
+
+import numpy as np
+import pytest
+
+trimesh = pytest.importorskip("trimesh")
+pytest.importorskip("pyvista")
+
+from solidflow.core.cache import MeshCache
+from solidflow.geometry.spatial.bvh import BVH
+from solidflow.geometry.spatial.index import spatial_index
+
+
+def _brute_distances(mesh, point):
+    """Расстояния от точки до всех граней"""
+    from trimesh.triangles import closest_point
+
+    triangles = mesh.triangles
+    closest = closest_point(triangles, np.repeat(point[None], len(triangles), axis=0))
+    return np.linalg.norm(closest - point, axis=1)
+
+
+def test_nearest_faces_match_brute_force():
+    """Тест k ближайших граней и радиуса поиска"""
+    mesh = trimesh.creation.icosphere(subdivisions=3)
+    bvh = BVH.from_mesh(mesh)
+    points = np.random.default_rng(0).normal(size=(40, 3))
+
+    dist, faces = bvh.nearest_faces(points, k=4)
+    for i, point in enumerate(points):
+        expected = np.sort(_brute_distances(mesh, point))[:4]
+        assert np.allclose(dist[i], expected)
+        assert np.allclose(_brute_distances(mesh, point)[faces[i]], dist[i])
+
+    dist, faces = bvh.nearest_faces(np.zeros((1, 3)), k=2, max_distance=0.5)
+    assert np.all(np.isinf(dist)) and np.all(faces == -1)
+
+
+def test_query_aabb_match_brute_force():
+    """Тест пересечения боксов с AABB граней"""
+    mesh = trimesh.creation.icosphere(subdivisions=3)
+    bvh = BVH.from_mesh(mesh)
+    centers = np.random.default_rng(1).normal(size=(30, 3))
+    lo, hi = centers - 0.2, centers + 0.2
+
+    boxes, faces = bvh.query_aabb(lo, hi)
+
+    tri_lo, tri_hi = mesh.triangles.min(axis=1), mesh.triangles.max(axis=1)
+    for i in range(len(centers)):
+        expected = np.flatnonzero(np.all(tri_lo <= hi[i], axis=1) & np.all(tri_hi >= lo[i], axis=1))
+        assert np.array_equal(faces[boxes == i], expected)
+
+
+def test_spatial_index_cached_by_geometry_version():
+    """Тест кэширования индекса на mesh и сброса при изменении геометрии"""
+    mesh = trimesh.creation.box()
+    first = spatial_index(mesh, persistent=False)
+
+    assert spatial_index(mesh, persistent=False) is first
+
+    mesh.vertices[0] = [2.0, 2.0, 2.0]
+    second = spatial_index(mesh, persistent=False)
+    assert second is not first
+    assert second.node_hi[0].max() == pytest.approx(2.0)
+
+
+def test_spatial_index_disk_cache(tmp_path):
+    """Тест сохранения индекса в дисковом кэше и вытеснения записей"""
+    import pyvista as pv
+
+    cache = MeshCache(tmp_path)
+    mesh = pv.Sphere()
+    built = spatial_index(mesh, cache=cache)
+    assert len(list(tmp_path.glob("bvh/*.npz"))) == 1
+
+    # Копия mesh без индекса в памяти — индекс берется с диска
+    restored = spatial_index(mesh.copy(), cache=cache)
+    assert restored is not built
+    assert np.array_equal(restored.order, built.order)
+    assert np.array_equal(restored.node_lo, built.node_lo)
+    points = np.array([[0.0, 0.0, 2.0], [0.1, 0.2, 0.0]])
+    assert np.allclose(restored.closest_point(points)[1], built.closest_point(points)[1])
+
+    # Превышение предельного размера — старые записи удаляются
+    cache.max_bytes = 0
+    cache.store("bvh", "other", {"a": np.zeros(10)})
+    assert cache.size() == 0
+
+
+def test_spatial_index_lock_per_mesh():
+    """Тест: построение индекса одного mesh не задерживает другой mesh"""
+    import gc
+    import threading
+
+    from solidflow.geometry.mesh import arrays
+    from solidflow.geometry.mesh.arrays import mesh_lock
+    from solidflow.geometry.spatial import index
+
+    busy = trimesh.creation.icosphere(subdivisions=2)
+    other = trimesh.creation.icosphere(subdivisions=2)
+    assert mesh_lock(busy, index._ATTR) is mesh_lock(busy, index._ATTR)
+    assert mesh_lock(busy, index._ATTR) is not mesh_lock(other, index._ATTR)
+
+    result = []
+    with mesh_lock(busy, index._ATTR):
+        thread = threading.Thread(
+            target=lambda out, mesh: out.append(spatial_index(mesh, persistent=False)),
+            args=(result, other),
+        )
+        thread.start()
+        thread.join(timeout=30)
+    assert result and result[0] is spatial_index(other, persistent=False)
+
+    # Блокировки удаляются вместе с mesh
+    key = id(other)
+    del other, result
+    gc.collect()
+    assert key not in arrays._mesh_locks
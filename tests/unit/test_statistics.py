@@ -57,3 +57,34 @@ def test_statistics_compute_all():
     assert "size" in all_stats
     assert "bounding_box" in all_stats
 
+
+def test_statistics_volume_estimated_for_open_mesh():
+    """Тест объема негерметичной модели: оценка по вокселям"""
+    pv = pytest.importorskip("pyvista")
+    cube = pv.Cube().triangulate()
+    # Куб без одной стороны
+    mesh = pv.PolyData(cube.points, cube.faces.reshape(-1, 4)[2:].ravel())
+    stats = MeshStatistics(mesh)
+
+    assert stats.is_volume_estimated()
+    assert stats.get_volume() == pytest.approx(1.0, rel=0.05)
+
+
+def test_statistics_voxel_volume_cancel_and_progress():
+    """Тест оценки объема по вокселям: прогресс и отмена не теряются"""
+    pv = pytest.importorskip("pyvista")
+    from solidflow.core.tasks import TaskCancelled
+
+    cube = pv.Cube().triangulate()
+    open_cube = cube.faces.reshape(-1, 4)[2:].ravel()
+
+    values = []
+    MeshStatistics(pv.PolyData(cube.points, open_cube)).compute_all(progress=values.append)
+    assert values and values[-1] == 100
+
+    def cancel():
+        raise TaskCancelled()
+
+    stats = MeshStatistics(pv.PolyData(cube.points, open_cube))
+    with pytest.raises(TaskCancelled):
+        stats.compute_all(check=cancel)
@@ -0,0 +1,103 @@
+"""
+Тесты для импорта STEP
+"""
+
+import numpy as np
+import pytest
+
+from solidflow.core.cache import MeshCache, file_hash
+from solidflow.geometry.mesh import step as step_module
+from solidflow.geometry.mesh.step import STEPImporter
+
+
+def _write_step(path):
+    """Записать в STEP сборку из двух тел (куб и цилиндр)"""
+    from OCC.Core.BRep import BRep_Builder
+    from OCC.Core.BRepPrimAPI import BRepPrimAPI_MakeBox, BRepPrimAPI_MakeCylinder
+    from OCC.Core.gp import gp_Ax2, gp_Dir, gp_Pnt
+    from OCC.Core.STEPControl import STEPControl_AsIs, STEPControl_Writer
+    from OCC.Core.TopoDS import TopoDS_Compound
+
+    compound = TopoDS_Compound()
+    builder = BRep_Builder()
+    builder.MakeCompound(compound)
+    builder.Add(compound, BRepPrimAPI_MakeBox(10.0, 10.0, 10.0).Shape())
+    axis = gp_Ax2(gp_Pnt(30.0, 0.0, 0.0), gp_Dir(0.0, 0.0, 1.0))
+    builder.Add(compound, BRepPrimAPI_MakeCylinder(axis, 5.0, 10.0).Shape())
+    writer = STEPControl_Writer()
+    writer.Transfer(compound, STEPControl_AsIs)
+    writer.Write(str(path))
+
+
+def test_step_requires_occ(tmp_path, monkeypatch):
+    """Тест: без pythonocc-core импорт сообщает понятную ошибку"""
+    monkeypatch.setattr(step_module, "occ_available", lambda: False)
+    path = tmp_path / "part.step"
+    path.write_text("ISO-10303-21;\nEND-ISO-10303-21;\n")
+    with pytest.raises(ImportError, match="pythonocc-core"):
+        STEPImporter(persistent=False).load(path)
+    with pytest.raises(ValueError):
+        STEPImporter(linear_deflection=0.0)
+    with pytest.raises(FileNotFoundError):
+        STEPImporter(persistent=False).load(tmp_path / "missing.stp")
+
+
+def test_step_cache_by_tolerance(tmp_path, monkeypatch):
+    """Тест: результат кэшируется по хэшу файла и точности"""
+    monkeypatch.setattr(step_module, "occ_available", lambda: False)
+    path = tmp_path / "part.stp"
+    path.write_text("ISO-10303-21;\nEND-ISO-10303-21;\n")
+    cache = MeshCache(tmp_path / "cache")
+    importer = STEPImporter(0.1, 20.0, cache=cache)
+    vertices = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 1]], dtype=np.float64)
+    faces = np.array([[0, 2, 1], [0, 1, 3], [0, 3, 2], [1, 2, 3]])
+    cache.store(
+        "step",
+        f"{file_hash(path)}-{importer.tolerance_key}",
+        {"vertices": vertices, "faces": faces},
+    )
+
+    # Файл с той же точностью открывается из кэша без pythonocc
+    mesh = importer.load(path)
+    assert mesh.n_points == 4 and mesh.n_cells == 4
+    assert np.allclose(mesh.points, vertices)
+    assert importer.open_edges == 0
+
+    # Число открытых ребер известно и для сетки из кэша
+    cache.store(
+        "step",
+        f"{file_hash(path)}-{importer.tolerance_key}",
+        {"vertices": vertices, "faces": faces[:3]},
+    )
+    importer.load(path)
+    assert importer.open_edges == 3
+
+    # Другая точность требует тесселяции
+    with pytest.raises(ImportError):
+        STEPImporter(0.05, 20.0, cache=cache).load(path)
+
+
+def test_step_parallel_tessellation(tmp_path, monkeypatch):
+    """Тест: параллельная тесселяция по граням дает замкнутые тела, детали кэшируются"""
+    pytest.importorskip("OCC.Core")
+    path = tmp_path / "assembly.step"
+    _write_step(path)
+    cache = MeshCache(tmp_path / "cache")
+
+    mesh = STEPImporter(0.05, 15.0, cache=cache, max_workers=2).load(path)
+    assert mesh.n_cells > 12
+    edges = mesh.extract_feature_edges(
+        boundary_edges=True, non_manifold_edges=True, feature_edges=False, manifold_edges=False
+    )
+    assert edges.n_cells == 0
+    assert mesh.volume == pytest.approx(1000.0 + np.pi * 25.0 * 10.0, rel=0.02)
+
+    # Файл изменен (другой заголовок), детали те же: тесселяция не выполняется
+    path.write_bytes(path.read_bytes().replace(b"FILE_NAME(", b"FILE_NAME( ", 1))
+
+    def fail(*args):
+        raise AssertionError("деталь тесселирована повторно")
+
+    monkeypatch.setattr(step_module, "_tessellate_batch", fail)
+    cached = STEPImporter(0.05, 15.0, cache=cache, max_workers=1).load(path)
+    assert cached.n_cells == mesh.n_cells
@@ -0,0 +1,93 @@
+"""
+Тесты для генерации поддержек
+"""
+
+import numpy as np
+import pytest
+
+trimesh = pytest.importorskip("trimesh")
+pv = pytest.importorskip("pyvista")
+pytest.importorskip("scipy")
+
+from solidflow.geometry.mesh.arrays import arrays_to_polydata
+from solidflow.geometry.mesh.exporter import STLExporter
+from solidflow.geometry.supports.generator import (
+    SupportGenerator,
+    SupportSettings,
+    frustum_arrays,
+    poisson_disk_select,
+)
+
+
+def _table():
+    """Столешница 40 x 40 на ножке 6 x 6 (пересекающиеся оболочки)"""
+    top = trimesh.creation.box(extents=[40, 40, 3])
+    top.apply_translation([0, 0, 31.5])
+    leg = trimesh.creation.box(extents=[6, 6, 31])
+    leg.apply_translation([0, 0, 15.5])
+    return trimesh.util.concatenate([top, leg])
+
+
+def test_frustum_mesh():
+    """Тест замкнутости, ориентации и объема усеченных конусов"""
+    vertices, faces = frustum_arrays(
+        [[0, 0, 0], [5, 0, 0]], [[0, 0, 10], [5, 3, 4]], np.array([1.0, 0.5]), [1.0, 0.2], 16
+    )
+    mesh = trimesh.Trimesh(vertices, faces)
+    assert len(faces) == 2 * 4 * 16
+    assert mesh.is_watertight and mesh.is_winding_consistent
+    assert mesh.volume > 0
+    # Правильный 16-угольник: площадь 16/2 * sin(2π/16)
+    area = 8 * np.sin(2 * np.pi / 16)
+    assert trimesh.Trimesh(vertices[:34], faces[:64]).volume == pytest.approx(10 * area)
+
+
+def test_poisson_disk_matches_greedy():
+    """Тест прореживания: результат последовательного жадного выбора"""
+    points = np.random.default_rng(1).random((800, 3)) * [20, 20, 1]
+    chosen = poisson_disk_select(points, 1.5)
+
+    expected = []
+    for i, p in enumerate(points):
+        if all(np.linalg.norm(points[j] - p) >= 1.5 for j in expected):
+            expected.append(i)
+    assert chosen.tolist() == expected
+
+
+def test_table_supports(tmp_path):
+    """Тест поддержек под столешницей: опора на стол, без пересечений, экспорт"""
+    table = _table()
+    result = SupportGenerator(table).generate()
+    summary = result.summary()
+
+    # Точки опоры — на нижней грани столешницы вне ножки
+    contacts = result.contacts
+    assert summary["contacts"] > 50
+    assert np.allclose(contacts[:, 2], 30.0)
+    assert not np.any((np.abs(contacts[:, 0]) < 3) & (np.abs(contacts[:, 1]) < 3))
+    assert summary["branches"] > 0 and summary["on_model"] == 0
+    assert np.isclose(min(result.starts[:, 2].min(), result.ends[:, 2].min()), 0.0)
+
+    # Оси поддержек не заходят внутрь модели
+    t = np.linspace(0.1, 0.9, 9)[None, :, None]
+    x, y, z = (result.starts[:, None] + t * (result.ends - result.starts)[:, None]).reshape(-1, 3).T
+    in_top = (np.abs(x) < 20) & (np.abs(y) < 20) & (z > 30) & (z < 33)
+    in_leg = (np.abs(x) < 3) & (np.abs(y) < 3) & (z < 31)
+    assert not np.any(in_top | in_leg)
+
+    # Слияние в деревья экономит материал
+    columns = SupportGenerator(table, SupportSettings(tree=False)).generate()
+    assert columns.summary()["branches"] == 0
+    assert result.volume < columns.volume
+
+    path = tmp_path / "supports.stl"
+    STLExporter.save(result.mesh, path)
+    assert pv.read(path).n_cells == result.mesh.n_cells
+
+
+def test_no_supports_needed():
+    """Тест модели без нависаний"""
+    box = trimesh.creation.box(extents=[10, 10, 10])
+    result = SupportGenerator(arrays_to_polydata(box.vertices, box.faces)).generate()
+    assert result.summary()["contacts"] == 0
+    assert result.mesh.n_cells == 0
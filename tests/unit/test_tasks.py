@@ -0,0 +1,116 @@
+"""
+Тесты для планировщика фоновых задач
+"""
+
+import threading
+
+import pytest
+
+pytest.importorskip("PySide6")
+
+from solidflow.core.tasks import TaskScheduler, wait_for
+
+
+@pytest.fixture
+def qapp():
+    """Fixture для Qt приложения"""
+    QApplication = pytest.importorskip("PySide6.QtWidgets").QApplication
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([])
+    return app
+
+
+def _square(value, ctx):
+    ctx.progress(50)
+    return value * value
+
+
+def _blocking(event, ctx):
+    while not event.is_set():
+        if ctx.wait(0.01):
+            ctx.check()
+    return "done"
+
+
+def _fail(ctx):
+    raise ValueError("boom")
+
+
+def test_scheduler_result_via_signal(qapp):
+    """Тест доставки результата через сигнал"""
+    scheduler = TaskScheduler()
+    results = []
+    progress = []
+    scheduler.task_finished.connect(lambda key, result: results.append((key, result)))
+    scheduler.task_progress.connect(lambda key, percent: progress.append(percent))
+
+    assert scheduler.submit("square", _square, 7)
+    assert wait_for(scheduler, "square")
+
+    assert results == [("square", 49)]
+    assert 50 in progress
+    assert not scheduler.is_busy()
+
+
+def test_scheduler_deduplicates_running_task(qapp):
+    """Тест дедупликации повторной постановки задачи"""
+    scheduler = TaskScheduler()
+    finished = []
+    scheduler.task_finished.connect(lambda key, result: finished.append(key))
+
+    release = threading.Event()
+    assert scheduler.submit("analyze", _blocking, release)
+    assert not scheduler.submit("analyze", _blocking, release)
+
+    release.set()
+    assert wait_for(scheduler, "analyze")
+    assert finished == ["analyze"]
+
+
+def test_scheduler_cancel(qapp):
+    """Тест отмены задачи"""
+    scheduler = TaskScheduler()
+    cancelled = []
+    finished = []
+    scheduler.task_cancelled.connect(cancelled.append)
+    scheduler.task_finished.connect(lambda key, result: finished.append(key))
+
+    release = threading.Event()
+    scheduler.submit("long", _blocking, release)
+    scheduler.cancel("long")
+
+    assert wait_for(scheduler, "long")
+    assert cancelled == ["long"]
+    assert finished == []
+
+
+def test_scheduler_failure(qapp):
+    """Тест доставки ошибки задачи"""
+    scheduler = TaskScheduler()
+    errors = []
+    scheduler.task_failed.connect(lambda key, error: errors.append(error))
+
+    scheduler.submit("fail", _fail)
+    assert wait_for(scheduler, "fail")
+
+    assert len(errors) == 1
+    assert isinstance(errors[0], ValueError)
+
+
+def test_window_task_in_scheduler(qapp):
+    """Тест задачи главного окна: результат с исходной моделью и текст сводки"""
+    pv = pytest.importorskip("pyvista")
+    from solidflow.gui.tasks import format_thickness_summary, thickness_task
+
+    box = pv.Box(bounds=(0, 10, 0, 4, 0, 2)).triangulate()
+    scheduler = TaskScheduler()
+    results = []
+    scheduler.task_finished.connect(lambda key, result: results.append(result))
+
+    scheduler.submit("thickness", thickness_task, box, None)
+    assert wait_for(scheduler, "thickness")
+
+    assert results[0]["source"] is box
+    text = format_thickness_summary(results[0]["thickness"], 2.5)
+    assert "Минимальная толщина: 2.000 мм" in text
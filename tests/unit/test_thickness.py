@@ -0,0 +1,111 @@
+"""
+Тесты для BVH и анализа толщины стенок
+"""
+
+import numpy as np
+import pytest
+
+trimesh = pytest.importorskip("trimesh")
+pytest.importorskip("pyvista")
+
+from solidflow.analysis.thickness import ThicknessAnalyzer
+from solidflow.geometry.spatial.bvh import BVH
+
+
+def _plate():
+    """Пластина 10 x 4 x 2 с мелкими гранями"""
+    return trimesh.creation.box(extents=[10, 4, 2]).subdivide().subdivide()
+
+
+def test_bvh_rays_match_brute_force():
+    """Тест пересечений лучей с BVH против полного перебора"""
+    mesh = _plate()
+    bvh = BVH(mesh.vertices, mesh.faces, leaf_size=2)
+    rng = np.random.default_rng(0)
+    origins = rng.uniform(-6, 6, size=(200, 3))
+    directions = rng.normal(size=(200, 3))
+
+    t, face = bvh.intersect_rays(origins, directions, max_workers=1)
+
+    all_faces = np.arange(len(mesh.faces))
+    for i in range(len(origins)):
+        candidates = bvh._ray_triangle(
+            np.repeat(origins[i : i + 1], len(all_faces), axis=0),
+            np.repeat(directions[i : i + 1], len(all_faces), axis=0),
+            bvh.face_slot[all_faces],
+        )
+        candidates = candidates[candidates > 0]
+        expected = candidates.min() if len(candidates) else np.inf
+        assert t[i] == pytest.approx(expected)
+        assert (face[i] >= 0) == np.isfinite(expected)
+
+
+def test_bvh_closest_point():
+    """Тест ближайшей точки и радиуса поиска"""
+    bvh = BVH.from_mesh(_plate())
+    points = np.array([[0.0, 0.0, 3.0], [7.0, 0.0, 0.0], [0.0, 0.0, 0.5]])
+
+    closest, dist, face = bvh.closest_point(points)
+    assert np.allclose(dist, [2.0, 2.0, 0.5])
+    assert np.allclose(closest[0], [0.0, 0.0, 1.0])
+    assert np.all(face >= 0)
+
+    _, dist, face = bvh.closest_point(points, max_distance=1.0)
+    assert np.isinf(dist[0]) and face[0] == -1
+    assert dist[2] == pytest.approx(0.5)
+
+
+@pytest.mark.parametrize("method", ["ray", "sphere"])
+def test_plate_thickness(method):
+    """Тест толщины пластины обоими методами"""
+    result = ThicknessAnalyzer(_plate()).analyze(method=method)
+    summary = result.summary()
+
+    assert summary["measured"] == summary["faces"]
+    assert summary["min"] == pytest.approx(2.0)
+    assert summary["max"] == pytest.approx(10.0)
+    # Верхняя и нижняя грани пластины — толщина 2
+    top = np.flatnonzero(np.abs(_plate().face_normals[:, 2]) > 0.9)
+    assert np.allclose(result.face_thickness[top], 2.0)
+    assert set(result.thin_faces(2.5)) == set(top)
+
+
+def test_open_mesh_unmeasured_faces():
+    """Тест граней без пересечения у незамкнутой модели"""
+    mesh = _plate()
+    # Удаляем нижнюю стенку: лучи от верхней уходят наружу
+    keep = mesh.face_normals[:, 2] > -0.9
+    open_mesh = trimesh.Trimesh(mesh.vertices, mesh.faces[keep], process=False)
+
+    result = ThicknessAnalyzer(open_mesh).analyze(samples_per_face=2)
+    top = open_mesh.face_normals[:, 2] > 0.9
+
+    assert np.all(np.isnan(result.face_thickness[top]))
+    assert result.summary()["measured"] == int((~top).sum())
+
+    with pytest.raises(ValueError):
+        ThicknessAnalyzer(open_mesh).analyze(method="unknown")
+
+
+@pytest.mark.parametrize("samples_per_face", [1, 2])
+def test_sampled_thickness(samples_per_face):
+    """Тест быстрой оценки: измеряется выборка граней, остальные — по ближайшей"""
+    mesh = _plate()
+    result = ThicknessAnalyzer(mesh).analyze(
+        samples_per_face=samples_per_face, max_points=100 * samples_per_face
+    )
+    summary = result.summary()
+
+    assert summary["sampled"]
+    assert len(result.sampled_faces) == 100
+    assert summary["measured"] == 100
+    assert np.all(np.isfinite(result.face_thickness))
+    full = ThicknessAnalyzer(mesh).analyze(samples_per_face=samples_per_face)
+    assert np.allclose(
+        result.face_thickness[result.sampled_faces], full.face_thickness[result.sampled_faces]
+    )
+    # Центр верхней стенки далеко от боковых граней — толщина 2
+    top = np.flatnonzero(
+        (mesh.face_normals[:, 2] > 0.9) & (np.abs(mesh.triangles_center[:, 0]) < 2)
+    )
+    assert np.allclose(result.face_thickness[top], 2.0)
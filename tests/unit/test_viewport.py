@@ -53,3 +53,189 @@ def test_viewport_clear(qapp):
     assert viewport.current_mesh is None
     assert viewport.current_actor is None
 
+
+
+def test_viewport_face_scalars(qapp):
+    """Тест раскраски модели по значениям на гранях"""
+    import numpy as np
+    import pyvista as pv
+
+    viewport = Viewport3D()
+    mesh = pv.Cube()
+    viewport.load_mesh(mesh)
+
+    # Cube состоит из четырехугольников — значения заданы для треугольников
+    values = np.arange(12, dtype=float)
+    viewport.show_face_scalars(values, "Толщина, мм")
+    assert viewport.has_face_scalars()
+    assert viewport.get_display_mode() == "solid"
+    assert "Толщина, мм" not in mesh.cell_data
+
+    viewport.clear_face_scalars()
+    assert not viewport.has_face_scalars()
+
+    viewport.show_face_scalars(values, "Толщина, мм")
+    viewport.load_mesh(mesh)
+    assert not viewport.has_face_scalars()
+
+
+def test_viewport_point_cloud(qapp):
+    """Тест показа облака точек уровнем октодерева в пределах бюджета"""
+    import numpy as np
+    import pyvista as pv
+
+    from solidflow.geometry.pointcloud.cloud import PointCloud
+    from solidflow.geometry.pointcloud.octree import PointOctree
+
+    points = np.random.default_rng(0).uniform(0, 10, (20000, 3))
+    octree = PointOctree.build(PointCloud(points=points), depth=5)
+
+    viewport = Viewport3D()
+    viewport.load_point_cloud(octree, budget=1000)
+    assert viewport.has_point_cloud()
+    assert octree.level_size(viewport.point_cloud_level()) <= 1000
+
+    viewport.load_mesh(pv.Sphere())
+    assert not viewport.has_point_cloud()
+    viewport.load_point_cloud(octree)
+    viewport.clear()
+    assert not viewport.has_point_cloud()
+
+
+def test_viewport_interaction_lod(qapp):
+    """Тест подмены модели упрощенной копией на время движения камеры"""
+    import numpy as np
+    import pyvista as pv
+
+    viewport = Viewport3D()
+    viewport.lod.min_faces = 10000
+    mesh = pv.Sphere(theta_resolution=300, phi_resolution=300)
+    viewport.load_mesh(mesh)
+    assert viewport.lod.wait(30)
+    assert viewport.lod.levels and viewport.lod.levels[0] < mesh.n_cells
+
+    # Кадр полной модели вдвое дольше бюджета: при движении показывается уровень
+    viewport.lod.record_frame(2 * viewport.lod.budget)
+    viewport.lod.start_interaction()
+    shown = viewport.current_actor.mapper.dataset
+    assert shown.n_cells == viewport.lod.shown_faces < mesh.n_cells
+    assert "Normals" in shown.point_data
+    viewport.lod.end_interaction()
+    assert viewport.current_actor.mapper.dataset.n_cells == mesh.n_cells
+
+    # Раскраска по граням переносится на упрощенную копию
+    viewport.show_face_scalars(np.arange(mesh.n_cells, dtype=float), "Толщина, мм")
+    assert viewport.lod.wait(30)
+    viewport.lod.record_frame(2 * viewport.lod.budget)
+    viewport.lod.start_interaction()
+    shown = viewport.current_actor.mapper.dataset
+    assert shown.n_cells < mesh.n_cells
+    assert shown.cell_data.active_scalars_name == "Толщина, мм"
+    viewport.lod.end_interaction()
+
+    # Маленькая модель не упрощается
+    viewport.load_mesh(pv.Sphere())
+    assert viewport.lod.levels == []
+
+
+def test_viewport_display_toggles(qapp):
+    """Тест: режим отображения и ребра переключаются свойствами того же actor"""
+    import numpy as np
+    import pyvista as pv
+
+    viewport = Viewport3D()
+    mesh = pv.Sphere()
+    viewport.load_mesh(mesh)
+    actor = viewport.current_actor
+    dataset = actor.mapper.dataset
+    assert "Normals" in dataset.point_data
+
+    viewport.set_display_mode("wireframe")
+    assert viewport.current_actor is actor
+    assert actor.prop.style == "Wireframe"
+    viewport.show_edges(True)
+    assert viewport.edges_visible() and not actor.prop.show_edges
+
+    viewport.set_display_mode("solid")
+    assert viewport.current_actor is actor
+    assert actor.prop.style == "Surface" and actor.prop.show_edges
+    # Набор данных с нормалями гладкого затенения не пересоздавался
+    assert actor.mapper.dataset is dataset
+
+    # Раскраска — отдельный actor; после ее снятия снова показан actor модели
+    viewport.show_face_scalars(np.zeros(mesh.n_cells), "Толщина, мм")
+    assert viewport.current_actor is not actor and not actor.GetVisibility()
+    viewport.clear_face_scalars()
+    assert viewport.current_actor is actor and actor.GetVisibility()
+
+
+def test_viewport_defect_overlay(qapp):
+    """Тест: дефекты — массив на наборе данных actor модели, переключение без его изменения"""
+    import numpy as np
+    import pyvista as pv
+
+    trimesh = pytest.importorskip("trimesh")
+    from solidflow.analysis.defects import DefectAnalyzer
+
+    box = trimesh.creation.box()
+    faces = box.faces.copy()
+    faces[0] = faces[0][::-1]
+    mesh = pv.PolyData(box.vertices, np.column_stack([np.full(11, 3), faces[:11]]).ravel())
+    defects = DefectAnalyzer(mesh).analyze()
+
+    viewport = Viewport3D()
+    viewport.load_mesh(mesh)
+    actor = viewport.current_actor
+    dataset = actor.mapper.dataset
+    viewport.show_defects(defects)
+    assert viewport.has_defects() and viewport.current_actor is actor
+    assert actor.mapper.dataset is dataset and actor.mapper.scalar_visibility
+    assert dataset.cell_data["Дефекты"][0] and "Дефекты" not in mesh.cell_data
+
+    # Переключение вида меняет таблицу цветов, а не данные модели
+    modified = dataset.GetMTime()
+    viewport.set_defect_visible("boundary", False)
+    viewport.set_defect_visible("flipped", False)
+    assert not viewport.defect_visible("flipped")
+    assert dataset.GetMTime() == modified and actor.mapper.dataset is dataset
+
+    viewport.clear_defects()
+    assert not viewport.has_defects() and not actor.mapper.scalar_visibility
+    assert "Дефекты" not in dataset.cell_data
+
+
+def test_viewport_render_stats(qapp, tmp_path):
+    """Тест статистики отрисовки: треугольники, режим и уровень детализации кадра"""
+    import pyvista as pv
+
+    viewport = Viewport3D()
+
+    def frame():
+        # Окно Qt вне экрана не рисует: кадр имитируется событиями окна отрисовки
+        viewport.plotter.ren_win.InvokeEvent("StartEvent")
+        viewport.plotter.ren_win.InvokeEvent("EndEvent")
+        return viewport.stats.frames[-1]
+
+    viewport.lod.min_faces = 10000
+    mesh = pv.Sphere(theta_resolution=300, phi_resolution=300)
+    viewport.load_mesh(mesh)
+    assert viewport.lod.wait(30)
+
+    # Кадр во время движения камеры: упрощенная копия и ее уровень
+    viewport.lod.record_frame(2 * viewport.lod.budget)
+    viewport.lod.start_interaction()
+    shown = (viewport.lod.shown_faces, viewport.lod.shown_level)
+    assert shown[0] < mesh.n_cells and shown[1] >= 1
+    record = frame()
+    assert (record[2], record[4]) == shown
+    viewport.lod.end_interaction()
+
+    viewport.show_edges(True)
+    record = frame()
+    assert record[2] == mesh.n_cells
+    assert record[4:6] == (0, "solid+edges")
+
+    viewport.set_stats_overlay(True)
+    assert viewport.stats_overlay_visible()
+    viewport.set_stats_overlay(False)
+    assert viewport.export_render_stats(tmp_path / "stats.csv") == len(viewport.stats.frames)
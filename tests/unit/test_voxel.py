@@ -0,0 +1,72 @@
+"""
+Тесты для воксельной модели и воксельного ремонта
+"""
+
+import numpy as np
+import pytest
+
+trimesh = pytest.importorskip("trimesh")
+pytest.importorskip("pyvista")
+
+from solidflow.geometry.mesh.processor import MeshProcessor
+from solidflow.geometry.voxel.voxelizer import Voxelizer, voxel_grid
+
+
+def test_voxel_volume_matches_analytic():
+    """Тест объема: коробка точно, сфера — с точностью до вокселя; память — по поверхности"""
+    box = trimesh.creation.box(extents=[10, 5, 2])
+    grid = Voxelizer(box, pitch=0.1).voxelize()
+    assert grid.volume == pytest.approx(100.0)
+
+    sphere = trimesh.creation.icosphere(subdivisions=4, radius=10)
+    grid = Voxelizer(sphere, resolution=96, max_workers=2).voxelize()
+    assert grid.volume == pytest.approx(sphere.volume, rel=0.01)
+    # Плотный массив bool той же сетки — байт на воксель
+    assert grid.nbytes < np.prod(grid.shape) / 10
+    assert np.array_equal(grid.contains([[0, 0, 0], [9.5, 0, 0], [11, 0, 0]]), [True, True, False])
+
+
+def test_voxel_fill_tolerates_defects():
+    """Тест заполнения: дыры, вывернутые грани и пересекающиеся оболочки"""
+    sphere = trimesh.creation.icosphere(subdivisions=4, radius=10)
+    reference = Voxelizer(sphere, resolution=64).voxelize().volume
+
+    holed = trimesh.Trimesh(sphere.vertices, sphere.faces[40:])
+    assert not holed.is_watertight
+    assert Voxelizer(holed, resolution=64).voxelize().volume == pytest.approx(reference, rel=0.01)
+
+    faces = sphere.faces.copy()
+    faces[::3] = faces[::3, ::-1]
+    flipped = trimesh.Trimesh(sphere.vertices, faces, process=False)
+    assert Voxelizer(flipped, resolution=64).voxelize().volume == pytest.approx(reference, rel=0.01)
+
+    # Две пересекающиеся сферы: объединение без пустоты в пересечении
+    shifted = sphere.copy()
+    shifted.apply_translation([10, 0, 0])
+    union = trimesh.util.concatenate([sphere, shifted])
+    lens = np.pi * (4 * 10 + 10) * (2 * 10 - 10) ** 2 / 12
+    volume = Voxelizer(union, resolution=96).voxelize().volume
+    assert volume == pytest.approx(2 * sphere.volume - lens, rel=0.02)
+
+
+def test_voxel_grid_cached_by_version():
+    """Тест кэша сетки: повторный вызов возвращает тот же объект, смена разрешения — новый"""
+    box = trimesh.creation.box(extents=[4, 4, 4])
+    grid = voxel_grid(box, resolution=32)
+
+    assert voxel_grid(box, resolution=32) is grid
+    assert voxel_grid(box, resolution=16) is not grid
+
+
+def test_voxel_remesh_watertight():
+    """Тест воксельного ремонта: модель с дырой становится замкнутой, объем сохраняется"""
+    sphere = trimesh.creation.icosphere(subdivisions=4, radius=10)
+    holed = trimesh.Trimesh(sphere.vertices, sphere.faces[40:])
+
+    remeshed = MeshProcessor(holed).voxel_remesh(resolution=64, smooth_iterations=10)
+    faces = remeshed.faces.reshape(-1, 4)[:, 1:]
+    result = trimesh.Trimesh(remeshed.points, faces)
+
+    assert result.is_watertight
+    assert result.volume > 0
+    assert result.volume == pytest.approx(sphere.volume, rel=0.02)